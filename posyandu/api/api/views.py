@@ -7,7 +7,7 @@ from rest_framework.permissions import IsAuthenticated
 # Create your views here.
 
 class PenimbanganViewSet(viewsets.ModelViewSet):
-    queryset = Penimbangan.objects.all()
+    queryset = Penimbangan.objects.select_related('pemeriksa', 'anak')
     serializer_class = PenimbanganSerializer
     permission_classes = [IsAuthenticated]
 
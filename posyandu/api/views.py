@@ -24,13 +24,13 @@ class PosyanduViewSet(viewsets.ModelViewSet): # pylint: disable=too-many-ancesto
 
 class AnakViewSet(viewsets.ModelViewSet): # pylint: disable=too-many-ancestors
     """API endpoint yang memungkinkan data Anak untuk dilihat atau diedit."""
-    queryset = Anak.objects.all() # pylint: disable=no-member
+    queryset = Anak.objects.select_related('posyandu') # pylint: disable=no-member
     serializer_class = AnakSerializer
     permission_classes = [IsAuthenticated]
 
 class PenimbanganViewSet(viewsets.ModelViewSet): # pylint: disable=too-many-ancestors
     """API endpoint yang memungkinkan data Penimbangan untuk dilihat atau diedit."""
-    queryset = Penimbangan.objects.all() # pylint: disable=no-member
+    queryset = Penimbangan.objects.select_related('pemeriksa') # pylint: disable=no-member
     serializer_class = PenimbanganSerializer
     permission_classes = [IsAuthenticated]
 
@@ -45,7 +45,7 @@ yang melakukan request."""
 
 class UserViewSet(viewsets.ModelViewSet): # pylint: disable=too-many-ancestors
     """API endpoint yang memungkinkan data User untuk dilihat atau diedit."""
-    queryset = User.objects.all() # pylint: disable=no-member
+    queryset = User.objects.select_related('userprofile') # pylint: disable=no-member
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated]
 
@@ -23,7 +23,7 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
     
     def get_object(self):
         """Mengambil profil pengguna yang sedang login."""
-        profile, created = UserProfile.objects.get_or_create(user=self.request.user)
+        profile, created = UserProfile.objects.select_related('user').get_or_create(user=self.request.user)
         return profile
 
 
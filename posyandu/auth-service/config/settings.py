@@ -6,11 +6,22 @@ Service ini menangani autentikasi dan otorisasi untuk seluruh sistem.
 from datetime import timedelta
 from pathlib import Path
 import os
+import sys
 from decouple import config
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Paket bersama (common/) disalin ke /app/common saat build Docker; saat
+# dijalankan langsung dari monorepo, paket berada di root folder posyandu/.
+COMMON_DIR = BASE_DIR.parent
+if not (BASE_DIR / 'common').exists() and str(COMMON_DIR) not in sys.path:
+    sys.path.append(str(COMMON_DIR))
+
+from common.cache import cache_settings  # noqa: E402
+from common.database import database_settings  # noqa: E402
+from common.performance import logging_settings  # noqa: E402
+
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_KEY = config('SECRET_KEY', default='django-insecure-auth-service-key')
 
@@ -35,9 +46,12 @@ INSTALLED_APPS = [
     'allauth.account',
     'allauth.socialaccount',
     'auth.apps.AuthConfig',
+    'common',
 ]
 
 MIDDLEWARE = [
+    'common.performance.PerformanceMiddleware',
+    'common.metrics.MetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -69,17 +83,16 @@ TEMPLATES = [
 WSGI_APPLICATION = 'config.wsgi.application'
 
 # Database
+# Mode koneksi dan ukuran pool diatur lewat env DB_* (lihat common/database.py)
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.postgresql',
-        'NAME': config('DB_NAME', default='posyandu_auth'),
-        'USER': config('DB_USER', default='postgres'),
-        'PASSWORD': config('DB_PASSWORD', default='password'),
-        'HOST': config('DB_HOST', default='shared-database'),
-        'PORT': config('DB_PORT', default='5432'),
-    }
+    'default': database_settings('posyandu_auth'),
 }
 
+# Cache (backend diatur lewat env CACHE_*, lihat common/cache.py)
+CACHES = cache_settings('posyandu_auth')
+
+LOGGING = logging_settings()
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -10,8 +10,13 @@ from rest_framework_simplejwt.views import (
     TokenRefreshView,
 )
 
+from common.database import pool_stats_view
+from common.metrics import metrics_view
+
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('internal/db-pool/', pool_stats_view),
+    path('metrics', metrics_view),
     path('api/auth/', include('auth.urls')),
     path('api/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
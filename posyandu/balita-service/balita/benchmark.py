@@ -0,0 +1,57 @@
+"""
+Data benchmark balita-service: pemeriksaan bulanan balita.
+
+Balita, posyandu, umur, dan jenis kelamin diambil dari `SeedContext.balita()`
+sehingga cocok dengan data posyandu-service. Z-score dan status gizi
+dihitung dengan `apply_growth()` per batch, sama seperti saat pencatatan.
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from .growth import apply_growth
+from .models import PemeriksaanBalita
+
+
+MODELS = [PemeriksaanBalita]
+
+
+def _median(umur_bulan):
+    """Perkiraan kasar median (berat kg, tinggi cm, lingkar kepala cm, lingkar lengan cm)."""
+    if umur_bulan < 12:
+        berat, tinggi = 3.3 + 0.52 * umur_bulan, 50 + 2.15 * umur_bulan
+    elif umur_bulan < 24:
+        berat, tinggi = 9.6 + 0.17 * (umur_bulan - 12), 75.8 + 0.95 * (umur_bulan - 12)
+    else:
+        berat, tinggi = 11.6 + 0.17 * (umur_bulan - 24), 87.2 + 0.63 * (umur_bulan - 24)
+    return berat, tinggi, 35 + 0.45 * min(umur_bulan, 24), 11 + 0.15 * min(umur_bulan, 24)
+
+
+def _pemeriksaan_rows(ctx):
+    rng = ctx.random('pemeriksaan')
+    balita_count = ctx.count('balita')
+    for number in range(1, ctx.count('pemeriksaan') + 1):
+        balita_id = (number - 1) % balita_count + 1
+        ref = ctx.balita(balita_id)
+        # Pemeriksaan ke-n balita yang sama dilakukan n bulan sebelum tanggal akhir
+        tanggal = ctx.end_date - timedelta(days=((number - 1) // balita_count) * 30 + balita_id % 28)
+        tanggal = max(tanggal, ref.tanggal_lahir)
+        umur_bulan = (tanggal - ref.tanggal_lahir).days // 30
+        berat, tinggi, kepala, lengan = _median(umur_bulan)
+        yield PemeriksaanBalita(
+            id=number,
+            visit_id=number,
+            balita_id=balita_id,
+            posyandu_id=ref.posyandu_id,
+            tanggal_pemeriksaan=tanggal,
+            berat_badan=Decimal(f'{berat * rng.gauss(1, 0.08):.2f}'),
+            tinggi_badan=Decimal(f'{tinggi * rng.gauss(1, 0.04):.1f}'),
+            lingkar_kepala=Decimal(f'{kepala * rng.gauss(1, 0.03):.1f}'),
+            lingkar_lengan=Decimal(f'{lengan * rng.gauss(1, 0.06):.1f}'),
+            umur_bulan=umur_bulan,
+            jenis_kelamin=ref.jenis_kelamin,
+            created_by=1,
+        )
+
+
+def seed(ctx):
+    ctx.bulk_insert(PemeriksaanBalita, _pemeriksaan_rows(ctx), prepare=apply_growth)
@@ -0,0 +1,218 @@
+"""
+Mesin z-score pertumbuhan anak berdasarkan WHO Child Growth Standards (2006).
+
+Tabel LMS (`data/who_lms.csv`) dimuat sekali ke array NumPy per indikator
+dan jenis kelamin. Semua perhitungan menerima array sehingga satu anak
+maupun ribuan pemeriksaan dihitung dengan kode yang sama tanpa loop Python.
+
+Indikator:
+
+- `bb_u`   berat badan menurut umur (0-60 bulan)
+- `tb_u`   panjang/tinggi badan menurut umur (tabel panjang < 24 bulan)
+- `bb_tb`  berat badan menurut panjang (< 24 bulan) / tinggi badan
+- `imt_u`  IMT menurut umur
+
+Klasifikasi mengikuti Permenkes No. 2 Tahun 2020 tentang Standar
+Antropometri Anak.
+"""
+import csv
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+
+DATA_FILE = Path(__file__).resolve().parent / 'data' / 'who_lms.csv'
+JENIS_KELAMIN = ('Laki-laki', 'Perempuan')
+
+# Batas z-score yang dianggap tidak masuk akal (WHO flag), diubah menjadi NaN
+BATAS_TIDAK_WAJAR = {
+    'bb_u': (-6, 5),
+    'tb_u': (-6, 6),
+    'bb_tb': (-5, 5),
+    'imt_u': (-5, 5),
+}
+
+
+class LMSTable:
+    """Tabel LMS berjarak seragam dengan interpolasi linear."""
+
+    def __init__(self, x, L, M, S):
+        self.start = x[0]
+        self.step = x[1] - x[0]
+        self.L = L
+        self.M = M
+        self.S = S
+
+    def lookup(self, x):
+        """Mengembalikan array (L, M, S) untuk `x`; NaN bila di luar tabel."""
+        position = (np.asarray(x, dtype=float) - self.start) / self.step
+        valid = (position >= 0) & (position <= len(self.M) - 1)
+        position = np.where(valid, position, 0)
+        lower = np.floor(position).astype(int)
+        upper = np.minimum(lower + 1, len(self.M) - 1)
+        fraction = position - lower
+        values = []
+        for column in (self.L, self.M, self.S):
+            value = column[lower] + (column[upper] - column[lower]) * fraction
+            values.append(np.where(valid, value, np.nan))
+        return values
+
+
+@lru_cache(maxsize=1)
+def load_tables():
+    """Memuat tabel LMS WHO: dict `(indikator, jenis_kelamin) -> LMSTable`."""
+    rows = {}
+    with open(DATA_FILE, newline='') as handle:
+        for row in csv.DictReader(handle):
+            key = (row['indikator'], row['jenis_kelamin'])
+            rows.setdefault(key, []).append(
+                (float(row['x']), float(row['L']), float(row['M']), float(row['S']))
+            )
+    return {
+        key: LMSTable(*np.array(values).T)
+        for key, values in rows.items()
+    }
+
+
+def _lms(indikator_muda, indikator_tua, umur_bulan, x, jenis_kelamin):
+    """
+    Mengambil L, M, S per baris sesuai jenis kelamin dan kelompok umur.
+
+    Anak < 24 bulan memakai `indikator_muda`, selebihnya `indikator_tua`.
+    """
+    tables = load_tables()
+    muda = umur_bulan < 24
+    result = [np.full(len(x), np.nan) for _ in range(3)]
+    for jk in JENIS_KELAMIN:
+        for indikator, mask in ((indikator_muda, muda), (indikator_tua, ~muda)):
+            rows = (jenis_kelamin == jk) & mask
+            if rows.any():
+                for target, value in zip(result, tables[(indikator, jk)].lookup(x[rows])):
+                    target[rows] = value
+    return result
+
+
+def _zscore(value, L, M, S, restricted):
+    """
+    Rumus LMS WHO. Untuk indikator berbasis berat (`restricted`), z di luar
+    +/-3 dihitung ulang dengan jarak SD2-SD3 sesuai metode WHO.
+    """
+    with np.errstate(invalid='ignore', divide='ignore'):
+        L_safe = np.where(L == 0, 1, L)
+        z = np.where(
+            L == 0,
+            np.log(value / M) / S,
+            (np.power(value / M, L_safe) - 1) / (L_safe * S),
+        )
+        if restricted:
+            def sd(n):
+                return M * np.power(1 + L_safe * S * n, 1 / L_safe)
+            sd3_pos, sd2_pos = sd(3), sd(2)
+            sd3_neg, sd2_neg = sd(-3), sd(-2)
+            z = np.where(z > 3, 3 + (value - sd3_pos) / (sd3_pos - sd2_pos), z)
+            z = np.where(z < -3, -3 + (value - sd3_neg) / (sd2_neg - sd3_neg), z)
+    return z
+
+
+def compute_zscores(umur_bulan, jenis_kelamin, berat_badan, tinggi_badan):
+    """
+    Menghitung z-score keempat indikator untuk array pengukuran.
+
+    Semua argumen boleh berupa skalar atau array dengan panjang sama; nilai
+    kosong (None) menghasilkan NaN. Mengembalikan dict `indikator -> array`.
+    """
+    umur = np.atleast_1d(np.asarray(umur_bulan, dtype=float))
+    jk = np.atleast_1d(np.asarray(jenis_kelamin, dtype=object))
+    berat = np.atleast_1d(np.asarray(berat_badan, dtype=float))
+    tinggi = np.atleast_1d(np.asarray(tinggi_badan, dtype=float))
+
+    with np.errstate(invalid='ignore'):
+        imt = berat / np.square(tinggi / 100)
+        tanpa_umur = np.isnan(umur)
+        umur_lookup = np.where(tanpa_umur, -1, umur)
+
+    zscores = {
+        'bb_u': _zscore(berat, *_lms('wfa', 'wfa', umur_lookup, umur_lookup, jk), restricted=True),
+        'tb_u': _zscore(tinggi, *_lms('lhfa_0_2', 'lhfa_2_5', umur_lookup, umur_lookup, jk), restricted=False),
+        'bb_tb': _zscore(berat, *_lms('wfl', 'wfh', umur_lookup, tinggi, jk), restricted=True),
+        'imt_u': _zscore(imt, *_lms('bfa_0_2', 'bfa_2_5', umur_lookup, umur_lookup, jk), restricted=True),
+    }
+    for indikator, (bawah, atas) in BATAS_TIDAK_WAJAR.items():
+        z = zscores[indikator]
+        with np.errstate(invalid='ignore'):
+            zscores[indikator] = np.where(tanpa_umur | (z < bawah) | (z > atas), np.nan, z)
+    return zscores
+
+
+def classify_status_gizi(z_bb_tb):
+    """
+    Status gizi dari z-score BB/TB (Permenkes 2/2020).
+
+    Kategori "berisiko gizi lebih" (+1 s.d. +2 SD) tidak ada pada pilihan
+    `status_gizi` sehingga dimasukkan ke `normal`. NaN menghasilkan None.
+    """
+    z = np.asarray(z_bb_tb, dtype=float)
+    with np.errstate(invalid='ignore'):
+        status = np.select(
+            [z < -3, z < -2, z <= 2, z <= 3, z > 3],
+            ['buruk', 'kurang', 'normal', 'lebih', 'obesitas'],
+            default=None,
+        )
+    return status
+
+
+def prevalence(zscores):
+    """
+    Prevalensi masalah gizi dari hasil `compute_zscores()`.
+
+    Penyebut tiap indikator adalah jumlah anak dengan z-score valid untuk
+    indikator tersebut.
+    """
+    definisi = {
+        'stunting': ('tb_u', lambda z: z < -2),
+        'stunting_berat': ('tb_u', lambda z: z < -3),
+        'wasting': ('bb_tb', lambda z: z < -2),
+        'wasting_berat': ('bb_tb', lambda z: z < -3),
+        'underweight': ('bb_u', lambda z: z < -2),
+        'overweight': ('bb_tb', lambda z: z > 2),
+    }
+    result = {}
+    for nama, (indikator, kondisi) in definisi.items():
+        z = zscores[indikator]
+        valid = ~np.isnan(z)
+        jumlah_valid = int(valid.sum())
+        with np.errstate(invalid='ignore'):
+            jumlah = int(kondisi(z[valid]).sum())
+        result[nama] = {
+            'jumlah': jumlah,
+            'diukur': jumlah_valid,
+            'persen': round(jumlah * 100 / jumlah_valid, 2) if jumlah_valid else 0,
+        }
+    return result
+
+
+def apply_growth(instances, set_status=True):
+    """
+    Mengisi z-score dan `status_gizi` pada instance PemeriksaanBalita.
+
+    Z-score instance tanpa `umur_bulan`/`jenis_kelamin` menjadi None;
+    `status_gizi` yang sudah diisi manual tidak ditimpa. Mengembalikan array
+    status gizi hasil perhitungan.
+    """
+    if not instances:
+        return np.array([], dtype=object)
+    zscores = compute_zscores(
+        [obj.umur_bulan for obj in instances],
+        [obj.jenis_kelamin for obj in instances],
+        [obj.berat_badan for obj in instances],
+        [obj.tinggi_badan for obj in instances],
+    )
+    status = classify_status_gizi(zscores['bb_tb'])
+    for index, obj in enumerate(instances):
+        for indikator, values in zscores.items():
+            value = values[index]
+            setattr(obj, f'zscore_{indikator}', None if np.isnan(value) else round(float(value), 2))
+        if set_status and not obj.status_gizi and status[index] is not None:
+            obj.status_gizi = status[index]
+    return status
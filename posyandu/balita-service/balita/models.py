@@ -3,7 +3,10 @@ Model untuk balita-service.
 Menangani pemeriksaan balita POS BINDU PTM.
 """
 from django.db import models
+from common.statistics import VacatedDay, track_vacated_days
+from common.sync import Tombstone, track_deletions
 from decimal import Decimal
+from .growth import apply_growth
 
 
 class PemeriksaanBalita(models.Model):
@@ -39,6 +42,28 @@ class PemeriksaanBalita(models.Model):
         help_text="Lingkar lengan atas dalam cm"
     )
     
+    # Data anak saat pemeriksaan, dibutuhkan untuk z-score WHO
+    umur_bulan = models.IntegerField(
+        blank=True,
+        null=True,
+        help_text="Umur dalam bulan penuh saat pemeriksaan"
+    )
+    jenis_kelamin = models.CharField(
+        max_length=10,
+        choices=[
+            ('Laki-laki', 'Laki-laki'),
+            ('Perempuan', 'Perempuan'),
+        ],
+        blank=True,
+        null=True
+    )
+    
+    # Z-score WHO Child Growth Standards (dihitung otomatis)
+    zscore_bb_u = models.DecimalField(max_digits=5, decimal_places=2, blank=True, null=True)
+    zscore_tb_u = models.DecimalField(max_digits=5, decimal_places=2, blank=True, null=True)
+    zscore_bb_tb = models.DecimalField(max_digits=5, decimal_places=2, blank=True, null=True)
+    zscore_imt_u = models.DecimalField(max_digits=5, decimal_places=2, blank=True, null=True)
+    
     # Status gizi (dihitung otomatis)
     status_gizi = models.CharField(
         max_length=20,
@@ -120,37 +145,22 @@ class PemeriksaanBalita(models.Model):
             models.Index(fields=['balita_id']),
             models.Index(fields=['posyandu_id']),
             models.Index(fields=['tanggal_pemeriksaan']),
+            models.Index(fields=['updated_at', 'id']),
         ]
     
     def __str__(self):
         return f"Pemeriksaan Balita {self.balita_id} - {self.tanggal_pemeriksaan}"
     
     def calculate_status_gizi(self, umur_bulan, jenis_kelamin):
-        """Menghitung status gizi berdasarkan BB/TB dan umur."""
-        # Implementasi sederhana - dalam implementasi nyata gunakan chart WHO
-        if umur_bulan < 24:
-            # Untuk balita < 2 tahun, gunakan BB/TB
-            if self.berat_badan < 7.0:
-                return 'buruk'
-            elif self.berat_badan < 8.5:
-                return 'kurang'
-            elif self.berat_badan > 12.0:
-                return 'lebih'
-            else:
-                return 'normal'
-        else:
-            # Untuk balita 2-5 tahun, gunakan IMT
-            if self.tinggi_badan > 0:
-                imt = self.berat_badan / ((self.tinggi_badan / 100) ** 2)
-                if imt < 14.0:
-                    return 'buruk'
-                elif imt < 16.0:
-                    return 'kurang'
-                elif imt > 20.0:
-                    return 'obesitas'
-                else:
-                    return 'normal'
-        return 'normal'
+        """
+        Menghitung z-score WHO dan status gizi berdasarkan BB/TB.
+        
+        Field z-score diisi pada instance; status dikembalikan (None bila
+        pengukuran di luar tabel WHO atau tidak wajar).
+        """
+        self.umur_bulan = umur_bulan
+        self.jenis_kelamin = jenis_kelamin
+        return apply_growth([self], set_status=False)[0]
 
 
 class ImunisasiBalita(models.Model):
@@ -249,6 +259,7 @@ class ImunisasiBalita(models.Model):
             models.Index(fields=['posyandu_id']),
             models.Index(fields=['jenis_imunisasi']),
             models.Index(fields=['tanggal_imunisasi']),
+            models.Index(fields=['updated_at', 'id']),
         ]
     
     def __str__(self):
@@ -328,7 +339,22 @@ class VitaminBalita(models.Model):
             models.Index(fields=['posyandu_id']),
             models.Index(fields=['jenis_vitamin']),
             models.Index(fields=['tanggal_pemberian']),
+            models.Index(fields=['updated_at', 'id']),
         ]
     
     def __str__(self):
         return f"{self.get_jenis_vitamin_display()} - {self.balita_id}"
+
+
+class SyncTombstone(Tombstone):
+    """Penanda record yang dihapus untuk change feed `/api/sync/`."""
+
+
+track_deletions(SyncTombstone, PemeriksaanBalita, ImunisasiBalita, VitaminBalita)
+
+
+class FeedVacatedDay(VacatedDay):
+    """Hari yang ditinggalkan record feed harian, untuk rollup `daily_feed`."""
+
+
+track_vacated_days(FeedVacatedDay, PemeriksaanBalita, 'tanggal_pemeriksaan')
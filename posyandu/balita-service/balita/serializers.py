@@ -2,6 +2,7 @@
 Serializers untuk balita-service.
 """
 from rest_framework import serializers
+from .growth import apply_growth
 from .models import PemeriksaanBalita, ImunisasiBalita, VitaminBalita
 
 
@@ -13,10 +14,30 @@ class PemeriksaanBalitaSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'visit_id', 'balita_id', 'posyandu_id', 'tanggal_pemeriksaan',
             'berat_badan', 'tinggi_badan', 'lingkar_kepala', 'lingkar_lengan',
-            'status_gizi', 'motorik_kasar', 'motorik_halus', 'bicara', 'sosial',
+            'umur_bulan', 'jenis_kelamin', 'zscore_bb_u', 'zscore_tb_u', 'zscore_bb_tb',
+            'zscore_imt_u', 'status_gizi', 'motorik_kasar', 'motorik_halus', 'bicara', 'sosial',
             'catatan_perkembangan', 'rekomendasi', 'created_at', 'updated_at'
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        read_only_fields = [
+            'id', 'zscore_bb_u', 'zscore_tb_u', 'zscore_bb_tb', 'zscore_imt_u',
+            'created_at', 'updated_at'
+        ]
+    
+    def create(self, validated_data):
+        instance = PemeriksaanBalita(**validated_data)
+        apply_growth([instance])
+        instance.save()
+        return instance
+    
+    def update(self, instance, validated_data):
+        for field, value in validated_data.items():
+            setattr(instance, field, value)
+        status_gizi = apply_growth([instance], set_status=False)[0]
+        # Status dihitung ulang kecuali diisi manual pada request ini
+        if status_gizi is not None and 'status_gizi' not in validated_data:
+            instance.status_gizi = status_gizi
+        instance.save()
+        return instance
 
 
 class ImunisasiBalitaSerializer(serializers.ModelSerializer):
@@ -51,3 +72,27 @@ class BalitaSearchSerializer(serializers.Serializer):
     nama = serializers.CharField(required=False)
     nama_ibu = serializers.CharField(required=False)
     posyandu_id = serializers.IntegerField(required=False)
+
+
+class SesiBulkSerializer(serializers.Serializer):
+    """
+    Serializer untuk payload satu hari sesi posyandu.
+
+    `posyandu_id`, `tanggal`, dan `created_by` di level sesi menjadi nilai
+    default bagi setiap baris; baris tetap divalidasi dengan serializer
+    modelnya masing-masing.
+    """
+    MAX_ROWS = 1000
+
+    posyandu_id = serializers.IntegerField()
+    tanggal = serializers.DateField()
+    created_by = serializers.IntegerField()
+    pemeriksaan = serializers.ListField(
+        child=serializers.DictField(), required=False, default=list, max_length=MAX_ROWS
+    )
+    imunisasi = serializers.ListField(
+        child=serializers.DictField(), required=False, default=list, max_length=MAX_ROWS
+    )
+    vitamin = serializers.ListField(
+        child=serializers.DictField(), required=False, default=list, max_length=MAX_ROWS
+    )
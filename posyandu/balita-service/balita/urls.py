@@ -3,12 +3,17 @@ URLs untuk balita-service.
 """
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import PemeriksaanBalitaViewSet, ImunisasiBalitaViewSet, VitaminBalitaViewSet
+from .views import (
+    PemeriksaanBalitaViewSet, ImunisasiBalitaViewSet, VitaminBalitaViewSet, SesiPosyanduViewSet,
+    SyncViewSet
+)
 
 router = DefaultRouter()
 router.register(r'pemeriksaan', PemeriksaanBalitaViewSet)
 router.register(r'imunisasi', ImunisasiBalitaViewSet)
 router.register(r'vitamin', VitaminBalitaViewSet)
+router.register(r'sessions', SesiPosyanduViewSet, basename='sessions')
+router.register(r'sync', SyncViewSet, basename='sync')
 
 urlpatterns = [
     path('', include(router.urls)),
@@ -6,15 +6,24 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q
-from .models import PemeriksaanBalita, ImunisasiBalita, VitaminBalita
+from django.db import connections, transaction
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.utils.dateparse import parse_date
+import numpy as np
+from common.batch import BatchLookupMixin
+from common.related import RelatedLoadsMixin
+from common.conditional import ConditionalGetMixin
+from common.statistics import StatisticsMixin, DailyFeedMixin, Stat, Total, count_by
+from common.sync import ChangeFeedViewSet, SyncSource
+from .growth import apply_growth, compute_zscores, classify_status_gizi, prevalence
+from .models import PemeriksaanBalita, ImunisasiBalita, VitaminBalita, SyncTombstone, FeedVacatedDay
 from .serializers import (
     PemeriksaanBalitaSerializer, ImunisasiBalitaSerializer, 
-    VitaminBalitaSerializer, BalitaSearchSerializer
+    VitaminBalitaSerializer, BalitaSearchSerializer, SesiBulkSerializer
 )
 
 
-class PemeriksaanBalitaViewSet(viewsets.ModelViewSet):
+class PemeriksaanBalitaViewSet(ConditionalGetMixin, StatisticsMixin, DailyFeedMixin, BatchLookupMixin, RelatedLoadsMixin, viewsets.ModelViewSet):
     """ViewSet untuk model PemeriksaanBalita."""
     queryset = PemeriksaanBalita.objects.all()
     serializer_class = PemeriksaanBalitaSerializer
@@ -23,6 +32,32 @@ class PemeriksaanBalitaViewSet(viewsets.ModelViewSet):
     search_fields = ['balita_id', 'posyandu_id']
     ordering_fields = ['tanggal_pemeriksaan', 'created_at']
     ordering = ['-tanggal_pemeriksaan']
+    statistics_spec = {
+        'total_pemeriksaan': Total(),
+        'by_status_gizi': count_by('status_gizi', ['normal', 'kurang', 'buruk', 'lebih']),
+        'by_perkembangan': {
+            'sesuai': Q(motorik_kasar='sesuai', motorik_halus='sesuai', bicara='sesuai', sosial='sesuai'),
+            'meragukan': (
+                Q(motorik_kasar='meragukan') | Q(motorik_halus='meragukan') |
+                Q(bicara='meragukan') | Q(sosial='meragukan')
+            ),
+            'menyimpang': (
+                Q(motorik_kasar='menyimpang') | Q(motorik_halus='menyimpang') |
+                Q(bicara='menyimpang') | Q(sosial='menyimpang')
+            ),
+        },
+    }
+    daily_feed_date_field = 'tanggal_pemeriksaan'
+    daily_feed_vacated_model = FeedVacatedDay
+    daily_feed_spec = {
+        'total_balita': Stat(Count('balita_id', distinct=True), default=0),
+        'balita_gizi_normal': Stat(Count('balita_id', distinct=True, filter=Q(status_gizi='normal')), default=0),
+        'balita_gizi_kurang': Stat(Count('balita_id', distinct=True, filter=Q(status_gizi='kurang')), default=0),
+        'balita_gizi_lebih': Stat(
+            Count('balita_id', distinct=True, filter=Q(status_gizi__in=['lebih', 'obesitas'])), default=0
+        ),
+        'balita_gizi_buruk': Stat(Count('balita_id', distinct=True, filter=Q(status_gizi='buruk')), default=0),
+    }
     
     @action(detail=False, methods=['get'])
     def by_balita(self, request):
@@ -63,44 +98,73 @@ class PemeriksaanBalitaViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
     
     @action(detail=False, methods=['get'])
-    def statistics(self, request):
-        """Statistik pemeriksaan balita."""
-        total_pemeriksaan = self.queryset.count()
-        by_status_gizi = {
-            'normal': self.queryset.filter(status_gizi='normal').count(),
-            'kurang': self.queryset.filter(status_gizi='kurang').count(),
-            'buruk': self.queryset.filter(status_gizi='buruk').count(),
-            'lebih': self.queryset.filter(status_gizi='lebih').count(),
-        }
-        by_perkembangan = {
-            'sesuai': self.queryset.filter(
-                motorik_kasar='sesuai',
-                motorik_halus='sesuai',
-                bicara='sesuai',
-                sosial='sesuai'
-            ).count(),
-            'meragukan': self.queryset.filter(
-                Q(motorik_kasar='meragukan') | 
-                Q(motorik_halus='meragukan') | 
-                Q(bicara='meragukan') | 
-                Q(sosial='meragukan')
-            ).count(),
-            'menyimpang': self.queryset.filter(
-                Q(motorik_kasar='menyimpang') | 
-                Q(motorik_halus='menyimpang') | 
-                Q(bicara='menyimpang') | 
-                Q(sosial='menyimpang')
-            ).count(),
-        }
+    def prevalensi(self, request):
+        """
+        Prevalensi stunting, wasting, underweight, dan overweight.
+        
+        Memakai pemeriksaan terakhir setiap balita dalam filter (mis.
+        `posyandu_ids=1,2,3` untuk satu wilayah, `dari`/`sampai` untuk
+        periode). Z-score seluruh balita dihitung dalam satu proses vektor.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        posyandu_ids = request.query_params.get('posyandu_ids')
+        if posyandu_ids:
+            try:
+                ids = [int(value) for value in posyandu_ids.split(',') if value.strip()]
+            except ValueError:
+                return Response(
+                    {'error': 'posyandu_ids parameter must be a comma-separated list of integers'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            queryset = queryset.filter(posyandu_id__in=ids)
+        for param, lookup in (('dari', 'gte'), ('sampai', 'lte')):
+            value = request.query_params.get(param)
+            if value:
+                try:
+                    parsed = parse_date(value)
+                except ValueError:
+                    # Format benar tetapi tanggal mustahil, mis. 2024-02-30
+                    parsed = None
+                if parsed is None:
+                    return Response(
+                        {'error': f'{param} parameter must be a date (YYYY-MM-DD)'},
+                        status=status.HTTP_400_BAD_REQUEST
+                    )
+                queryset = queryset.filter(**{f'tanggal_pemeriksaan__{lookup}': parsed})
+        
+        queryset = queryset.filter(umur_bulan__isnull=False, jenis_kelamin__isnull=False)
+        # Pemeriksaan terakhir setiap balita dipilih di database
+        if connections[queryset.db].vendor == 'postgresql':
+            latest = (
+                queryset.order_by('balita_id', '-tanggal_pemeriksaan', '-id')
+                .distinct('balita_id')
+            )
+        else:
+            latest = queryset.filter(pk=Subquery(
+                queryset.filter(balita_id=OuterRef('balita_id'))
+                .order_by('-tanggal_pemeriksaan', '-id')
+                .values('pk')[:1]
+            ))
+        rows = list(latest.values_list('umur_bulan', 'jenis_kelamin', 'berat_badan', 'tinggi_badan'))
+        if rows:
+            umur, jenis_kelamin, berat, tinggi = (np.array(column, dtype=object) for column in zip(*rows))
+            zscores = compute_zscores(umur, jenis_kelamin, berat, tinggi)
+            status_gizi = classify_status_gizi(zscores['bb_tb'])
+        else:
+            zscores = compute_zscores([], [], [], [])
+            status_gizi = np.array([], dtype=object)
         
         return Response({
-            'total_pemeriksaan': total_pemeriksaan,
-            'by_status_gizi': by_status_gizi,
-            'by_perkembangan': by_perkembangan,
+            'jumlah_balita': len(rows),
+            **prevalence(zscores),
+            'by_status_gizi': {
+                value: int((status_gizi == value).sum())
+                for value in ['normal', 'kurang', 'buruk', 'lebih', 'obesitas']
+            },
         })
 
 
-class ImunisasiBalitaViewSet(viewsets.ModelViewSet):
+class ImunisasiBalitaViewSet(ConditionalGetMixin, StatisticsMixin, BatchLookupMixin, RelatedLoadsMixin, viewsets.ModelViewSet):
     """ViewSet untuk model ImunisasiBalita."""
     queryset = ImunisasiBalita.objects.all()
     serializer_class = ImunisasiBalitaSerializer
@@ -109,6 +173,11 @@ class ImunisasiBalitaViewSet(viewsets.ModelViewSet):
     search_fields = ['balita_id', 'posyandu_id', 'petugas_imunisasi']
     ordering_fields = ['tanggal_imunisasi', 'created_at']
     ordering = ['-tanggal_imunisasi']
+    statistics_spec = {
+        'total_imunisasi': Total(),
+        'by_status': count_by('status', ['diberikan', 'tidak_diberikan', 'kontraindikasi', 'menolak']),
+        'by_jenis': count_by('jenis_imunisasi', ImunisasiBalita.JENIS_IMUNISASI_CHOICES),
+    }
     
     @action(detail=False, methods=['get'])
     def by_balita(self, request):
@@ -147,29 +216,9 @@ class ImunisasiBalitaViewSet(viewsets.ModelViewSet):
         
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
-    
-    @action(detail=False, methods=['get'])
-    def statistics(self, request):
-        """Statistik imunisasi."""
-        total_imunisasi = self.queryset.count()
-        by_status = {
-            'diberikan': self.queryset.filter(status='diberikan').count(),
-            'tidak_diberikan': self.queryset.filter(status='tidak_diberikan').count(),
-            'kontraindikasi': self.queryset.filter(status='kontraindikasi').count(),
-            'menolak': self.queryset.filter(status='menolak').count(),
-        }
-        by_jenis = {}
-        for choice in ImunisasiBalita.JENIS_IMUNISASI_CHOICES:
-            by_jenis[choice[0]] = self.queryset.filter(jenis_imunisasi=choice[0]).count()
-        
-        return Response({
-            'total_imunisasi': total_imunisasi,
-            'by_status': by_status,
-            'by_jenis': by_jenis,
-        })
 
 
-class VitaminBalitaViewSet(viewsets.ModelViewSet):
+class VitaminBalitaViewSet(ConditionalGetMixin, StatisticsMixin, BatchLookupMixin, RelatedLoadsMixin, viewsets.ModelViewSet):
     """ViewSet untuk model VitaminBalita."""
     queryset = VitaminBalita.objects.all()
     serializer_class = VitaminBalitaSerializer
@@ -178,6 +227,11 @@ class VitaminBalitaViewSet(viewsets.ModelViewSet):
     search_fields = ['balita_id', 'posyandu_id', 'petugas_pemberian']
     ordering_fields = ['tanggal_pemberian', 'created_at']
     ordering = ['-tanggal_pemberian']
+    statistics_spec = {
+        'total_vitamin': Total(),
+        'by_status': count_by('status', ['diberikan', 'tidak_diberikan', 'menolak']),
+        'by_jenis': count_by('jenis_vitamin', VitaminBalita.JENIS_VITAMIN_CHOICES),
+    }
     
     @action(detail=False, methods=['get'])
     def by_balita(self, request):
@@ -216,22 +270,75 @@ class VitaminBalitaViewSet(viewsets.ModelViewSet):
         
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
+
+
+class SesiPosyanduViewSet(viewsets.ViewSet):
+    """ViewSet untuk unggah data satu sesi posyandu sekaligus."""
     
-    @action(detail=False, methods=['get'])
-    def statistics(self, request):
-        """Statistik vitamin."""
-        total_vitamin = self.queryset.count()
-        by_status = {
-            'diberikan': self.queryset.filter(status='diberikan').count(),
-            'tidak_diberikan': self.queryset.filter(status='tidak_diberikan').count(),
-            'menolak': self.queryset.filter(status='menolak').count(),
-        }
-        by_jenis = {}
-        for choice in VitaminBalita.JENIS_VITAMIN_CHOICES:
-            by_jenis[choice[0]] = self.queryset.filter(jenis_vitamin=choice[0]).count()
+    # key payload -> (serializer baris, field tanggal pada model)
+    SECTIONS = {
+        'pemeriksaan': (PemeriksaanBalitaSerializer, 'tanggal_pemeriksaan'),
+        'imunisasi': (ImunisasiBalitaSerializer, 'tanggal_imunisasi'),
+        'vitamin': (VitaminBalitaSerializer, 'tanggal_pemberian'),
+    }
+    BATCH_SIZE = 500
+    
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """
+        Menyimpan pemeriksaan, imunisasi, dan vitamin satu sesi dalam satu transaksi.
+        
+        Seluruh baris divalidasi terlebih dahulu; jika ada baris yang tidak
+        valid, tidak ada data yang disimpan dan response berisi error per
+        baris beserta indeksnya sehingga sesi dapat dikirim ulang utuh.
+        """
+        sesi = SesiBulkSerializer(data=request.data)
+        sesi.is_valid(raise_exception=True)
+        data = sesi.validated_data
+        
+        serializers_by_section = {}
+        errors = {}
+        for key, (serializer_class, date_field) in self.SECTIONS.items():
+            rows = [
+                {'posyandu_id': data['posyandu_id'], date_field: data['tanggal'], **row}
+                for row in data[key]
+            ]
+            serializer = serializer_class(data=rows, many=True)
+            if not serializer.is_valid():
+                errors[key] = [
+                    {'index': index, 'errors': row_errors}
+                    for index, row_errors in enumerate(serializer.errors)
+                    if row_errors
+                ]
+            serializers_by_section[key] = serializer
+        
+        if errors:
+            return Response({'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+        
+        created = {}
+        with transaction.atomic():
+            for key, serializer in serializers_by_section.items():
+                model = serializer.child.Meta.model
+                objects = [model(created_by=data['created_by'], **row) for row in serializer.validated_data]
+                if model is PemeriksaanBalita:
+                    # Z-score seluruh pemeriksaan sesi dihitung sekaligus
+                    apply_growth(objects)
+                objects = model.objects.bulk_create(objects, batch_size=self.BATCH_SIZE)
+                created[key] = [obj.pk for obj in objects]
         
         return Response({
-            'total_vitamin': total_vitamin,
-            'by_status': by_status,
-            'by_jenis': by_jenis,
-        })
+            'posyandu_id': data['posyandu_id'],
+            'tanggal': data['tanggal'],
+            'created': {key: len(ids) for key, ids in created.items()},
+            'ids': created,
+        }, status=status.HTTP_201_CREATED)
+
+
+class SyncViewSet(ChangeFeedViewSet):
+    """Change feed untuk sinkronisasi perangkat offline."""
+    tombstone_model = SyncTombstone
+    sync_sources = {
+        'pemeriksaan': SyncSource(PemeriksaanBalita.objects.all(), PemeriksaanBalitaSerializer),
+        'imunisasi': SyncSource(ImunisasiBalita.objects.all(), ImunisasiBalitaSerializer),
+        'vitamin': SyncSource(VitaminBalita.objects.all(), VitaminBalitaSerializer),
+    }
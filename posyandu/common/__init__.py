@@ -0,0 +1,6 @@
+"""
+Paket bersama untuk seluruh microservice Posyandu+ dan POS BINDU PTM.
+
+Modul di dalam paket ini tidak bergantung pada app tertentu sehingga dapat
+dipakai oleh setiap service (mixin ViewSet, utilitas query, dan sebagainya).
+"""
@@ -0,0 +1,143 @@
+"""
+Lookup banyak ID sekaligus untuk ViewSet DRF.
+
+`BatchLookupMixin` menambahkan aksi `batch` sehingga klien yang memegang
+daftar ID tidak perlu memanggil endpoint detail atau `by_visit`/`by_balita`
+satu per satu::
+
+    GET  /api/pemeriksaan/batch/?ids=1,2,3
+    GET  /api/pemeriksaan/batch/?field=balita_id&ids=10,11
+    POST /api/pemeriksaan/batch/  {"field": "balita_id", "ids": [10, 11]}
+
+Semua ID diselesaikan dengan satu query `__in`. Respons berupa map per ID:
+untuk `id` nilainya satu objek, untuk field lain (mis. `visit_id`,
+`participant_id`, `posyandu_id`) nilainya list objek. ID tanpa data
+dikembalikan di `missing`. Bila hasil melebihi `BATCH_MAX_ROWS`, respons
+ditandai `truncated` dan ID yang datanya ada tetapi terpotong tidak
+dimasukkan ke `missing`.
+
+Field yang boleh dipakai: `id` dan field model berakhiran `_id` (ID lintas
+service maupun foreign key), atau `batch_lookup_fields` pada ViewSet.
+"""
+from decouple import config
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+
+BATCH_MAX_IDS = config('BATCH_MAX_IDS', default=500, cast=int)
+BATCH_MAX_ROWS = config('BATCH_MAX_ROWS', default=5000, cast=int)
+
+# Rentang bigint PostgreSQL; nilai di luar ini tidak pernah dikirim ke database
+MIN_ID, MAX_ID = -2 ** 63, 2 ** 63 - 1
+
+
+def parse_ids(raw):
+    """
+    List ID unik dari `"1,2,3"` atau list; None bila ada yang bukan bilangan
+    bulat atau di luar rentang bigint.
+    """
+    if isinstance(raw, str):
+        raw = raw.split(',')
+    ids = []
+    for value in raw:
+        if isinstance(value, str):
+            value = value.strip()
+            if not value:
+                continue
+            try:
+                value = int(value)
+            except ValueError:
+                return None
+        elif isinstance(value, bool) or not isinstance(value, int):
+            return None
+        if not MIN_ID <= value <= MAX_ID:
+            return None
+        ids.append(value)
+    return list(dict.fromkeys(ids))
+
+
+class BatchLookupMixin:
+    """Mixin ViewSet untuk aksi `batch` (lookup banyak ID dalam satu query)."""
+    batch_lookup_fields = None
+    batch_max_ids = BATCH_MAX_IDS
+    batch_max_rows = BATCH_MAX_ROWS
+
+    def get_batch_lookup_fields(self):
+        if self.batch_lookup_fields is not None:
+            return tuple(self.batch_lookup_fields)
+        fields = ['id']
+        for field in self.queryset.model._meta.concrete_fields:
+            if field.attname.endswith('_id') and field.attname not in fields:
+                fields.append(field.attname)
+        return tuple(fields)
+
+    def _batch_params(self, request):
+        if request.method == 'POST':
+            return request.data.get('field', 'id'), request.data.get('ids')
+        ids = request.query_params.getlist('ids')
+        return request.query_params.get('field', 'id'), ','.join(ids) if ids else None
+
+    @action(detail=False, methods=['get', 'post'])
+    def batch(self, request):
+        """Mengambil banyak objek berdasarkan daftar ID dalam satu query."""
+        if request.method == 'POST' and not isinstance(request.data, dict):
+            return Response(
+                {'error': 'body must be a JSON object'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        field, raw_ids = self._batch_params(request)
+        lookup_fields = self.get_batch_lookup_fields()
+        if field not in lookup_fields:
+            return Response(
+                {'error': f"field must be any of {', '.join(lookup_fields)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if raw_ids in (None, '', []):
+            return Response(
+                {'error': 'ids parameter is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        ids = parse_ids(raw_ids) if isinstance(raw_ids, (str, list)) else None
+        if ids is None:
+            return Response(
+                {'error': 'ids must be a list of 64-bit integers'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(ids) > self.batch_max_ids:
+            return Response(
+                {'error': f'at most {self.batch_max_ids} ids per request'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        attname = 'pk' if field == 'id' else field
+        queryset = self.get_queryset().filter(**{f'{attname}__in': ids})
+        rows = list(queryset[:self.batch_max_rows + 1])
+        truncated = len(rows) > self.batch_max_rows
+        rows = rows[:self.batch_max_rows]
+        serialized = self.get_serializer(rows, many=True).data
+
+        results = {}
+        for row, data in zip(rows, serialized):
+            key = str(getattr(row, attname))
+            if field == 'id':
+                results[key] = data
+            else:
+                results.setdefault(key, []).append(data)
+
+        unresolved = [pk for pk in ids if str(pk) not in results]
+        if truncated and unresolved:
+            # Baris ID ini mungkin hanya terpotong batas baris, bukan tidak ada
+            found = {
+                str(value) for value in
+                queryset.filter(**{f'{attname}__in': unresolved})
+                .order_by().values_list(attname, flat=True).distinct()
+            }
+            unresolved = [pk for pk in unresolved if str(pk) not in found]
+
+        return Response({
+            'field': field,
+            'results': results,
+            'missing': unresolved,
+            'truncated': truncated,
+        })
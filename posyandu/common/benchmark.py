@@ -0,0 +1,186 @@
+"""
+Data sintetis untuk benchmark dan uji beban.
+
+Volume acuan `VOLUMES` (skala 1.0) setara satu kabupaten: 500 posyandu,
+100 ribu balita dengan 300 ribu pemeriksaan dan sekitar 1 juta pencatatan
+imunisasi, serta 200 ribu peserta POS BINDU dengan 400 ribu kunjungan, hasil
+lab, dan penilaian risiko.
+
+Setiap service mengisi tabelnya sendiri lewat modul `<app>/benchmark.py`
+(daftar `MODELS` dan fungsi `seed(ctx)`), dijalankan dengan command
+`seed_benchmark`. ID lintas service dihitung dari rumus yang sama di
+`SeedContext` (`balita()`, `participant()`, `visit()`), sehingga `balita_id`
+di imunisasi-service menunjuk balita yang sama di posyandu-service tanpa
+service saling memanggil. Nilai acak berasal dari `random.Random` dengan
+seed tetap: skala, seed, dan tanggal akhir yang sama menghasilkan data yang
+identik.
+
+Tingkat modul hanya memakai pustaka standar agar `scripts/utils/loadtest.py`
+dapat memakai `VOLUMES` dan `scaled()` tanpa Django.
+"""
+import itertools
+import random
+import time
+from collections import namedtuple
+from datetime import date, timedelta
+
+
+VOLUMES = {
+    'posyandu': 500,
+    'balita': 100_000,
+    'pemeriksaan': 300_000,
+    'imunisasi': 1_000_000,
+    'desa': 200,
+    'participant': 200_000,
+    'visit': 400_000,
+    'lab': 400_000,
+    'risk': 400_000,
+}
+DEFAULT_SEED = 42
+DEFAULT_BATCH_SIZE = 5000
+
+NAMA_LAKI = [
+    'Agus', 'Ahmad', 'Andi', 'Arif', 'Bagus', 'Bambang', 'Budi', 'Dedi', 'Dimas', 'Eko',
+    'Fajar', 'Hendra', 'Joko', 'Made', 'Muhammad', 'Nanang', 'Putu', 'Rizki', 'Slamet', 'Wahyu',
+]
+NAMA_PEREMPUAN = [
+    'Aisyah', 'Ani', 'Dewi', 'Fitri', 'Indah', 'Intan', 'Kartini', 'Lestari', 'Nur', 'Nurul',
+    'Putri', 'Ratna', 'Rina', 'Sari', 'Siti', 'Sri', 'Tuti', 'Wulan', 'Yuni', 'Zahra',
+]
+NAMA_BELAKANG = [
+    'Hidayat', 'Kurniawan', 'Lubis', 'Nasution', 'Pratama', 'Purnomo', 'Rahayu', 'Saputra',
+    'Setiawan', 'Siregar', 'Susanti', 'Wahyuni', 'Wibowo', 'Wijaya', 'Yulianti', 'Handayani',
+]
+KECAMATAN = ['Cibinong', 'Citeureup', 'Sukaraja', 'Babakan Madang', 'Cileungsi', 'Gunung Putri']
+
+BalitaRef = namedtuple('BalitaRef', 'tanggal_lahir jenis_kelamin posyandu_id')
+ParticipantRef = namedtuple('ParticipantRef', 'tanggal_lahir jenis_kelamin desa_id')
+VisitRef = namedtuple('VisitRef', 'participant_id pos_date')
+
+
+def scaled(name, scale=1.0):
+    """Jumlah baris `name` pada skala tertentu (minimal 1)."""
+    return max(1, int(round(VOLUMES[name] * scale)))
+
+
+def _spread(number, salt, modulo):
+    """Bilangan semu-acak 0..modulo-1 yang hanya bergantung pada `number` dan `salt`."""
+    return ((number * 2654435761 + salt * 40503) % 2 ** 32) % modulo
+
+
+class SeedContext:
+    """Parameter seeding dan rumus ID/atribut yang dipakai bersama semua service."""
+
+    def __init__(self, scale=1.0, seed=DEFAULT_SEED, batch_size=DEFAULT_BATCH_SIZE, end_date=None,
+                 log=None, progress=None):
+        self.scale = scale
+        self.seed = seed
+        self.batch_size = batch_size
+        self.end_date = end_date or date.today()
+        self.log = log or (lambda message: None)
+        self.progress = progress or (lambda message: None)
+
+    def count(self, name):
+        return scaled(name, self.scale)
+
+    def random(self, name):
+        """Generator acak per tabel, tidak terpengaruh urutan seeding tabel lain."""
+        return random.Random(f'{self.seed}:{name}')
+
+    # Atribut lintas service
+
+    def balita(self, balita_id):
+        """Balita usia 0-59 bulan, dibagi rata ke semua posyandu."""
+        umur_hari = _spread(balita_id, self.seed, 60 * 30)
+        return BalitaRef(
+            tanggal_lahir=self.end_date - timedelta(days=umur_hari),
+            jenis_kelamin='Laki-laki' if _spread(balita_id, self.seed + 1, 2) else 'Perempuan',
+            posyandu_id=(balita_id - 1) % self.count('posyandu') + 1,
+        )
+
+    def participant(self, participant_id):
+        """Peserta POS BINDU usia 15-79 tahun, dibagi rata ke semua desa."""
+        umur_hari = 15 * 365 + _spread(participant_id, self.seed + 2, 65 * 365)
+        return ParticipantRef(
+            tanggal_lahir=self.end_date - timedelta(days=umur_hari),
+            jenis_kelamin='Laki-laki' if _spread(participant_id, self.seed + 3, 2) else 'Perempuan',
+            desa_id=(participant_id - 1) % self.count('desa') + 1,
+        )
+
+    def visit(self, visit_id):
+        """Kunjungan ke-n peserta; kunjungan berikutnya peserta yang sama jatuh sebulan sebelumnya."""
+        participants = self.count('participant')
+        putaran = (visit_id - 1) // participants
+        hari = _spread(visit_id, self.seed + 4, 28) + putaran * 30
+        return VisitRef(
+            participant_id=(visit_id - 1) % participants + 1,
+            pos_date=self.end_date - timedelta(days=min(hari, 365 * 2)),
+        )
+
+    # Nilai tiruan
+
+    @staticmethod
+    def person_name(rng, jenis_kelamin):
+        depan = NAMA_LAKI if jenis_kelamin == 'Laki-laki' else NAMA_PEREMPUAN
+        return f'{rng.choice(depan)} {rng.choice(NAMA_BELAKANG)}'
+
+    @staticmethod
+    def nik(kind, number):
+        """NIK 16 digit unik per jenis data (`kind` 1 digit)."""
+        return f'3201{kind}{number:011d}'
+
+    @staticmethod
+    def phone(rng):
+        return f'08{rng.randrange(10 ** 9, 10 ** 10)}'
+
+    @staticmethod
+    def desa_name(number):
+        return f'Desa {NAMA_BELAKANG[number % len(NAMA_BELAKANG)]} {number}'
+
+    @staticmethod
+    def kecamatan_name(number):
+        return KECAMATAN[number % len(KECAMATAN)]
+
+    # Penulisan
+
+    def bulk_insert(self, model, rows, prepare=None):
+        """
+        Menyimpan instance dari iterable `rows` per `batch_size` dengan
+        `bulk_create`, lalu menyesuaikan sequence ID, memperbarui statistik
+        planner (PostgreSQL), dan menginvalidasi cache respons model.
+        `prepare(batch)` dipanggil sebelum tiap batch disimpan.
+        """
+        from django.db import router, transaction
+
+        using = router.db_for_write(model)
+        rows = iter(rows)
+        total = 0
+        started = time.monotonic()
+        while True:
+            batch = list(itertools.islice(rows, self.batch_size))
+            if not batch:
+                break
+            if prepare is not None:
+                prepare(batch)
+            with transaction.atomic(using=using):
+                model.objects.using(using).bulk_create(batch)
+            total += len(batch)
+            self.progress(f'  {model._meta.label}: {total}')
+        self.finish_table(model, using)
+        self.log(f'{model._meta.label}: {total} baris ({time.monotonic() - started:.1f} detik)')
+        return total
+
+    @staticmethod
+    def finish_table(model, using):
+        from django.core.management.color import no_style
+        from django.db import connections
+
+        from .cache import invalidate_model_cache
+
+        connection = connections[using]
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), [model]):
+                cursor.execute(sql)
+            if connection.vendor == 'postgresql':
+                cursor.execute(f'ANALYZE {connection.ops.quote_name(model._meta.db_table)}')
+        invalidate_model_cache(model)
@@ -0,0 +1,180 @@
+"""
+Cache respons bersama untuk seluruh service Django.
+
+`cache_settings()` menyusun `CACHES` dari environment variable:
+
+- `CACHE_BACKEND`: `locmem` (default), `file`, `redis`, atau `dummy`
+  (cache dimatikan).
+- `CACHE_LOCATION`: folder untuk `file` (default
+  `/tmp/django_cache/<prefix>`) atau URL untuk `redis` (default
+  `redis://redis:6379/0`, layanan `redis` pada profil compose `redis`).
+- `CACHE_TIMEOUT`: TTL default dalam detik (default 300).
+- `REFERENCE_CACHE_TIMEOUT`: TTL alias `reference` (default 600).
+
+Alias `reference` selalu berada di memori proses dan dipakai data referensi
+yang jarang berubah (jadwal imunisasi, metode KB, jenis vitamin, dst.).
+
+`CachedResponseMixin` menyimpan `response.data` untuk aksi GET yang terdaftar
+di `cache_actions`, dengan key dari path, query params, dan scope user.
+Setiap model mempunyai nomor generasi di alias `default`; sinyal
+`post_save`/`post_delete` menggantinya sehingga semua respons lama tidak
+terpakai lagi. Dengan `CACHE_BACKEND=file` atau `redis` generasi dibagi
+semua worker, sedangkan dengan `locmem` hanya worker yang menerima
+perubahan yang langsung melihatnya (worker lain setelah TTL habis).
+`QuerySet.update()`/`bulk_create()` tidak memicu sinyal; panggil
+`invalidate_model_cache()` secara manual setelahnya.
+"""
+import hashlib
+import time
+
+from decouple import config
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from rest_framework.response import Response
+
+
+CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+    'dummy': 'django.core.cache.backends.dummy.DummyCache',
+}
+GENERATION_ALIAS = 'default'
+
+
+def cache_settings(key_prefix):
+    """Mengembalikan dict `CACHES` sesuai environment."""
+    backend = config('CACHE_BACKEND', default='locmem')
+    if backend not in CACHE_BACKENDS:
+        raise ImproperlyConfigured(
+            f"CACHE_BACKEND tidak dikenal: {backend} (gunakan {', '.join(CACHE_BACKENDS)})"
+        )
+
+    default_locations = {
+        'locmem': key_prefix,
+        'file': f'/tmp/django_cache/{key_prefix}',
+        'redis': 'redis://redis:6379/0',
+        'dummy': '',
+    }
+    return {
+        'default': {
+            'BACKEND': CACHE_BACKENDS[backend],
+            'LOCATION': config('CACHE_LOCATION', default='') or default_locations[backend],
+            'KEY_PREFIX': key_prefix,
+            'TIMEOUT': config('CACHE_TIMEOUT', default=300, cast=int),
+        },
+        'reference': {
+            'BACKEND': CACHE_BACKENDS['dummy' if backend == 'dummy' else 'locmem'],
+            'LOCATION': f'{key_prefix}-reference',
+            'KEY_PREFIX': key_prefix,
+            'TIMEOUT': config('REFERENCE_CACHE_TIMEOUT', default=600, cast=int),
+        },
+    }
+
+
+def _generation_key(model):
+    return f'cache-gen:{model._meta.label_lower}'
+
+
+def model_cache_generation(model):
+    """Nomor generasi cache model saat ini (0 bila belum pernah berubah)."""
+    return caches[GENERATION_ALIAS].get(_generation_key(model), 0)
+
+
+def invalidate_model_cache(model):
+    """
+    Mengganti generasi cache `model` setelah transaksi berjalan di-commit,
+    sehingga request lain tidak menyimpan ulang data sebelum commit.
+    """
+    key = _generation_key(model)
+    transaction.on_commit(
+        lambda: caches[GENERATION_ALIAS].set(key, time.time_ns(), timeout=None)
+    )
+
+
+def _invalidate_on_signal(sender, **kwargs):
+    invalidate_model_cache(sender)
+
+
+def connect_cache_invalidation(model):
+    """Mendaftarkan invalidasi cache `model` pada `post_save`/`post_delete`."""
+    uid = f'cache-invalidation:{model._meta.label_lower}'
+    post_save.connect(_invalidate_on_signal, sender=model, dispatch_uid=uid)
+    post_delete.connect(_invalidate_on_signal, sender=model, dispatch_uid=uid)
+
+
+class CachedResponseMixin:
+    """
+    Mixin ViewSet untuk menyimpan respons GET di cache.
+
+    Atribut:
+
+    - `cache_actions`: nama aksi yang di-cache (default list dan retrieve;
+      tambahkan nama `@action` lain bila perlu).
+    - `cache_alias`: alias cache (`reference` untuk data referensi).
+    - `cache_timeout`: TTL detik (default TIMEOUT alias).
+    - `cache_invalidated_by`: model lain yang perubahannya juga
+      menginvalidasi respons ViewSet ini (model queryset selalu termasuk).
+
+    Respons diberi header `X-Cache: HIT` atau `MISS`.
+    """
+    cache_actions = ('list', 'retrieve')
+    cache_alias = 'default'
+    cache_timeout = DEFAULT_TIMEOUT
+    cache_invalidated_by = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        queryset = getattr(cls, 'queryset', None)
+        if queryset is not None:
+            connect_cache_invalidation(queryset.model)
+        for model in cls.cache_invalidated_by:
+            connect_cache_invalidation(model)
+
+    def _cache_models(self):
+        return (self.queryset.model,) + tuple(self.cache_invalidated_by)
+
+    def get_cache_scope(self, request):
+        """Bagian key yang membedakan user; override untuk scope lain."""
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            return f'user:{user.pk}'
+        return 'anon'
+
+    def get_response_cache_key(self, request, *args, **kwargs):
+        generations = ':'.join(str(model_cache_generation(model)) for model in self._cache_models())
+        params = sorted(
+            (name, value)
+            for name in request.query_params
+            for value in request.query_params.getlist(name)
+        )
+        raw = repr((request.get_host(), request.path, params, self.get_cache_scope(request)))
+        digest = hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest()
+        return f'response:{self.queryset.model._meta.label_lower}:{self.action}:{generations}:{digest}'
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self._response_cache_key = None
+        if request.method not in ('GET', 'HEAD') or self.action not in self.cache_actions:
+            return
+
+        key = self.get_response_cache_key(request, *args, **kwargs)
+        data = caches[self.cache_alias].get(key)
+        if data is None:
+            self._response_cache_key = key
+            return
+
+        response = Response(data, headers={'X-Cache': 'HIT'})
+        # Handler aksi diganti agar dispatch langsung mengembalikan data cache
+        setattr(self, request.method.lower(), lambda *args, **kwargs: response)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        key = getattr(self, '_response_cache_key', None)
+        if key and response.status_code == 200 and isinstance(response, Response):
+            caches[self.cache_alias].set(key, response.data, self.cache_timeout)
+            response['X-Cache'] = 'MISS'
+        return response
@@ -0,0 +1,139 @@
+"""
+Conditional GET (`ETag` / `Last-Modified`) untuk ViewSet DRF.
+
+`ConditionalGetMixin` menghitung validator murah sebelum data diserialisasi:
+
+- list: `Max(updated_at)` dan `Count` dari queryset yang sudah difilter
+  (satu query agregat). Query params (filter, halaman, ukuran halaman) dan
+  representasi hasil content negotiation (JSON, CSV, NDJSON) ikut di-hash
+  ke ETag sehingga setiap halaman dan format punya validator sendiri.
+- retrieve: `updated_at` satu baris.
+
+Bila klien mengirim `If-None-Match`/`If-Modified-Since` yang masih cocok,
+respons 304 dikembalikan tanpa query data dan tanpa serialisasi. Baris yang
+dihapus terdeteksi karena `Count` berubah; perubahan lewat
+`QuerySet.update()` harus ikut mengisi `updated_at` agar terdeteksi.
+
+Contoh::
+
+    class BalitaViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
+        queryset = Balita.objects.all()
+
+Letakkan mixin paling kiri agar validator juga dipasang pada respons dari
+`CachedResponseMixin`.
+"""
+import hashlib
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.response import Response
+
+
+class ConditionalGetMixin:
+    """Mixin ViewSet untuk ETag dan Last-Modified pada list dan retrieve."""
+    conditional_actions = ('list', 'retrieve')
+    last_modified_field = 'updated_at'
+
+    def _supports_conditional_get(self, request):
+        if request.method not in ('GET', 'HEAD') or self.action not in self.conditional_actions:
+            return False
+        try:
+            self.queryset.model._meta.get_field(self.last_modified_field)
+        except FieldDoesNotExist:
+            return False
+        return True
+
+    def get_conditional_state(self):
+        """
+        Mengembalikan `(jumlah, updated_at terakhir)` untuk aksi saat ini, atau
+        None bila objek detail tidak ditemukan (dibiarkan menjadi 404 biasa).
+        """
+        field = self.last_modified_field
+        queryset = self.get_queryset()
+        if self.action == 'retrieve':
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            try:
+                rows = list(
+                    queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+                    .values_list(field, flat=True)[:1]
+                )
+            except (ValueError, TypeError, ValidationError):
+                # pk tidak valid (mis. bukan angka): 404 dari get_object()
+                return None
+            return (1, rows[0]) if rows else None
+
+        state = self.filter_queryset(queryset).aggregate(
+            count=Count('pk'), last_modified=Max(field)
+        )
+        return state['count'], state['last_modified']
+
+    def get_conditional_validators(self, request):
+        """Mengembalikan `(etag, last_modified)`; keduanya None bila tidak tersedia."""
+        state = self.get_conditional_state()
+        if state is None:
+            return None, None
+
+        count, last_modified = state
+        params = sorted(
+            (name, value)
+            for name in request.query_params
+            for value in request.query_params.getlist(name)
+        )
+        # Representasi (JSON, CSV, NDJSON, ...) ikut di-hash: body berbeda, ETag berbeda
+        renderer = getattr(request, 'accepted_renderer', None)
+        representation = (renderer.format, getattr(request, 'accepted_media_type', None)) if renderer else None
+        raw = repr((
+            request.path, params, representation, count,
+            last_modified.isoformat() if last_modified else None,
+        ))
+        etag = '"%s"' % hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest()
+        return etag, last_modified
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self._conditional_validators = None
+        if not self._supports_conditional_get(request):
+            return
+
+        etag, last_modified = self.get_conditional_validators(request)
+        if etag is not None:
+            self._conditional_validators = (etag, last_modified)
+
+    def is_not_modified(self, request):
+        """True bila `If-None-Match`/`If-Modified-Since` klien masih cocok."""
+        validators = getattr(self, '_conditional_validators', None)
+        if not validators:
+            return False
+        etag, last_modified = validators
+        return get_conditional_response(
+            request,
+            etag=etag,
+            last_modified=int(last_modified.timestamp()) if last_modified else None,
+        ) is not None
+
+    def list(self, request, *args, **kwargs):
+        if self.is_not_modified(request):
+            return Response(status=status.HTTP_304_NOT_MODIFIED)
+        return super().list(request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        if self.is_not_modified(request):
+            return Response(status=status.HTTP_304_NOT_MODIFIED)
+        return super().retrieve(request, *args, **kwargs)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        # Respons dari jalur lain (mis. HIT `CachedResponseMixin`) juga menjadi 304
+        if response.status_code == 200 and isinstance(response, Response) and self.is_not_modified(request):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        response = super().finalize_response(request, response, *args, **kwargs)
+        validators = getattr(self, '_conditional_validators', None)
+        if validators and response.status_code in (200, 304):
+            etag, last_modified = validators
+            response['ETag'] = etag
+            if last_modified:
+                response['Last-Modified'] = http_date(last_modified.timestamp())
+            patch_vary_headers(response, ['Accept'])
+        return response
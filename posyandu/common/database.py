@@ -0,0 +1,135 @@
+"""
+Konfigurasi koneksi database bersama untuk seluruh service Django.
+
+Setiap `config/settings.py` memanggil `database_settings()` sehingga cara
+koneksi ke PostgreSQL diatur seragam lewat environment variable:
+
+- `DB_NAME`, `DB_USER`, `DB_PASSWORD`, `DB_HOST`, `DB_PORT`: seperti sebelumnya.
+- `DB_POOL_MODE`:
+    - `pool` (default): connection pool psycopg3 per proses worker
+      (`OPTIONS['pool']` Django). Koneksi dipinjam per request dan
+      dikembalikan ke pool, bukan ditutup.
+    - `persistent`: satu koneksi per thread yang dipakai ulang selama
+      `DB_CONN_MAX_AGE` detik dengan health check sebelum dipakai. Pilih mode
+      ini saat memakai pgbouncer.
+    - `none`: koneksi baru setiap request (perilaku lama).
+- `DB_POOL_MIN_SIZE`, `DB_POOL_MAX_SIZE`: ukuran pool per proses.
+- `DB_POOL_TIMEOUT`: detik maksimal menunggu koneksi kosong sebelum
+  request gagal (`PoolTimeout`).
+- `DB_POOL_MAX_IDLE`, `DB_POOL_MAX_LIFETIME`: koneksi menganggur/tua ditutup
+  dan diganti.
+- `DB_HEALTH_CHECKS`: validasi koneksi sebelum dipakai ulang (default aktif)
+  sehingga koneksi yang diputus server/pgbouncer tidak menimbulkan error.
+- `DB_PGBOUNCER`: aktifkan bila `DB_HOST` menunjuk ke pgbouncer dengan
+  `pool_mode=transaction` (server-side cursor dimatikan).
+
+Total koneksi ke PostgreSQL per service adalah
+`WEB_CONCURRENCY x DB_POOL_MAX_SIZE`; jumlahkan untuk semua service dan
+pastikan masih di bawah `max_connections` server.
+"""
+import os
+
+from decouple import config
+from django.core.exceptions import ImproperlyConfigured
+
+
+POOL_MODES = ('pool', 'persistent', 'none')
+
+
+def database_settings(default_name):
+    """Mengembalikan dict `DATABASES['default']` sesuai environment."""
+    mode = config('DB_POOL_MODE', default='pool')
+    if mode not in POOL_MODES:
+        raise ImproperlyConfigured(
+            f"DB_POOL_MODE tidak dikenal: {mode} (gunakan {', '.join(POOL_MODES)})"
+        )
+
+    database = {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': config('DB_NAME', default=default_name),
+        'USER': config('DB_USER', default='postgres'),
+        'PASSWORD': config('DB_PASSWORD', default='password'),
+        'HOST': config('DB_HOST', default='shared-database'),
+        'PORT': config('DB_PORT', default='5432'),
+        'CONN_MAX_AGE': 0,
+        'CONN_HEALTH_CHECKS': config('DB_HEALTH_CHECKS', default=True, cast=bool),
+        'DISABLE_SERVER_SIDE_CURSORS': config('DB_PGBOUNCER', default=False, cast=bool),
+        'OPTIONS': {
+            'connect_timeout': config('DB_CONNECT_TIMEOUT', default=5, cast=int),
+        },
+    }
+
+    if mode == 'pool':
+        # Pool Django mewajibkan CONN_MAX_AGE = 0; pool sendiri yang menjaga
+        # koneksi tetap terbuka. CONN_HEALTH_CHECKS diteruskan Django sebagai
+        # `check` pool sehingga koneksi divalidasi sebelum dipinjam.
+        database['OPTIONS']['pool'] = {
+            'min_size': config('DB_POOL_MIN_SIZE', default=1, cast=int),
+            'max_size': config('DB_POOL_MAX_SIZE', default=4, cast=int),
+            'timeout': config('DB_POOL_TIMEOUT', default=10, cast=float),
+            'max_idle': config('DB_POOL_MAX_IDLE', default=300, cast=float),
+            'max_lifetime': config('DB_POOL_MAX_LIFETIME', default=1800, cast=float),
+            'name': default_name,
+        }
+    elif mode == 'persistent':
+        database['CONN_MAX_AGE'] = config('DB_CONN_MAX_AGE', default=60, cast=int)
+
+    return database
+
+
+def pool_stats(alias='default'):
+    """
+    Metrik koneksi database proses saat ini.
+
+    Pada mode `pool` berisi jumlah koneksi terpakai (`in_use`), request yang
+    sedang/pernah menunggu (`waiting`, `waits_total`, `wait_ms_total`), dan
+    request yang gagal karena timeout (`timeouts_total`). Angka bersifat per
+    proses worker; counter bertambah sejak proses dimulai.
+    """
+    from django.db import connections
+
+    connection = connections[alias]
+    settings_dict = connection.settings_dict
+    stats = {
+        'alias': alias,
+        'pid': os.getpid(),
+        'vendor': connection.vendor,
+    }
+
+    if settings_dict.get('OPTIONS', {}).get('pool') and connection.vendor == 'postgresql':
+        pool = connection.pool
+        raw = pool.get_stats()
+        size = raw.get('pool_size', 0)
+        available = raw.get('pool_available', 0)
+        stats.update({
+            'mode': 'pool',
+            'min_size': pool.min_size,
+            'max_size': pool.max_size,
+            'size': size,
+            'available': available,
+            'in_use': size - available,
+            'waiting': raw.get('requests_waiting', 0),
+            'requests_total': raw.get('requests_num', 0),
+            'waits_total': raw.get('requests_queued', 0),
+            'wait_ms_total': raw.get('requests_wait_ms', 0),
+            'timeouts_total': raw.get('requests_errors', 0),
+            'connections_total': raw.get('connections_num', 0),
+            'connection_errors_total': raw.get('connections_errors', 0),
+            'connections_lost_total': raw.get('connections_lost', 0),
+        })
+    else:
+        max_age = settings_dict.get('CONN_MAX_AGE', 0)
+        stats.update({
+            'mode': 'persistent' if max_age else 'none',
+            'conn_max_age': max_age,
+            'health_checks': settings_dict.get('CONN_HEALTH_CHECKS', False),
+            'connected': connection.connection is not None,
+        })
+    return stats
+
+
+def pool_stats_view(request):
+    """Endpoint internal `GET /internal/db-pool/` berisi `pool_stats()`."""
+    from django.http import JsonResponse
+
+    return JsonResponse(pool_stats())
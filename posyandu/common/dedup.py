@@ -0,0 +1,435 @@
+"""
+Deteksi data ganda (duplikat) orang berbasis fonetik.
+
+Pendaftaran ganda dengan ejaan nama berbeda ("Siti Nurhaliza" dan
+"Siti Nurhalizah", "Djoko" dan "Joko") dicari tanpa membandingkan semua
+pasangan:
+
+1. Blocking: setiap record mendapat kunci fonetik nama (`phonetic_key()`,
+   disimpan di kolom `nama_fonetik`). Pasangan kandidat hanya diambil dari
+   record yang sama pada minimal dua dari tiga atribut: kunci fonetik,
+   tanggal lahir, dan desa. Satu atribut yang salah ketik tetap
+   tertangkap lewat dua atribut lainnya.
+2. Skoring: nama dibandingkan dengan Jaro-Winkler setelah ejaan lama dan
+   variasi konsonan diseragamkan (`respell()`). Pasangan dengan skor
+   minimal `SIMILARITY_THRESHOLD` disimpan sebagai `DuplicateCandidate`.
+
+Blok yang lebih besar dari `MAX_BLOCK_SIZE` (mis. nama sangat umum di satu
+desa) hanya dibandingkan dengan `WINDOW` tetangga terdekat setelah diurutkan
+menurut nama, sehingga jumlah perbandingan tetap mendekati linear.
+
+Pemakaian pada `models.py` service::
+
+    class DedupCandidate(DuplicateCandidate):
+        pass
+
+    track_duplicates(DedupCandidate, Balita)
+
+Deteksi berjalan otomatis setiap record disimpan (satu query ber-index),
+sedangkan `find_duplicates()` (command `find_duplicates`) memproses seluruh
+tabel sekaligus, termasuk mengisi `nama_fonetik` untuk data lama.
+"""
+import re
+import time
+import unicodedata
+from collections import defaultdict
+
+from django.db import models, transaction
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save, pre_save
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+
+SIMILARITY_THRESHOLD = 0.88
+MAX_BLOCK_SIZE = 100
+WINDOW = 20
+INCREMENTAL_LIMIT = 500
+
+# Gelar/sebutan yang tidak ikut dibandingkan ("By. Ny. Siti" = bayi Ny. Siti)
+HONORIFICS = {
+    'an', 'by', 'ny', 'nn', 'tn', 'sdr', 'sdri', 'bpk', 'ibu',
+    'h', 'hj', 'haji', 'hajjah', 'dr', 'drs', 'dra', 'ir', 'prof',
+}
+
+# Ejaan lama dan variasi konsonan yang dibaca sama, diterapkan berurutan
+RESPELLINGS = [
+    ('oe', 'u'), ('dj', 'j'), ('tj', 'c'), ('sj', 'sy'), ('nj', 'ny'), ('ch', 'h'),
+    ('kh', 'h'), ('sy', 's'), ('ph', 'f'), ('dh', 'd'), ('th', 't'),
+    ('v', 'f'), ('z', 's'), ('q', 'k'), ('x', 'ks'), ('y', 'i'),
+]
+VOWELS = set('aiueo')
+
+
+def normalize_name(nama):
+    """Huruf kecil tanpa aksen, gelar, dan tanda baca; gelar akademik setelah koma dibuang."""
+    nama = unicodedata.normalize('NFKD', nama or '').encode('ascii', 'ignore').decode()
+    nama = nama.split(',')[0].lower()
+    words = re.findall(r'[a-z]+', nama)
+    while words and words[0] in HONORIFICS:
+        words.pop(0)
+    return ' '.join(words)
+
+
+def respell(nama):
+    """Nama ternormalisasi dengan ejaan diseragamkan dan huruf ganda dilebur."""
+    text = normalize_name(nama)
+    for old, new in RESPELLINGS:
+        text = text.replace(old, new)
+    return re.sub(r'(.)\1+', r'\1', text)
+
+
+def phonetic_key(nama):
+    """
+    Kunci fonetik nama: huruf pertama diikuti kerangka konsonan.
+
+    Spasi diabaikan ("Nur Haliza" = "Nurhaliza") dan `h` di tengah kata
+    dibuang ("Nurhalizah" = "Nurhaliza", "Muhammad" = "Mohammad").
+    """
+    text = respell(nama).replace(' ', '')
+    if not text:
+        return ''
+    rest = ''.join(char for char in text[1:] if char not in VOWELS and char != 'h')
+    return (text[0] + re.sub(r'(.)\1+', r'\1', rest))[:100]
+
+
+def jaro_winkler(a, b, prefix_weight=0.1):
+    """Kemiripan Jaro-Winkler 0..1 dua string."""
+    if a == b:
+        return 1.0
+    len_a, len_b = len(a), len(b)
+    if not len_a or not len_b:
+        return 0.0
+
+    window = max(max(len_a, len_b) // 2 - 1, 0)
+    flags_b = [False] * len_b
+    matched_a = []
+    for i, char in enumerate(a):
+        for j in range(max(0, i - window), min(len_b, i + window + 1)):
+            if not flags_b[j] and b[j] == char:
+                flags_b[j] = True
+                matched_a.append(char)
+                break
+    matches = len(matched_a)
+    if not matches:
+        return 0.0
+
+    matched_b = [b[j] for j in range(len_b) if flags_b[j]]
+    transpositions = sum(x != y for x, y in zip(matched_a, matched_b)) / 2
+    jaro = (matches / len_a + matches / len_b + (matches - transpositions) / matches) / 3
+
+    prefix = 0
+    for x, y in zip(a[:4], b[:4]):
+        if x != y:
+            break
+        prefix += 1
+    return jaro + prefix * prefix_weight * (1 - jaro)
+
+
+def name_similarity(nama_a, nama_b):
+    """Skor Jaro-Winkler nama setelah `respell()`, spasi diabaikan."""
+    return jaro_winkler(respell(nama_a).replace(' ', ''), respell(nama_b).replace(' ', ''))
+
+
+class DuplicateCandidate(models.Model):
+    """Model abstrak pasangan record yang diduga orang yang sama."""
+    STATUS_CHOICES = [
+        ('baru', 'Baru'),
+        ('duplikat', 'Duplikat'),
+        ('bukan_duplikat', 'Bukan Duplikat'),
+    ]
+
+    model_label = models.CharField(max_length=100)
+    left_id = models.BigIntegerField()
+    right_id = models.BigIntegerField()
+    score = models.FloatField()
+    matched_on = models.CharField(max_length=100, help_text="Atribut blocking yang sama")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='baru')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        abstract = True
+        ordering = ['-score', 'id']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['model_label', 'left_id', 'right_id'],
+                name='%(app_label)s_%(class)s_unique_pair',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['model_label', 'status']),
+        ]
+
+    def __str__(self):
+        return f"{self.model_label} #{self.left_id} ~ #{self.right_id} ({self.score:.2f})"
+
+
+class DedupSpec:
+    """Pengaturan deteksi duplikat satu model."""
+
+    def __init__(self, candidate_model, model, name_field, birth_field, area_field, key_field):
+        self.candidate_model = candidate_model
+        self.model = model
+        self.name_field = name_field
+        self.birth_field = birth_field
+        self.area_field = area_field
+        self.key_field = key_field
+
+    @property
+    def label(self):
+        return self.model._meta.label_lower
+
+    def row_fields(self):
+        return ['pk', self.name_field, self.birth_field, self.area_field, self.key_field]
+
+
+_specs = {}
+
+
+def get_dedup_spec(label):
+    """`DedupSpec` terdaftar untuk label model (`app.model`), atau None."""
+    return _specs.get(label.lower())
+
+
+def registered_dedup_specs():
+    return list(_specs.values())
+
+
+def track_duplicates(candidate_model, model, name_field='nama', birth_field='tanggal_lahir',
+                     area_field='desa', key_field='nama_fonetik'):
+    """
+    Mengisi `key_field` dan merapikan spasi `area_field` setiap `model`
+    disimpan, mencari duplikatnya, dan menghapus kandidat milik record yang
+    dihapus.
+    """
+    spec = DedupSpec(candidate_model, model, name_field, birth_field, area_field, key_field)
+    _specs[spec.label] = spec
+
+    def set_phonetic_key(sender, instance, **kwargs):
+        setattr(instance, key_field, phonetic_key(getattr(instance, name_field)))
+        setattr(instance, area_field, normalize_area(getattr(instance, area_field)))
+
+    def detect_duplicates(sender, instance, raw=False, **kwargs):
+        if not raw:
+            find_duplicates_for(spec, instance)
+
+    def delete_candidates(sender, instance, **kwargs):
+        candidate_model.objects.filter(
+            Q(left_id=instance.pk) | Q(right_id=instance.pk), model_label=spec.label
+        ).delete()
+
+    uid = f'dedup:{spec.label}'
+    pre_save.connect(set_phonetic_key, sender=model, weak=False, dispatch_uid=uid)
+    post_save.connect(detect_duplicates, sender=model, weak=False, dispatch_uid=uid)
+    post_delete.connect(delete_candidates, sender=model, weak=False, dispatch_uid=uid)
+    return spec
+
+
+def normalize_area(area):
+    """Nama desa tanpa spasi di tepi dan spasi ganda (huruf besar/kecil dipertahankan)."""
+    if isinstance(area, str):
+        return ' '.join(area.split())
+    return area
+
+
+def _area_key(area):
+    """Nilai desa untuk blocking; dipakai deteksi per record maupun batch."""
+    area = normalize_area(area)
+    if isinstance(area, str):
+        return area.lower() or None
+    return area
+
+
+def _blocking_keys(key, birth, area):
+    """Kunci blok `(jenis, nilai...)` sebuah record; atribut kosong tidak membentuk blok."""
+    keys = []
+    if key and birth:
+        keys.append(('fonetik+tanggal_lahir', key, birth))
+    if key and area is not None:
+        keys.append(('fonetik+desa', key, area))
+    if birth and area is not None:
+        keys.append(('tanggal_lahir+desa', birth, area))
+    return keys
+
+
+def _score_pair(left, right, matched_on):
+    """Membuat kandidat `(left_id, right_id, skor, matched_on)` bila cukup mirip."""
+    score = name_similarity(left[1], right[1])
+    if score < SIMILARITY_THRESHOLD:
+        return None
+    left_id, right_id = sorted((left[0], right[0]))
+    return left_id, right_id, round(score, 4), '|'.join(sorted(matched_on))
+
+
+def _save_candidates(spec, candidates):
+    """Menyimpan kandidat baru; kandidat yang sudah ada (dan statusnya) tidak diubah."""
+    spec.candidate_model.objects.bulk_create(
+        [
+            spec.candidate_model(
+                model_label=spec.label, left_id=left_id, right_id=right_id,
+                score=score, matched_on=matched_on,
+            )
+            for left_id, right_id, score, matched_on in candidates
+        ],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+
+def find_duplicates_for(spec, instance):
+    """
+    Mencari duplikat satu record terhadap seluruh tabel dengan satu query
+    ber-index (`nama_fonetik`, `tanggal_lahir`). Mengembalikan jumlah kandidat.
+    """
+    row = (
+        instance.pk,
+        getattr(instance, spec.name_field),
+        getattr(instance, spec.birth_field),
+        _area_key(getattr(instance, spec.area_field)),
+        getattr(instance, spec.key_field),
+    )
+    # Desa tersimpan sudah dirapikan `normalize_area()` saat disimpan (atau
+    # oleh `find_duplicates()` untuk data lama), sehingga cukup `iexact`
+    area = normalize_area(getattr(instance, spec.area_field))
+    lookups = {
+        'fonetik': (spec.key_field, row[4]),
+        'tanggal_lahir': (spec.birth_field, row[2]),
+        'desa': (f'{spec.area_field}__iexact', area) if isinstance(area, str) else (spec.area_field, area),
+    }
+    own_keys = set(_blocking_keys(row[4], row[2], row[3]))
+    if not own_keys:
+        return 0
+    condition = Q()
+    for kind, *values in own_keys:
+        condition |= Q(**dict(lookups[part] for part in kind.split('+')))
+
+    others = (
+        spec.model._default_manager.filter(condition)
+        .exclude(pk=instance.pk)
+        .values_list(*spec.row_fields())[:INCREMENTAL_LIMIT]
+    )
+    candidates = []
+    for other in others:
+        other_keys = _blocking_keys(other[4], other[2], _area_key(other[3]))
+        matched_on = [key[0] for key in other_keys if key in own_keys]
+        if not matched_on:
+            continue
+        candidate = _score_pair(row, other, matched_on)
+        if candidate:
+            candidates.append(candidate)
+
+    if candidates:
+        _save_candidates(spec, candidates)
+    return len(candidates)
+
+
+def _block_pairs(members):
+    """Pasangan dalam satu blok; blok besar memakai jendela tetangga terurut nama."""
+    if len(members) <= MAX_BLOCK_SIZE:
+        for i, left in enumerate(members):
+            for right in members[i + 1:]:
+                yield left, right
+        return
+    members = sorted(members, key=lambda row: respell(row[1]))
+    for i, left in enumerate(members):
+        for right in members[i + 1:i + 1 + WINDOW]:
+            yield left, right
+
+
+def find_duplicates(spec, queryset=None, batch_size=2000, dry_run=False):
+    """
+    Deteksi duplikat batch untuk seluruh `queryset` (default semua record).
+
+    `nama_fonetik` yang kosong/usang dan desa yang belum dirapikan
+    diperbarui lewat `bulk_update` (tanpa menyentuh `updated_at`), lalu
+    kandidat baru disimpan. Mengembalikan
+    ringkasan jumlah record, blok, perbandingan, dan kandidat.
+    """
+    started = time.perf_counter()
+    queryset = spec.model._default_manager.all() if queryset is None else queryset
+
+    rows = []
+    stale = []
+    for pk, nama, birth, area, stored_key in queryset.values_list(*spec.row_fields()).iterator(
+        chunk_size=batch_size
+    ):
+        key = phonetic_key(nama)
+        normalized = normalize_area(area)
+        if key != stored_key or normalized != area:
+            stale.append(spec.model(pk=pk, **{spec.key_field: key, spec.area_field: normalized}))
+        rows.append((pk, nama, birth, _area_key(area), key))
+
+    blocks = defaultdict(list)
+    for row in rows:
+        for block_key in _blocking_keys(row[4], row[2], row[3]):
+            blocks[block_key].append(row)
+
+    matched_on = defaultdict(set)
+    comparisons = 0
+    for block_key, members in blocks.items():
+        if len(members) < 2:
+            continue
+        for left, right in _block_pairs(members):
+            pair = (left, right) if left[0] < right[0] else (right, left)
+            comparisons += pair not in matched_on
+            matched_on[pair].add(block_key[0])
+
+    candidates = [
+        candidate
+        for (left, right), kinds in matched_on.items()
+        if (candidate := _score_pair(left, right, kinds))
+    ]
+
+    if not dry_run:
+        with transaction.atomic():
+            spec.model._default_manager.bulk_update(
+                stale, [spec.key_field, spec.area_field], batch_size=batch_size
+            )
+            _save_candidates(spec, candidates)
+
+    return {
+        'model': spec.label,
+        'processed': len(rows),
+        'keys_updated': len(stale),
+        'blocks': sum(1 for members in blocks.values() if len(members) > 1),
+        'oversized_blocks': sum(1 for members in blocks.values() if len(members) > MAX_BLOCK_SIZE),
+        'comparisons': comparisons,
+        'candidates': len(candidates),
+        'dry_run': dry_run,
+        'duration_ms': round((time.perf_counter() - started) * 1000, 1),
+    }
+
+
+class DuplicateCandidateViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Daftar kandidat duplikat untuk ditinjau petugas.
+
+    Filter `?model=<app.model>` dan `?status=baru`; `POST .../<id>/resolve/`
+    dengan `{"status": "duplikat" | "bukan_duplikat"}` menyimpan keputusan.
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        model_label = self.request.query_params.get('model')
+        if model_label:
+            queryset = queryset.filter(model_label=model_label.lower())
+        status_param = self.request.query_params.get('status')
+        if status_param:
+            queryset = queryset.filter(status=status_param)
+        return queryset
+
+    @action(detail=True, methods=['post'])
+    def resolve(self, request, pk=None):
+        """Menandai kandidat sebagai duplikat atau bukan duplikat."""
+        candidate = self.get_object()
+        new_status = request.data.get('status')
+        if new_status not in ('duplikat', 'bukan_duplikat'):
+            return Response(
+                {'error': 'status must be duplikat or bukan_duplikat'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        candidate.status = new_status
+        candidate.save(update_fields=['status', 'updated_at'])
+        return Response(self.get_serializer(candidate).data)
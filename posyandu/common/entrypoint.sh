@@ -0,0 +1,42 @@
+#!/bin/sh
+# Entrypoint bersama seluruh service Django.
+#
+# SERVER_MODE menentukan server yang dijalankan:
+#   runserver  server development Django (default)
+#   gunicorn   produksi, WSGI (config.wsgi) dengan worker gthread
+#   uvicorn    produksi, ASGI (config.asgi) dengan worker uvicorn di bawah gunicorn
+#
+# Pengaturan worker ada di common/gunicorn.conf.py.
+set -e
+
+PORT="${PORT:-8000}"
+export PORT
+
+COMMON_DIR="$(dirname "$0")"
+
+# Worker gunicorn/uvicorn menulis metrik Prometheus ke folder bersama agar
+# /metrics menggabungkan semua worker; dikosongkan setiap start.
+case "${SERVER_MODE:-runserver}" in
+    gunicorn|uvicorn)
+        PROMETHEUS_MULTIPROC_DIR="${PROMETHEUS_MULTIPROC_DIR:-/tmp/prometheus-multiproc}"
+        rm -rf "${PROMETHEUS_MULTIPROC_DIR}"
+        mkdir -p "${PROMETHEUS_MULTIPROC_DIR}"
+        export PROMETHEUS_MULTIPROC_DIR
+        ;;
+esac
+
+case "${SERVER_MODE:-runserver}" in
+    runserver)
+        exec python manage.py runserver "0.0.0.0:${PORT}"
+        ;;
+    gunicorn)
+        exec gunicorn config.wsgi:application --config "${COMMON_DIR}/gunicorn.conf.py"
+        ;;
+    uvicorn)
+        exec gunicorn config.asgi:application --config "${COMMON_DIR}/gunicorn.conf.py"
+        ;;
+    *)
+        echo "SERVER_MODE tidak dikenal: ${SERVER_MODE} (gunakan runserver, gunicorn, atau uvicorn)" >&2
+        exit 1
+        ;;
+esac
@@ -0,0 +1,175 @@
+"""
+Fan-out HTTP paralel ke service lain.
+
+`fan_out()` menjalankan beberapa `ServiceCall` sekaligus lewat satu
+`httpx.AsyncClient` bersama (connection pool + keep-alive) pada event loop
+asyncio di thread latar per proses worker, sehingga view DRF sinkron di
+runserver, gunicorn, maupun uvicorn dapat memakainya. Lama fan-out mengikuti
+panggilan paling lambat, bukan jumlah semua panggilan.
+
+Setiap panggilan punya batas waktu sendiri; service yang lambat atau error
+tidak menggagalkan panggilan lain, melainkan menghasilkan `ServiceResult`
+dengan status `timeout` atau `error`.
+
+Environment variable:
+
+- `FANOUT_TIMEOUT`: batas waktu default per panggilan dalam detik (default 3),
+  termasuk mengikuti halaman `next`.
+- `FANOUT_CONNECT_TIMEOUT`: batas waktu membuka koneksi (default 1).
+- `FANOUT_MAX_CONNECTIONS`, `FANOUT_MAX_KEEPALIVE`: ukuran pool per proses.
+"""
+import asyncio
+import os
+import threading
+import time
+
+import httpx
+from decouple import config
+
+
+FANOUT_TIMEOUT = config('FANOUT_TIMEOUT', default=3.0, cast=float)
+FANOUT_CONNECT_TIMEOUT = config('FANOUT_CONNECT_TIMEOUT', default=1.0, cast=float)
+FANOUT_MAX_CONNECTIONS = config('FANOUT_MAX_CONNECTIONS', default=50, cast=int)
+FANOUT_MAX_KEEPALIVE = config('FANOUT_MAX_KEEPALIVE', default=20, cast=int)
+MAX_PAGES = 20
+
+
+class ServiceCall:
+    """
+    Satu GET ke service lain.
+
+    Respons terpaginasi DRF (`results` + `next`) diikuti sampai halaman
+    terakhir (maksimal `MAX_PAGES`) dan dikembalikan sebagai satu list.
+    """
+
+    def __init__(self, name, url, params=None, timeout=None):
+        self.name = name
+        self.url = url
+        self.params = params or {}
+        self.timeout = timeout or FANOUT_TIMEOUT
+
+
+class ServiceResult:
+    """Hasil satu `ServiceCall`: `status` `ok`, `not_found`, `timeout`, atau `error`."""
+
+    def __init__(self, name, status, data=None, elapsed_ms=0.0, error=None):
+        self.name = name
+        self.status = status
+        self.data = data
+        self.elapsed_ms = elapsed_ms
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.status == 'ok'
+
+    def summary(self):
+        """Ringkasan untuk respons API (tanpa data)."""
+        summary = {'status': self.status, 'elapsed_ms': self.elapsed_ms}
+        if isinstance(self.data, list):
+            summary['count'] = len(self.data)
+        if self.error:
+            summary['error'] = self.error
+        return summary
+
+
+class _FanoutRunner:
+    """Event loop latar dan `AsyncClient` milik proses saat ini."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pid = None
+        self._loop = None
+        self._client = None
+
+    def loop(self):
+        with self._lock:
+            # Thread tidak ikut ter-fork (gunicorn --preload): buat ulang per proses
+            if self._pid != os.getpid():
+                self._loop = asyncio.new_event_loop()
+                self._client = None
+                self._pid = os.getpid()
+                threading.Thread(target=self._loop.run_forever, name='fanout-loop', daemon=True).start()
+            return self._loop
+
+    def client(self):
+        """Dipanggil dari dalam event loop latar."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(FANOUT_TIMEOUT, connect=FANOUT_CONNECT_TIMEOUT),
+                limits=httpx.Limits(
+                    max_connections=FANOUT_MAX_CONNECTIONS,
+                    max_keepalive_connections=FANOUT_MAX_KEEPALIVE,
+                ),
+            )
+        return self._client
+
+    def run(self, coroutine, timeout):
+        future = asyncio.run_coroutine_threadsafe(coroutine, self.loop())
+        return future.result(timeout)
+
+
+_runner = _FanoutRunner()
+
+
+async def _get_all(client, call, headers):
+    response = await client.get(call.url, params=call.params, headers=headers)
+    if response.status_code == 404:
+        return 'not_found', None
+    response.raise_for_status()
+    payload = response.json()
+    if not (isinstance(payload, dict) and 'results' in payload):
+        return 'ok', payload
+
+    rows = list(payload['results'])
+    for _ in range(MAX_PAGES - 1):
+        if not payload.get('next'):
+            break
+        response = await client.get(payload['next'], headers=headers)
+        response.raise_for_status()
+        payload = response.json()
+        if not (isinstance(payload, dict) and isinstance(payload.get('results'), list)):
+            raise ValueError(f'unexpected page format from {response.url}')
+        rows.extend(payload['results'])
+    return 'ok', rows
+
+
+async def _fetch(call, headers):
+    started = time.perf_counter()
+    try:
+        async with asyncio.timeout(call.timeout):
+            status, data = await _get_all(_runner.client(), call, headers)
+        error = None
+    except (TimeoutError, httpx.TimeoutException):
+        status, data, error = 'timeout', None, f'no response within {call.timeout}s'
+    except Exception as exc:
+        # Respons tak terduga (mis. halaman lanjutan tanpa `results`) hanya
+        # menandai service ini `error`, tidak menggagalkan seluruh fan-out
+        status, data, error = 'error', None, f'{exc.__class__.__name__}: {exc}'
+    elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+    return ServiceResult(call.name, status, data, elapsed_ms, error)
+
+
+async def _gather(calls, headers):
+    results = await asyncio.gather(*(_fetch(call, headers) for call in calls))
+    return {result.name: result for result in results}
+
+
+def fan_out(calls, headers=None):
+    """
+    Menjalankan `calls` secara paralel dan mengembalikan dict
+    `nama -> ServiceResult`. Selesai paling lambat setelah timeout terbesar.
+    """
+    if not calls:
+        return {}
+    deadline = max(call.timeout for call in calls) + 1
+    return _runner.run(_gather(calls, headers or {}), deadline)
+
+
+def forwarded_headers(request):
+    """Header request masuk yang diteruskan ke service lain (token user)."""
+    headers = {}
+    authorization = request.headers.get('Authorization')
+    if authorization:
+        headers['Authorization'] = authorization
+    return headers
@@ -0,0 +1,80 @@
+"""
+Konfigurasi gunicorn bersama untuk seluruh service Django.
+
+Dipakai oleh `common/entrypoint.sh` saat `SERVER_MODE` bernilai `gunicorn`
+(WSGI, worker `gthread`) atau `uvicorn` (ASGI, worker `UvicornWorker`).
+Semua nilai dapat diubah lewat environment variable:
+
+- `PORT`: port yang didengarkan (default 8000).
+- `WEB_CONCURRENCY`: jumlah worker (default `2 x CPU + 1`, dibatasi
+  `GUNICORN_MAX_WORKERS` karena banyak service berbagi satu host dan satu
+  database).
+- `GUNICORN_THREADS`: thread per worker `gthread` (default 4).
+- `GUNICORN_TIMEOUT`, `GUNICORN_GRACEFUL_TIMEOUT`, `GUNICORN_KEEPALIVE`.
+- `GUNICORN_MAX_REQUESTS`: worker didaur ulang setelah sekian request
+  (dengan jitter) untuk membatasi kebocoran memori.
+- `GUNICORN_PRELOAD`: memuat aplikasi sekali sebelum fork (default aktif).
+
+Metrik Prometheus worker ditulis ke `PROMETHEUS_MULTIPROC_DIR` (diisi
+`entrypoint.sh`); file worker yang berhenti ditandai lewat `child_exit`.
+
+Reload bertahap tanpa downtime: `kill -HUP <pid master>` memulai worker
+baru lalu menghentikan worker lama setelah request berjalan selesai.
+Karena aplikasi di-preload, perubahan kode membutuhkan restart container.
+"""
+import multiprocessing
+import os
+
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+def _env_bool(name, default):
+    value = os.environ.get(name)
+    if value is None or value == '':
+        return default
+    return value.lower() in ('1', 'true', 'yes', 'on')
+
+
+SERVER_MODE = os.environ.get('SERVER_MODE', 'gunicorn')
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+
+cpu_count = multiprocessing.cpu_count()
+workers = _env_int(
+    'WEB_CONCURRENCY',
+    min(cpu_count * 2 + 1, _env_int('GUNICORN_MAX_WORKERS', 8))
+)
+if SERVER_MODE == 'uvicorn':
+    worker_class = 'uvicorn.workers.UvicornWorker'
+else:
+    worker_class = 'gthread'
+    threads = _env_int('GUNICORN_THREADS', 4)
+
+preload_app = _env_bool('GUNICORN_PRELOAD', True)
+
+# Di belakang api-gateway (nginx) koneksi keep-alive dipakai ulang oleh proxy
+keepalive = _env_int('GUNICORN_KEEPALIVE', 5)
+timeout = _env_int('GUNICORN_TIMEOUT', 30)
+graceful_timeout = _env_int('GUNICORN_GRACEFUL_TIMEOUT', 30)
+
+max_requests = _env_int('GUNICORN_MAX_REQUESTS', 1000)
+max_requests_jitter = _env_int('GUNICORN_MAX_REQUESTS_JITTER', max_requests // 10)
+
+# Heartbeat worker di tmpfs agar tidak tersendat oleh disk container
+worker_tmp_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None
+forwarded_allow_ips = os.environ.get('FORWARDED_ALLOW_IPS', '*')
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-') or None
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+
+def child_exit(server, worker):
+    """Menandai worker yang berhenti agar metrik gauge-nya tidak ikut dijumlahkan."""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
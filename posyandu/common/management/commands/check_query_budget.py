@@ -0,0 +1,52 @@
+"""
+Command untuk memastikan endpoint list tidak mengalami N+1 query.
+
+Berjalan di database test (`test_<nama database>`) yang dibuat dan dihapus
+otomatis, sehingga aman dijalankan di CI maupun lokal::
+
+    python manage.py check_query_budget
+    python manage.py check_query_budget --budget 6 --only visits
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from common.querybudget import QUERY_BUDGET, SEED_SIZES, check_endpoints
+
+
+class Command(BaseCommand):
+    help = 'Mengukur jumlah query setiap endpoint list router pada dua ukuran data dan membandingkannya dengan batas.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--budget', type=int, default=QUERY_BUDGET, help='Batas query per request list')
+        parser.add_argument('--only', nargs='*', help='Hanya path yang mengandung teks ini')
+        parser.add_argument('--keepdb', action='store_true', help='Pakai ulang database test yang sudah ada')
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=options['keepdb'])
+        try:
+            results = check_endpoints(SEED_SIZES, options['only'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options['keepdb'])
+            teardown_test_environment()
+
+        budget = options['budget']
+        failed = 0
+        for result in results:
+            counts = ', '.join(f'{size} baris: {count}' for size, count in result.counts.items())
+            if result.error:
+                line = self.style.ERROR(f'GAGAL  {result.path} ({result.error})')
+            elif result.growing:
+                line = self.style.ERROR(f'N+1    {result.path} ({counts})')
+            elif not result.ok(budget):
+                line = self.style.ERROR(f'LEBIH  {result.path} ({counts})')
+            else:
+                line = self.style.SUCCESS(f'OK     {result.path} ({counts})')
+            failed += not result.ok(budget)
+            self.stdout.write(line)
+
+        if failed:
+            raise CommandError(f'{failed} dari {len(results)} endpoint melebihi batas {budget} query')
+        self.stdout.write(self.style.SUCCESS(f'{len(results)} endpoint dalam batas {budget} query'))
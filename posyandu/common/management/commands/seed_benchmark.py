@@ -0,0 +1,84 @@
+"""
+Command untuk mengisi database service dengan data sintetis benchmark.
+
+Menjalankan `seed(ctx)` dari modul `benchmark.py` setiap app di service ini.
+Jalankan dengan `--scale` dan `--seed` yang sama di semua service agar ID
+lintas service saling cocok::
+
+    python manage.py seed_benchmark --scale 0.1
+    python manage.py seed_benchmark --flush --seed 7 --end-date 2025-06-30
+"""
+import importlib
+from datetime import date
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connections, router
+
+from common.benchmark import DEFAULT_BATCH_SIZE, DEFAULT_SEED, VOLUMES, SeedContext
+
+
+def seeders():
+    """`(app_config, modul)` untuk setiap app yang memiliki `benchmark.seed`."""
+    result = []
+    for app_config in apps.get_app_configs():
+        try:
+            module = importlib.import_module(f'{app_config.name}.benchmark')
+        except ModuleNotFoundError as exc:
+            if exc.name != f'{app_config.name}.benchmark':
+                raise
+            continue
+        if hasattr(module, 'seed'):
+            result.append((app_config, module))
+    return result
+
+
+class Command(BaseCommand):
+    help = 'Mengisi tabel service dengan data sintetis untuk benchmark dan uji beban.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=float, default=1.0,
+                            help=f'Pengali volume acuan ({VOLUMES["balita"]} balita pada skala 1)')
+        parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help='Seed generator acak')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='Baris per bulk_create')
+        parser.add_argument('--end-date', type=date.fromisoformat, help='Tanggal data terakhir (default hari ini)')
+        parser.add_argument('--flush', action='store_true', help='Kosongkan tabel benchmark sebelum mengisi')
+
+    def handle(self, *args, **options):
+        modules = seeders()
+        if not modules:
+            raise CommandError('Service ini tidak memiliki modul benchmark')
+
+        models = [model for _, module in modules for model in module.MODELS]
+        if options['flush']:
+            self.flush(models)
+        else:
+            for model in models:
+                if model.objects.exists():
+                    raise CommandError(
+                        f'Tabel {model._meta.db_table} sudah berisi data; pakai --flush untuk mengosongkan'
+                    )
+
+        ctx = SeedContext(
+            scale=options['scale'],
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+            end_date=options['end_date'],
+            log=self.stdout.write,
+            progress=self.stdout.write if options['verbosity'] > 1 else None,
+        )
+        for app_config, module in modules:
+            self.stdout.write(f'Mengisi {app_config.label} (skala {ctx.scale}, seed {ctx.seed})')
+            module.seed(ctx)
+        self.stdout.write(self.style.SUCCESS('Data benchmark selesai diisi'))
+
+    def flush(self, models):
+        tables = {}
+        for model in models:
+            tables.setdefault(router.db_for_write(model), []).append(model._meta.db_table)
+        for using, names in tables.items():
+            connection = connections[using]
+            sql_list = connection.ops.sql_flush(no_style(), names, reset_sequences=True, allow_cascade=True)
+            connection.ops.execute_sql_flush(sql_list)
+            self.stdout.write(f'Mengosongkan {", ".join(names)}')
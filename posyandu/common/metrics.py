@@ -0,0 +1,113 @@
+"""
+Metrik Prometheus untuk seluruh service Django.
+
+`MetricsMiddleware` (dipasang tepat setelah `PerformanceMiddleware`)
+mencatat per request:
+
+- `http_requests_in_progress`: request yang sedang diproses (saturasi
+  worker), dijumlahkan dari worker yang masih hidup.
+- `http_request_duration_seconds{method, view, status}`: histogram durasi
+  per nama URL (mis. `pemeriksaan-list`) dan kode status; `_count` dipakai
+  untuk laju request dan error rate.
+- `db_queries_total{view}` dan `db_query_duration_seconds_total{view}`:
+  jumlah dan waktu query dari `common.performance`.
+- `response_cache_total{view, result}`: `hit`/`miss` `CachedResponseMixin`
+  (header `X-Cache`), untuk rasio cache hit.
+
+`stock_operation_duration_seconds{model, operation, outcome}` diisi oleh
+`common.stock` untuk alokasi FEFO, reservasi, dan mutasi stok.
+
+`GET /metrics` (`metrics_view`) menyajikan metrik dalam format teks
+Prometheus. Dengan gunicorn/uvicorn `common/entrypoint.sh` mengisi
+`PROMETHEUS_MULTIPROC_DIR` sehingga setiap worker menulis ke file bersama
+dan `/metrics` menggabungkan semua worker, apa pun worker yang menjawab.
+"""
+import os
+import time
+from contextlib import contextmanager
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess,
+)
+
+
+REQUEST_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STOCK_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+UNMATCHED_VIEW = 'unmatched'
+
+REQUESTS_IN_PROGRESS = Gauge(
+    'http_requests_in_progress', 'Request yang sedang diproses', multiprocess_mode='livesum',
+)
+REQUEST_DURATION = Histogram(
+    'http_request_duration_seconds', 'Durasi request HTTP per view dan status',
+    ['method', 'view', 'status'], buckets=REQUEST_BUCKETS,
+)
+DB_QUERIES = Counter('db_queries', 'Jumlah query database per view', ['view'])
+DB_QUERY_DURATION = Counter('db_query_duration_seconds', 'Total waktu query database per view', ['view'])
+RESPONSE_CACHE = Counter('response_cache', 'Hasil cache respons (hit/miss) per view', ['view', 'result'])
+STOCK_OPERATION_DURATION = Histogram(
+    'stock_operation_duration_seconds', 'Durasi operasi stok (alokasi FEFO, reservasi, mutasi)',
+    ['model', 'operation', 'outcome'], buckets=STOCK_BUCKETS,
+)
+
+
+def metrics_view(request):
+    """Endpoint `GET /metrics` dalam format teks Prometheus."""
+    from django.http import HttpResponse
+
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
+
+
+@contextmanager
+def track_stock_operation(model, operation):
+    """
+    Mengukur durasi operasi stok. `outcome` bernilai `ok`, `insufficient`
+    (stok tidak cukup), atau `error`.
+    """
+    from .stock import InsufficientStock
+
+    started = time.perf_counter()
+    outcome = 'error'
+    try:
+        yield
+        outcome = 'ok'
+    except InsufficientStock:
+        outcome = 'insufficient'
+        raise
+    finally:
+        STOCK_OPERATION_DURATION.labels(model, operation, outcome).observe(time.perf_counter() - started)
+
+
+class MetricsMiddleware:
+    """Middleware pengisi metrik request, database, dan cache respons."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        from .performance import current_profile
+
+        started = time.perf_counter()
+        with REQUESTS_IN_PROGRESS.track_inprogress():
+            response = self.get_response(request)
+        match = request.resolver_match
+        if match is not None and match.func is metrics_view:
+            return response
+
+        view = match.view_name if match and match.view_name else UNMATCHED_VIEW
+        REQUEST_DURATION.labels(request.method, view, str(response.status_code)).observe(
+            time.perf_counter() - started
+        )
+        profile = current_profile()
+        if profile is not None:
+            DB_QUERIES.labels(view).inc(profile.db_queries)
+            DB_QUERY_DURATION.labels(view).inc(profile.db_ms / 1000)
+        cache_result = response.get('X-Cache')
+        if cache_result in ('HIT', 'MISS'):
+            RESPONSE_CACHE.labels(view, cache_result.lower()).inc()
+        return response
@@ -0,0 +1,162 @@
+"""
+Pagination bersama untuk tabel bervolume tinggi.
+
+`KeysetPagination` berperilaku sama dengan `PageNumberPagination` bawaan
+(`?page=`), kecuali klien meminta mode cursor dengan `?pagination=cursor`
+atau mengirim `?cursor=`. Pada mode cursor halaman berikutnya diambil dengan
+kondisi keyset `(a, b) < (nilai_a, nilai_b)` sesuai `cursor_ordering` pada
+ViewSet, tanpa `OFFSET` dan tanpa query `COUNT(*)`.
+
+Contoh::
+
+    class ActivityLogViewSet(viewsets.ModelViewSet):
+        pagination_class = KeysetPagination
+        cursor_ordering = ('-created_at', '-id')
+
+Field pada `cursor_ordering` harus tidak nullable dan kombinasinya unik
+(akhiri dengan `id`), serta didukung index komposit dengan urutan yang sama.
+"""
+import base64
+import binascii
+import json
+from collections import OrderedDict
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def _encode_value(value):
+    if hasattr(value, 'isoformat'):
+        # isoformat mempertahankan mikrodetik, berbeda dengan DjangoJSONEncoder
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+class KeysetPagination(PageNumberPagination):
+    """PageNumberPagination dengan mode cursor (keyset) yang bersifat opt-in."""
+    cursor_query_param = 'cursor'
+    mode_query_param = 'pagination'
+    cursor_page_size_query_param = 'page_size'
+    max_cursor_page_size = 500
+    invalid_cursor_message = 'Invalid cursor'
+
+    def is_cursor_request(self, request, view):
+        """Mode cursor hanya aktif bila diminta klien dan ViewSet mendukungnya."""
+        if not getattr(view, 'cursor_ordering', None):
+            return False
+        return (
+            request.query_params.get(self.mode_query_param) == 'cursor'
+            or self.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_mode = self.is_cursor_request(request, view)
+        if not self.cursor_mode:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.ordering = tuple(view.cursor_ordering)
+        self.cursor_page_size = self.get_cursor_page_size(request)
+        fields = [(name.lstrip('-'), name.startswith('-')) for name in self.ordering]
+
+        position, reverse = self.decode_cursor(request, queryset.model, fields)
+        order = [
+            ('-' if descending != reverse else '') + name
+            for name, descending in fields
+        ]
+        queryset = queryset.order_by(*order)
+        if position is not None:
+            queryset = queryset.filter(self._after(fields, position, reverse))
+
+        rows = list(queryset[:self.cursor_page_size + 1])
+        has_more = len(rows) > self.cursor_page_size
+        rows = rows[:self.cursor_page_size]
+        if reverse:
+            rows.reverse()
+
+        # Saat mundur, halaman asal selalu ada di depan; begitu pula sebaliknya
+        has_next = has_more if not reverse else position is not None
+        has_previous = has_more if reverse else position is not None
+        self.next_position = self._position(rows[-1], fields) if rows and has_next else None
+        self.previous_position = self._position(rows[0], fields) if rows and has_previous else None
+        return rows
+
+    def get_cursor_page_size(self, request):
+        try:
+            size = int(request.query_params[self.cursor_page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_cursor_page_size))
+
+    def _after(self, fields, position, reverse):
+        """Kondisi keyset: baris setelah `position` pada arah traversal."""
+        condition = Q()
+        equal = Q()
+        for (name, descending), value in zip(fields, position):
+            lookup = 'lt' if descending != reverse else 'gt'
+            condition |= equal & Q(**{f'{name}__{lookup}': value})
+            equal &= Q(**{name: value})
+        # Batas pada kolom pertama agar planner dapat memakai range scan index
+        first_name, first_descending = fields[0]
+        bound = 'lte' if first_descending != reverse else 'gte'
+        return Q(**{f'{first_name}__{bound}': position[0]}) & condition
+
+    def _position(self, obj, fields):
+        return [getattr(obj, name) for name, _ in fields]
+
+    def encode_cursor(self, position, reverse):
+        payload = {'v': [_encode_value(value) for value in position]}
+        if reverse:
+            payload['r'] = 1
+        encoded = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request, model, fields):
+        """Mengembalikan `(position, reverse)`; position None untuk halaman pertama."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode()).decode())
+            values = payload['v']
+            if len(values) != len(fields):
+                raise ValueError
+            position = [
+                model._meta.get_field(name).to_python(value)
+                for (name, _), value in zip(fields, values)
+            ]
+        except (TypeError, ValueError, KeyError, ValidationError, binascii.Error, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+        return position, bool(payload.get('r'))
+
+    def get_next_link(self):
+        if getattr(self, 'cursor_mode', False):
+            if self.next_position is None:
+                return None
+            return self.encode_cursor(self.next_position, reverse=False)
+        return super().get_next_link()
+
+    def get_previous_link(self):
+        if getattr(self, 'cursor_mode', False):
+            if self.previous_position is None:
+                return None
+            return self.encode_cursor(self.previous_position, reverse=True)
+        return super().get_previous_link()
+
+    def get_paginated_response(self, data):
+        if not getattr(self, 'cursor_mode', False):
+            return super().get_paginated_response(data)
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
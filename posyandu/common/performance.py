@@ -0,0 +1,218 @@
+"""
+Instrumentasi performa per request untuk seluruh service Django.
+
+`PerformanceMiddleware` (dipasang paling atas di `MIDDLEWARE`) mencatat
+untuk setiap request:
+
+- `total_ms`: waktu sejak request masuk sampai respons selesai dirender
+- `db_queries`, `db_ms`: jumlah dan total waktu query ke semua database
+- `serializer_ms`: waktu membentuk `serializer.data` (termasuk query yang
+  dipicu serializer, mis. N+1)
+- `response_bytes`: ukuran body respons
+
+Nilai tersebut dikirim sebagai header `Server-Timing` (terlihat di tab
+Network DevTools) dan satu baris log JSON per request pada logger
+`common.performance`, bersama `view` (nama URL, mis. `pemeriksaan-list`)
+dan `route` agar mudah dikelompokkan. Request yang lebih lambat dari
+`PERF_SLOW_MS` dicatat dengan level WARNING beserta query paling lambat
+(SQL tanpa parameter, agar NIK dan data pribadi tidak ikut tercatat).
+
+Environment variable:
+
+- `PERF_ENABLED`: aktifkan instrumentasi (default True).
+- `PERF_SERVER_TIMING`: kirim header `Server-Timing` (default True).
+- `PERF_LOG_REQUESTS`: log setiap request, bukan hanya yang lambat
+  (default True).
+- `PERF_SLOW_MS`: ambang request lambat dalam milidetik (default 500).
+- `PERF_SLOW_SQL_SAMPLE`: porsi request lambat yang dicatat bersama SQL-nya,
+  0 sampai 1 (default 1).
+- `PERF_SLOW_SQL_LIMIT`: jumlah query paling lambat yang dicatat (default 20).
+- `PERF_LOG_LEVEL`: level logger `common.performance` (default INFO).
+"""
+import heapq
+import json
+import logging
+import random
+import time
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from decouple import config
+from django.db import connections
+
+
+PERF_ENABLED = config('PERF_ENABLED', default=True, cast=bool)
+PERF_SERVER_TIMING = config('PERF_SERVER_TIMING', default=True, cast=bool)
+PERF_LOG_REQUESTS = config('PERF_LOG_REQUESTS', default=True, cast=bool)
+PERF_SLOW_MS = config('PERF_SLOW_MS', default=500.0, cast=float)
+PERF_SLOW_SQL_SAMPLE = config('PERF_SLOW_SQL_SAMPLE', default=1.0, cast=float)
+PERF_SLOW_SQL_LIMIT = config('PERF_SLOW_SQL_LIMIT', default=20, cast=int)
+
+logger = logging.getLogger('common.performance')
+_current_profile = ContextVar('performance_profile', default=None)
+
+
+def logging_settings():
+    """
+    `LOGGING` yang menulis log performa sebagai JSON per baris ke stdout.
+    Logger lain tetap memakai konfigurasi bawaan Django.
+    """
+    return {
+        'version': 1,
+        'disable_existing_loggers': False,
+        'formatters': {
+            'message': {'format': '%(message)s'},
+        },
+        'handlers': {
+            'performance': {
+                'class': 'logging.StreamHandler',
+                'stream': 'ext://sys.stdout',
+                'formatter': 'message',
+            },
+        },
+        'loggers': {
+            'common.performance': {
+                'handlers': ['performance'],
+                'level': config('PERF_LOG_LEVEL', default='INFO'),
+                'propagate': False,
+            },
+        },
+    }
+
+
+class RequestProfile:
+    """Pengukuran satu request; dipakai juga sebagai `execute_wrapper` database."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.total_ms = 0.0
+        self.db_queries = 0
+        self.db_ms = 0.0
+        self.serializer_ms = 0.0
+        self.serializing = False
+        self._slowest = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.db_queries += 1
+            self.db_ms += elapsed_ms
+            entry = (elapsed_ms, self.db_queries, sql)
+            if len(self._slowest) < PERF_SLOW_SQL_LIMIT:
+                heapq.heappush(self._slowest, entry)
+            elif PERF_SLOW_SQL_LIMIT:
+                heapq.heappushpop(self._slowest, entry)
+
+    def slowest_queries(self):
+        """Query paling lambat, urut dari yang terlama."""
+        return [
+            {'ms': round(elapsed_ms, 2), 'order': order, 'sql': sql}
+            for elapsed_ms, order, sql in sorted(self._slowest, reverse=True)
+        ]
+
+    def finish(self):
+        self.total_ms = (time.perf_counter() - self.started) * 1000
+
+    def server_timing(self):
+        return ', '.join([
+            f'db;dur={self.db_ms:.1f};desc="{self.db_queries} queries"',
+            f'ser;dur={self.serializer_ms:.1f};desc="serializer"',
+            f'app;dur={max(self.total_ms - self.db_ms - self.serializer_ms, 0):.1f};desc="view"',
+            f'total;dur={self.total_ms:.1f}',
+        ])
+
+
+def current_profile():
+    """`RequestProfile` request yang sedang berjalan, atau None."""
+    return _current_profile.get()
+
+
+_serializer_timing_installed = False
+
+
+def install_serializer_timing():
+    """
+    Membungkus `BaseSerializer.data` agar waktu serialisasi tercatat di
+    `RequestProfile`. Serializer bersarang dihitung sekali lewat serializer
+    terluar.
+    """
+    global _serializer_timing_installed
+    if _serializer_timing_installed:
+        return
+    from rest_framework.serializers import BaseSerializer
+
+    original = BaseSerializer.data
+
+    def timed_data(serializer):
+        profile = _current_profile.get()
+        if profile is None or profile.serializing:
+            return original.fget(serializer)
+        profile.serializing = True
+        started = time.perf_counter()
+        try:
+            return original.fget(serializer)
+        finally:
+            profile.serializer_ms += (time.perf_counter() - started) * 1000
+            profile.serializing = False
+
+    BaseSerializer.data = property(timed_data, doc=original.__doc__)
+    _serializer_timing_installed = True
+
+
+def _response_size(response):
+    if response.streaming:
+        length = response.get('Content-Length')
+        return int(length) if length and length.isdigit() else None
+    return len(response.content)
+
+
+class PerformanceMiddleware:
+    """Middleware pencatat waktu, query, dan ukuran respons per request."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        install_serializer_timing()
+
+    def __call__(self, request):
+        if not PERF_ENABLED:
+            return self.get_response(request)
+
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(profile))
+                response = self.get_response(request)
+        finally:
+            _current_profile.reset(token)
+        profile.finish()
+
+        if PERF_SERVER_TIMING:
+            response['Server-Timing'] = profile.server_timing()
+        slow = profile.total_ms >= PERF_SLOW_MS
+        if slow or PERF_LOG_REQUESTS:
+            self.log(request, response, profile, slow)
+        return response
+
+    def log(self, request, response, profile, slow):
+        match = request.resolver_match
+        record = {
+            'event': 'slow_request' if slow else 'request',
+            'method': request.method,
+            'path': request.path,
+            'view': match.view_name if match else None,
+            'route': match.route if match else None,
+            'status': response.status_code,
+            'total_ms': round(profile.total_ms, 1),
+            'db_queries': profile.db_queries,
+            'db_ms': round(profile.db_ms, 1),
+            'serializer_ms': round(profile.serializer_ms, 1),
+            'response_bytes': _response_size(response),
+        }
+        if slow and random.random() < PERF_SLOW_SQL_SAMPLE:
+            record['sql'] = profile.slowest_queries()
+        logger.log(logging.WARNING if slow else logging.INFO, json.dumps(record, default=str))
@@ -0,0 +1,184 @@
+"""
+Batas jumlah query untuk endpoint list.
+
+Endpoint list yang sehat menjalankan query dalam jumlah tetap (count
+pagination, query data, dan satu query per `prefetch_related`), berapa pun
+jumlah baris yang diserialisasi. N+1 terlihat sebagai jumlah query yang naik
+mengikuti jumlah baris.
+
+`assert_max_queries()` dipakai langsung di test::
+
+    with assert_max_queries(5):
+        client.get('/api/visits/')
+
+`check_endpoints()` (dipakai command `check_query_budget`) mengisi setiap
+model endpoint list router dengan data contoh pada dua ukuran berbeda di
+dalam transaksi yang di-rollback, lalu membandingkan jumlah query keduanya
+dan terhadap batas `QUERY_BUDGET` (default 8).
+"""
+import itertools
+from contextlib import contextmanager
+from datetime import time, timedelta
+from decimal import Decimal
+
+from decouple import config
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS, connections, models, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import URLPattern, URLResolver, get_resolver
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+
+QUERY_BUDGET = config('QUERY_BUDGET', default=8, cast=int)
+SEED_SIZES = (2, 12)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def _format_queries(queries):
+    return '\n'.join(f"{index}. {query['sql']}" for index, query in enumerate(queries, 1))
+
+
+@contextmanager
+def assert_max_queries(limit, using=DEFAULT_DB_ALIAS):
+    """Gagal (`QueryBudgetExceeded`) bila blok menjalankan lebih dari `limit` query."""
+    with CaptureQueriesContext(connections[using]) as context:
+        yield context
+    if len(context) > limit:
+        raise QueryBudgetExceeded(
+            f'{len(context)} query melebihi batas {limit}:\n{_format_queries(context.captured_queries)}'
+        )
+
+
+class RowFactory:
+    """Membuat baris contoh untuk model apa pun dengan nilai yang valid di database."""
+
+    def __init__(self):
+        self._sequence = itertools.count(1)
+        self._shared = {}
+
+    def value(self, field, number):
+        if not field.unique:
+            if field.choices:
+                return field.choices[0][0]
+            if field.has_default():
+                return field.get_default()
+        if isinstance(field, models.BooleanField):
+            return False
+        if isinstance(field, models.DecimalField):
+            return Decimal(1)
+        if isinstance(field, (models.IntegerField, models.FloatField)):
+            return number
+        if isinstance(field, models.DateTimeField):
+            return timezone.now() - timedelta(minutes=number)
+        if isinstance(field, models.DateField):
+            return timezone.localdate() - timedelta(days=number)
+        if isinstance(field, models.TimeField):
+            return time(8, 0)
+        if isinstance(field, models.EmailField):
+            return f'contoh{number}@example.com'
+        if isinstance(field, models.URLField):
+            return f'https://example.com/{number}'
+        if isinstance(field, models.GenericIPAddressField):
+            return '127.0.0.1'
+        if isinstance(field, models.FileField):
+            return ''
+        if isinstance(field, models.JSONField):
+            return {}
+        if isinstance(field, (models.CharField, models.TextField)):
+            return str(number).zfill(min(field.max_length or 16, 16))[-(field.max_length or 16):]
+        return None
+
+    def related(self, field, depth):
+        target = field.related_model
+        if field.one_to_one:
+            return self.create(target, depth + 1)
+        if target not in self._shared:
+            self._shared[target] = self.create(target, depth + 1)
+        return self._shared[target]
+
+    def create(self, model, depth=0):
+        number = next(self._sequence)
+        values = {}
+        for field in model._meta.concrete_fields:
+            if field.primary_key or getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False):
+                continue
+            if field.is_relation:
+                # Relasi ke model sendiri / terlalu dalam dibiarkan kosong bila boleh
+                if field.null and (field.related_model is model or depth > 2):
+                    continue
+                values[field.name] = self.related(field, depth)
+                continue
+            values[field.attname] = self.value(field, number)
+        instance = model.objects.create(**values)
+        for field in model._meta.many_to_many:
+            getattr(instance, field.name).add(self.related(field, depth))
+        return instance
+
+
+def _list_routes(resolver=None, prefix=''):
+    """`(path, ViewSet)` untuk setiap route `*-list` yang dibuat router DRF."""
+    resolver = resolver or get_resolver()
+    for pattern in resolver.url_patterns:
+        route = prefix + str(pattern.pattern).lstrip('^').rstrip('$')
+        if isinstance(pattern, URLResolver):
+            yield from _list_routes(pattern, route)
+        elif isinstance(pattern, URLPattern):
+            view = getattr(pattern.callback, 'cls', None)
+            actions = getattr(pattern.callback, 'actions', None) or {}
+            if (view is not None and actions.get('get') == 'list' and '(?P<format>' not in route
+                    and getattr(view, 'queryset', None) is not None):
+                yield '/' + route, view
+
+
+class EndpointResult:
+    def __init__(self, path, view, counts=None, error=None):
+        self.path = path
+        self.view = view
+        self.counts = counts or {}
+        self.error = error
+
+    @property
+    def growing(self):
+        return len(set(self.counts.values())) > 1
+
+    def ok(self, budget):
+        return self.error is None and not self.growing and max(self.counts.values()) <= budget
+
+
+def _measure(client, path, view, size):
+    """Jumlah query `GET path` dengan `size` baris contoh; data di-rollback."""
+    with transaction.atomic():
+        factory = RowFactory()
+        for _ in range(size):
+            factory.create(view.queryset.model)
+        with CaptureQueriesContext(connections[view.queryset.db]) as context:
+            response = client.get(path)
+        transaction.set_rollback(True)
+    if response.status_code != 200:
+        raise ValueError(f'HTTP {response.status_code}')
+    return len(context)
+
+
+def check_endpoints(sizes=SEED_SIZES, only=None):
+    """Mengukur setiap endpoint list router; mengembalikan list `EndpointResult`."""
+    client = APIClient()
+    client.force_authenticate(user=get_user_model()(username='query-budget'))
+    results = []
+    cache = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+             'reference': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+    with override_settings(ALLOWED_HOSTS=['*'], CACHES=cache):
+        for path, view in _list_routes():
+            if only and not any(name in path for name in only):
+                continue
+            result = EndpointResult(path, view)
+            try:
+                for size in sizes:
+                    result.counts[size] = _measure(client, path, view, size)
+            except Exception as exc:  # pylint: disable=broad-except
+                result.error = f'{exc.__class__.__name__}: {exc}'
+            results.append(result)
+    return results
@@ -0,0 +1,131 @@
+"""
+Pemuatan relasi otomatis untuk queryset ViewSet DRF.
+
+Field serializer seperti `CharField(source='participant.nama_lengkap')`,
+`SlugRelatedField`, serializer bersarang, atau field many-to-many membaca
+objek relasi untuk setiap baris. Tanpa `select_related`/`prefetch_related`
+satu halaman list berisi N baris menjalankan N query tambahan.
+
+`related_loads()` menurunkan path relasi yang dibaca serializer:
+
+- relasi tunggal (foreign key, one-to-one) -> `select_related`
+- relasi banyak (many-to-many, reverse foreign key) -> `prefetch_related`
+- `PrimaryKeyRelatedField` pada foreign key tidak dimuat karena cukup
+  membaca kolom `<field>_id`.
+
+`RelatedLoadsMixin` menerapkannya ke `queryset` ViewSet saat kelas dibuat,
+sehingga list, detail, dan aksi tambahan yang memakai `self.queryset`
+ikut terbantu. Relasi yang tidak terlihat dari definisi field (mis. dibaca
+di dalam `SerializerMethodField`) dideklarasikan lewat `related_select` dan
+`related_prefetch`::
+
+    class VisitViewSet(RelatedLoadsMixin, viewsets.ModelViewSet):
+        queryset = Visit.objects.all()
+        serializer_class = VisitSerializer
+        related_select = ['participant']
+
+Jalankan `python manage.py check_query_budget` untuk memastikan jumlah
+query endpoint list tidak bertambah mengikuti jumlah baris.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.relations import ManyRelatedField, PrimaryKeyRelatedField, RelatedField
+
+
+def _relation(model, name):
+    """Field relasi `name` pada `model`, atau None bila bukan relasi."""
+    if model is None:
+        return None
+    try:
+        field = model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return None
+    return field if field.is_relation else None
+
+
+def _is_multiple(field):
+    return field.many_to_many or field.one_to_many
+
+
+def _leaf_is_loaded(field, relation):
+    """Apakah field DRF membaca objek relasi (bukan hanya kolom `_id`)."""
+    if isinstance(field, (serializers.BaseSerializer, ManyRelatedField)):
+        return True
+    if isinstance(field, PrimaryKeyRelatedField):
+        return _is_multiple(relation)
+    return isinstance(field, RelatedField)
+
+
+def _collect(serializer, model, prefix, multiple, select, prefetch):
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        if field.source == '*':
+            if isinstance(field, serializers.BaseSerializer):
+                _collect(field, model, prefix, multiple, select, prefetch)
+            continue
+
+        current, path, many = model, list(prefix), multiple
+        attrs = field.source_attrs
+        for index, attr in enumerate(attrs):
+            relation = _relation(current, attr)
+            if relation is None:
+                break
+            if index == len(attrs) - 1 and not _leaf_is_loaded(field, relation):
+                break
+            path.append(attr)
+            many = many or _is_multiple(relation)
+            current = relation.related_model
+        if len(path) == len(prefix):
+            continue
+
+        lookup = '__'.join(path)
+        (prefetch if many else select).append(lookup)
+        if isinstance(field, serializers.BaseSerializer) and len(path) - len(prefix) == len(attrs):
+            _collect(field, current, path, many, select, prefetch)
+
+
+def related_loads(serializer_class, model=None):
+    """
+    Mengembalikan `(select, prefetch)`: path relasi yang dibaca
+    `serializer_class` untuk argumen `select_related` dan `prefetch_related`.
+    """
+    if serializer_class is None:
+        return [], []
+    serializer = serializer_class()
+    if model is None:
+        model = getattr(getattr(serializer, 'Meta', None), 'model', None)
+    select, prefetch = [], []
+    _collect(serializer, model, [], False, select, prefetch)
+    # Path yang diawali path lain cukup disebut sekali
+    select = [path for path in select if not any(other.startswith(path + '__') for other in select)]
+    return list(dict.fromkeys(select)), list(dict.fromkeys(prefetch))
+
+
+def with_related_loads(queryset, serializer_class, select=(), prefetch=()):
+    """`queryset` dengan relasi yang dibaca `serializer_class` ikut dimuat."""
+    derived_select, derived_prefetch = related_loads(serializer_class, queryset.model)
+    select = list(dict.fromkeys([*derived_select, *select]))
+    prefetch = list(dict.fromkeys([*derived_prefetch, *prefetch]))
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    return queryset
+
+
+class RelatedLoadsMixin:
+    """Mixin ViewSet yang memuat relasi serializer bersama `queryset`."""
+    related_select = ()
+    related_prefetch = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        own = ('queryset', 'serializer_class', 'related_select', 'related_prefetch')
+        if getattr(cls, 'queryset', None) is None or not any(name in cls.__dict__ for name in own):
+            return
+        cls.queryset = with_related_loads(
+            cls.queryset, getattr(cls, 'serializer_class', None), cls.related_select, cls.related_prefetch
+        )
@@ -0,0 +1,76 @@
+"""
+Cache in-process untuk snapshot dashboard yang sudah dimaterialisasi.
+
+Snapshot dashboard dibangun berkala oleh command `build_dashboard`
+(laporan-service dan reporting-service) lalu disimpan di `DashboardData`.
+Action `latest` hanya membaca snapshot tersebut, dan `SnapshotCache`
+menyimpan hasil bacaannya di memori proses worker selama `ttl` detik
+sehingga dashboard yang dibuka berulang kali tidak menyentuh database.
+
+Builder berjalan di proses lain (cron), jadi cache tidak di-invalidasi
+secara eksplisit: `ttl` yang pendek membatasi berapa lama snapshot lama
+masih disajikan setelah refresh. `ttl` 0 mematikan cache.
+
+Contoh::
+
+    _latest_cache = SnapshotCache(ttl=settings.DASHBOARD_CACHE_TTL)
+
+    data = _latest_cache.get_or_load(('kecamatan', 'Cibinong'), load_snapshot)
+"""
+import threading
+import time
+from datetime import timedelta
+
+from django.utils import timezone
+
+
+class SnapshotCache:
+    """Dict thread-safe berbatas ukuran dengan masa berlaku per entri."""
+
+    def __init__(self, ttl, max_entries=1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get_or_load(self, key, loader):
+        """
+        Mengembalikan nilai `key` dari cache, atau memanggil `loader()` bila
+        belum ada atau sudah lewat `ttl`. `loader` dipanggil di luar lock;
+        dua request bersamaan untuk key yang sama paling buruk membaca
+        snapshot dua kali.
+        """
+        if self.ttl <= 0:
+            return loader()
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                return entry[1]
+
+        value = loader()
+        with self._lock:
+            self._entries.pop(key, None)
+            if len(self._entries) >= self.max_entries:
+                self._evict(now)
+            self._entries[key] = (now + self.ttl, value)
+        return value
+
+    def _evict(self, now):
+        expired = [key for key, (expires, _) in self._entries.items() if expires <= now]
+        for key in expired:
+            del self._entries[key]
+        # Masih penuh: buang entri yang paling lama dimasukkan
+        while len(self._entries) >= self.max_entries:
+            del self._entries[next(iter(self._entries))]
+
+    def clear(self):
+        """Mengosongkan cache (mis. setelah refresh di proses yang sama)."""
+        with self._lock:
+            self._entries.clear()
+
+
+def snapshot_expiry(ttl_seconds, now=None):
+    """Waktu kedaluwarsa snapshot yang dibangun pada `now`."""
+    return (now or timezone.now()) + timedelta(seconds=ttl_seconds)
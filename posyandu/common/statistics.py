@@ -0,0 +1,368 @@
+"""
+Mesin statistik deklaratif untuk action `statistics` pada setiap service.
+
+Spesifikasi statistik berupa dict bersarang yang bentuknya sama dengan JSON
+response. Setiap daun dikompilasi menjadi satu ekspresi agregat sehingga
+seluruh hitungan bersyarat dan rata-rata dihitung dengan satu query
+`aggregate()`. Hanya daun `GroupBy` (nilai yang tidak diketahui sebelumnya)
+yang membutuhkan query `values().annotate()` tersendiri.
+
+Contoh::
+
+    statistics_spec = {
+        'total_imunisasi': Total(),
+        'by_status': count_by('status', ['diberikan', 'menolak']),
+        'by_jenis': count_by('jenis_imunisasi', ImunisasiBalita.JENIS_IMUNISASI_CHOICES),
+        'rata_rata_skor': Stat(Avg('skor'), default=0, digits=2),
+        'top_jenis': GroupBy('jenis_pemeriksaan', top=10),
+    }
+"""
+from django.db import models
+from django.db.models import Aggregate, Count, Q
+from django.db.models.signals import post_delete, pre_save
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+
+class Stat:
+    """Daun statistik berupa ekspresi agregat dengan pasca-proses opsional."""
+
+    def __init__(self, aggregate, default=None, digits=None):
+        self.aggregate = aggregate
+        self.default = default
+        self.digits = digits
+
+    def finalize(self, value):
+        """Menerapkan nilai default dan pembulatan pada hasil agregat."""
+        if value is None:
+            value = self.default
+        if value is not None and self.digits is not None:
+            value = round(value, self.digits)
+        return value
+
+
+class Total(Stat):
+    """Jumlah seluruh baris pada queryset."""
+
+    def __init__(self):
+        super().__init__(Count('pk'), default=0)
+
+
+class CountIf(Stat):
+    """Jumlah baris yang memenuhi kondisi `Q`."""
+
+    def __init__(self, condition):
+        super().__init__(Count('pk', filter=condition), default=0)
+
+
+class GroupBy:
+    """
+    Hitungan per nilai field yang tidak diketahui sebelumnya.
+
+    Tanpa `top`, hasilnya dict `{nilai: jumlah}`. Dengan `top`, hasilnya list
+    `[{field: nilai, 'count': jumlah}, ...]` terurut dari jumlah terbesar.
+    """
+
+    def __init__(self, field, top=None):
+        self.field = field
+        self.top = top
+
+    def evaluate(self, queryset):
+        """Menjalankan satu query GROUP BY untuk field ini."""
+        rows = (
+            queryset.order_by()
+            .values(self.field)
+            .annotate(count=Count('pk'))
+        )
+        if self.top is None:
+            return {row[self.field]: row['count'] for row in rows}
+        return list(rows.order_by('-count')[:self.top])
+
+
+def count_by(field, values):
+    """
+    Membuat hitungan bersyarat untuk setiap nilai `field`.
+
+    `values` boleh berupa list nilai atau list choices `(nilai, label)`.
+    """
+    spec = {}
+    for value in values:
+        if isinstance(value, (list, tuple)):
+            value = value[0]
+        spec[value] = Q(**{field: value})
+    return spec
+
+
+def count_by_choices(model, field):
+    """Membuat hitungan bersyarat untuk setiap choices yang didefinisikan pada field model."""
+    return count_by(field, model._meta.get_field(field).choices)
+
+
+def _compile(spec, aggregates, groups, path=()):
+    """Meratakan spesifikasi bersarang menjadi alias agregat dan GROUP BY."""
+    for key, node in spec.items():
+        node_path = path + (key,)
+        if isinstance(node, dict):
+            _compile(node, aggregates, groups, node_path)
+        elif isinstance(node, GroupBy):
+            groups[node_path] = node
+        else:
+            if isinstance(node, Q):
+                node = CountIf(node)
+            elif isinstance(node, Aggregate):
+                node = Stat(node)
+            elif not isinstance(node, Stat):
+                raise TypeError(f"Daun statistik tidak dikenal pada {'.'.join(map(str, node_path))}: {node!r}")
+            aggregates[node_path] = node
+
+
+def _assign(result, path, value):
+    target = result
+    for key in path[:-1]:
+        target = target.setdefault(key, {})
+    target[path[-1]] = value
+
+
+def compute_statistics(queryset, spec):
+    """
+    Menghitung statistik `spec` atas `queryset`.
+
+    Semua hitungan bersyarat dan agregat dijalankan dalam satu query;
+    setiap `GroupBy` menambah satu query GROUP BY.
+    """
+    aggregates = {}
+    groups = {}
+    _compile(spec, aggregates, groups)
+
+    result = {}
+    if aggregates:
+        # Alias sintetis agar tidak bentrok dengan nama field model
+        aliases = {f'_stat_{index}': path for index, path in enumerate(aggregates)}
+        values = queryset.order_by().aggregate(**{
+            alias: aggregates[path].aggregate for alias, path in aliases.items()
+        })
+        for alias, path in aliases.items():
+            _assign(result, path, aggregates[path].finalize(values[alias]))
+    for path, group in groups.items():
+        _assign(result, path, group.evaluate(queryset))
+
+    # Kembalikan urutan key sesuai urutan pada spesifikasi
+    return _reorder(spec, result)
+
+
+def compute_grouped_statistics(queryset, group_fields, spec):
+    """
+    Menghitung statistik datar `spec` untuk setiap kombinasi `group_fields`.
+
+    Seluruh grup dihitung dalam satu query `values().annotate()`. Hasilnya
+    list dict berisi nilai field grup dan setiap key pada `spec`.
+    """
+    aggregates = {}
+    groups = {}
+    _compile(spec, aggregates, groups)
+    if groups or any(len(path) > 1 for path in aggregates):
+        raise TypeError("Statistik per grup hanya mendukung spesifikasi datar tanpa GroupBy")
+
+    aliases = {f'_stat_{index}': path for index, path in enumerate(aggregates)}
+    rows = (
+        queryset.order_by()
+        .values(*group_fields)
+        .annotate(**{alias: aggregates[path].aggregate for alias, path in aliases.items()})
+        .order_by(*group_fields)
+    )
+    result = []
+    for row in rows:
+        item = {field: row[field] for field in group_fields}
+        for alias, path in aliases.items():
+            item[path[0]] = aggregates[path].finalize(row[alias])
+        result.append(item)
+    return result
+
+
+def _reorder(spec, result):
+    ordered = {}
+    for key, node in spec.items():
+        if isinstance(node, dict):
+            ordered[key] = _reorder(node, result.get(key, {}))
+        else:
+            ordered[key] = result[key]
+    return ordered
+
+
+class StatisticsMixin:
+    """
+    Mixin ViewSet yang menyediakan action `statistics` dari `statistics_spec`.
+
+    Queryset statistik mengikuti filter yang sama dengan endpoint list,
+    sehingga `?posyandu_id=...` dan filter lain ikut diterapkan.
+    """
+    statistics_spec = None
+
+    def get_statistics_spec(self):
+        """Mengembalikan spesifikasi statistik untuk ViewSet ini."""
+        return self.statistics_spec
+
+    @action(detail=False, methods=['get'])
+    def statistics(self, request):
+        """Statistik ringkas dalam satu query agregat."""
+        queryset = self.filter_queryset(self.get_queryset())
+        return Response(compute_statistics(queryset, self.get_statistics_spec()))
+
+
+class VacatedDay(models.Model):
+    """
+    Model abstrak penanda hari `(posyandu_id, tanggal)` yang ditinggalkan
+    record feed harian: record dihapus, atau tanggal/posyandunya diubah.
+    Dibaca `DailyFeedMixin` agar hari tersebut ikut dihitung ulang.
+    """
+    model_label = models.CharField(max_length=100)
+    posyandu_id = models.IntegerField()
+    tanggal = models.DateField()
+    changed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        abstract = True
+        ordering = ['changed_at', 'id']
+        indexes = [
+            models.Index(fields=['model_label', 'changed_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.model_label} {self.posyandu_id}/{self.tanggal} berubah {self.changed_at}"
+
+
+def track_vacated_days(vacated_model, tracked_model, date_field):
+    """
+    Mencatat hari lama `(posyandu_id, date_field)` saat instance
+    `tracked_model` dihapus atau dipindah ke posyandu/tanggal lain.
+    Perubahan lewat `QuerySet.update()` tidak terdeteksi.
+    """
+    label = tracked_model._meta.label_lower
+
+    def record(posyandu_id, tanggal):
+        if posyandu_id is not None and tanggal is not None:
+            vacated_model.objects.create(model_label=label, posyandu_id=posyandu_id, tanggal=tanggal)
+
+    def before_save(sender, instance, raw=False, **kwargs):
+        if raw or instance._state.adding or instance.pk is None:
+            return
+        old = sender._default_manager.filter(pk=instance.pk).values_list('posyandu_id', date_field).first()
+        if old is not None and old != (instance.posyandu_id, getattr(instance, date_field)):
+            record(*old)
+
+    def after_delete(sender, instance, **kwargs):
+        record(instance.posyandu_id, getattr(instance, date_field))
+
+    pre_save.connect(before_save, sender=tracked_model, weak=False, dispatch_uid=f'vacated:save:{label}')
+    post_delete.connect(after_delete, sender=tracked_model, weak=False, dispatch_uid=f'vacated:delete:{label}')
+
+
+class DailyFeedMixin:
+    """
+    Mixin ViewSet yang menyediakan action `daily_feed` untuk rollup laporan.
+
+    Feed berisi hitungan absolut per `(posyandu_id, tanggal)` sesuai
+    `daily_feed_spec`, dengan tanggal diambil dari `daily_feed_date_field`.
+    Parameter yang didukung:
+
+    - `dari` / `sampai`: rentang tanggal kegiatan (untuk backfill).
+    - `changed_since`: hanya hari yang memiliki record dengan `updated_at`
+      sejak waktu tersebut, ditambah hari yang ditinggalkan record (dihapus
+      atau dipindah) menurut `daily_feed_vacated_model`; hari yang tersentuh
+      dihitung ulang secara penuh, dan hari yang kini kosong dikirim dengan
+      nilai 0.
+    - `posyandu_id`: membatasi ke satu posyandu.
+
+    Karena nilai per hari selalu absolut, konsumen cukup menimpa barisnya
+    sehingga pemrosesan ulang feed yang sama bersifat idempoten.
+    """
+    daily_feed_date_field = None
+    daily_feed_spec = None
+    # Turunan konkret `VacatedDay` yang diisi `track_vacated_days()`
+    daily_feed_vacated_model = None
+
+    @action(detail=False, methods=['get'])
+    def daily_feed(self, request):
+        """Hitungan harian per posyandu untuk rollup StatistikPosyandu."""
+        # Dicatat sebelum query agar perubahan selama query ikut pada feed berikutnya
+        generated_at = timezone.now()
+        date_field = self.daily_feed_date_field
+        queryset = self.get_queryset()
+
+        posyandu_id = request.query_params.get('posyandu_id')
+        if posyandu_id:
+            queryset = queryset.filter(posyandu_id=posyandu_id)
+
+        date_filters = {}
+        for param, lookup in (('dari', 'gte'), ('sampai', 'lte')):
+            value = request.query_params.get(param)
+            if value:
+                try:
+                    parsed = parse_date(value)
+                except ValueError:
+                    # Format benar tetapi tanggal mustahil, mis. 2024-02-30
+                    parsed = None
+                if parsed is None:
+                    return Response(
+                        {'error': f'{param} parameter must be a date (YYYY-MM-DD)'},
+                        status=status.HTTP_400_BAD_REQUEST
+                    )
+                queryset = queryset.filter(**{f'{date_field}__{lookup}': parsed})
+                date_filters[f'tanggal__{lookup}'] = parsed
+
+        changed_pairs = None
+        changed_since = request.query_params.get('changed_since')
+        if changed_since:
+            since = parse_datetime(changed_since)
+            if since is None:
+                return Response(
+                    {'error': 'changed_since parameter must be an ISO datetime'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            if timezone.is_naive(since):
+                since = timezone.make_aware(since)
+            changed_pairs = set(
+                queryset.filter(updated_at__gte=since)
+                .order_by()
+                .values_list('posyandu_id', date_field)
+                .distinct()
+            )
+            if self.daily_feed_vacated_model is not None:
+                vacated = self.daily_feed_vacated_model.objects.filter(
+                    model_label=queryset.model._meta.label_lower, changed_at__gte=since, **date_filters
+                )
+                if posyandu_id:
+                    vacated = vacated.filter(posyandu_id=posyandu_id)
+                changed_pairs.update(
+                    vacated.order_by().values_list('posyandu_id', 'tanggal').distinct()
+                )
+            queryset = queryset.filter(**{
+                'posyandu_id__in': {pair[0] for pair in changed_pairs},
+                f'{date_field}__in': {pair[1] for pair in changed_pairs},
+            })
+
+        rows = []
+        if changed_pairs is None or changed_pairs:
+            for row in compute_grouped_statistics(queryset, ['posyandu_id', date_field], self.daily_feed_spec):
+                tanggal = row.pop(date_field)
+                if changed_pairs is not None and (row['posyandu_id'], tanggal) not in changed_pairs:
+                    continue
+                rows.append({'posyandu_id': row.pop('posyandu_id'), 'tanggal': tanggal, **row})
+
+        if changed_pairs:
+            # Hari yang kini tanpa record ditimpa 0 oleh konsumen
+            found = {(row['posyandu_id'], row['tanggal']) for row in rows}
+            for pair in sorted(changed_pairs - found):
+                rows.append({
+                    'posyandu_id': pair[0], 'tanggal': pair[1],
+                    **{key: 0 for key in self.daily_feed_spec},
+                })
+
+        return Response({
+            'generated_at': generated_at,
+            'date_field': date_field,
+            'rows': rows,
+        })
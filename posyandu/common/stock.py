@@ -0,0 +1,592 @@
+"""
+Ledger stok bersama untuk stok vaksin, alat KB, vitamin, PMT, dan strip lab.
+
+Pengurangan stok selalu dilakukan dengan satu `UPDATE` bersyarat::
+
+    UPDATE stok SET jumlah_stok = jumlah_stok - n
+    WHERE id = ... AND jumlah_stok >= n
+
+sehingga beberapa kader yang mencatat bersamaan tidak pernah membuat stok
+minus atau saling menimpa. Setiap perubahan dicatat pada tabel mutasi yang
+hanya bisa ditambah (append-only).
+
+Contoh::
+
+    class MutasiVaksin(StockMovement):
+        stok = models.ForeignKey(VaksinStock, on_delete=models.PROTECT, related_name='mutasi')
+
+    vaksin_ledger = StockLedger(
+        MutasiVaksin, quantity_field='jumlah_stok',
+        jenis_field='jenis_vaksin', expiry_field='tanggal_kedaluwarsa', lot_field='batch_number'
+    )
+    vaksin_ledger.reserve([(1, 5), (2, 3)], referensi='sesi:2024-01-15')
+    vaksin_ledger.allocate('BCG', 12)  # FEFO: lot terdekat kedaluwarsa lebih dahulu
+"""
+from collections import OrderedDict
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db import models, transaction
+from django.db.models import Case, DecimalField, ExpressionWrapper, F, ProtectedError, Q, Sum, Value, When
+from django.utils import timezone
+from rest_framework import serializers, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from .metrics import track_stock_operation
+from .statistics import CountIf, Stat, compute_statistics
+
+
+class InsufficientStock(Exception):
+    """Stok lot tidak mencukupi (atau lot tidak ditemukan)."""
+
+    def __init__(self, stok_id, diminta, tersedia, jenis=None):
+        self.stok_id = stok_id
+        self.diminta = diminta
+        self.tersedia = tersedia
+        self.jenis = jenis
+        target = f"jenis {jenis}" if stok_id is None else stok_id
+        super().__init__(f"Stok {target} tidak mencukupi: diminta {diminta}, tersedia {tersedia}")
+
+
+class StockMovement(models.Model):
+    """
+    Model abstrak mutasi stok (append-only).
+
+    Model turunan wajib mendefinisikan ForeignKey `stok` ke model stok.
+    """
+    JENIS_MUTASI_CHOICES = [
+        ('keluar', 'Keluar'),
+        ('masuk', 'Masuk'),
+    ]
+
+    jenis_mutasi = models.CharField(max_length=10, choices=JENIS_MUTASI_CHOICES)
+    jumlah = models.IntegerField(help_text="Jumlah yang keluar/masuk (selalu positif)")
+    saldo_akhir = models.IntegerField(help_text="Sisa stok lot setelah mutasi")
+    referensi = models.CharField(
+        max_length=100,
+        blank=True,
+        default='',
+        help_text="Referensi transaksi, mis. ID pencatatan atau sesi"
+    )
+
+    # Metadata
+    created_at = models.DateTimeField(auto_now_add=True)
+    created_by = models.IntegerField(null=True, blank=True)  # ID dari auth service
+
+    class Meta:
+        abstract = True
+        ordering = ['-created_at', '-id']
+
+    def save(self, *args, **kwargs):
+        if self.pk is not None:
+            raise ValueError("Mutasi stok tidak dapat diubah")
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        raise ValueError("Mutasi stok tidak dapat dihapus")
+
+
+class StockLedger:
+    """
+    Operasi stok atomik untuk satu model stok.
+
+    `movement_model` adalah turunan `StockMovement`; model stok diambil dari
+    ForeignKey `stok`-nya. `status_field` (boleh None) diubah menjadi
+    `habis` ketika stok mencapai 0 dan kembali `tersedia` ketika diisi ulang.
+    `jenis_field`, `expiry_field`, dan `lot_field` dipakai alokasi FEFO;
+    `price_field` dipakai untuk nilai stok pada laporan kedaluwarsa.
+    """
+    ALLOCATION_BATCH = 20
+
+    def __init__(self, movement_model, quantity_field='jumlah_stok', status_field='status',
+                 jenis_field=None, expiry_field='tanggal_kedaluwarsa', lot_field='batch_number',
+                 price_field=None):
+        self.movement_model = movement_model
+        self.quantity_field = quantity_field
+        self.status_field = status_field
+        self.jenis_field = jenis_field
+        self.expiry_field = expiry_field
+        self.lot_field = lot_field
+        self.price_field = price_field
+
+    @property
+    def stock_model(self):
+        # Diambil saat dipakai karena ledger dibuat ketika registry model belum siap
+        return self.movement_model._meta.get_field('stok').remote_field.model
+
+    def _tracked(self, operation):
+        """Durasi operasi dicatat pada metrik `stock_operation_duration_seconds`."""
+        return track_stock_operation(self.stock_model._meta.label_lower, operation)
+
+    def _decrement(self, stok_id, jumlah):
+        """Satu `UPDATE` bersyarat; mengembalikan True bila baris terkurangi."""
+        quantity = self.quantity_field
+        values = {quantity: F(quantity) - jumlah, 'updated_at': timezone.now()}
+        if self.status_field:
+            values[self.status_field] = Case(
+                When(**{quantity: jumlah}, then=Value('habis')),
+                default=F(self.status_field),
+            )
+        return self.stock_model.objects.filter(
+            pk=stok_id, **{f'{quantity}__gte': jumlah}
+        ).update(**values) == 1
+
+    def _balances(self, stok_ids):
+        return dict(
+            self.stock_model.objects.filter(pk__in=stok_ids)
+            .values_list('pk', self.quantity_field)
+        )
+
+    def _log(self, jenis_mutasi, items, referensi, created_by):
+        """Mencatat mutasi dengan saldo hasil UPDATE dalam transaksi yang sama."""
+        balances = self._balances([stok_id for stok_id, _ in items])
+        movements = self.movement_model.objects.bulk_create([
+            self.movement_model(
+                stok_id=stok_id,
+                jenis_mutasi=jenis_mutasi,
+                jumlah=jumlah,
+                saldo_akhir=balances[stok_id],
+                referensi=referensi or '',
+                created_by=created_by,
+            )
+            for stok_id, jumlah in items
+        ])
+        return [
+            {'stok_id': movement.stok_id, 'jumlah': movement.jumlah, 'saldo_akhir': movement.saldo_akhir}
+            for movement in movements
+        ]
+
+    def reserve(self, items, referensi='', created_by=None):
+        """
+        Mengurangi beberapa lot sekaligus secara all-or-nothing.
+
+        `items` berupa list `(stok_id, jumlah)`; lot yang sama digabung dan
+        lot dikunci berurutan berdasarkan id agar tidak terjadi deadlock antar
+        sesi. Bila satu lot tidak mencukupi, seluruh pengurangan dibatalkan
+        dan `InsufficientStock` dilempar.
+        """
+        merged = OrderedDict()
+        for stok_id, jumlah in sorted(items):
+            if jumlah <= 0:
+                raise ValueError("Jumlah harus lebih dari 0")
+            merged[stok_id] = merged.get(stok_id, 0) + jumlah
+        items = list(merged.items())
+
+        with self._tracked('reserve'), transaction.atomic():
+            for stok_id, jumlah in items:
+                if not self._decrement(stok_id, jumlah):
+                    tersedia = self._balances([stok_id]).get(stok_id, 0)
+                    raise InsufficientStock(stok_id, jumlah, tersedia)
+            return self._log('keluar', items, referensi, created_by)
+
+    def decrement(self, stok_id, jumlah=1, referensi='', created_by=None):
+        """Mengurangi satu lot; mengembalikan sisa stok lot."""
+        return self.reserve([(stok_id, jumlah)], referensi, created_by)[0]['saldo_akhir']
+
+    def increment(self, stok_id, jumlah, referensi='', created_by=None):
+        """
+        Menambah stok lot (penerimaan atau pembatalan); mengembalikan sisa stok.
+
+        Melempar `DoesNotExist` model stok bila lot tidak ditemukan.
+        """
+        if jumlah <= 0:
+            raise ValueError("Jumlah harus lebih dari 0")
+        quantity = self.quantity_field
+        values = {quantity: F(quantity) + jumlah, 'updated_at': timezone.now()}
+        if self.status_field:
+            values[self.status_field] = Case(
+                When(**{self.status_field: 'habis'}, then=Value('tersedia')),
+                default=F(self.status_field),
+            )
+        with self._tracked('increment'), transaction.atomic():
+            if not self.stock_model.objects.filter(pk=stok_id).update(**values):
+                raise self.stock_model.DoesNotExist(f"Stok {stok_id} tidak ditemukan")
+            return self._log('masuk', [(stok_id, jumlah)], referensi, created_by)[0]['saldo_akhir']
+
+    def opening_balance(self, stok, referensi='stok-awal', created_by=None):
+        """Mencatat kuantitas lot baru sebagai mutasi `masuk` pertama."""
+        jumlah = getattr(stok, self.quantity_field)
+        if jumlah and jumlah > 0:
+            self._log('masuk', [(stok.pk, jumlah)], referensi, created_by)
+
+    def available_lots(self, jenis):
+        """
+        Lot yang dapat dipakai untuk `jenis`, urut FEFO.
+
+        Filter dan urutan sesuai index komposit `(jenis, status, kedaluwarsa)`
+        pada model stok.
+        """
+        filters = {
+            self.jenis_field: jenis,
+            f'{self.expiry_field}__gte': date.today(),
+            f'{self.quantity_field}__gt': 0,
+        }
+        if self.status_field:
+            filters[self.status_field] = 'tersedia'
+        return self.stock_model.objects.filter(**filters).order_by(self.expiry_field, 'pk')
+
+    def expiring(self, days=30, queryset=None):
+        """
+        Lot tersedia yang kedaluwarsa dalam `days` hari (termasuk yang sudah
+        lewat), terurut dari yang paling dekat kedaluwarsa.
+        """
+        if queryset is None:
+            queryset = self.stock_model.objects.all()
+        if self.status_field:
+            queryset = queryset.filter(**{self.status_field: 'tersedia'})
+        return queryset.filter(**{
+            f'{self.expiry_field}__lte': date.today() + timedelta(days=days)
+        }).order_by(self.expiry_field, 'pk')
+
+    def expiry_horizon(self, weeks=12, queryset=None):
+        """
+        Jumlah lot, unit, dan nilai stok yang kedaluwarsa per minggu.
+
+        Bucket `minggu_ke` 0 berisi lot yang sudah kedaluwarsa tetapi masih
+        tersisa; bucket 1..`weeks` berisi lot yang kedaluwarsa pada minggu
+        tersebut mulai hari ini. Seluruh bucket dihitung dalam satu query
+        agregat bersyarat.
+        """
+        if queryset is None:
+            queryset = self.stock_model.objects.all()
+        queryset = queryset.filter(**{f'{self.quantity_field}__gt': 0})
+        if self.status_field:
+            queryset = queryset.exclude(**{self.status_field: 'habis'})
+
+        quantity = F(self.quantity_field)
+        if self.price_field:
+            value = ExpressionWrapper(
+                quantity * F(self.price_field),
+                output_field=DecimalField(max_digits=16, decimal_places=2),
+            )
+        today = date.today()
+        buckets = [(0, None, today - timedelta(days=1))]
+        buckets += [
+            (week, today + timedelta(days=7 * (week - 1)), today + timedelta(days=7 * week - 1))
+            for week in range(1, weeks + 1)
+        ]
+
+        spec = {}
+        for week, dari, sampai in buckets:
+            condition = Q(**{f'{self.expiry_field}__lte': sampai})
+            if dari is not None:
+                condition &= Q(**{f'{self.expiry_field}__gte': dari})
+            spec[week] = {
+                'jumlah_lot': CountIf(condition),
+                'jumlah_unit': Stat(Sum(self.quantity_field, filter=condition), default=0),
+            }
+            if self.price_field:
+                # Lot tanpa harga tidak menambah nilai
+                spec[week]['nilai'] = Stat(Sum(value, filter=condition), default=Decimal('0.00'))
+        result = compute_statistics(queryset, spec)
+        return [
+            {'minggu_ke': week, 'dari': dari, 'sampai': sampai, **result[week]}
+            for week, dari, sampai in buckets
+        ]
+
+    def _plan(self, jenis, jumlah, lock):
+        """
+        Memilih lot FEFO hingga `jumlah` terpenuhi.
+
+        Lot dibaca per `ALLOCATION_BATCH` baris dengan keyset `(kedaluwarsa,
+        id)` sehingga hanya lot yang dibutuhkan yang dibaca dan dikunci. Dengan
+        `lock`, lot yang sedang dikunci transaksi lain dilewati (`SKIP LOCKED`).
+        """
+        fields = ['pk', self.lot_field, self.expiry_field, self.quantity_field]
+        queryset = self.available_lots(jenis)
+        if lock:
+            queryset = queryset.select_for_update(skip_locked=True)
+
+        plan = []
+        sisa = jumlah
+        last = None
+        while sisa > 0:
+            batch = queryset
+            if last is not None:
+                batch = batch.filter(
+                    Q(**{f'{self.expiry_field}__gt': last[0]}) |
+                    Q(**{self.expiry_field: last[0], 'pk__gt': last[1]})
+                )
+            lots = list(batch.values_list(*fields)[:self.ALLOCATION_BATCH])
+            for pk, lot, expiry, tersedia in lots:
+                ambil = min(sisa, tersedia)
+                plan.append({'stok_id': pk, 'lot': lot, 'kedaluwarsa': expiry, 'jumlah': ambil})
+                sisa -= ambil
+                if sisa == 0:
+                    break
+            if len(lots) < self.ALLOCATION_BATCH:
+                break
+            last = (lots[-1][2], lots[-1][0])
+
+        if sisa > 0:
+            raise InsufficientStock(None, jumlah, jumlah - sisa, jenis=jenis)
+        return plan
+
+    def allocate(self, jenis, jumlah, referensi='', created_by=None, dry_run=False):
+        """
+        Mengalokasikan `jumlah` unit `jenis` dari lot yang paling dekat
+        kedaluwarsa (first-expiry-first-out).
+
+        Seluruh lot terpilih dikunci dan dikurangi dalam satu transaksi;
+        mengembalikan rincian per lot. `dry_run` hanya menghitung rencana
+        alokasi tanpa mengunci maupun mengurangi stok.
+        """
+        if jumlah <= 0:
+            raise ValueError("Jumlah harus lebih dari 0")
+        if dry_run:
+            with self._tracked('allocate_dry_run'):
+                return self._plan(jenis, jumlah, lock=False)
+
+        with self._tracked('allocate'), transaction.atomic():
+            plan = self._plan(jenis, jumlah, lock=True)
+            for item in plan:
+                # Lot sudah dikunci sehingga pengurangan bersyarat selalu berhasil
+                if not self._decrement(item['stok_id'], item['jumlah']):
+                    raise InsufficientStock(item['stok_id'], item['jumlah'], 0)
+            logged = self._log(
+                'keluar', [(item['stok_id'], item['jumlah']) for item in plan], referensi, created_by
+            )
+        for item, movement in zip(plan, logged):
+            item['saldo_akhir'] = movement['saldo_akhir']
+        return plan
+
+
+class StockLotSerializerMixin:
+    """
+    Mixin ModelSerializer lot stok.
+
+    Kuantitas lot (`stock_ledger.quantity_field`, ditambah
+    `locked_quantity_fields`) hanya diisi saat lot dibuat dan dicatat sebagai
+    mutasi `masuk` awal. Setelah itu field tersebut read-only; mengirim nilai
+    berbeda lewat PUT/PATCH ditolak karena perubahan stok harus lewat action
+    `masuk`/`keluar`/`reserve`/`allocate` agar tercatat di ledger.
+    """
+    stock_ledger = None
+    locked_quantity_fields = ()
+
+    def _locked_fields(self):
+        return (self.stock_ledger.quantity_field, *self.locked_quantity_fields)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if self.instance is not None:
+            for name in self._locked_fields():
+                if name in fields:
+                    fields[name].read_only = True
+        return fields
+
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        if self.instance is not None:
+            errors = {
+                name: 'Stok hanya dapat diubah lewat action masuk, keluar, reserve, atau allocate.'
+                for name in self._locked_fields()
+                if name in self.initial_data
+                and str(self.initial_data[name]) != str(getattr(self.instance, name))
+            }
+            if errors:
+                raise serializers.ValidationError(errors)
+        return attrs
+
+    def create(self, validated_data):
+        with transaction.atomic():
+            instance = super().create(validated_data)
+            self.stock_ledger.opening_balance(instance, created_by=getattr(instance, 'created_by', None))
+        return instance
+
+
+class StockMutationSerializer(serializers.Serializer):
+    """Request pengurangan/penambahan satu lot."""
+    jumlah = serializers.IntegerField(min_value=1)
+    referensi = serializers.CharField(max_length=100, required=False, allow_blank=True, default='')
+    created_by = serializers.IntegerField(required=False, allow_null=True, default=None)
+
+
+class AllocationSerializer(serializers.Serializer):
+    """Request alokasi FEFO untuk satu jenis stok."""
+    jenis = serializers.CharField(max_length=50)
+    jumlah = serializers.IntegerField(min_value=1)
+    referensi = serializers.CharField(max_length=100, required=False, allow_blank=True, default='')
+    created_by = serializers.IntegerField(required=False, allow_null=True, default=None)
+    dry_run = serializers.BooleanField(required=False, default=False)
+
+
+class ReservationItemSerializer(serializers.Serializer):
+    stok_id = serializers.IntegerField()
+    jumlah = serializers.IntegerField(min_value=1)
+
+
+class ReservationSerializer(serializers.Serializer):
+    """Request reservasi beberapa lot sekaligus."""
+    MAX_ITEMS = 200
+
+    items = ReservationItemSerializer(many=True, allow_empty=False, max_length=MAX_ITEMS)
+    referensi = serializers.CharField(max_length=100, required=False, allow_blank=True, default='')
+    created_by = serializers.IntegerField(required=False, allow_null=True, default=None)
+
+
+def parse_positive_int(value, default, maximum):
+    """Parameter query bilangan bulat 1..`maximum`; None bila tidak valid."""
+    if value in (None, ''):
+        return default
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        return None
+    return value if 1 <= value <= maximum else None
+
+
+def insufficient_stock_response(exc):
+    data = {
+        'error': 'Insufficient stock',
+        'stok_id': exc.stok_id,
+        'diminta': exc.diminta,
+        'tersedia': exc.tersedia,
+    }
+    if exc.jenis is not None:
+        data['jenis'] = exc.jenis
+    return Response(data, status=status.HTTP_400_BAD_REQUEST)
+
+
+class StockLedgerMixin:
+    """
+    Mixin ViewSet stok yang menyediakan action ledger dari `stock_ledger`.
+
+    - `POST {id}/keluar/`: mengurangi satu lot.
+    - `POST {id}/masuk/`: menambah satu lot.
+    - `POST reserve/`: mengurangi beberapa lot dalam satu transaksi.
+    - `POST allocate/`: alokasi FEFO berdasarkan jenis dan jumlah.
+    - `GET {id}/mutasi/`: riwayat mutasi lot.
+
+    Lot yang sudah memiliki mutasi tidak dapat dihapus (409).
+    """
+    stock_ledger = None
+
+    def destroy(self, request, *args, **kwargs):
+        try:
+            return super().destroy(request, *args, **kwargs)
+        except ProtectedError:
+            return Response(
+                {'error': 'Stock lot has movements and cannot be deleted'},
+                status=status.HTTP_409_CONFLICT
+            )
+
+    @action(detail=True, methods=['post'])
+    def keluar(self, request, pk=None):
+        """Mengurangi stok lot secara atomik."""
+        stok = self.get_object()
+        serializer = StockMutationSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            saldo = self.stock_ledger.decrement(stok.pk, **serializer.validated_data)
+        except InsufficientStock as exc:
+            return insufficient_stock_response(exc)
+        return Response({'stok_id': stok.pk, 'saldo_akhir': saldo})
+
+    @action(detail=True, methods=['post'])
+    def masuk(self, request, pk=None):
+        """Menambah stok lot secara atomik."""
+        stok = self.get_object()
+        serializer = StockMutationSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            saldo = self.stock_ledger.increment(stok.pk, **serializer.validated_data)
+        except self.stock_ledger.stock_model.DoesNotExist:
+            return Response({'error': 'Stock not found'}, status=status.HTTP_404_NOT_FOUND)
+        return Response({'stok_id': stok.pk, 'saldo_akhir': saldo})
+
+    @action(detail=False, methods=['post'])
+    def reserve(self, request):
+        """Mengurangi beberapa lot sekaligus; gagal seluruhnya bila satu lot kurang."""
+        serializer = ReservationSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        try:
+            items = self.stock_ledger.reserve(
+                [(item['stok_id'], item['jumlah']) for item in data['items']],
+                referensi=data['referensi'],
+                created_by=data['created_by'],
+            )
+        except InsufficientStock as exc:
+            return insufficient_stock_response(exc)
+        return Response({'referensi': data['referensi'], 'items': items}, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['post'])
+    def allocate(self, request):
+        """Mengambil stok dari lot yang paling dekat kedaluwarsa lebih dahulu."""
+        serializer = AllocationSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        try:
+            lots = self.stock_ledger.allocate(**data)
+        except InsufficientStock as exc:
+            return insufficient_stock_response(exc)
+        return Response({
+            'jenis': data['jenis'],
+            'jumlah': data['jumlah'],
+            'dry_run': data['dry_run'],
+            'lots': lots,
+        }, status=status.HTTP_200_OK if data['dry_run'] else status.HTTP_201_CREATED)
+
+    @action(detail=True, methods=['get'])
+    def mutasi(self, request, pk=None):
+        """Riwayat mutasi lot, terbaru lebih dahulu."""
+        stok = self.get_object()
+        queryset = self.stock_ledger.movement_model.objects.filter(stok_id=stok.pk).values(
+            'id', 'jenis_mutasi', 'jumlah', 'saldo_akhir', 'referensi', 'created_at', 'created_by'
+        )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(page)
+        return Response(list(queryset))
+
+
+class StockExpiryMixin:
+    """
+    Mixin ViewSet stok untuk laporan kedaluwarsa berbasis `stock_ledger`.
+
+    Seluruh filter tanggal dijalankan di database memakai index tanggal
+    kedaluwarsa, sehingga pagination tetap dilakukan oleh database.
+    """
+    max_expiry_days = 365
+    max_horizon_weeks = 52
+
+    @action(detail=False, methods=['get'])
+    def expiring_soon(self, request):
+        """Mengambil stok yang akan kedaluwarsa dalam `days` hari (default 30)."""
+        days = parse_positive_int(
+            request.query_params.get('days', request.query_params.get('days_ahead')),
+            default=30, maximum=self.max_expiry_days
+        )
+        if days is None:
+            return Response(
+                {'error': f'days parameter must be an integer between 1 and {self.max_expiry_days}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        queryset = self.stock_ledger.expiring(days, self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
+
+    @action(detail=False, methods=['get'])
+    def expiry_horizon(self, request):
+        """Jumlah lot, unit, dan nilai stok yang kedaluwarsa per minggu."""
+        weeks = parse_positive_int(
+            request.query_params.get('weeks'), default=12, maximum=self.max_horizon_weeks
+        )
+        if weeks is None:
+            return Response(
+                {'error': f'weeks parameter must be an integer between 1 and {self.max_horizon_weeks}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        queryset = self.filter_queryset(self.get_queryset())
+        return Response({
+            'tanggal': date.today(),
+            'buckets': self.stock_ledger.expiry_horizon(weeks, queryset),
+        })
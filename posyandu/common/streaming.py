@@ -0,0 +1,230 @@
+"""
+Export streaming CSV / NDJSON untuk endpoint list ViewSet DRF.
+
+`StreamingExportMixin` membuat list yang diminta dengan `?format=csv` atau
+`?format=ndjson` (atau header `Accept: text/csv` /
+`application/x-ndjson`) dikirim sebagai `StreamingHttpResponse` berisi
+seluruh baris hasil filter, tanpa pagination::
+
+    GET /api/vital-signs/?format=csv&participant_id=10
+    GET /api/pencatatan/?format=ndjson&posyandu_id=3&ordering=tanggal_pemberian
+
+Filter (`filterset_fields`, `search`, `ordering`) sama dengan list biasa.
+Baris dibaca dengan `values_list().iterator(chunk_size=STREAM_CHUNK_SIZE)`
+di dalam satu transaksi sehingga PostgreSQL memakai server-side cursor
+tanpa `WITH HOLD`, lalu ditulis ke respons per blok sekitar
+`STREAM_BUFFER_BYTES`. Memori proses tetap konstan berapa pun jumlah
+barisnya. Di bawah ASGI (`SERVER_MODE=uvicorn`) generator tersebut
+dibungkus `AsyncStream` agar Django tidak menampung seluruh isi respons
+dengan `sync_to_async(list)`; tiap blok diambil lewat `sync_to_async` pada
+thread yang sama sehingga transaksi dan cursor tetap utuh. Bila
+`DB_PGBOUNCER` aktif, Django menonaktifkan server-side cursor dan seluruh
+hasil query dimuat driver database sekaligus.
+
+Kolom yang diekspor adalah semua kolom model (`<field>_id` untuk foreign
+key), atau `export_fields` pada ViewSet::
+
+    class VitalSignsViewSet(ConditionalGetMixin, StreamingExportMixin, viewsets.ModelViewSet):
+        queryset = VitalSigns.objects.all()
+
+Letakkan mixin di kanan `ConditionalGetMixin` agar ETag tetap dipasang.
+"""
+import csv
+import io
+import json
+
+from asgiref.sync import sync_to_async
+from decouple import config
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, transaction
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+
+STREAM_CHUNK_SIZE = config('STREAM_CHUNK_SIZE', default=2000, cast=int)
+STREAM_BUFFER_BYTES = config('STREAM_BUFFER_BYTES', default=64 * 1024, cast=int)
+
+
+class StreamRenderer(BaseRenderer):
+    """
+    Penanda format streaming untuk content negotiation DRF. Isi respons
+    ditulis oleh `StreamingExportMixin`; renderer ini hanya dipakai untuk
+    respons tanpa isi (mis. 304).
+    """
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return b''
+
+
+class CSVStreamRenderer(StreamRenderer):
+    media_type = 'text/csv'
+    format = 'csv'
+
+
+class NDJSONStreamRenderer(StreamRenderer):
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+
+
+STREAM_RENDERERS = (CSVStreamRenderer, NDJSONStreamRenderer)
+STREAM_FORMATS = {renderer.format for renderer in STREAM_RENDERERS}
+
+
+def _isoformat(value):
+    return value.isoformat() if value is not None else None
+
+
+def _json_dumps(value):
+    return json.dumps(value, cls=DjangoJSONEncoder) if value is not None else None
+
+
+def csv_converters(model, columns):
+    """
+    `(index, fungsi)` untuk kolom yang nilainya perlu diubah sebelum ditulis
+    ke CSV: tanggal/waktu ke ISO 8601 dan JSONField ke teks JSON. Kolom lain
+    ditulis apa adanya (None menjadi sel kosong).
+    """
+    fields = {field.attname: field for field in model._meta.concrete_fields}
+    converters = []
+    for index, column in enumerate(columns):
+        field = fields.get(column)
+        if isinstance(field, (models.DateTimeField, models.TimeField)):
+            converters.append((index, _isoformat))
+        elif isinstance(field, models.JSONField):
+            converters.append((index, _json_dumps))
+    return converters
+
+
+def stream_csv(columns, rows, converters=()):
+    """Header lalu baris CSV, dikirim per blok `STREAM_BUFFER_BYTES`."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for row in rows:
+        if converters:
+            row = list(row)
+            for index, convert in converters:
+                row[index] = convert(row[index])
+        writer.writerow(row)
+        if buffer.tell() >= STREAM_BUFFER_BYTES:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def stream_ndjson(columns, rows, converters=()):
+    """Satu objek JSON per baris, dikirim per blok `STREAM_BUFFER_BYTES`."""
+    encoder = DjangoJSONEncoder()
+    lines, size = [], 0
+    for row in rows:
+        line = encoder.encode(dict(zip(columns, row)))
+        lines.append(line)
+        size += len(line) + 1
+        if size >= STREAM_BUFFER_BYTES:
+            yield '\n'.join(lines) + '\n'
+            lines, size = [], 0
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+
+# format -> (penulis, pembentuk konverter kolom)
+STREAM_WRITERS = {
+    'csv': (stream_csv, csv_converters),
+    'ndjson': (stream_ndjson, None),
+}
+
+
+def iterate_rows(queryset, columns, chunk_size=None):
+    """
+    Tuple nilai `columns` dari `queryset`, dibaca per `chunk_size` baris
+    lewat server-side cursor di dalam satu transaksi baca.
+    """
+    with transaction.atomic(using=queryset.db):
+        yield from queryset.values_list(*columns).iterator(chunk_size=chunk_size or STREAM_CHUNK_SIZE)
+
+
+class AsyncStream:
+    """
+    Iterator async di atas generator sync untuk `StreamingHttpResponse`
+    di bawah ASGI. Setiap blok diambil dengan
+    `sync_to_async(thread_sensitive=True)` sehingga semua langkah generator
+    (transaksi dan server-side cursor) berjalan di thread yang sama.
+    Generator sync ditutup (transaksi dan cursor dilepas) saat stream
+    selesai, dibatalkan karena klien memutus koneksi, atau saat Django
+    menutup respons.
+    """
+    _done = object()
+
+    def __init__(self, iterator):
+        self.iterator = iterator
+
+    async def __aiter__(self):
+        next_block = sync_to_async(next, thread_sensitive=True)
+        try:
+            while True:
+                block = await next_block(self.iterator, self._done)
+                if block is self._done:
+                    return
+                yield block
+        finally:
+            # Klien putus: Django membatalkan task tanpa memanggil close()
+            await sync_to_async(self.close, thread_sensitive=True)()
+
+    def close(self):
+        self.iterator.close()
+
+
+class StreamingExportMixin:
+    """Mixin ViewSet untuk list `?format=csv` / `?format=ndjson` yang di-stream."""
+    export_fields = None
+
+    def get_renderers(self):
+        renderers = super().get_renderers()
+        if self.action == 'list':
+            renderers += [renderer() for renderer in STREAM_RENDERERS]
+        return renderers
+
+    def get_export_fields(self):
+        if self.export_fields is not None:
+            return list(self.export_fields)
+        return [field.attname for field in self.queryset.model._meta.concrete_fields]
+
+    def get_export_filename(self, extension):
+        model_name = self.queryset.model._meta.model_name
+        return f'{model_name}-{timezone.localdate():%Y%m%d}.{extension}'
+
+    def _stream_format(self):
+        renderer = getattr(self.request, 'accepted_renderer', None)
+        return renderer.format if renderer is not None and renderer.format in STREAM_FORMATS else None
+
+    def handle_exception(self, exc):
+        # Error (mis. nilai filter tidak valid) tetap dikirim sebagai JSON
+        if self._stream_format():
+            self.request.accepted_renderer = JSONRenderer()
+            self.request.accepted_media_type = JSONRenderer.media_type
+        return super().handle_exception(exc)
+
+    def list(self, request, *args, **kwargs):
+        stream_format = self._stream_format()
+        if stream_format is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        columns = self.get_export_fields()
+        writer, build_converters = STREAM_WRITERS[stream_format]
+        converters = build_converters(queryset.model, columns) if build_converters else ()
+        content = writer(columns, iterate_rows(queryset, columns), converters)
+        if isinstance(request._request, ASGIRequest):
+            content = AsyncStream(content)
+        response = StreamingHttpResponse(
+            content,
+            content_type=f'{request.accepted_renderer.media_type}; charset=utf-8',
+        )
+        response['Content-Disposition'] = f'attachment; filename="{self.get_export_filename(stream_format)}"'
+        # Nginx meneruskan blok langsung ke klien tanpa menampung seluruh file
+        response['X-Accel-Buffering'] = 'no'
+        return response
@@ -0,0 +1,215 @@
+"""
+Change feed (delta sync) untuk perangkat offline.
+
+Setiap service yang datanya dibawa ke perangkat lapangan mendefinisikan
+model `Tombstone` konkret (turunan `Tombstone` di sini), mendaftarkan model
+yang dilacak lewat `track_deletions()`, lalu membuat ViewSet turunan
+`ChangeFeedViewSet`::
+
+    class SyncViewSet(ChangeFeedViewSet):
+        tombstone_model = Tombstone
+        sync_sources = {
+            'pemeriksaan': SyncSource(PemeriksaanBalita.objects.all(), PemeriksaanBalitaSerializer),
+        }
+
+`GET /api/sync/?models=pemeriksaan,imunisasi&since=<sync_token>&limit=500`
+mengembalikan baris yang berubah (`updated_at`) dan ID yang dihapus
+(tombstone) per model, berurutan `(updated_at, id)`, paling banyak `limit`
+per model. Klien menyimpan `sync_token` dari respons dan mengulang request
+selama `has_more` bernilai true. Tanpa `since` feed dimulai dari awal
+(sinkronisasi penuh pertama).
+
+Token berisi posisi keyset terakhir tiap model sehingga hanya bergerak maju.
+Baris yang berubah dalam `safety_lag` terakhir ditahan sampai sinkronisasi
+berikutnya agar transaksi yang belum commit (dengan `updated_at` lebih lama)
+tidak terlewat. Klien menerapkan `updated` lebih dulu lalu `deleted`.
+"""
+import base64
+import binascii
+import json
+from datetime import timedelta
+
+from django.db import models
+from django.db.models import Q
+from django.db.models.signals import post_delete
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import status, viewsets
+from rest_framework.response import Response
+
+from .related import with_related_loads
+from .stock import parse_positive_int
+
+
+class Tombstone(models.Model):
+    """Model abstrak penanda record yang dihapus, untuk change feed."""
+    model_label = models.CharField(max_length=100)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        abstract = True
+        ordering = ['deleted_at', 'id']
+        indexes = [
+            models.Index(fields=['model_label', 'deleted_at', 'id']),
+        ]
+
+    def __str__(self):
+        return f"{self.model_label}#{self.object_id} dihapus {self.deleted_at}"
+
+
+def track_deletions(tombstone_model, *tracked_models):
+    """Mencatat tombstone setiap kali instance `tracked_models` dihapus."""
+    def record_tombstone(sender, instance, **kwargs):
+        tombstone_model.objects.create(model_label=sender._meta.label_lower, object_id=instance.pk)
+
+    for model in tracked_models:
+        post_delete.connect(
+            record_tombstone,
+            sender=model,
+            weak=False,
+            dispatch_uid=f'tombstone:{model._meta.label_lower}',
+        )
+
+
+class SyncSource:
+    """
+    Satu model pada change feed: queryset dasar dan serializer-nya. Relasi
+    yang dibaca serializer ikut dimuat (`common.related`).
+    """
+
+    def __init__(self, queryset, serializer_class, updated_field='updated_at'):
+        self.queryset = with_related_loads(queryset, serializer_class)
+        self.serializer_class = serializer_class
+        self.updated_field = updated_field
+
+
+class InvalidSyncToken(ValueError):
+    pass
+
+
+def encode_sync_token(cursors):
+    payload = json.dumps({'v': 1, 'c': cursors}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_sync_token(token):
+    """Mengembalikan dict `nama -> {'u': [waktu, id], 'd': [waktu, id]}`."""
+    if not token:
+        return {}
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token.encode()).decode())
+        cursors = payload['c']
+        if payload.get('v') != 1 or not isinstance(cursors, dict):
+            raise InvalidSyncToken(token)
+        for cursor in cursors.values():
+            for key in ('u', 'd'):
+                if key in cursor:
+                    _parse_position(cursor[key])
+    except (TypeError, ValueError, KeyError, AttributeError, binascii.Error, UnicodeDecodeError):
+        raise InvalidSyncToken(token)
+    return cursors
+
+
+def _parse_position(position):
+    if position is None:
+        return None
+    moment, pk = position
+    moment = parse_datetime(moment)
+    if moment is None or not isinstance(pk, int):
+        raise InvalidSyncToken(position)
+    return moment, pk
+
+
+def _after(field, position):
+    """Kondisi keyset `(field, id) > position` dengan batas bawah untuk index."""
+    moment, pk = position
+    return Q(**{f'{field}__gte': moment}) & (
+        Q(**{f'{field}__gt': moment}) | Q(**{field: moment, 'pk__gt': pk})
+    )
+
+
+def _page(queryset, field, position, upper, limit):
+    queryset = queryset.filter(**{f'{field}__lte': upper})
+    if position is not None:
+        queryset = queryset.filter(_after(field, position))
+    rows = list(queryset.order_by(field, 'pk')[:limit + 1])
+    return rows[:limit], len(rows) > limit
+
+
+class ChangeFeedViewSet(viewsets.ViewSet):
+    """
+    ViewSet change feed multi-model.
+
+    - `sync_sources`: dict `nama -> SyncSource`.
+    - `tombstone_model`: model `Tombstone` konkret service.
+    - `page_size` / `max_page_size`: jumlah baris per model per request.
+    - `safety_lag`: perubahan yang lebih baru dari ini ditunda ke request
+      berikutnya.
+    """
+    sync_sources = {}
+    tombstone_model = None
+    page_size = 500
+    max_page_size = 5000
+    safety_lag = timedelta(seconds=5)
+
+    def list(self, request):
+        """Perubahan dan penghapusan sejak `since` untuk model pada `models`."""
+        names = request.query_params.get('models')
+        names = [name.strip() for name in names.split(',') if name.strip()] if names else list(self.sync_sources)
+        unknown = [name for name in names if name not in self.sync_sources]
+        if unknown or not names:
+            return Response(
+                {'error': f"models must be any of {', '.join(self.sync_sources)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        limit = parse_positive_int(request.query_params.get('limit'), self.page_size, self.max_page_size)
+        if limit is None:
+            return Response(
+                {'error': f'limit must be between 1 and {self.max_page_size}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            cursors = decode_sync_token(request.query_params.get('since'))
+        except InvalidSyncToken:
+            return Response(
+                {'error': 'since parameter is not a valid sync token'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        upper = timezone.now() - self.safety_lag
+        changes = {}
+        for name in names:
+            cursor = dict(cursors.get(name, {}))
+            changes[name] = self._model_changes(request, self.sync_sources[name], cursor, upper, limit)
+            cursors[name] = cursor
+
+        return Response({
+            'sync_token': encode_sync_token(cursors),
+            'has_more': any(change['has_more'] for change in changes.values()),
+            'server_time': upper,
+            'changes': changes,
+        })
+
+    def _model_changes(self, request, source, cursor, upper, limit):
+        """Satu potongan perubahan model; `cursor` diperbarui di tempat."""
+        field = source.updated_field
+        rows, more_updated = _page(source.queryset.all(), field, _parse_position(cursor.get('u')), upper, limit)
+        if rows:
+            cursor['u'] = [getattr(rows[-1], field).isoformat(), rows[-1].pk]
+
+        tombstones = self.tombstone_model.objects.filter(
+            model_label=source.queryset.model._meta.label_lower
+        )
+        deleted, more_deleted = _page(tombstones, 'deleted_at', _parse_position(cursor.get('d')), upper, limit)
+        if deleted:
+            cursor['d'] = [deleted[-1].deleted_at.isoformat(), deleted[-1].pk]
+
+        serializer = source.serializer_class(rows, many=True, context={'request': request, 'view': self})
+        return {
+            'updated': serializer.data,
+            'deleted': [tombstone.object_id for tombstone in deleted],
+            'has_more': more_updated or more_deleted,
+        }
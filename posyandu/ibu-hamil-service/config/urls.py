@@ -6,8 +6,13 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 
+from common.database import pool_stats_view
+from common.metrics import metrics_view
+
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('internal/db-pool/', pool_stats_view),
+    path('metrics', metrics_view),
     path('api/', include('ibu_hamil.urls')),
 ]
 
@@ -7,6 +7,11 @@ from rest_framework.response import Response
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
 from django.db.models import Q
+from common.batch import BatchLookupMixin
+from common.related import RelatedLoadsMixin
+from common.conditional import ConditionalGetMixin
+from common.statistics import StatisticsMixin, Total, count_by, count_by_choices
+from common.streaming import StreamingExportMixin
 from .models import PemeriksaanIbuHamil, SuplemenIbuHamil, IbuNifas, BayiBaruLahir
 from .serializers import (
     PemeriksaanIbuHamilSerializer, SuplemenIbuHamilSerializer,
@@ -14,7 +19,7 @@ from .serializers import (
 )
 
 
-class PemeriksaanIbuHamilViewSet(viewsets.ModelViewSet):
+class PemeriksaanIbuHamilViewSet(ConditionalGetMixin, StreamingExportMixin, StatisticsMixin, BatchLookupMixin, RelatedLoadsMixin, viewsets.ModelViewSet):
     """ViewSet untuk model PemeriksaanIbuHamil."""
     queryset = PemeriksaanIbuHamil.objects.all()
     serializer_class = PemeriksaanIbuHamilSerializer
@@ -23,6 +28,17 @@ class PemeriksaanIbuHamilViewSet(viewsets.ModelViewSet):
     search_fields = ['ibu_hamil_id', 'posyandu_id', 'keluhan']
     ordering_fields = ['tanggal_pemeriksaan', 'created_at']
     ordering = ['-tanggal_pemeriksaan']
+    statistics_spec = {
+        'total_pemeriksaan': Total(),
+        'by_risiko': {
+            'normal': Q(risiko_tinggi=False),
+            'tinggi': Q(risiko_tinggi=True),
+        },
+        'by_rujukan': {
+            'perlu_rujukan': Q(perlu_rujukan=True),
+            'tidak_perlu_rujukan': Q(perlu_rujukan=False),
+        },
+    }
     
     @action(detail=False, methods=['get'])
     def by_ibu_hamil(self, request):
@@ -61,28 +77,9 @@ class PemeriksaanIbuHamilViewSet(viewsets.ModelViewSet):
         
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
-    
-    @action(detail=False, methods=['get'])
-    def statistics(self, request):
-        """Statistik pemeriksaan ibu hamil."""
-        total_pemeriksaan = self.queryset.count()
-        by_risiko = {
-            'normal': self.queryset.filter(risiko_tinggi=False).count(),
-            'tinggi': self.queryset.filter(risiko_tinggi=True).count(),
-        }
-        by_rujukan = {
-            'perlu_rujukan': self.queryset.filter(perlu_rujukan=True).count(),
-            'tidak_perlu_rujukan': self.queryset.filter(perlu_rujukan=False).count(),
-        }
-        
-        return Response({
-            'total_pemeriksaan': total_pemeriksaan,
-            'by_risiko': by_risiko,
-            'by_rujukan': by_rujukan,
-        })
 
 
-class SuplemenIbuHamilViewSet(viewsets.ModelViewSet):
+class SuplemenIbuHamilViewSet(ConditionalGetMixin, StatisticsMixin, BatchLookupMixin, RelatedLoadsMixin, viewsets.ModelViewSet):
     """ViewSet untuk model SuplemenIbuHamil."""
     queryset = SuplemenIbuHamil.objects.all()
     serializer_class = SuplemenIbuHamilSerializer
@@ -91,6 +88,11 @@ class SuplemenIbuHamilViewSet(viewsets.ModelViewSet):
     search_fields = ['ibu_hamil_id', 'posyandu_id', 'petugas_pemberian']
     ordering_fields = ['tanggal_pemberian', 'created_at']
     ordering = ['-tanggal_pemberian']
+    statistics_spec = {
+        'total_suplemen': Total(),
+        'by_status': count_by('status', ['diberikan', 'tidak_diberikan', 'menolak']),
+        'by_jenis': count_by('jenis_suplemen', SuplemenIbuHamil.JENIS_SUPLEMEN_CHOICES),
+    }
     
     @action(detail=False, methods=['get'])
     def by_ibu_hamil(self, request):
@@ -129,28 +131,9 @@ class SuplemenIbuHamilViewSet(viewsets.ModelViewSet):
         
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
-    
-    @action(detail=False, methods=['get'])
-    def statistics(self, request):
-        """Statistik suplemen."""
-        total_suplemen = self.queryset.count()
-        by_status = {
-            'diberikan': self.queryset.filter(status='diberikan').count(),
-            'tidak_diberikan': self.queryset.filter(status='tidak_diberikan').count(),
-            'menolak': self.queryset.filter(status='menolak').count(),
-        }
-        by_jenis = {}
-        for choice in SuplemenIbuHamil.JENIS_SUPLEMEN_CHOICES:
-            by_jenis[choice[0]] = self.queryset.filter(jenis_suplemen=choice[0]).count()
-        
-        return Response({
-            'total_suplemen': total_suplemen,
-            'by_status': by_status,
-            'by_jenis': by_jenis,
-        })
 
 
-class IbuNifasViewSet(viewsets.ModelViewSet):
+class IbuNifasViewSet(ConditionalGetMixin, StatisticsMixin, BatchLookupMixin, RelatedLoadsMixin, viewsets.ModelViewSet):
     """ViewSet untuk model IbuNifas."""
     queryset = IbuNifas.objects.all()
     serializer_class = IbuNifasSerializer
@@ -159,6 +142,11 @@ class IbuNifasViewSet(viewsets.ModelViewSet):
     search_fields = ['ibu_hamil_id', 'posyandu_id', 'keluhan']
     ordering_fields = ['tanggal_persalinan', 'created_at']
     ordering = ['-tanggal_persalinan']
+    statistics_spec = {
+        'total_nifas': Total(),
+        'by_kondisi': count_by('kondisi_ibu', ['baik', 'kurang_baik', 'buruk']),
+        'by_persalinan': count_by_choices(IbuNifas, 'jenis_persalinan'),
+    }
     
     @action(detail=False, methods=['get'])
     def by_ibu_hamil(self, request):
@@ -178,28 +166,9 @@ class IbuNifasViewSet(viewsets.ModelViewSet):
         
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
-    
-    @action(detail=False, methods=['get'])
-    def statistics(self, request):
-        """Statistik ibu nifas."""
-        total_nifas = self.queryset.count()
-        by_kondisi = {
-            'baik': self.queryset.filter(kondisi_ibu='baik').count(),
-            'kurang_baik': self.queryset.filter(kondisi_ibu='kurang_baik').count(),
-            'buruk': self.queryset.filter(kondisi_ibu='buruk').count(),
-        }
-        by_persalinan = {}
-        for choice in IbuNifas.JENIS_PERSALINAN_CHOICES:
-            by_persalinan[choice[0]] = self.queryset.filter(jenis_persalinan=choice[0]).count()
-        
-        return Response({
-            'total_nifas': total_nifas,
-            'by_kondisi': by_kondisi,
-            'by_persalinan': by_persalinan,
-        })
 
 
-class BayiBaruLahirViewSet(viewsets.ModelViewSet):
+class BayiBaruLahirViewSet(ConditionalGetMixin, StatisticsMixin, BatchLookupMixin, RelatedLoadsMixin, viewsets.ModelViewSet):
     """ViewSet untuk model BayiBaruLahir."""
     queryset = BayiBaruLahir.objects.all()
     serializer_class = BayiBaruLahirSerializer
@@ -208,6 +177,15 @@ class BayiBaruLahirViewSet(viewsets.ModelViewSet):
     search_fields = ['ibu_hamil_id', 'posyandu_id', 'catatan']
     ordering_fields = ['tanggal_lahir', 'created_at']
     ordering = ['-tanggal_lahir']
+    statistics_spec = {
+        'total_bayi': Total(),
+        'by_kondisi': count_by('kondisi_lahir', ['baik', 'kurang_baik', 'buruk']),
+        'by_jenis_kelamin': {
+            'laki_laki': Q(jenis_kelamin='Laki-laki'),
+            'perempuan': Q(jenis_kelamin='Perempuan'),
+        },
+        'by_status': count_by('status', ['hidup', 'meninggal']),
+    }
     
     @action(detail=False, methods=['get'])
     def by_ibu_hamil(self, request):
@@ -227,28 +205,3 @@ class BayiBaruLahirViewSet(viewsets.ModelViewSet):
         
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
-    
-    @action(detail=False, methods=['get'])
-    def statistics(self, request):
-        """Statistik bayi baru lahir."""
-        total_bayi = self.queryset.count()
-        by_kondisi = {
-            'baik': self.queryset.filter(kondisi_lahir='baik').count(),
-            'kurang_baik': self.queryset.filter(kondisi_lahir='kurang_baik').count(),
-            'buruk': self.queryset.filter(kondisi_lahir='buruk').count(),
-        }
-        by_jenis_kelamin = {
-            'laki_laki': self.queryset.filter(jenis_kelamin='Laki-laki').count(),
-            'perempuan': self.queryset.filter(jenis_kelamin='Perempuan').count(),
-        }
-        by_status = {
-            'hidup': self.queryset.filter(status='hidup').count(),
-            'meninggal': self.queryset.filter(status='meninggal').count(),
-        }
-        
-        return Response({
-            'total_bayi': total_bayi,
-            'by_kondisi': by_kondisi,
-            'by_jenis_kelamin': by_jenis_kelamin,
-            'by_status': by_status,
-        })
@@ -0,0 +1,88 @@
+"""
+Data benchmark imunisasi-service: riwayat imunisasi balita dan stok vaksin.
+
+Setiap balita (`SeedContext.balita()`) mendapat dosis sesuai umurnya menurut
+`JADWAL`, paling banyak rata-rata `imunisasi / balita` dosis, sehingga
+volume total mendekati `VOLUMES['imunisasi']`.
+
+Stok tiap lot dicatat juga sebagai mutasi `masuk` agar saldo cocok dengan
+riwayat mutasi `StockLedger`.
+"""
+from datetime import timedelta
+
+from .models import JadwalImunisasi, MutasiVaksin, PencatatanImunisasi, VaksinStock
+
+
+MODELS = [PencatatanImunisasi, MutasiVaksin, VaksinStock]
+
+# (jenis, usia pemberian dalam bulan), urut menurut usia
+JADWAL = [
+    ('hepb_1', 0), ('polio_0', 0), ('bcg', 1), ('polio_1', 1), ('dpt_1', 2), ('polio_2', 2),
+    ('hepb_2', 2), ('dpt_2', 3), ('polio_3', 3), ('hepb_3', 3), ('dpt_3', 4), ('polio_4', 4),
+    ('campak', 9), ('mr_1', 9), ('mr_2', 18),
+]
+LOT_PER_JENIS = 10
+
+
+def _pencatatan_rows(ctx):
+    rng = ctx.random('imunisasi')
+    balita_count = ctx.count('balita')
+    per_balita = -(-ctx.count('imunisasi') // balita_count)
+    number = 0
+    for balita_id in range(1, balita_count + 1):
+        ref = ctx.balita(balita_id)
+        for jenis, usia in JADWAL[:per_balita]:
+            tanggal = ref.tanggal_lahir + timedelta(days=usia * 30 + rng.randint(0, 14))
+            if tanggal > ctx.end_date or number >= ctx.count('imunisasi'):
+                break
+            number += 1
+            status = 'diberikan' if rng.random() < 0.96 else rng.choice(['tidak_diberikan', 'menolak'])
+            yield PencatatanImunisasi(
+                id=number,
+                balita_id=balita_id,
+                posyandu_id=ref.posyandu_id,
+                jenis_imunisasi=jenis,
+                tanggal_pemberian=tanggal,
+                usia_saat_imunisasi_bulan=usia,
+                status=status,
+                alasan_tidak_diberikan=None if status == 'diberikan' else 'Anak sedang demam',
+                batch_vaksin=f'{jenis.upper()}-{tanggal.year}-{rng.randint(1, LOT_PER_JENIS):02d}',
+                created_by=1,
+            )
+
+
+def _stock_rows(ctx):
+    rng = ctx.random('stok')
+    number = 0
+    for jenis, label in JadwalImunisasi.JENIS_IMUNISASI_CHOICES:
+        for lot in range(1, LOT_PER_JENIS + 1):
+            number += 1
+            kedaluwarsa = ctx.end_date + timedelta(days=rng.randint(-30, 540))
+            jumlah = rng.randint(0, 500)
+            if kedaluwarsa < ctx.end_date:
+                status = 'kedaluwarsa'
+            else:
+                status = 'tersedia' if jumlah else 'habis'
+            yield VaksinStock(
+                id=number,
+                jenis_vaksin=label,
+                batch_number=f'{jenis.upper()}-{lot:02d}',
+                tanggal_kedaluwarsa=kedaluwarsa,
+                jumlah_stok=jumlah,
+                supplier='Bio Farma',
+                status=status,
+                created_by=1,
+            )
+
+
+def seed(ctx):
+    ctx.bulk_insert(PencatatanImunisasi, _pencatatan_rows(ctx))
+    stocks = list(_stock_rows(ctx))
+    ctx.bulk_insert(VaksinStock, stocks)
+    ctx.bulk_insert(MutasiVaksin, (
+        MutasiVaksin(
+            id=stok.id, stok_id=stok.id, jenis_mutasi='masuk', jumlah=stok.jumlah_stok,
+            saldo_akhir=stok.jumlah_stok, referensi='seed_benchmark', created_by=1,
+        )
+        for stok in stocks if stok.jumlah_stok
+    ))
@@ -3,6 +3,9 @@ Model untuk imunisasi-service.
 Menangani jadwal dan pencatatan imunisasi balita.
 """
 from django.db import models
+from common.statistics import VacatedDay, track_vacated_days
+from common.stock import StockMovement, StockLedger, InsufficientStock
+from common.sync import Tombstone, track_deletions
 from decimal import Decimal
 
 
@@ -172,8 +175,9 @@ class PencatatanImunisasi(models.Model):
             models.Index(fields=['balita_id']),
             models.Index(fields=['posyandu_id']),
             models.Index(fields=['jenis_imunisasi']),
-            models.Index(fields=['tanggal_pemberian']),
+            models.Index(fields=['tanggal_pemberian', 'id']),
             models.Index(fields=['status']),
+            models.Index(fields=['updated_at', 'id']),
         ]
     
     def __str__(self):
@@ -310,10 +314,11 @@ class VaksinStock(models.Model):
     class Meta:
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['jenis_vaksin']),
+            models.Index(fields=['jenis_vaksin', 'status', 'tanggal_kedaluwarsa']),
             models.Index(fields=['batch_number']),
             models.Index(fields=['tanggal_kedaluwarsa']),
             models.Index(fields=['status']),
+            models.Index(fields=['updated_at', 'id']),
         ]
     
     def __str__(self):
@@ -332,11 +337,46 @@ class VaksinStock(models.Model):
         return self.tanggal_kedaluwarsa <= date.today() + timedelta(days=30)
     
     def use_vaccine(self, jumlah=1):
-        """Mengurangi jumlah stok vaksin."""
-        if self.jumlah_stok >= jumlah:
-            self.jumlah_stok -= jumlah
-            if self.jumlah_stok == 0:
-                self.status = 'habis'
-            self.save()
-            return True
-        return False
+        """Mengurangi stok vaksin secara atomik melalui ledger stok."""
+        try:
+            self.jumlah_stok = vaksin_ledger.decrement(self.pk, jumlah)
+        except InsufficientStock:
+            return False
+        if self.jumlah_stok == 0:
+            self.status = 'habis'
+        return True
+
+
+class MutasiVaksin(StockMovement):
+    """Model untuk mutasi stok vaksin."""
+    
+    stok = models.ForeignKey(VaksinStock, on_delete=models.PROTECT, related_name='mutasi')
+    
+    class Meta(StockMovement.Meta):
+        indexes = [
+            models.Index(fields=['stok', 'created_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.get_jenis_mutasi_display()} {self.jumlah} - {self.stok}"
+
+
+vaksin_ledger = StockLedger(
+    MutasiVaksin, quantity_field='jumlah_stok', status_field='status',
+    jenis_field='jenis_vaksin', expiry_field='tanggal_kedaluwarsa', lot_field='batch_number',
+    price_field='harga_per_dosis'
+)
+
+
+class SyncTombstone(Tombstone):
+    """Penanda record yang dihapus untuk change feed `/api/sync/`."""
+
+
+track_deletions(SyncTombstone, PencatatanImunisasi, VaksinStock)
+
+
+class FeedVacatedDay(VacatedDay):
+    """Hari yang ditinggalkan record feed harian, untuk rollup `daily_feed`."""
+
+
+track_vacated_days(FeedVacatedDay, PencatatanImunisasi, 'tanggal_pemberian')
@@ -2,7 +2,8 @@
 Serializers untuk imunisasi-service.
 """
 from rest_framework import serializers
-from .models import JadwalImunisasi, PencatatanImunisasi, ReminderImunisasi, VaksinStock
+from common.stock import StockLotSerializerMixin
+from .models import JadwalImunisasi, PencatatanImunisasi, ReminderImunisasi, VaksinStock, vaksin_ledger
 
 
 class JadwalImunisasiSerializer(serializers.ModelSerializer):
@@ -43,8 +44,9 @@ class ReminderImunisasiSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at']
 
 
-class VaksinStockSerializer(serializers.ModelSerializer):
+class VaksinStockSerializer(StockLotSerializerMixin, serializers.ModelSerializer):
     """Serializer untuk model VaksinStock."""
+    stock_ledger = vaksin_ledger
     
     class Meta:
         model = VaksinStock
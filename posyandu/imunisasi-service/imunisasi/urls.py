@@ -5,7 +5,7 @@ from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import (
     JadwalImunisasiViewSet, PencatatanImunisasiViewSet,
-    ReminderImunisasiViewSet, VaksinStockViewSet
+    ReminderImunisasiViewSet, VaksinStockViewSet, SyncViewSet
 )
 
 router = DefaultRouter()
@@ -13,6 +13,7 @@ router.register(r'jadwal', JadwalImunisasiViewSet)
 router.register(r'pencatatan', PencatatanImunisasiViewSet)
 router.register(r'reminder', ReminderImunisasiViewSet)
 router.register(r'stok', VaksinStockViewSet)
+router.register(r'sync', SyncViewSet, basename='sync')
 
 urlpatterns = [
     path('', include(router.urls)),
@@ -7,14 +7,26 @@ from rest_framework.response import Response
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
 from django.db.models import Q
-from .models import JadwalImunisasi, PencatatanImunisasi, ReminderImunisasi, VaksinStock
+from common.batch import BatchLookupMixin
+from common.related import RelatedLoadsMixin
+from common.conditional import ConditionalGetMixin
+from common.pagination import KeysetPagination
+from common.cache import CachedResponseMixin
+from common.statistics import StatisticsMixin, DailyFeedMixin, Total, GroupBy, count_by
+from common.stock import StockLedgerMixin, StockExpiryMixin
+from common.sync import ChangeFeedViewSet, SyncSource
+from common.streaming import StreamingExportMixin
+from .models import (
+    JadwalImunisasi, PencatatanImunisasi, ReminderImunisasi, VaksinStock, vaksin_ledger, SyncTombstone,
+    FeedVacatedDay
+)
 from .serializers import (
     JadwalImunisasiSerializer, PencatatanImunisasiSerializer,
     ReminderImunisasiSerializer, VaksinStockSerializer, ImunisasiSearchSerializer
 )
 
 
-class JadwalImunisasiViewSet(viewsets.ModelViewSet):
+class JadwalImunisasiViewSet(ConditionalGetMixin, CachedResponseMixin, BatchLookupMixin, RelatedLoadsMixin, viewsets.ModelViewSet):
     """ViewSet untuk model JadwalImunisasi."""
     queryset = JadwalImunisasi.objects.all()
     serializer_class = JadwalImunisasiSerializer
@@ -23,6 +35,8 @@ class JadwalImunisasiViewSet(viewsets.ModelViewSet):
     search_fields = ['jenis_imunisasi', 'deskripsi']
     ordering_fields = ['usia_minimal_bulan', 'jenis_imunisasi']
     ordering = ['usia_minimal_bulan', 'jenis_imunisasi']
+    cache_alias = 'reference'
+    cache_actions = ('list', 'retrieve', 'by_usia')
     
     @action(detail=False, methods=['get'])
     def by_usia(self, request):
@@ -57,7 +71,7 @@ class JadwalImunisasiViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class PencatatanImunisasiViewSet(viewsets.ModelViewSet):
+class PencatatanImunisasiViewSet(ConditionalGetMixin, StreamingExportMixin, StatisticsMixin, DailyFeedMixin, BatchLookupMixin, RelatedLoadsMixin, viewsets.ModelViewSet):
     """ViewSet untuk model PencatatanImunisasi."""
     queryset = PencatatanImunisasi.objects.all()
     serializer_class = PencatatanImunisasiSerializer
@@ -66,6 +80,20 @@ class PencatatanImunisasiViewSet(viewsets.ModelViewSet):
     search_fields = ['balita_id', 'posyandu_id', 'petugas_pemberian', 'batch_vaksin']
     ordering_fields = ['tanggal_pemberian', 'created_at']
     ordering = ['-tanggal_pemberian']
+    pagination_class = KeysetPagination
+    cursor_ordering = ('-tanggal_pemberian', '-id')
+    statistics_spec = {
+        'total_pencatatan': Total(),
+        'by_status': count_by('status', ['diberikan', 'tidak_diberikan', 'kontraindikasi', 'menolak']),
+        'by_jenis': count_by('jenis_imunisasi', JadwalImunisasi.JENIS_IMUNISASI_CHOICES),
+    }
+    daily_feed_date_field = 'tanggal_pemberian'
+    daily_feed_vacated_model = FeedVacatedDay
+    daily_feed_spec = {
+        'total_imunisasi': Total(),
+        'dosis_diberikan': Q(status='diberikan'),
+        'dosis_tidak_diberikan': ~Q(status='diberikan'),
+    }
     
     @action(detail=False, methods=['get'])
     def by_balita(self, request):
@@ -104,29 +132,9 @@ class PencatatanImunisasiViewSet(viewsets.ModelViewSet):
         
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
-    
-    @action(detail=False, methods=['get'])
-    def statistics(self, request):
-        """Statistik pencatatan imunisasi."""
-        total_pencatatan = self.queryset.count()
-        by_status = {
-            'diberikan': self.queryset.filter(status='diberikan').count(),
-            'tidak_diberikan': self.queryset.filter(status='tidak_diberikan').count(),
-            'kontraindikasi': self.queryset.filter(status='kontraindikasi').count(),
-            'menolak': self.queryset.filter(status='menolak').count(),
-        }
-        by_jenis = {}
-        for choice in PencatatanImunisasi.JENIS_IMUNISASI_CHOICES:
-            by_jenis[choice[0]] = self.queryset.filter(jenis_imunisasi=choice[0]).count()
-        
-        return Response({
-            'total_pencatatan': total_pencatatan,
-            'by_status': by_status,
-            'by_jenis': by_jenis,
-        })
 
 
-class ReminderImunisasiViewSet(viewsets.ModelViewSet):
+class ReminderImunisasiViewSet(ConditionalGetMixin, StatisticsMixin, BatchLookupMixin, RelatedLoadsMixin, viewsets.ModelViewSet):
     """ViewSet untuk model ReminderImunisasi."""
     queryset = ReminderImunisasi.objects.all()
     serializer_class = ReminderImunisasiSerializer
@@ -135,6 +143,11 @@ class ReminderImunisasiViewSet(viewsets.ModelViewSet):
     search_fields = ['balita_id', 'posyandu_id', 'catatan']
     ordering_fields = ['prioritas', 'tanggal_reminder', 'created_at']
     ordering = ['prioritas', '-tanggal_reminder']
+    statistics_spec = {
+        'total_reminder': Total(),
+        'by_status': count_by('status', ['belum_jadwal', 'sudah_jadwal', 'terlambat', 'diberikan']),
+        'by_prioritas': count_by('prioritas', ['rendah', 'sedang', 'tinggi', 'urgent']),
+    }
     
     @action(detail=False, methods=['get'])
     def by_balita(self, request):
@@ -173,40 +186,23 @@ class ReminderImunisasiViewSet(viewsets.ModelViewSet):
         
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
-    
-    @action(detail=False, methods=['get'])
-    def statistics(self, request):
-        """Statistik reminder imunisasi."""
-        total_reminder = self.queryset.count()
-        by_status = {
-            'belum_jadwal': self.queryset.filter(status='belum_jadwal').count(),
-            'sudah_jadwal': self.queryset.filter(status='sudah_jadwal').count(),
-            'terlambat': self.queryset.filter(status='terlambat').count(),
-            'diberikan': self.queryset.filter(status='diberikan').count(),
-        }
-        by_prioritas = {
-            'rendah': self.queryset.filter(prioritas='rendah').count(),
-            'sedang': self.queryset.filter(prioritas='sedang').count(),
-            'tinggi': self.queryset.filter(prioritas='tinggi').count(),
-            'urgent': self.queryset.filter(prioritas='urgent').count(),
-        }
-        
-        return Response({
-            'total_reminder': total_reminder,
-            'by_status': by_status,
-            'by_prioritas': by_prioritas,
-        })
 
 
-class VaksinStockViewSet(viewsets.ModelViewSet):
+class VaksinStockViewSet(ConditionalGetMixin, StatisticsMixin, StockLedgerMixin, StockExpiryMixin, BatchLookupMixin, RelatedLoadsMixin, viewsets.ModelViewSet):
     """ViewSet untuk model VaksinStock."""
     queryset = VaksinStock.objects.all()
     serializer_class = VaksinStockSerializer
+    stock_ledger = vaksin_ledger
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['jenis_vaksin', 'status', 'supplier']
     search_fields = ['jenis_vaksin', 'batch_number', 'supplier']
     ordering_fields = ['jenis_vaksin', 'tanggal_kedaluwarsa', 'created_at']
     ordering = ['jenis_vaksin', 'tanggal_kedaluwarsa']
+    statistics_spec = {
+        'total_stok': Total(),
+        'by_status': count_by('status', ['tersedia', 'habis', 'kedaluwarsa']),
+        'by_jenis': GroupBy('jenis_vaksin'),
+    }
     
     @action(detail=False, methods=['get'])
     def by_jenis(self, request):
@@ -226,40 +222,12 @@ class VaksinStockViewSet(viewsets.ModelViewSet):
         
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
-    
-    @action(detail=False, methods=['get'])
-    def expiring_soon(self, request):
-        """Mengambil vaksin yang akan kedaluwarsa dalam 30 hari."""
-        queryset = self.queryset.filter(status='tersedia')
-        expiring_vaccines = []
-        for vaccine in queryset:
-            if vaccine.is_expiring_soon:
-                expiring_vaccines.append(vaccine)
-        
-        page = self.paginate_queryset(expiring_vaccines)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-        
-        serializer = self.get_serializer(expiring_vaccines, many=True)
-        return Response(serializer.data)
-    
-    @action(detail=False, methods=['get'])
-    def statistics(self, request):
-        """Statistik stok vaksin."""
-        total_stok = self.queryset.count()
-        by_status = {
-            'tersedia': self.queryset.filter(status='tersedia').count(),
-            'habis': self.queryset.filter(status='habis').count(),
-            'kedaluwarsa': self.queryset.filter(status='kedaluwarsa').count(),
-        }
-        by_jenis = {}
-        for vaccine in self.queryset.values('jenis_vaksin').distinct():
-            jenis = vaccine['jenis_vaksin']
-            by_jenis[jenis] = self.queryset.filter(jenis_vaksin=jenis).count()
-        
-        return Response({
-            'total_stok': total_stok,
-            'by_status': by_status,
-            'by_jenis': by_jenis,
-        })
+
+
+class SyncViewSet(ChangeFeedViewSet):
+    """Change feed untuk sinkronisasi perangkat offline."""
+    tombstone_model = SyncTombstone
+    sync_sources = {
+        'pencatatan': SyncSource(PencatatanImunisasi.objects.all(), PencatatanImunisasiSerializer),
+        'stok': SyncSource(VaksinStock.objects.all(), VaksinStockSerializer),
+    }
@@ -3,6 +3,9 @@ Model untuk kb-service.
 Menangani KB & kesehatan reproduksi.
 """
 from django.db import models
+from common.statistics import VacatedDay, track_vacated_days
+from common.stock import StockMovement, StockLedger, InsufficientStock
+from common.sync import Tombstone, track_deletions
 from decimal import Decimal
 
 
@@ -325,11 +328,12 @@ class StokKB(models.Model):
     class Meta:
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['jenis_alat']),
+            models.Index(fields=['jenis_alat', 'status', 'tanggal_kedaluwarsa']),
             models.Index(fields=['metode_kb']),
             models.Index(fields=['batch_number']),
             models.Index(fields=['tanggal_kedaluwarsa']),
             models.Index(fields=['status']),
+            models.Index(fields=['updated_at', 'id']),
         ]
     
     def __str__(self):
@@ -348,14 +352,35 @@ class StokKB(models.Model):
         return self.tanggal_kedaluwarsa <= date.today() + timedelta(days=30)
     
     def use_kb_item(self, jumlah=1):
-        """Mengurangi jumlah stok alat KB."""
-        if self.jumlah_stok >= jumlah:
-            self.jumlah_stok -= jumlah
-            if self.jumlah_stok == 0:
-                self.status = 'habis'
-            self.save()
-            return True
-        return False
+        """Mengurangi stok alat KB secara atomik melalui ledger stok."""
+        try:
+            self.jumlah_stok = kb_ledger.decrement(self.pk, jumlah)
+        except InsufficientStock:
+            return False
+        if self.jumlah_stok == 0:
+            self.status = 'habis'
+        return True
+
+
+class MutasiStokKB(StockMovement):
+    """Model untuk mutasi stok alat KB."""
+    
+    stok = models.ForeignKey(StokKB, on_delete=models.PROTECT, related_name='mutasi')
+    
+    class Meta(StockMovement.Meta):
+        indexes = [
+            models.Index(fields=['stok', 'created_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.get_jenis_mutasi_display()} {self.jumlah} - {self.stok}"
+
+
+kb_ledger = StockLedger(
+    MutasiStokKB, quantity_field='jumlah_stok', status_field='status',
+    jenis_field='jenis_alat', expiry_field='tanggal_kedaluwarsa', lot_field='batch_number',
+    price_field='harga_per_unit'
+)
 
 
 class RujukanKB(models.Model):
@@ -444,3 +469,17 @@ class RujukanKB(models.Model):
     
     def __str__(self):
         return f"Rujukan KB - {self.wus_id} - {self.tanggal_rujukan}"
+
+
+class SyncTombstone(Tombstone):
+    """Penanda record yang dihapus untuk change feed `/api/sync/`."""
+
+
+track_deletions(SyncTombstone, StokKB)
+
+
+class FeedVacatedDay(VacatedDay):
+    """Hari yang ditinggalkan record feed harian, untuk rollup `daily_feed`."""
+
+
+track_vacated_days(FeedVacatedDay, PencatatanKB, 'tanggal_mulai')
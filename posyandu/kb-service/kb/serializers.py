@@ -2,7 +2,8 @@
 Serializers untuk kb-service.
 """
 from rest_framework import serializers
-from .models import MetodeKB, PencatatanKB, KonselingKB, StokKB, RujukanKB
+from common.stock import StockLotSerializerMixin
+from .models import MetodeKB, PencatatanKB, KonselingKB, StokKB, RujukanKB, kb_ledger
 
 
 class MetodeKBSerializer(serializers.ModelSerializer):
@@ -44,8 +45,9 @@ class KonselingKBSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at']
 
 
-class StokKBSerializer(serializers.ModelSerializer):
+class StokKBSerializer(StockLotSerializerMixin, serializers.ModelSerializer):
     """Serializer untuk model StokKB."""
+    stock_ledger = kb_ledger
     
     class Meta:
         model = StokKB
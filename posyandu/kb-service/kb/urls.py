@@ -5,7 +5,7 @@ from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import (
     MetodeKBViewSet, PencatatanKBViewSet, KonselingKBViewSet,
-    StokKBViewSet, RujukanKBViewSet
+    StokKBViewSet, RujukanKBViewSet, SyncViewSet
 )
 
 router = DefaultRouter()
@@ -14,6 +14,7 @@ router.register(r'pencatatan', PencatatanKBViewSet)
 router.register(r'konseling', KonselingKBViewSet)
 router.register(r'stok', StokKBViewSet)
 router.register(r'rujukan', RujukanKBViewSet)
+router.register(r'sync', SyncViewSet, basename='sync')
 
 urlpatterns = [
     path('', include(router.urls)),
@@ -6,15 +6,22 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q
-from .models import MetodeKB, PencatatanKB, KonselingKB, StokKB, RujukanKB
+from django.db.models import Q, Count
+from common.batch import BatchLookupMixin
+from common.related import RelatedLoadsMixin
+from common.conditional import ConditionalGetMixin
+from common.cache import CachedResponseMixin
+from common.statistics import StatisticsMixin, DailyFeedMixin, Stat, Total, count_by
+from common.stock import StockLedgerMixin, StockExpiryMixin
+from common.sync import ChangeFeedViewSet, SyncSource
+from .models import MetodeKB, PencatatanKB, KonselingKB, StokKB, RujukanKB, kb_ledger, SyncTombstone, FeedVacatedDay
 from .serializers import (
     MetodeKBSerializer, PencatatanKBSerializer, KonselingKBSerializer,
     StokKBSerializer, RujukanKBSerializer, KBSearchSerializer
 )
 
 
-class MetodeKBViewSet(viewsets.ModelViewSet):
+class MetodeKBViewSet(ConditionalGetMixin, CachedResponseMixin, BatchLookupMixin, RelatedLoadsMixin, viewsets.ModelViewSet):
     """ViewSet untuk model MetodeKB."""
     queryset = MetodeKB.objects.all()
     serializer_class = MetodeKBSerializer
@@ -23,6 +30,8 @@ class MetodeKBViewSet(viewsets.ModelViewSet):
     search_fields = ['jenis_metode', 'deskripsi']
     ordering_fields = ['jenis_metode', 'efektivitas_percent']
     ordering = ['jenis_metode']
+    cache_alias = 'reference'
+    cache_actions = ('list', 'retrieve', 'aktif')
     
     @action(detail=False, methods=['get'])
     def aktif(self, request):
@@ -37,7 +46,7 @@ class MetodeKBViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class PencatatanKBViewSet(viewsets.ModelViewSet):
+class PencatatanKBViewSet(ConditionalGetMixin, StatisticsMixin, DailyFeedMixin, BatchLookupMixin, RelatedLoadsMixin, viewsets.ModelViewSet):
     """ViewSet untuk model PencatatanKB."""
     queryset = PencatatanKB.objects.all()
     serializer_class = PencatatanKBSerializer
@@ -46,6 +55,18 @@ class PencatatanKBViewSet(viewsets.ModelViewSet):
     search_fields = ['wus_id', 'posyandu_id', 'petugas_kb']
     ordering_fields = ['tanggal_mulai', 'created_at']
     ordering = ['-tanggal_mulai']
+    statistics_spec = {
+        'total_pencatatan': Total(),
+        'by_status': count_by('status', ['aktif', 'tidak_aktif', 'ganti_metode', 'hamil', 'menolak']),
+        'by_metode': count_by('metode_kb', MetodeKB.JENIS_METODE_CHOICES),
+    }
+    daily_feed_date_field = 'tanggal_mulai'
+    daily_feed_vacated_model = FeedVacatedDay
+    daily_feed_spec = {
+        'total_wus': Stat(Count('wus_id', distinct=True), default=0),
+        'wus_aktif_kb': Stat(Count('wus_id', distinct=True, filter=Q(status='aktif')), default=0),
+        'wus_tidak_aktif_kb': Stat(Count('wus_id', distinct=True, filter=~Q(status='aktif')), default=0),
+    }
     
     @action(detail=False, methods=['get'])
     def by_wus(self, request):
@@ -84,30 +105,9 @@ class PencatatanKBViewSet(viewsets.ModelViewSet):
         
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
-    
-    @action(detail=False, methods=['get'])
-    def statistics(self, request):
-        """Statistik pencatatan KB."""
-        total_pencatatan = self.queryset.count()
-        by_status = {
-            'aktif': self.queryset.filter(status='aktif').count(),
-            'tidak_aktif': self.queryset.filter(status='tidak_aktif').count(),
-            'ganti_metode': self.queryset.filter(status='ganti_metode').count(),
-            'hamil': self.queryset.filter(status='hamil').count(),
-            'menolak': self.queryset.filter(status='menolak').count(),
-        }
-        by_metode = {}
-        for choice in PencatatanKB.JENIS_METODE_CHOICES:
-            by_metode[choice[0]] = self.queryset.filter(metode_kb=choice[0]).count()
-        
-        return Response({
-            'total_pencatatan': total_pencatatan,
-            'by_status': by_status,
-            'by_metode': by_metode,
-        })
 
 
-class KonselingKBViewSet(viewsets.ModelViewSet):
+class KonselingKBViewSet(ConditionalGetMixin, StatisticsMixin, BatchLookupMixin, RelatedLoadsMixin, viewsets.ModelViewSet):
     """ViewSet untuk model KonselingKB."""
     queryset = KonselingKB.objects.all()
     serializer_class = KonselingKBSerializer
@@ -116,6 +116,11 @@ class KonselingKBViewSet(viewsets.ModelViewSet):
     search_fields = ['wus_id', 'posyandu_id', 'topik_konseling', 'petugas_konseling']
     ordering_fields = ['tanggal_konseling', 'created_at']
     ordering = ['-tanggal_konseling']
+    statistics_spec = {
+        'total_konseling': Total(),
+        'by_jenis': count_by('jenis_konseling', ['awal', 'kontrol', 'ganti_metode', 'efek_samping', 'hamil']),
+        'by_status': count_by('status', ['selesai', 'tindak_lanjut', 'rujukan']),
+    }
     
     @action(detail=False, methods=['get'])
     def by_wus(self, request):
@@ -154,40 +159,23 @@ class KonselingKBViewSet(viewsets.ModelViewSet):
         
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
-    
-    @action(detail=False, methods=['get'])
-    def statistics(self, request):
-        """Statistik konseling KB."""
-        total_konseling = self.queryset.count()
-        by_jenis = {
-            'awal': self.queryset.filter(jenis_konseling='awal').count(),
-            'kontrol': self.queryset.filter(jenis_konseling='kontrol').count(),
-            'ganti_metode': self.queryset.filter(jenis_konseling='ganti_metode').count(),
-            'efek_samping': self.queryset.filter(jenis_konseling='efek_samping').count(),
-            'hamil': self.queryset.filter(jenis_konseling='hamil').count(),
-        }
-        by_status = {
-            'selesai': self.queryset.filter(status='selesai').count(),
-            'tindak_lanjut': self.queryset.filter(status='tindak_lanjut').count(),
-            'rujukan': self.queryset.filter(status='rujukan').count(),
-        }
-        
-        return Response({
-            'total_konseling': total_konseling,
-            'by_jenis': by_jenis,
-            'by_status': by_status,
-        })
 
 
-class StokKBViewSet(viewsets.ModelViewSet):
+class StokKBViewSet(ConditionalGetMixin, StatisticsMixin, StockLedgerMixin, StockExpiryMixin, BatchLookupMixin, RelatedLoadsMixin, viewsets.ModelViewSet):
     """ViewSet untuk model StokKB."""
     queryset = StokKB.objects.all()
     serializer_class = StokKBSerializer
+    stock_ledger = kb_ledger
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['jenis_alat', 'metode_kb', 'status', 'supplier']
     search_fields = ['jenis_alat', 'batch_number', 'supplier']
     ordering_fields = ['jenis_alat', 'tanggal_kedaluwarsa', 'created_at']
     ordering = ['jenis_alat', 'tanggal_kedaluwarsa']
+    statistics_spec = {
+        'total_stok': Total(),
+        'by_status': count_by('status', ['tersedia', 'habis', 'kedaluwarsa']),
+        'by_metode': count_by('metode_kb', MetodeKB.JENIS_METODE_CHOICES),
+    }
     
     @action(detail=False, methods=['get'])
     def by_metode(self, request):
@@ -207,45 +195,9 @@ class StokKBViewSet(viewsets.ModelViewSet):
         
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
-    
-    @action(detail=False, methods=['get'])
-    def expiring_soon(self, request):
-        """Mengambil stok yang akan kedaluwarsa dalam 30 hari."""
-        queryset = self.queryset.filter(status='tersedia')
-        expiring_items = []
-        for item in queryset:
-            if item.is_expiring_soon:
-                expiring_items.append(item)
-        
-        page = self.paginate_queryset(expiring_items)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-        
-        serializer = self.get_serializer(expiring_items, many=True)
-        return Response(serializer.data)
-    
-    @action(detail=False, methods=['get'])
-    def statistics(self, request):
-        """Statistik stok KB."""
-        total_stok = self.queryset.count()
-        by_status = {
-            'tersedia': self.queryset.filter(status='tersedia').count(),
-            'habis': self.queryset.filter(status='habis').count(),
-            'kedaluwarsa': self.queryset.filter(status='kedaluwarsa').count(),
-        }
-        by_metode = {}
-        for choice in StokKB.JENIS_METODE_CHOICES:
-            by_metode[choice[0]] = self.queryset.filter(metode_kb=choice[0]).count()
-        
-        return Response({
-            'total_stok': total_stok,
-            'by_status': by_status,
-            'by_metode': by_metode,
-        })
 
 
-class RujukanKBViewSet(viewsets.ModelViewSet):
+class RujukanKBViewSet(ConditionalGetMixin, StatisticsMixin, BatchLookupMixin, RelatedLoadsMixin, viewsets.ModelViewSet):
     """ViewSet untuk model RujukanKB."""
     queryset = RujukanKB.objects.all()
     serializer_class = RujukanKBSerializer
@@ -254,6 +206,10 @@ class RujukanKBViewSet(viewsets.ModelViewSet):
     search_fields = ['wus_id', 'posyandu_id', 'tujuan_rujukan', 'petugas_rujukan']
     ordering_fields = ['tanggal_rujukan', 'created_at']
     ordering = ['-tanggal_rujukan']
+    statistics_spec = {
+        'total_rujukan': Total(),
+        'by_status': count_by('status', ['dikirim', 'diterima', 'selesai', 'ditolak']),
+    }
     
     @action(detail=False, methods=['get'])
     def by_wus(self, request):
@@ -292,19 +248,11 @@ class RujukanKBViewSet(viewsets.ModelViewSet):
         
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
-    
-    @action(detail=False, methods=['get'])
-    def statistics(self, request):
-        """Statistik rujukan KB."""
-        total_rujukan = self.queryset.count()
-        by_status = {
-            'dikirim': self.queryset.filter(status='dikirim').count(),
-            'diterima': self.queryset.filter(status='diterima').count(),
-            'selesai': self.queryset.filter(status='selesai').count(),
-            'ditolak': self.queryset.filter(status='ditolak').count(),
-        }
-        
-        return Response({
-            'total_rujukan': total_rujukan,
-            'by_status': by_status,
-        })
+
+
+class SyncViewSet(ChangeFeedViewSet):
+    """Change feed untuk sinkronisasi perangkat offline."""
+    tombstone_model = SyncTombstone
+    sync_sources = {
+        'stok': SyncSource(StokKB.objects.all(), StokKBSerializer),
+    }
@@ -5,11 +5,22 @@ Service ini menangani laporan dan statistik.
 """
 from pathlib import Path
 import os
+import sys
 from decouple import config
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Paket bersama (common/) disalin ke /app/common saat build Docker; saat
+# dijalankan langsung dari monorepo, paket berada di root folder posyandu/.
+COMMON_DIR = BASE_DIR.parent
+if not (BASE_DIR / 'common').exists() and str(COMMON_DIR) not in sys.path:
+    sys.path.append(str(COMMON_DIR))
+
+from common.cache import cache_settings  # noqa: E402
+from common.database import database_settings  # noqa: E402
+from common.performance import logging_settings  # noqa: E402
+
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_KEY = config('SECRET_KEY', default='django-insecure-laporan-service-key')
 
@@ -30,9 +41,12 @@ INSTALLED_APPS = [
     'corsheaders',
     'django_filters',
     'laporan',
+    'common',
 ]
 
 MIDDLEWARE = [
+    'common.performance.PerformanceMiddleware',
+    'common.metrics.MetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -63,17 +77,16 @@ TEMPLATES = [
 WSGI_APPLICATION = 'config.wsgi.application'
 
 # Database
+# Mode koneksi dan ukuran pool diatur lewat env DB_* (lihat common/database.py)
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.postgresql',
-        'NAME': config('DB_NAME', default='posyandu_laporan'),
-        'USER': config('DB_USER', default='postgres'),
-        'PASSWORD': config('DB_PASSWORD', default='password'),
-        'HOST': config('DB_HOST', default='shared-database'),
-        'PORT': config('DB_PORT', default='5432'),
-    }
+    'default': database_settings('posyandu_laporan'),
 }
 
+# Cache (backend diatur lewat env CACHE_*, lihat common/cache.py)
+CACHES = cache_settings('posyandu_laporan')
+
+LOGGING = logging_settings()
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -116,6 +129,31 @@ SERVICE_NAME = 'laporan-service'
 SERVICE_PORT = 8009
 AUTH_SERVICE_URL = config('AUTH_SERVICE_URL', default='http://auth-service:8001')
 POSYANDU_SERVICE_URL = config('POSYANDU_SERVICE_URL', default='http://posyandu-service:8002')
+BALITA_SERVICE_URL = config('BALITA_SERVICE_URL', default='http://balita-service:8003')
+IMUNISASI_SERVICE_URL = config('IMUNISASI_SERVICE_URL', default='http://imunisasi-service:8005')
+KB_SERVICE_URL = config('KB_SERVICE_URL', default='http://kb-service:8006')
+VITAMIN_SERVICE_URL = config('VITAMIN_SERVICE_URL', default='http://vitamin-service:8007')
+RUJUKAN_SERVICE_URL = config('RUJUKAN_SERVICE_URL', default='http://rujukan-service:8008')
+
+# Rollup StatistikPosyandu dari feed harian service lain
+ROLLUP_REQUEST_TIMEOUT = config('ROLLUP_REQUEST_TIMEOUT', default=30, cast=int)
+ROLLUP_BACKFILL_CHUNK_DAYS = config('ROLLUP_BACKFILL_CHUNK_DAYS', default=31, cast=int)
+
+# Laporan gabungan stok kedaluwarsa
+STOK_REQUEST_TIMEOUT = config('STOK_REQUEST_TIMEOUT', default=10, cast=int)
+
+# Snapshot dashboard (command build_dashboard) dan cache in-process action latest
+DASHBOARD_WINDOW_DAYS = config('DASHBOARD_WINDOW_DAYS', default=30, cast=int)
+DASHBOARD_SNAPSHOT_TTL = config('DASHBOARD_SNAPSHOT_TTL', default=3600, cast=int)
+DASHBOARD_STOK_WEEKS = config('DASHBOARD_STOK_WEEKS', default=4, cast=int)
+DASHBOARD_CACHE_TTL = config('DASHBOARD_CACHE_TTL', default=60, cast=int)
+
+# Worker export laporan (command run_export_worker)
+EXPORT_WORKERS = config('EXPORT_WORKERS', default=2, cast=int)
+EXPORT_POLL_INTERVAL = config('EXPORT_POLL_INTERVAL', default=2.0, cast=float)
+EXPORT_CHUNK_SIZE = config('EXPORT_CHUNK_SIZE', default=2000, cast=int)
+EXPORT_STALE_SECONDS = config('EXPORT_STALE_SECONDS', default=600, cast=int)
+EXPORT_MAX_ATTEMPTS = config('EXPORT_MAX_ATTEMPTS', default=3, cast=int)
 
 # REST Framework Configuration
 REST_FRAMEWORK = {
@@ -0,0 +1,261 @@
+"""
+Snapshot dashboard (paket KPI) laporan-service yang dibangun inkremental.
+
+`build_dashboard()` dijalankan berkala lewat command `build_dashboard`
+(mis. cron setelah `rollup_statistik`) dan menulis `DashboardData` untuk
+tanggal hari ini pada tiga tingkat:
+
+- `posyandu`: jumlah kolom StatistikPosyandu selama `DASHBOARD_WINDOW_DAYS`
+  hari terakhir. Hanya posyandu yang barisnya berubah sejak snapshot
+  terakhir (`updated_at` > `sumber_diperbarui`), belum punya snapshot hari
+  ini, atau snapshotnya sudah kedaluwarsa yang dihitung ulang, dalam satu
+  query GROUP BY atas tabel rollup (bukan tabel sumber).
+- `kecamatan`: penjumlahan snapshot posyandu anggotanya. Pemetaan posyandu
+  ke kecamatan diambil dari posyandu-service.
+- `semua`: penjumlahan seluruh snapshot posyandu ditambah peringatan stok
+  kedaluwarsa dari `stok.expiry_horizon_report`. Stok dicatat per service,
+  bukan per wilayah, sehingga hanya ada di tingkat ini; stok diambil ulang
+  saat snapshot `semua` kedaluwarsa.
+
+Setiap snapshot yang ditulis ulang menaikkan `versi` dan memperpanjang
+`kedaluwarsa_pada` sebesar `DASHBOARD_SNAPSHOT_TTL`. Action `latest` hanya
+membaca snapshot ini.
+"""
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+
+import requests
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max, Sum
+from django.utils import timezone
+
+from common.snapshot import snapshot_expiry
+
+from .models import DashboardData, StatistikPosyandu
+from .stok import expiry_horizon_report
+
+
+# Kolom StatistikPosyandu yang dijumlahkan ke dalam snapshot
+JUMLAH_FIELDS = [
+    'total_balita', 'balita_gizi_normal', 'balita_gizi_kurang',
+    'balita_gizi_lebih', 'balita_gizi_buruk',
+    'total_ibu_hamil', 'ibu_hamil_normal', 'ibu_hamil_risiko_tinggi',
+    'total_imunisasi', 'imunisasi_lengkap', 'imunisasi_tidak_lengkap',
+    'total_wus', 'wus_aktif_kb', 'wus_tidak_aktif_kb',
+    'total_vitamin', 'total_pmt',
+    'total_rujukan', 'rujukan_selesai', 'rujukan_pending',
+]
+
+SNAPSHOT_UPDATE_FIELDS = [
+    'posyandu_id', 'data_dashboard', 'versi', 'sumber_diperbarui',
+    'kedaluwarsa_pada', 'updated_at',
+]
+
+
+def _persen(bagian, total):
+    return round(bagian * 100 / total, 1) if total else None
+
+
+def kpi_bundle(jumlah, dari, sampai):
+    """Paket KPI dashboard dari jumlah kolom StatistikPosyandu."""
+    return {
+        'periode': {'dari': dari.isoformat(), 'sampai': sampai.isoformat()},
+        'cakupan': {
+            'dosis_imunisasi_diberikan_persen': _persen(jumlah['imunisasi_lengkap'], jumlah['total_imunisasi']),
+            'wus_aktif_kb_persen': _persen(jumlah['wus_aktif_kb'], jumlah['total_wus']),
+            'balita_gizi_normal_persen': _persen(jumlah['balita_gizi_normal'], jumlah['total_balita']),
+        },
+        'distribusi_risiko': {
+            'gizi_balita': {
+                'normal': jumlah['balita_gizi_normal'],
+                'kurang': jumlah['balita_gizi_kurang'],
+                'lebih': jumlah['balita_gizi_lebih'],
+                'buruk': jumlah['balita_gizi_buruk'],
+            },
+            'ibu_hamil': {
+                'normal': jumlah['ibu_hamil_normal'],
+                'risiko_tinggi': jumlah['ibu_hamil_risiko_tinggi'],
+            },
+        },
+        'rujukan': {
+            'total': jumlah['total_rujukan'],
+            'selesai': jumlah['rujukan_selesai'],
+            'pending': jumlah['rujukan_pending'],
+        },
+        'jumlah': jumlah,
+    }
+
+
+def _sum_jumlah(bundles):
+    bundles = list(bundles)
+    return {
+        field: sum(bundle['jumlah'][field] for bundle in bundles)
+        for field in JUMLAH_FIELDS
+    }
+
+
+def fetch_kecamatan():
+    """Pemetaan `posyandu_id -> kecamatan` dari posyandu-service."""
+    url = settings.POSYANDU_SERVICE_URL.rstrip('/') + '/api/posyandu/'
+    mapping = {}
+    while url:
+        response = requests.get(url, timeout=settings.ROLLUP_REQUEST_TIMEOUT)
+        response.raise_for_status()
+        payload = response.json()
+        if isinstance(payload, dict):
+            rows, url = payload['results'], payload.get('next')
+        else:
+            rows, url = payload, None
+        for row in rows:
+            if row.get('kecamatan'):
+                mapping[row['id']] = row['kecamatan']
+    return mapping
+
+
+def peringatan_stok(weeks):
+    """Ringkasan lot yang sudah dan akan kedaluwarsa dalam `weeks` minggu."""
+    report = expiry_horizon_report(weeks)
+    result = {
+        'horizon_minggu': weeks,
+        'lot_kedaluwarsa': 0,
+        'nilai_kedaluwarsa': Decimal('0'),
+        'lot_akan_kedaluwarsa': 0,
+        'nilai_akan_kedaluwarsa': Decimal('0'),
+        'per_sumber': {},
+        'errors': report['errors'],
+    }
+    for bucket in report['buckets']:
+        kunci = 'kedaluwarsa' if bucket['minggu_ke'] == 0 else 'akan_kedaluwarsa'
+        result[f'lot_{kunci}'] += bucket['jumlah_lot']
+        result[f'nilai_{kunci}'] += bucket['nilai']
+        for sumber, item in bucket['per_sumber'].items():
+            per_sumber = result['per_sumber'].setdefault(
+                sumber, {'lot_kedaluwarsa': 0, 'lot_akan_kedaluwarsa': 0}
+            )
+            per_sumber[f'lot_{kunci}'] += item['jumlah_lot']
+    result['nilai_kedaluwarsa'] = str(result['nilai_kedaluwarsa'])
+    result['nilai_akan_kedaluwarsa'] = str(result['nilai_akan_kedaluwarsa'])
+    return result
+
+
+def build_dashboard(tanggal=None, force=False):
+    """
+    Membangun ulang snapshot yang berubah atau kedaluwarsa untuk `tanggal`
+    (default hari ini). Dengan `force=True` semua snapshot dibangun ulang.
+
+    Mengembalikan jumlah snapshot yang ditulis per tingkat dan `errors` per
+    sumber eksternal yang gagal; kegagalan satu sumber tidak menggagalkan
+    tingkat lain.
+    """
+    now = timezone.now()
+    sampai = tanggal or timezone.localdate()
+    dari = sampai - timedelta(days=settings.DASHBOARD_WINDOW_DAYS - 1)
+    kedaluwarsa_pada = snapshot_expiry(settings.DASHBOARD_SNAPSHOT_TTL, now)
+
+    snapshots = {
+        (snapshot.tingkat, snapshot.kode_wilayah): snapshot
+        for snapshot in DashboardData.objects.filter(tanggal_data=sampai)
+    }
+
+    def perlu_dibangun(snapshot, diperbarui=None):
+        if force or snapshot is None:
+            return True
+        if snapshot.kedaluwarsa_pada is None or snapshot.kedaluwarsa_pada <= now:
+            return True
+        return diperbarui is not None and (
+            snapshot.sumber_diperbarui is None or diperbarui > snapshot.sumber_diperbarui
+        )
+
+    def new_snapshot(tingkat, kode, data, diperbarui, posyandu_id=None):
+        previous = snapshots.get((tingkat, kode))
+        return DashboardData(
+            tingkat=tingkat,
+            kode_wilayah=kode,
+            posyandu_id=posyandu_id,
+            tanggal_data=sampai,
+            data_dashboard=data,
+            versi=previous.versi + 1 if previous else 1,
+            sumber_diperbarui=diperbarui,
+            kedaluwarsa_pada=kedaluwarsa_pada,
+        )
+
+    window = StatistikPosyandu.objects.filter(tanggal_statistik__range=(dari, sampai)).order_by()
+    # Satu baris per posyandu; tabel rollup jauh lebih kecil dari tabel sumber
+    terakhir = dict(window.values_list('posyandu_id').annotate(Max('updated_at')))
+
+    changed = [
+        posyandu_id for posyandu_id, diperbarui in terakhir.items()
+        if perlu_dibangun(snapshots.get(('posyandu', str(posyandu_id))), diperbarui)
+    ]
+    bundles = {
+        posyandu_id: snapshots[('posyandu', str(posyandu_id))].data_dashboard
+        for posyandu_id in terakhir
+        if posyandu_id not in changed
+    }
+    objects = []
+    if changed:
+        rows = (
+            window.filter(posyandu_id__in=changed)
+            .values('posyandu_id')
+            .annotate(**{field: Sum(field) for field in JUMLAH_FIELDS})
+        )
+        for row in rows:
+            posyandu_id = row.pop('posyandu_id')
+            bundles[posyandu_id] = kpi_bundle(row, dari, sampai)
+            objects.append(new_snapshot(
+                'posyandu', str(posyandu_id), bundles[posyandu_id],
+                terakhir[posyandu_id], posyandu_id=posyandu_id,
+            ))
+    changed = set(changed)
+    written = {'posyandu': len(objects), 'kecamatan': 0, 'semua': 0}
+    errors = {}
+
+    try:
+        kecamatan_map = fetch_kecamatan()
+    except (requests.RequestException, KeyError, ValueError) as exc:
+        kecamatan_map = None
+        errors['posyandu'] = str(exc)
+
+    if kecamatan_map is not None:
+        anggota = defaultdict(list)
+        for posyandu_id in bundles:
+            if posyandu_id in kecamatan_map:
+                anggota[kecamatan_map[posyandu_id]].append(posyandu_id)
+        for kecamatan, posyandu_ids in sorted(anggota.items()):
+            posyandu_ids.sort()
+            snapshot = snapshots.get(('kecamatan', kecamatan))
+            if not (
+                perlu_dibangun(snapshot)
+                or changed.intersection(posyandu_ids)
+                or snapshot.data_dashboard.get('posyandu_ids') != posyandu_ids
+            ):
+                continue
+            data = kpi_bundle(_sum_jumlah([bundles[pid] for pid in posyandu_ids]), dari, sampai)
+            data['posyandu_ids'] = posyandu_ids
+            objects.append(new_snapshot(
+                'kecamatan', kecamatan, data, max(terakhir[pid] for pid in posyandu_ids)
+            ))
+            written['kecamatan'] += 1
+
+    snapshot = snapshots.get(('semua', ''))
+    if changed or perlu_dibangun(snapshot):
+        data = kpi_bundle(_sum_jumlah(bundles.values()), dari, sampai)
+        data['jumlah_posyandu'] = len(bundles)
+        if perlu_dibangun(snapshot) or 'peringatan_stok' not in snapshot.data_dashboard:
+            data['peringatan_stok'] = peringatan_stok(settings.DASHBOARD_STOK_WEEKS)
+        else:
+            data['peringatan_stok'] = snapshot.data_dashboard['peringatan_stok']
+        objects.append(new_snapshot('semua', '', data, max(terakhir.values(), default=None)))
+        written['semua'] = 1
+
+    if objects:
+        with transaction.atomic():
+            DashboardData.objects.bulk_create(
+                objects,
+                update_conflicts=True,
+                unique_fields=['tingkat', 'kode_wilayah', 'tanggal_data'],
+                update_fields=SNAPSHOT_UPDATE_FIELDS,
+            )
+    return {**written, 'errors': errors}
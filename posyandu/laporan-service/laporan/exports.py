@@ -0,0 +1,302 @@
+"""
+Pipeline export laporan asinkron (PDF, Excel, CSV, JSON).
+
+`ExportLog` sekaligus menjadi antrean job di database, tanpa broker
+eksternal:
+
+1. Klien membuat job lewat `POST /api/export-log/` (`laporan`,
+   `format_export`, `created_by`); statusnya `queued`.
+2. Command `run_export_worker` mengklaim job dengan `SELECT ... FOR UPDATE
+   SKIP LOCKED` (beberapa worker boleh berjalan bersamaan) lalu merendernya
+   di process pool.
+3. Renderer membaca baris StatistikPosyandu dengan `iterator(chunk_size=...)`
+   (server-side cursor di PostgreSQL) dan menulis langsung ke file
+   sementara; Excel memakai mode write-only openpyxl, PDF digambar per
+   halaman. Memori worker tetap konstan berapa pun jumlah barisnya. Progres
+   dan heartbeat ditulis ke `ExportLog` setiap `EXPORT_CHUNK_SIZE` baris.
+4. Klien memantau `GET /api/export-log/<id>/` lalu mengunduh dari
+   `GET /api/export-log/<id>/download/` setelah status `completed`.
+
+Job `processing` yang heartbeat-nya lebih lama dari `EXPORT_STALE_SECONDS`
+(worker mati) dikembalikan ke antrean, atau ditandai `failed` setelah
+`EXPORT_MAX_ATTEMPTS` percobaan.
+"""
+import csv
+import logging
+import os
+import socket
+import tempfile
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import InterfaceError, OperationalError, transaction
+from django.db.models import F
+from django.utils import timezone
+from openpyxl import Workbook
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.pdfgen import canvas
+
+from .models import ExportLog, StatistikPosyandu
+
+
+logger = logging.getLogger(__name__)
+
+BASE_COLUMNS = ['posyandu_id', 'tanggal_statistik']
+
+# Kategori template laporan -> kolom StatistikPosyandu yang diekspor
+KATEGORI_COLUMNS = {
+    'balita': ['total_balita', 'balita_gizi_normal', 'balita_gizi_kurang',
+               'balita_gizi_lebih', 'balita_gizi_buruk'],
+    'ibu_hamil': ['total_ibu_hamil', 'ibu_hamil_normal', 'ibu_hamil_risiko_tinggi'],
+    'imunisasi': ['total_imunisasi', 'imunisasi_lengkap', 'imunisasi_tidak_lengkap'],
+    'kb': ['total_wus', 'wus_aktif_kb', 'wus_tidak_aktif_kb'],
+    'vitamin': ['total_vitamin', 'total_pmt'],
+    'rujukan': ['total_rujukan', 'rujukan_selesai', 'rujukan_pending'],
+}
+
+
+def export_columns(laporan):
+    """Kolom export sesuai kategori template; kategori `umum` memuat semuanya."""
+    columns = KATEGORI_COLUMNS.get(laporan.template.kategori_laporan)
+    if columns is None:
+        columns = [column for group in KATEGORI_COLUMNS.values() for column in group]
+    return BASE_COLUMNS + columns
+
+
+def export_queryset(laporan):
+    """
+    Baris StatistikPosyandu selama periode laporan, untuk posyandu laporan
+    atau `parameter_used['posyandu_ids']` bila diisi (laporan lintas posyandu).
+    """
+    queryset = StatistikPosyandu.objects.filter(
+        tanggal_statistik__range=(laporan.tanggal_mulai, laporan.tanggal_akhir)
+    )
+    parameter = laporan.parameter_used if isinstance(laporan.parameter_used, dict) else {}
+    if parameter.get('posyandu_ids'):
+        queryset = queryset.filter(posyandu_id__in=parameter['posyandu_ids'])
+    else:
+        queryset = queryset.filter(posyandu_id=laporan.posyandu_id)
+    return queryset.order_by('tanggal_statistik', 'posyandu_id')
+
+
+def render_csv(path, laporan, columns, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as handle:
+        writer = csv.writer(handle)
+        writer.writerow(columns)
+        writer.writerows(rows)
+
+
+def render_json(path, laporan, columns, rows):
+    """Objek JSON dengan metadata laporan dan `rows`, ditulis baris demi baris."""
+    encoder = DjangoJSONEncoder()
+    with open(path, 'w', encoding='utf-8') as handle:
+        meta = {
+            'id': laporan.pk,
+            'nama_laporan': laporan.nama_laporan,
+            'tanggal_mulai': laporan.tanggal_mulai,
+            'tanggal_akhir': laporan.tanggal_akhir,
+            'data_laporan': laporan.data_laporan,
+        }
+        handle.write('{"laporan": %s, "rows": [' % encoder.encode(meta))
+        separator = '\n'
+        for row in rows:
+            handle.write(separator + encoder.encode(dict(zip(columns, row))))
+            separator = ',\n'
+        handle.write('\n]}\n')
+
+
+def render_excel(path, laporan, columns, rows):
+    """Workbook write-only: baris langsung di-flush ke file sementara openpyxl."""
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Data')
+    sheet.append(columns)
+    for row in rows:
+        sheet.append(row)
+
+    ringkasan = workbook.create_sheet('Ringkasan')
+    ringkasan.append(['nama_laporan', laporan.nama_laporan])
+    ringkasan.append(['tanggal_mulai', laporan.tanggal_mulai])
+    ringkasan.append(['tanggal_akhir', laporan.tanggal_akhir])
+    if isinstance(laporan.data_laporan, dict):
+        for key, value in laporan.data_laporan.items():
+            if not isinstance(value, (dict, list)):
+                ringkasan.append([key, value])
+    workbook.save(path)
+
+
+def render_pdf(path, laporan, columns, rows):
+    """Tabel sederhana yang digambar per halaman dengan canvas reportlab."""
+    width, height = landscape(A4)
+    margin, line_height, font_size = 36, 11, 6
+    column_width = (width - 2 * margin) / len(columns)
+    pdf = canvas.Canvas(path, pagesize=(width, height), pageCompression=1)
+
+    def start_page():
+        pdf.setFont('Helvetica-Bold', 10)
+        pdf.drawString(margin, height - margin, laporan.nama_laporan)
+        pdf.setFont('Helvetica', 8)
+        pdf.drawString(
+            margin, height - margin - 12,
+            f'Periode {laporan.tanggal_mulai} s/d {laporan.tanggal_akhir} - halaman {pdf.getPageNumber()}'
+        )
+        # Nama kolom dipecah per kata agar muat di kolom yang sempit
+        pdf.setFont('Helvetica-Bold', font_size)
+        top = height - margin - 30
+        words = [column.split('_') for column in columns]
+        for index, parts in enumerate(words):
+            for line, part in enumerate(parts):
+                pdf.drawString(margin + index * column_width, top - line * (font_size + 1), part)
+        pdf.setFont('Helvetica', font_size)
+        return top - max(len(parts) for parts in words) * (font_size + 1) - 4
+
+    y = start_page()
+    for row in rows:
+        if y < margin:
+            pdf.showPage()
+            y = start_page()
+        for index, value in enumerate(row):
+            pdf.drawString(margin + index * column_width, y, str(value))
+        y -= line_height
+    pdf.save()
+
+
+# Gangguan sementara (koneksi database putus/timeout): job boleh dicoba lagi
+RETRYABLE_ERRORS = (OperationalError, InterfaceError)
+
+# format_export -> (renderer, ekstensi file)
+RENDERERS = {
+    'csv': (render_csv, '.csv'),
+    'json': (render_json, '.json'),
+    'excel': (render_excel, '.xlsx'),
+    'pdf': (render_pdf, '.pdf'),
+}
+
+
+def worker_name():
+    """Identitas worker yang dicatat pada job yang sedang dikerjakan."""
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def requeue_stale(now=None):
+    """
+    Mengembalikan job `processing` yang worker-nya berhenti ke antrean, atau
+    menandainya gagal bila percobaannya sudah habis.
+    """
+    now = now or timezone.now()
+    stale = ExportLog.objects.filter(
+        status='processing',
+        heartbeat_at__lt=now - timedelta(seconds=settings.EXPORT_STALE_SECONDS),
+    )
+    failed = stale.filter(percobaan__gte=settings.EXPORT_MAX_ATTEMPTS).update(
+        status='failed', selesai_pada=now, updated_at=now,
+        error_message='Worker berhenti sebelum export selesai',
+    )
+    requeued = stale.update(status='queued', worker='', updated_at=now)
+    return requeued, failed
+
+
+def release(export_ids, worker):
+    """Mengembalikan job milik `worker` yang belum selesai ke antrean (worker berhenti)."""
+    return ExportLog.objects.filter(
+        pk__in=export_ids, worker=worker, status='processing'
+    ).update(status='queued', worker='', updated_at=timezone.now())
+
+
+def claim_next(worker):
+    """Mengklaim job `queued` tertua untuk `worker`; None bila antrean kosong."""
+    with transaction.atomic():
+        export = (
+            ExportLog.objects.select_for_update(skip_locked=True)
+            .filter(status='queued')
+            .order_by('created_at', 'id')
+            .only('id')
+            .first()
+        )
+        if export is None:
+            return None
+        now = timezone.now()
+        ExportLog.objects.filter(pk=export.pk).update(
+            status='processing', worker=worker, percobaan=F('percobaan') + 1,
+            mulai_diproses=now, heartbeat_at=now, selesai_pada=None,
+            baris_diproses=0, progres=0, error_message=None, updated_at=now,
+        )
+    return export.pk
+
+
+def _update(export_id, worker, **fields):
+    """Memperbarui job hanya bila masih dipegang `worker`."""
+    now = timezone.now()
+    return ExportLog.objects.filter(pk=export_id, worker=worker, status='processing').update(
+        heartbeat_at=now, updated_at=now, **fields
+    )
+
+
+def _tracked(rows, export_id, worker, total):
+    """Meneruskan baris sambil mencatat progres setiap `EXPORT_CHUNK_SIZE` baris."""
+    count = 0
+    for row in rows:
+        yield row
+        count += 1
+        if count % settings.EXPORT_CHUNK_SIZE == 0:
+            _update(
+                export_id, worker, baris_diproses=count,
+                progres=min(99, count * 100 // total) if total else 0,
+            )
+
+
+def run_export(export_id, worker):
+    """
+    Merender satu job export. Dijalankan di proses anak `run_export_worker`.
+
+    Mengembalikan `(status, keterangan)`. Error yang akan terulang bila
+    dicoba lagi (format tidak dikenal, job/laporan sudah dihapus, error
+    render) langsung dicatat `failed`. Gangguan database sementara
+    mengembalikan job ke antrean (`queued`) selama percobaan belum
+    mencapai `EXPORT_MAX_ATTEMPTS`.
+    """
+    path = None
+    percobaan = 0
+    try:
+        export = ExportLog.objects.select_related('laporan__template').get(pk=export_id)
+        percobaan = export.percobaan
+        if export.format_export not in RENDERERS:
+            raise ValueError(f'Format export tidak dikenal: {export.format_export}')
+        laporan = export.laporan
+        renderer, extension = RENDERERS[export.format_export]
+        columns = export_columns(laporan)
+        queryset = export_queryset(laporan)
+        total = queryset.count()
+        _update(export_id, worker, total_baris=total)
+
+        handle, path = tempfile.mkstemp(suffix=extension)
+        os.close(handle)
+        rows = queryset.values_list(*columns).iterator(chunk_size=settings.EXPORT_CHUNK_SIZE)
+        renderer(path, laporan, columns, _tracked(rows, export_id, worker, total))
+        with open(path, 'rb') as source:
+            name = export.file_export.storage.save(
+                f'exports/laporan-{laporan.pk}-export-{export.pk}{extension}', File(source)
+            )
+    except RETRYABLE_ERRORS as exc:
+        logger.warning('Export %s terganggu: %s', export_id, exc)
+        if percobaan < settings.EXPORT_MAX_ATTEMPTS:
+            ExportLog.objects.filter(pk=export_id, worker=worker, status='processing').update(
+                status='queued', worker='', error_message=str(exc), updated_at=timezone.now()
+            )
+            return 'queued', str(exc)
+        _update(export_id, worker, status='failed', error_message=str(exc), selesai_pada=timezone.now())
+        return 'failed', str(exc)
+    except Exception as exc:
+        logger.exception('Export %s gagal', export_id)
+        _update(export_id, worker, status='failed', error_message=str(exc), selesai_pada=timezone.now())
+        return 'failed', str(exc)
+    finally:
+        if path is not None:
+            os.unlink(path)
+
+    _update(
+        export_id, worker, status='completed', file_export=name,
+        baris_diproses=total, progres=100, selesai_pada=timezone.now(),
+    )
+    return 'completed', name
@@ -0,0 +1,39 @@
+"""
+Command untuk membangun snapshot DashboardData dari StatistikPosyandu.
+
+Contoh::
+
+    python manage.py build_dashboard                    # hanya yang berubah/kedaluwarsa
+    python manage.py build_dashboard --force
+    python manage.py build_dashboard --tanggal 2024-12-31
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from laporan.dashboard import build_dashboard
+
+
+class Command(BaseCommand):
+    help = 'Bangun snapshot dashboard per posyandu, per kecamatan, dan semua wilayah.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tanggal', help='Tanggal snapshot (YYYY-MM-DD, default: hari ini)')
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Bangun ulang semua snapshot walau belum berubah atau kedaluwarsa'
+        )
+
+    def handle(self, *args, **options):
+        tanggal = None
+        if options['tanggal']:
+            tanggal = parse_date(options['tanggal'])
+            if tanggal is None:
+                raise CommandError('Format tanggal harus YYYY-MM-DD')
+
+        result = build_dashboard(tanggal=tanggal, force=options['force'])
+        for sumber, error in result['errors'].items():
+            self.stderr.write(self.style.ERROR(f'{sumber}: gagal mengambil data ({error})'))
+        self.stdout.write(self.style.SUCCESS(
+            f"Snapshot diperbarui: {result['posyandu']} posyandu, "
+            f"{result['kecamatan']} kecamatan, {result['semua']} semua wilayah"
+        ))
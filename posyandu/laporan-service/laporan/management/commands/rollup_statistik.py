@@ -0,0 +1,59 @@
+"""
+Command untuk mengisi StatistikPosyandu dari feed harian service lain.
+
+Contoh::
+
+    python manage.py rollup_statistik                       # inkremental
+    python manage.py rollup_statistik --dari 2024-01-01 --sampai 2024-12-31
+    python manage.py rollup_statistik --sumber balita kb
+"""
+from datetime import date
+
+import requests
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from laporan.rollup import ROLLUP_SOURCES, backfill, run_incremental
+
+
+class Command(BaseCommand):
+    help = 'Rollup StatistikPosyandu dari feed harian balita, imunisasi, kb, vitamin, dan rujukan.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sumber', nargs='+', choices=list(ROLLUP_SOURCES),
+            help='Sumber yang diproses (default: semua sumber)'
+        )
+        parser.add_argument('--dari', help='Tanggal awal backfill (YYYY-MM-DD)')
+        parser.add_argument('--sampai', help='Tanggal akhir backfill (YYYY-MM-DD, default: hari ini)')
+        parser.add_argument('--posyandu-id', type=int, help='Batasi backfill ke satu posyandu')
+
+    def handle(self, *args, **options):
+        sumber_list = options['sumber'] or list(ROLLUP_SOURCES)
+
+        dari = sampai = None
+        if options['dari']:
+            dari = parse_date(options['dari'])
+            sampai = parse_date(options['sampai']) if options['sampai'] else date.today()
+            if dari is None or sampai is None:
+                raise CommandError('Format tanggal harus YYYY-MM-DD')
+            if dari > sampai:
+                raise CommandError('--dari tidak boleh setelah --sampai')
+        elif options['sampai'] or options['posyandu_id']:
+            raise CommandError('--sampai dan --posyandu-id hanya berlaku bersama --dari')
+
+        failed = []
+        for sumber in sumber_list:
+            try:
+                if dari:
+                    count = backfill(sumber, dari, sampai, posyandu_id=options['posyandu_id'])
+                else:
+                    count = run_incremental(sumber)
+            except requests.RequestException as exc:
+                failed.append(sumber)
+                self.stderr.write(self.style.ERROR(f'{sumber}: gagal mengambil feed ({exc})'))
+                continue
+            self.stdout.write(self.style.SUCCESS(f'{sumber}: {count} baris statistik diperbarui'))
+
+        if failed:
+            raise CommandError(f"Rollup gagal untuk sumber: {', '.join(failed)}")
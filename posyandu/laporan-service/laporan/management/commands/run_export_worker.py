@@ -0,0 +1,92 @@
+"""
+Command worker export laporan: mengambil job ExportLog dari antrean dan
+merendernya di process pool.
+
+Contoh::
+
+    python manage.py run_export_worker                  # berjalan terus
+    python manage.py run_export_worker --workers 4
+    python manage.py run_export_worker --once           # berhenti saat antrean kosong
+"""
+import multiprocessing
+import signal
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from laporan.exports import claim_next, release, requeue_stale, run_export, worker_name
+
+
+class Command(BaseCommand):
+    help = 'Worker export laporan (PDF, Excel, CSV, JSON) dengan antrean di tabel ExportLog.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=settings.EXPORT_WORKERS,
+            help='Jumlah proses render paralel'
+        )
+        parser.add_argument(
+            '--poll-interval', type=float, default=settings.EXPORT_POLL_INTERVAL,
+            help='Detik menunggu sebelum memeriksa antrean lagi'
+        )
+        parser.add_argument('--once', action='store_true', help='Berhenti setelah antrean kosong')
+
+    def handle(self, *args, **options):
+        workers = options['workers']
+        if workers < 1:
+            raise CommandError('--workers minimal 1')
+        poll_interval = options['poll_interval']
+        worker = worker_name()
+        self.stdout.write(f'Worker export {worker} berjalan dengan {workers} proses')
+
+        # spawn: proses anak menjalankan django.setup() sendiri tanpa mewarisi
+        # koneksi/pool database proses induk
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=django.setup,
+        )
+        running = {}
+        # docker stop mengirim SIGTERM: keluar lewat finally agar job dilepas
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+        try:
+            while True:
+                requeue_stale()
+                while len(running) < workers:
+                    export_id = claim_next(worker)
+                    if export_id is None:
+                        break
+                    running[pool.submit(run_export, export_id, worker)] = export_id
+
+                if not running:
+                    if options['once']:
+                        break
+                    time.sleep(poll_interval)
+                    continue
+
+                done, _ = wait(running, timeout=poll_interval, return_when=FIRST_COMPLETED)
+                for future in done:
+                    export_id = running[future]
+                    try:
+                        status, detail = future.result()
+                    except BrokenProcessPool as exc:
+                        raise CommandError(f'Process pool berhenti saat export {export_id}: {exc}')
+                    except Exception as exc:
+                        status, detail = 'failed', str(exc)
+                    del running[future]
+                    if status == 'completed':
+                        self.stdout.write(self.style.SUCCESS(f'Export {export_id}: {detail}'))
+                    elif status == 'queued':
+                        self.stderr.write(self.style.WARNING(f'Export {export_id} dikembalikan ke antrean: {detail}'))
+                    else:
+                        self.stderr.write(self.style.ERROR(f'Export {export_id} gagal: {detail}'))
+        finally:
+            if running:
+                # Job yang belum selesai langsung dikembalikan ke antrean
+                release(list(running.values()), worker)
+            pool.shutdown(wait=not running, cancel_futures=True)
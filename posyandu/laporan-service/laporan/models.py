@@ -164,7 +164,8 @@ class StatistikPosyandu(models.Model):
     ibu_hamil_normal = models.IntegerField(default=0)
     ibu_hamil_risiko_tinggi = models.IntegerField(default=0)
     
-    # Statistik imunisasi
+    # Statistik imunisasi (dari rollup: jumlah dosis diberikan / tidak
+    # diberikan, bukan jumlah anak berimunisasi lengkap)
     total_imunisasi = models.IntegerField(default=0)
     imunisasi_lengkap = models.IntegerField(default=0)
     imunisasi_tidak_lengkap = models.IntegerField(default=0)
@@ -200,10 +201,32 @@ class StatistikPosyandu(models.Model):
 
 
 class DashboardData(models.Model):
-    """Model untuk data dashboard."""
+    """
+    Model untuk snapshot dashboard (paket KPI) per posyandu, per kecamatan,
+    dan seluruh wilayah. Diisi oleh command `build_dashboard`.
+    """
+    
+    TINGKAT_CHOICES = [
+        ('posyandu', 'Posyandu'),
+        ('kecamatan', 'Kecamatan'),
+        ('semua', 'Semua Wilayah'),
+    ]
+    
+    # Cakupan snapshot
+    tingkat = models.CharField(
+        max_length=20,
+        choices=TINGKAT_CHOICES,
+        default='posyandu'
+    )
+    kode_wilayah = models.CharField(
+        max_length=100,
+        blank=True,
+        default='',
+        help_text="ID posyandu atau nama kecamatan; kosong untuk semua wilayah"
+    )
     
     # Data posyandu
-    posyandu_id = models.IntegerField()  # ID posyandu
+    posyandu_id = models.IntegerField(null=True, blank=True)  # ID posyandu
     tanggal_data = models.DateField()
     
     # Data dashboard
@@ -211,6 +234,22 @@ class DashboardData(models.Model):
         help_text="Data dashboard dalam format JSON"
     )
     
+    # Versi snapshot
+    versi = models.PositiveIntegerField(
+        default=1,
+        help_text="Bertambah setiap kali snapshot dibangun ulang"
+    )
+    sumber_diperbarui = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="updated_at StatistikPosyandu terbaru yang tercakup snapshot"
+    )
+    kedaluwarsa_pada = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Setelah waktu ini snapshot dibangun ulang walau tanpa perubahan"
+    )
+    
     # Metadata
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -221,14 +260,35 @@ class DashboardData(models.Model):
             models.Index(fields=['posyandu_id']),
             models.Index(fields=['tanggal_data']),
         ]
-        unique_together = ['posyandu_id', 'tanggal_data']
+        unique_together = ['tingkat', 'kode_wilayah', 'tanggal_data']
+    
+    def save(self, *args, **kwargs):
+        """Mengisi kode_wilayah snapshot posyandu dari posyandu_id."""
+        if self.tingkat == 'posyandu' and not self.kode_wilayah and self.posyandu_id is not None:
+            self.kode_wilayah = str(self.posyandu_id)
+        super().save(*args, **kwargs)
     
     def __str__(self):
-        return f"Dashboard Data Posyandu {self.posyandu_id} - {self.tanggal_data}"
+        if self.tingkat == 'posyandu':
+            return f"Dashboard Data Posyandu {self.posyandu_id} - {self.tanggal_data}"
+        wilayah = f" {self.kode_wilayah}" if self.kode_wilayah else ""
+        return f"Dashboard Data {self.get_tingkat_display()}{wilayah} - {self.tanggal_data}"
 
 
 class ExportLog(models.Model):
-    """Model untuk log export laporan."""
+    """
+    Model untuk log export laporan sekaligus antrean job export.
+
+    Export baru berstatus `queued` dan dikerjakan oleh command
+    `run_export_worker` (lihat `laporan/exports.py`).
+    """
+    
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('processing', 'Processing'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
     
     # Data export
     laporan = models.ForeignKey(
@@ -251,20 +311,40 @@ class ExportLog(models.Model):
     # File export
     file_export = models.FileField(
         upload_to='exports/',
+        blank=True,
         help_text="File hasil export"
     )
     
     # Status export
     status = models.CharField(
         max_length=20,
-        choices=[
-            ('processing', 'Processing'),
-            ('completed', 'Completed'),
-            ('failed', 'Failed'),
-        ],
-        default='processing'
+        choices=STATUS_CHOICES,
+        default='queued'
+    )
+    
+    # Progres export
+    total_baris = models.IntegerField(
+        null=True,
+        blank=True,
+        help_text="Jumlah baris yang akan ditulis"
+    )
+    baris_diproses = models.IntegerField(default=0)
+    progres = models.PositiveSmallIntegerField(
+        default=0,
+        help_text="Persentase baris yang sudah ditulis (0-100)"
     )
     
+    # Pengerjaan oleh worker
+    percobaan = models.PositiveSmallIntegerField(default=0)
+    worker = models.CharField(max_length=100, blank=True, default='')
+    heartbeat_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Terakhir kali worker melaporkan progres"
+    )
+    mulai_diproses = models.DateTimeField(null=True, blank=True)
+    selesai_pada = models.DateTimeField(null=True, blank=True)
+    
     # Error message
     error_message = models.TextField(
         blank=True,
@@ -283,7 +363,33 @@ class ExportLog(models.Model):
             models.Index(fields=['laporan']),
             models.Index(fields=['status']),
             models.Index(fields=['format_export']),
+            models.Index(fields=['status', 'created_at']),
         ]
     
     def __str__(self):
         return f"Export {self.laporan.nama_laporan} - {self.format_export}"
+
+
+class RollupCheckpoint(models.Model):
+    """Model untuk posisi terakhir rollup StatistikPosyandu per sumber feed."""
+    
+    # Nama sumber feed (balita, imunisasi, kb, vitamin, pmt, rujukan)
+    sumber = models.CharField(max_length=20, unique=True)
+    
+    # Nilai generated_at dari feed terakhir yang berhasil diterapkan
+    terakhir_diproses = models.DateTimeField(
+        help_text="Waktu generated_at feed terakhir yang diterapkan"
+    )
+    
+    # Jumlah baris statistik yang diperbarui pada run terakhir
+    jumlah_baris = models.IntegerField(default=0)
+    
+    # Metadata
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['sumber']
+    
+    def __str__(self):
+        return f"Rollup {self.sumber} - {self.terakhir_diproses}"
@@ -0,0 +1,165 @@
+"""
+Rollup inkremental StatistikPosyandu dari feed harian service lain.
+
+Setiap sumber menyediakan action `daily_feed` (lihat `common.statistics.
+DailyFeedMixin`) yang mengembalikan hitungan absolut per `(posyandu_id,
+tanggal)`. Rollup hanya menimpa kolom milik sumber tersebut pada baris
+StatistikPosyandu yang sesuai, sehingga menjalankan ulang feed yang sama
+selalu menghasilkan data yang sama.
+"""
+from datetime import timedelta
+
+import requests
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import StatistikPosyandu, RollupCheckpoint
+
+
+# sumber -> (setting URL service, path feed, kolom StatistikPosyandu)
+ROLLUP_SOURCES = {
+    'balita': (
+        'BALITA_SERVICE_URL', '/api/pemeriksaan/daily_feed/',
+        ['total_balita', 'balita_gizi_normal', 'balita_gizi_kurang',
+         'balita_gizi_lebih', 'balita_gizi_buruk'],
+    ),
+    'imunisasi': (
+        'IMUNISASI_SERVICE_URL', '/api/pencatatan/daily_feed/',
+        ['total_imunisasi', 'imunisasi_lengkap', 'imunisasi_tidak_lengkap'],
+    ),
+    'kb': (
+        'KB_SERVICE_URL', '/api/pencatatan/daily_feed/',
+        ['total_wus', 'wus_aktif_kb', 'wus_tidak_aktif_kb'],
+    ),
+    'vitamin': (
+        'VITAMIN_SERVICE_URL', '/api/pemberian/daily_feed/',
+        ['total_vitamin'],
+    ),
+    'pmt': (
+        'VITAMIN_SERVICE_URL', '/api/pmt/daily_feed/',
+        ['total_pmt'],
+    ),
+    'rujukan': (
+        'RUJUKAN_SERVICE_URL', '/api/rujukan/daily_feed/',
+        ['total_rujukan', 'rujukan_selesai', 'rujukan_pending'],
+    ),
+}
+
+
+# Kolom StatistikPosyandu yang diisi dari key feed bernama lain. Feed
+# imunisasi menghitung dosis per status pencatatan, bukan anak yang
+# imunisasinya sudah lengkap.
+FEED_KEYS = {
+    'imunisasi_lengkap': 'dosis_diberikan',
+    'imunisasi_tidak_lengkap': 'dosis_tidak_diberikan',
+}
+
+
+def fetch_feed(sumber, **params):
+    """Mengambil feed harian dari service sumber."""
+    setting_name, path, _ = ROLLUP_SOURCES[sumber]
+    url = getattr(settings, setting_name).rstrip('/') + path
+    response = requests.get(
+        url,
+        params={key: value for key, value in params.items() if value is not None},
+        timeout=settings.ROLLUP_REQUEST_TIMEOUT,
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+def apply_feed_rows(sumber, rows):
+    """
+    Meng-upsert baris feed ke StatistikPosyandu.
+
+    Hanya kolom milik `sumber` yang ditimpa; kolom dari sumber lain pada
+    baris yang sama tidak tersentuh.
+    """
+    columns = ROLLUP_SOURCES[sumber][2]
+    objects = [
+        StatistikPosyandu(
+            posyandu_id=row['posyandu_id'],
+            tanggal_statistik=parse_date(str(row['tanggal'])),
+            **{column: row.get(FEED_KEYS.get(column, column)) or 0 for column in columns}
+        )
+        for row in rows
+    ]
+    if objects:
+        StatistikPosyandu.objects.bulk_create(
+            objects,
+            update_conflicts=True,
+            unique_fields=['posyandu_id', 'tanggal_statistik'],
+            update_fields=columns + ['updated_at'],
+        )
+    return len(objects)
+
+
+def _reset_missing(sumber, rows, dari, sampai, posyandu_id=None):
+    """Mengosongkan kolom sumber pada hari dalam rentang yang tidak lagi ada di feed."""
+    columns = ROLLUP_SOURCES[sumber][2]
+    seen = {(row['posyandu_id'], parse_date(str(row['tanggal']))) for row in rows}
+    queryset = StatistikPosyandu.objects.filter(tanggal_statistik__range=(dari, sampai))
+    if posyandu_id is not None:
+        queryset = queryset.filter(posyandu_id=posyandu_id)
+    stale_ids = [
+        item['id']
+        for item in queryset.values('id', 'posyandu_id', 'tanggal_statistik')
+        if (item['posyandu_id'], item['tanggal_statistik']) not in seen
+    ]
+    if stale_ids:
+        StatistikPosyandu.objects.filter(id__in=stale_ids).update(
+            updated_at=timezone.now(), **{column: 0 for column in columns}
+        )
+    return len(stale_ids)
+
+
+def backfill(sumber, dari, sampai, posyandu_id=None, chunk_days=None):
+    """
+    Menghitung ulang kolom `sumber` untuk rentang tanggal kegiatan.
+
+    Rentang diproses per potongan `chunk_days` hari, masing-masing dalam
+    satu transaksi. Hari yang sudah tidak memiliki data di sumber dikosongkan
+    agar hasil backfill identik berapa kali pun dijalankan.
+    """
+    chunk_days = chunk_days or settings.ROLLUP_BACKFILL_CHUNK_DAYS
+    total = 0
+    start = dari
+    while start <= sampai:
+        end = min(start + timedelta(days=chunk_days - 1), sampai)
+        feed = fetch_feed(
+            sumber, dari=start.isoformat(), sampai=end.isoformat(), posyandu_id=posyandu_id
+        )
+        with transaction.atomic():
+            total += apply_feed_rows(sumber, feed['rows'])
+            _reset_missing(sumber, feed['rows'], start, end, posyandu_id)
+        start = end + timedelta(days=1)
+    return total
+
+
+def run_incremental(sumber):
+    """
+    Menerapkan perubahan sejak checkpoint terakhir sumber.
+
+    Feed juga memuat hari yang ditinggalkan record sumber (dihapus atau
+    dipindah ke tanggal/posyandu lain) dengan nilai barunya, termasuk 0, agar
+    hari lama tidak tertinggal basi.
+
+    Tanpa checkpoint, seluruh data sumber diproses sekali. Checkpoint disimpan
+    dalam transaksi yang sama dengan upsert sehingga run yang gagal dapat
+    diulang tanpa kehilangan perubahan.
+    """
+    checkpoint = RollupCheckpoint.objects.filter(sumber=sumber).first()
+    changed_since = checkpoint.terakhir_diproses.isoformat() if checkpoint else None
+    feed = fetch_feed(sumber, changed_since=changed_since)
+    with transaction.atomic():
+        count = apply_feed_rows(sumber, feed['rows'])
+        RollupCheckpoint.objects.update_or_create(
+            sumber=sumber,
+            defaults={
+                'terakhir_diproses': parse_datetime(str(feed['generated_at'])),
+                'jumlah_baris': count,
+            },
+        )
+    return count
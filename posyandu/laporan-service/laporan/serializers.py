@@ -55,10 +55,11 @@ class DashboardDataSerializer(serializers.ModelSerializer):
     class Meta:
         model = DashboardData
         fields = [
-            'id', 'posyandu_id', 'tanggal_data', 'data_dashboard',
+            'id', 'tingkat', 'kode_wilayah', 'posyandu_id', 'tanggal_data',
+            'data_dashboard', 'versi', 'sumber_diperbarui', 'kedaluwarsa_pada',
             'created_at', 'updated_at'
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'versi', 'sumber_diperbarui', 'kedaluwarsa_pada', 'created_at', 'updated_at']
 
 
 class ExportLogSerializer(serializers.ModelSerializer):
@@ -68,9 +69,16 @@ class ExportLogSerializer(serializers.ModelSerializer):
         model = ExportLog
         fields = [
             'id', 'laporan', 'format_export', 'file_export', 'status',
+            'total_baris', 'baris_diproses', 'progres', 'percobaan',
+            'mulai_diproses', 'selesai_pada', 'error_message',
+            'created_at', 'updated_at', 'created_by'
+        ]
+        # Diisi oleh worker export; klien hanya membuat job lalu memantau
+        read_only_fields = [
+            'id', 'file_export', 'status', 'total_baris', 'baris_diproses',
+            'progres', 'percobaan', 'mulai_diproses', 'selesai_pada',
             'error_message', 'created_at', 'updated_at'
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at']
 
 
 class LaporanSearchSerializer(serializers.Serializer):
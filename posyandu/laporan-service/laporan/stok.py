@@ -0,0 +1,77 @@
+"""
+Laporan gabungan stok kedaluwarsa dari service imunisasi, KB, dan vitamin.
+
+Setiap service stok menghitung bucket mingguannya sendiri dengan satu query
+agregat (`common.stock.StockExpiryMixin.expiry_horizon`); modul ini hanya
+mengambil hasilnya secara paralel dan menjumlahkan per minggu.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+import requests
+from django.conf import settings
+
+
+# sumber -> (setting URL service, path laporan horizon)
+STOCK_SOURCES = {
+    'vaksin': ('IMUNISASI_SERVICE_URL', '/api/stok/expiry_horizon/'),
+    'kb': ('KB_SERVICE_URL', '/api/stok/expiry_horizon/'),
+    'vitamin': ('VITAMIN_SERVICE_URL', '/api/stok-vitamin/expiry_horizon/'),
+    'pmt': ('VITAMIN_SERVICE_URL', '/api/stok-pmt/expiry_horizon/'),
+}
+
+
+def fetch_horizon(sumber, weeks):
+    """Mengambil bucket horizon kedaluwarsa dari satu service stok."""
+    setting_name, path = STOCK_SOURCES[sumber]
+    url = getattr(settings, setting_name).rstrip('/') + path
+    response = requests.get(url, params={'weeks': weeks}, timeout=settings.STOK_REQUEST_TIMEOUT)
+    response.raise_for_status()
+    return response.json()['buckets']
+
+
+def expiry_horizon_report(weeks=12):
+    """
+    Menggabungkan horizon kedaluwarsa seluruh stok per minggu.
+
+    Sumber yang gagal diambil dicatat pada `errors` tanpa menggagalkan
+    laporan dari sumber lain.
+    """
+    with ThreadPoolExecutor(max_workers=len(STOCK_SOURCES)) as executor:
+        futures = {
+            sumber: executor.submit(fetch_horizon, sumber, weeks)
+            for sumber in STOCK_SOURCES
+        }
+
+    buckets = {}
+    errors = {}
+    for sumber, future in futures.items():
+        try:
+            rows = future.result()
+        except (requests.RequestException, KeyError, ValueError) as exc:
+            errors[sumber] = str(exc)
+            continue
+        for row in rows:
+            bucket = buckets.setdefault(row['minggu_ke'], {
+                'minggu_ke': row['minggu_ke'],
+                'dari': row['dari'],
+                'sampai': row['sampai'],
+                'jumlah_lot': 0,
+                'nilai': Decimal('0'),
+                'per_sumber': {},
+            })
+            nilai = Decimal(str(row.get('nilai') or 0))
+            bucket['jumlah_lot'] += row['jumlah_lot']
+            bucket['nilai'] += nilai
+            bucket['per_sumber'][sumber] = {
+                'jumlah_lot': row['jumlah_lot'],
+                'jumlah_unit': row['jumlah_unit'],
+                'nilai': nilai,
+            }
+
+    rows = [buckets[key] for key in sorted(buckets)]
+    return {
+        'buckets': rows,
+        'total_nilai': sum((row['nilai'] for row in rows), Decimal('0')),
+        'errors': errors,
+    }
@@ -0,0 +1,44 @@
+from datetime import date
+from unittest import mock
+
+from django.test import TestCase
+
+from .dashboard import JUMLAH_FIELDS, build_dashboard
+from .models import DashboardData, StatistikPosyandu
+
+
+class BuildDashboardTests(TestCase):
+    tanggal = date(2024, 3, 31)
+
+    def setUp(self):
+        for posyandu_id, hari, base in [(1, 30, 1), (1, 31, 2), (2, 31, 5), (3, 31, 7)]:
+            StatistikPosyandu.objects.create(
+                posyandu_id=posyandu_id,
+                tanggal_statistik=date(2024, 3, hari),
+                **{field: base + index for index, field in enumerate(JUMLAH_FIELDS)},
+            )
+
+    @mock.patch('laporan.dashboard.peringatan_stok', return_value={})
+    @mock.patch('laporan.dashboard.fetch_kecamatan', return_value={1: 'Cibeunying', 2: 'Cibeunying', 3: 'Coblong'})
+    def test_kecamatan_menjumlahkan_semua_kolom_posyandu_anggota(self, *mocks):
+        build_dashboard(self.tanggal)
+        snapshots = {
+            (snapshot.tingkat, snapshot.kode_wilayah): snapshot.data_dashboard
+            for snapshot in DashboardData.objects.filter(tanggal_data=self.tanggal)
+        }
+
+        kecamatan = snapshots[('kecamatan', 'Cibeunying')]
+        self.assertEqual(kecamatan['posyandu_ids'], [1, 2])
+        for field in JUMLAH_FIELDS:
+            self.assertEqual(
+                kecamatan['jumlah'][field],
+                snapshots[('posyandu', '1')]['jumlah'][field] + snapshots[('posyandu', '2')]['jumlah'][field],
+                field,
+            )
+        self.assertEqual(
+            snapshots[('semua', '')]['jumlah'],
+            {
+                field: sum(snapshots[('posyandu', str(pid))]['jumlah'][field] for pid in (1, 2, 3))
+                for field in JUMLAH_FIELDS
+            },
+        )
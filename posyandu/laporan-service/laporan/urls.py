@@ -5,7 +5,7 @@ from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import (
     TemplateLaporanViewSet, LaporanViewSet, StatistikPosyanduViewSet,
-    DashboardDataViewSet, ExportLogViewSet
+    DashboardDataViewSet, ExportLogViewSet, StokKedaluwarsaViewSet
 )
 
 router = DefaultRouter()
@@ -14,6 +14,7 @@ router.register(r'laporan', LaporanViewSet)
 router.register(r'statistik', StatistikPosyanduViewSet)
 router.register(r'dashboard', DashboardDataViewSet)
 router.register(r'export-log', ExportLogViewSet)
+router.register(r'stok-kedaluwarsa', StokKedaluwarsaViewSet, basename='stok-kedaluwarsa')
 
 urlpatterns = [
     path('', include(router.urls)),
@@ -1,12 +1,24 @@
 """
 Views untuk laporan-service.
 """
+import os
+
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q
+from django.conf import settings
+from django.http import FileResponse
+from django.db.models import Q, Avg, Sum
+from django.utils.dateparse import parse_date
+from common.batch import BatchLookupMixin
+from common.related import RelatedLoadsMixin
+from common.conditional import ConditionalGetMixin
+from common.cache import CachedResponseMixin
+from common.snapshot import SnapshotCache
+from common.statistics import StatisticsMixin, Stat, Total, count_by, count_by_choices, compute_statistics
+from .stok import expiry_horizon_report
 from .models import TemplateLaporan, Laporan, StatistikPosyandu, DashboardData, ExportLog
 from .serializers import (
     TemplateLaporanSerializer, LaporanSerializer, StatistikPosyanduSerializer,
@@ -14,7 +26,11 @@ from .serializers import (
 )
 
 
-class TemplateLaporanViewSet(viewsets.ModelViewSet):
+# Snapshot dashboard yang sudah dibaca, per (tingkat, wilayah), di memori proses
+_latest_cache = SnapshotCache(ttl=settings.DASHBOARD_CACHE_TTL)
+
+
+class TemplateLaporanViewSet(ConditionalGetMixin, CachedResponseMixin, StatisticsMixin, BatchLookupMixin, RelatedLoadsMixin, viewsets.ModelViewSet):
     """ViewSet untuk model TemplateLaporan."""
     queryset = TemplateLaporan.objects.all()
     serializer_class = TemplateLaporanSerializer
@@ -23,6 +39,17 @@ class TemplateLaporanViewSet(viewsets.ModelViewSet):
     search_fields = ['nama_template', 'jenis_laporan', 'kategori_laporan']
     ordering_fields = ['nama_template', 'jenis_laporan', 'kategori_laporan']
     ordering = ['nama_template']
+    cache_alias = 'reference'
+    cache_actions = ('list', 'retrieve', 'aktif', 'by_kategori', 'statistics')
+    statistics_spec = {
+        'total_template': Total(),
+        'by_jenis': count_by('jenis_laporan', TemplateLaporan.JENIS_LAPORAN_CHOICES),
+        'by_kategori': count_by('kategori_laporan', TemplateLaporan.KATEGORI_LAPORAN_CHOICES),
+        'by_status': {
+            'aktif': Q(aktif=True),
+            'tidak_aktif': Q(aktif=False),
+        },
+    }
     
     @action(detail=False, methods=['get'])
     def aktif(self, request):
@@ -54,33 +81,9 @@ class TemplateLaporanViewSet(viewsets.ModelViewSet):
         
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
-    
-    @action(detail=False, methods=['get'])
-    def statistics(self, request):
-        """Statistik template laporan."""
-        total_template = self.queryset.count()
-        by_jenis = {}
-        for choice in TemplateLaporan.JENIS_LAPORAN_CHOICES:
-            by_jenis[choice[0]] = self.queryset.filter(jenis_laporan=choice[0]).count()
-        
-        by_kategori = {}
-        for choice in TemplateLaporan.KATEGORI_LAPORAN_CHOICES:
-            by_kategori[choice[0]] = self.queryset.filter(kategori_laporan=choice[0]).count()
-        
-        by_status = {
-            'aktif': self.queryset.filter(aktif=True).count(),
-            'tidak_aktif': self.queryset.filter(aktif=False).count(),
-        }
-        
-        return Response({
-            'total_template': total_template,
-            'by_jenis': by_jenis,
-            'by_kategori': by_kategori,
-            'by_status': by_status,
-        })
 
 
-class LaporanViewSet(viewsets.ModelViewSet):
+class LaporanViewSet(ConditionalGetMixin, StatisticsMixin, BatchLookupMixin, RelatedLoadsMixin, viewsets.ModelViewSet):
     """ViewSet untuk model Laporan."""
     queryset = Laporan.objects.all()
     serializer_class = LaporanSerializer
@@ -89,6 +92,10 @@ class LaporanViewSet(viewsets.ModelViewSet):
     search_fields = ['posyandu_id', 'nama_laporan']
     ordering_fields = ['tanggal_mulai', 'tanggal_akhir', 'created_at']
     ordering = ['-created_at']
+    statistics_spec = {
+        'total_laporan': Total(),
+        'by_status': count_by('status', ['draft', 'final', 'published', 'archived']),
+    }
     
     @action(detail=False, methods=['get'])
     def by_posyandu(self, request):
@@ -127,25 +134,9 @@ class LaporanViewSet(viewsets.ModelViewSet):
         
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
-    
-    @action(detail=False, methods=['get'])
-    def statistics(self, request):
-        """Statistik laporan."""
-        total_laporan = self.queryset.count()
-        by_status = {
-            'draft': self.queryset.filter(status='draft').count(),
-            'final': self.queryset.filter(status='final').count(),
-            'published': self.queryset.filter(status='published').count(),
-            'archived': self.queryset.filter(status='archived').count(),
-        }
-        
-        return Response({
-            'total_laporan': total_laporan,
-            'by_status': by_status,
-        })
 
 
-class StatistikPosyanduViewSet(viewsets.ModelViewSet):
+class StatistikPosyanduViewSet(ConditionalGetMixin, StatisticsMixin, BatchLookupMixin, RelatedLoadsMixin, viewsets.ModelViewSet):
     """ViewSet untuk model StatistikPosyandu."""
     queryset = StatistikPosyandu.objects.all()
     serializer_class = StatistikPosyanduSerializer
@@ -154,6 +145,61 @@ class StatistikPosyanduViewSet(viewsets.ModelViewSet):
     search_fields = ['posyandu_id']
     ordering_fields = ['tanggal_statistik', 'created_at']
     ordering = ['-tanggal_statistik']
+    statistics_spec = {
+        'total_statistik': Total(),
+        'rata_rata': {
+            'balita': Stat(Avg('total_balita'), default=0, digits=2),
+            'ibu_hamil': Stat(Avg('total_ibu_hamil'), default=0, digits=2),
+            'imunisasi': Stat(Avg('total_imunisasi'), default=0, digits=2),
+            'kb': Stat(Avg('total_wus'), default=0, digits=2),
+        },
+    }
+    rekap_spec = {
+        'jumlah_hari': Total(),
+        **{
+            field: Stat(Sum(field), default=0)
+            for field in [
+                'balita_gizi_normal', 'balita_gizi_kurang',
+                'balita_gizi_lebih', 'balita_gizi_buruk',
+                'total_ibu_hamil', 'ibu_hamil_normal', 'ibu_hamil_risiko_tinggi',
+                'total_imunisasi',
+                'total_wus', 'wus_aktif_kb', 'wus_tidak_aktif_kb',
+                'total_vitamin', 'total_pmt',
+                'total_rujukan', 'rujukan_selesai', 'rujukan_pending',
+            ]
+        },
+        # total_balita adalah jumlah balita unik per hari; dijumlahkan lintas
+        # hari hasilnya kunjungan (balita yang datang di beberapa hari
+        # terhitung berulang), bukan jumlah balita unik dalam rentang
+        'kunjungan_balita': Stat(Sum('total_balita'), default=0),
+        # Kolom imunisasi berisi jumlah dosis, bukan anak berimunisasi lengkap
+        'dosis_imunisasi_diberikan': Stat(Sum('imunisasi_lengkap'), default=0),
+        'dosis_imunisasi_tidak_diberikan': Stat(Sum('imunisasi_tidak_lengkap'), default=0),
+    }
+    
+    @action(detail=False, methods=['get'])
+    def rekap(self, request):
+        """Menjumlahkan statistik harian hasil rollup untuk rentang tanggal."""
+        try:
+            dari = parse_date(request.query_params.get('dari') or '')
+            sampai = parse_date(request.query_params.get('sampai') or '')
+        except ValueError:
+            # Format benar tetapi tanggal mustahil, mis. 2024-02-30
+            dari = sampai = None
+        if not dari or not sampai:
+            return Response(
+                {'error': 'dari and sampai parameters are required as valid dates (YYYY-MM-DD)'}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        queryset = self.queryset.filter(tanggal_statistik__range=(dari, sampai))
+        posyandu_id = request.query_params.get('posyandu_id')
+        if posyandu_id:
+            queryset = queryset.filter(posyandu_id=posyandu_id)
+        
+        data = compute_statistics(queryset, self.rekap_spec)
+        data.update({'posyandu_id': posyandu_id, 'dari': dari, 'sampai': sampai})
+        return Response(data)
     
     @action(detail=False, methods=['get'])
     def by_posyandu(self, request):
@@ -190,35 +236,14 @@ class StatistikPosyanduViewSet(viewsets.ModelViewSet):
         
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
-    
-    @action(detail=False, methods=['get'])
-    def statistics(self, request):
-        """Statistik statistik posyandu."""
-        total_statistik = self.queryset.count()
-        
-        # Rata-rata statistik
-        avg_balita = self.queryset.aggregate(avg=models.Avg('total_balita'))['avg'] or 0
-        avg_ibu_hamil = self.queryset.aggregate(avg=models.Avg('total_ibu_hamil'))['avg'] or 0
-        avg_imunisasi = self.queryset.aggregate(avg=models.Avg('total_imunisasi'))['avg'] or 0
-        avg_kb = self.queryset.aggregate(avg=models.Avg('total_wus'))['avg'] or 0
-        
-        return Response({
-            'total_statistik': total_statistik,
-            'rata_rata': {
-                'balita': round(avg_balita, 2),
-                'ibu_hamil': round(avg_ibu_hamil, 2),
-                'imunisasi': round(avg_imunisasi, 2),
-                'kb': round(avg_kb, 2),
-            }
-        })
 
 
-class DashboardDataViewSet(viewsets.ModelViewSet):
+class DashboardDataViewSet(ConditionalGetMixin, BatchLookupMixin, RelatedLoadsMixin, viewsets.ModelViewSet):
     """ViewSet untuk model DashboardData."""
     queryset = DashboardData.objects.all()
     serializer_class = DashboardDataSerializer
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
-    filterset_fields = ['posyandu_id', 'tanggal_data']
+    filterset_fields = ['tingkat', 'kode_wilayah', 'posyandu_id', 'tanggal_data']
     search_fields = ['posyandu_id']
     ordering_fields = ['tanggal_data', 'created_at']
     ordering = ['-tanggal_data']
@@ -244,23 +269,52 @@ class DashboardDataViewSet(viewsets.ModelViewSet):
     
     @action(detail=False, methods=['get'])
     def latest(self, request):
-        """Mengambil dashboard data terbaru."""
+        """
+        Snapshot dashboard terbaru dari `build_dashboard`.
+
+        `?posyandu_id=1` untuk satu posyandu, `?tingkat=kecamatan&wilayah=...`
+        untuk satu kecamatan, `?tingkat=semua` untuk seluruh wilayah. Tanpa
+        parameter mengembalikan 10 snapshot terbaru. Hasil disimpan di cache
+        in-process selama `DASHBOARD_CACHE_TTL` detik.
+        """
         posyandu_id = request.query_params.get('posyandu_id')
+        tingkat = request.query_params.get('tingkat')
+        wilayah = request.query_params.get('wilayah', '')
         if posyandu_id:
-            queryset = self.queryset.filter(posyandu_id=posyandu_id).order_by('-tanggal_data')[:1]
-        else:
-            queryset = self.queryset.order_by('-tanggal_data')[:10]
-        
-        page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-        
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+            tingkat, wilayah = 'posyandu', posyandu_id
+        elif tingkat == 'semua':
+            wilayah = ''
+        elif tingkat == 'posyandu':
+            return Response(
+                {'error': 'posyandu_id parameter is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        elif tingkat == 'kecamatan' and not wilayah:
+            return Response(
+                {'error': 'wilayah parameter is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        elif tingkat is None:
+            wilayah = ''
+        elif tingkat != 'kecamatan':
+            return Response(
+                {'error': 'tingkat parameter must be one of posyandu, kecamatan, semua'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        def load():
+            if tingkat is None:
+                queryset = self.queryset.order_by('-tanggal_data', '-updated_at')[:10]
+            else:
+                queryset = self.queryset.filter(
+                    tingkat=tingkat, kode_wilayah=wilayah
+                ).order_by('-tanggal_data')[:1]
+            return list(self.get_serializer(queryset, many=True).data)
+
+        return Response(_latest_cache.get_or_load((tingkat, wilayah), load))
 
 
-class ExportLogViewSet(viewsets.ModelViewSet):
+class ExportLogViewSet(ConditionalGetMixin, StatisticsMixin, BatchLookupMixin, RelatedLoadsMixin, viewsets.ModelViewSet):
     """ViewSet untuk model ExportLog."""
     queryset = ExportLog.objects.all()
     serializer_class = ExportLogSerializer
@@ -269,6 +323,11 @@ class ExportLogViewSet(viewsets.ModelViewSet):
     search_fields = ['laporan__nama_laporan']
     ordering_fields = ['created_at']
     ordering = ['-created_at']
+    statistics_spec = {
+        'total_export': Total(),
+        'by_format': count_by_choices(ExportLog, 'format_export'),
+        'by_status': count_by_choices(ExportLog, 'status'),
+    }
     
     @action(detail=False, methods=['get'])
     def by_laporan(self, request):
@@ -308,22 +367,50 @@ class ExportLogViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
     
-    @action(detail=False, methods=['get'])
-    def statistics(self, request):
-        """Statistik export log."""
-        total_export = self.queryset.count()
-        by_format = {}
-        for choice in ExportLog.FORMAT_EXPORT_CHOICES:
-            by_format[choice[0]] = self.queryset.filter(format_export=choice[0]).count()
-        
-        by_status = {
-            'processing': self.queryset.filter(status='processing').count(),
-            'completed': self.queryset.filter(status='completed').count(),
-            'failed': self.queryset.filter(status='failed').count(),
-        }
-        
-        return Response({
-            'total_export': total_export,
-            'by_format': by_format,
-            'by_status': by_status,
-        })
+    @action(detail=True, methods=['get'])
+    def download(self, request, pk=None):
+        """Mengunduh file hasil export yang sudah selesai dibuat worker."""
+        export = self.get_object()
+        if export.status != 'completed' or not export.file_export:
+            return Response(
+                {'error': 'export is not completed', 'status': export.status, 'progres': export.progres},
+                status=status.HTTP_409_CONFLICT
+            )
+        return FileResponse(
+            export.file_export.open('rb'),
+            as_attachment=True,
+            filename=os.path.basename(export.file_export.name),
+        )
+    
+    @action(detail=True, methods=['post'])
+    def retry(self, request, pk=None):
+        """Mengantrekan ulang export yang gagal."""
+        export = self.get_object()
+        if export.status != 'failed':
+            return Response(
+                {'error': 'only failed exports can be retried'},
+                status=status.HTTP_409_CONFLICT
+            )
+        export.status = 'queued'
+        export.percobaan = 0
+        export.error_message = None
+        export.save(update_fields=['status', 'percobaan', 'error_message', 'updated_at'])
+        return Response(self.get_serializer(export).data)
+
+
+class StokKedaluwarsaViewSet(viewsets.ViewSet):
+    """ViewSet untuk laporan gabungan stok yang akan kedaluwarsa."""
+    MAX_WEEKS = 52
+    
+    def list(self, request):
+        """Jumlah lot dan nilai stok yang kedaluwarsa per minggu dari seluruh service stok."""
+        try:
+            weeks = int(request.query_params.get('weeks', 12))
+        except ValueError:
+            weeks = 0
+        if not 1 <= weeks <= self.MAX_WEEKS:
+            return Response(
+                {'error': f'weeks parameter must be an integer between 1 and {self.MAX_WEEKS}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(expiry_horizon_report(weeks))
@@ -45,7 +45,7 @@ class VitalSigns(models.Model):
         indexes = [
             models.Index(fields=['visit_id']),
             models.Index(fields=['participant_id']),
-            models.Index(fields=['created_at']),
+            models.Index(fields=['created_at', 'id']),
         ]
     
     def __str__(self):
@@ -7,19 +7,40 @@ from rest_framework.response import Response
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
 from django.db.models import Q, Avg, Max, Min
+from common.batch import BatchLookupMixin
+from common.related import RelatedLoadsMixin
+from common.conditional import ConditionalGetMixin
+from common.pagination import KeysetPagination
+from common.statistics import StatisticsMixin, Stat, Total
+from common.streaming import StreamingExportMixin
 from .models import VitalSigns, Anthropometry
 from .serializers import VitalSignsSerializer, AnthropometrySerializer, VitalSignsSearchSerializer
 
 
-class VitalSignsViewSet(viewsets.ModelViewSet):
+class VitalSignsViewSet(ConditionalGetMixin, StreamingExportMixin, StatisticsMixin, BatchLookupMixin, RelatedLoadsMixin, viewsets.ModelViewSet):
     """ViewSet untuk model VitalSigns."""
     queryset = VitalSigns.objects.all()
     serializer_class = VitalSignsSerializer
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
-    filterset_fields = ['visit_id', 'td_sistol_rerata', 'td_diastol_rerata']
+    filterset_fields = ['visit_id', 'participant_id', 'td_sistol_rerata', 'td_diastol_rerata']
     search_fields = ['participant_id']
     ordering_fields = ['created_at']
     ordering = ['-created_at']
+    pagination_class = KeysetPagination
+    cursor_ordering = ('-created_at', '-id')
+    statistics_spec = {
+        'total_vital_sign': Total(),
+        'rata_rata': {
+            'sistol': Stat(Avg('td_sistol_rerata'), default=0, digits=2),
+            'diastol': Stat(Avg('td_diastol_rerata'), default=0, digits=2),
+            'nadi': Stat(Avg('nadi'), default=0, digits=2),
+            'suhu': Stat(Avg('suhu'), default=0, digits=2),
+        },
+        'range': {
+            'sistol': {'min': Min('td_sistol_rerata'), 'max': Max('td_sistol_rerata')},
+            'diastol': {'min': Min('td_diastol_rerata'), 'max': Max('td_diastol_rerata')},
+        },
+    }
     
     @action(detail=False, methods=['get'])
     def by_visit(self, request):
@@ -66,50 +87,26 @@ class VitalSignsViewSet(viewsets.ModelViewSet):
         
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
-    
-    @action(detail=False, methods=['get'])
-    def statistics(self, request):
-        """Statistik vital sign."""
-        total_vital_sign = self.queryset.count()
-        
-        # Rata-rata vital sign
-        avg_sistol = self.queryset.aggregate(avg=Avg('sistol'))['avg'] or 0
-        avg_diastol = self.queryset.aggregate(avg=Avg('diastol'))['avg'] or 0
-        avg_nadi = self.queryset.aggregate(avg=Avg('nadi'))['avg'] or 0
-        avg_suhu = self.queryset.aggregate(avg=Avg('suhu'))['avg'] or 0
-        
-        # Range vital sign
-        sistol_range = self.queryset.aggregate(
-            min=Min('sistol'), max=Max('sistol')
-        )
-        diastol_range = self.queryset.aggregate(
-            min=Min('diastol'), max=Max('diastol')
-        )
-        
-        return Response({
-            'total_vital_sign': total_vital_sign,
-            'rata_rata': {
-                'sistol': round(avg_sistol, 2),
-                'diastol': round(avg_diastol, 2),
-                'nadi': round(avg_nadi, 2),
-                'suhu': round(avg_suhu, 2),
-            },
-            'range': {
-                'sistol': sistol_range,
-                'diastol': diastol_range,
-            }
-        })
 
 
-class AnthropometryViewSet(viewsets.ModelViewSet):
+class AnthropometryViewSet(ConditionalGetMixin, StatisticsMixin, BatchLookupMixin, RelatedLoadsMixin, viewsets.ModelViewSet):
     """ViewSet untuk model Anthropometry."""
     queryset = Anthropometry.objects.all()
     serializer_class = AnthropometrySerializer
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
-    filterset_fields = ['visit']
+    filterset_fields = ['visit_id', 'participant_id']
     search_fields = ['visit__participant__nama_lengkap']
     ordering_fields = ['created_at']
     ordering = ['-created_at']
+    statistics_spec = {
+        'total_anthropometry': Total(),
+        'rata_rata': {
+            'berat_badan': Stat(Avg('berat_kg'), default=0, digits=2),
+            'tinggi_badan': Stat(Avg('tinggi_cm'), default=0, digits=2),
+            'lingkar_perut': Stat(Avg('lingkar_perut_cm'), default=0, digits=2),
+            'imt': Stat(Avg('imt'), default=0, digits=2),
+        },
+    }
     
     @action(detail=False, methods=['get'])
     def by_visit(self, request):
@@ -129,24 +126,3 @@ class AnthropometryViewSet(viewsets.ModelViewSet):
         
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
-    
-    @action(detail=False, methods=['get'])
-    def statistics(self, request):
-        """Statistik antropometri."""
-        total_anthropometry = self.queryset.count()
-        
-        # Rata-rata antropometri
-        avg_berat = self.queryset.aggregate(avg=Avg('berat_badan'))['avg'] or 0
-        avg_tinggi = self.queryset.aggregate(avg=Avg('tinggi_badan'))['avg'] or 0
-        avg_lingkar_pinggang = self.queryset.aggregate(avg=Avg('lingkar_pinggang'))['avg'] or 0
-        avg_lingkar_pinggul = self.queryset.aggregate(avg=Avg('lingkar_pinggul'))['avg'] or 0
-        
-        return Response({
-            'total_anthropometry': total_anthropometry,
-            'rata_rata': {
-                'berat_badan': round(avg_berat, 2),
-                'tinggi_badan': round(avg_tinggi, 2),
-                'lingkar_pinggang': round(avg_lingkar_pinggang, 2),
-                'lingkar_pinggul': round(avg_lingkar_pinggul, 2),
-            }
-        })
@@ -2,7 +2,7 @@
 Serializers untuk intervention-service.
 """
 from rest_framework import serializers
-from .models import Intervention
+from .models import Intervention, EducationMaterial
 
 
 class InterventionSerializer(serializers.ModelSerializer):
@@ -11,9 +11,26 @@ class InterventionSerializer(serializers.ModelSerializer):
     class Meta:
         model = Intervention
         fields = [
-            'id', 'visit', 'jenis_intervensi', 'deskripsi', 'target',
-            'metode', 'durasi', 'frekuensi', 'status', 'hasil',
-            'evaluasi', 'tindak_lanjut', 'created_at', 'updated_at'
+            'id', 'visit_id', 'participant_id', 'jenis_intervensi',
+            'topik_edukasi', 'materi_edukasi', 'link_materi', 'file_materi',
+            'catatan_konseling', 'target_spesifik', 'target_terukur',
+            'target_tercapai', 'target_relevan', 'target_waktu',
+            'status_intervensi', 'tanggal_target', 'tanggal_evaluasi',
+            'hasil_evaluasi', 'skor_pencapaian', 'created_at', 'updated_at',
+            'created_by'
+        ]
+        read_only_fields = ['id', 'created_at', 'updated_at']
+
+
+class EducationMaterialSerializer(serializers.ModelSerializer):
+    """Serializer untuk model EducationMaterial."""
+    
+    class Meta:
+        model = EducationMaterial
+        fields = [
+            'id', 'judul', 'topik', 'deskripsi', 'konten', 'file_materi',
+            'link_eksternal', 'kategori', 'status', 'created_at',
+            'updated_at', 'created_by'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
 
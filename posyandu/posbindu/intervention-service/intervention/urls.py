@@ -3,10 +3,11 @@ URLs untuk intervention-service.
 """
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import InterventionViewSet
+from .views import InterventionViewSet, EducationMaterialViewSet
 
 router = DefaultRouter()
 router.register(r'intervention', InterventionViewSet)
+router.register(r'education-material', EducationMaterialViewSet)
 
 urlpatterns = [
     path('', include(router.urls)),
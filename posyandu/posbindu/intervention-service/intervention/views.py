@@ -7,19 +7,29 @@ from rest_framework.response import Response
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
 from django.db.models import Q, Count
-from .models import Intervention
-from .serializers import InterventionSerializer, InterventionSearchSerializer
+from common.batch import BatchLookupMixin
+from common.related import RelatedLoadsMixin
+from common.conditional import ConditionalGetMixin
+from common.cache import CachedResponseMixin
+from common.statistics import StatisticsMixin, Total, count_by
+from .models import Intervention, EducationMaterial
+from .serializers import InterventionSerializer, InterventionSearchSerializer, EducationMaterialSerializer
 
 
-class InterventionViewSet(viewsets.ModelViewSet):
+class InterventionViewSet(ConditionalGetMixin, StatisticsMixin, BatchLookupMixin, RelatedLoadsMixin, viewsets.ModelViewSet):
     """ViewSet untuk model Intervention."""
     queryset = Intervention.objects.all()
     serializer_class = InterventionSerializer
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
-    filterset_fields = ['visit', 'jenis_intervensi', 'status']
+    filterset_fields = ['visit_id', 'participant_id', 'jenis_intervensi', 'status_intervensi']
     search_fields = ['visit__participant__nama_lengkap', 'jenis_intervensi', 'deskripsi']
     ordering_fields = ['created_at', 'durasi']
     ordering = ['-created_at']
+    statistics_spec = {
+        'total_intervention': Total(),
+        'by_status': count_by('status_intervensi', ['direncanakan', 'dilaksanakan', 'selesai', 'ditunda']),
+        'by_jenis': count_by('jenis_intervensi', Intervention.JENIS_INTERVENSI_CHOICES),
+    }
     
     @action(detail=False, methods=['get'])
     def by_visit(self, request):
@@ -101,24 +111,28 @@ class InterventionViewSet(viewsets.ModelViewSet):
         
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
+
+
+class EducationMaterialViewSet(ConditionalGetMixin, CachedResponseMixin, BatchLookupMixin, RelatedLoadsMixin, viewsets.ModelViewSet):
+    """ViewSet untuk model EducationMaterial."""
+    queryset = EducationMaterial.objects.all()
+    serializer_class = EducationMaterialSerializer
+    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filterset_fields = ['topik', 'kategori', 'status']
+    search_fields = ['judul', 'deskripsi']
+    ordering_fields = ['created_at', 'judul']
+    ordering = ['-created_at']
+    cache_alias = 'reference'
+    cache_actions = ('list', 'retrieve', 'published')
     
     @action(detail=False, methods=['get'])
-    def statistics(self, request):
-        """Statistik intervensi."""
-        total_intervention = self.queryset.count()
-        
-        # Statistik berdasarkan status
-        by_status = {}
-        for choice in Intervention.STATUS_CHOICES:
-            by_status[choice[0]] = self.queryset.filter(status=choice[0]).count()
-        
-        # Statistik berdasarkan jenis intervensi
-        by_jenis = {}
-        for choice in Intervention.JENIS_INTERVENSI_CHOICES:
-            by_jenis[choice[0]] = self.queryset.filter(jenis_intervensi=choice[0]).count()
+    def published(self, request):
+        """Mengambil materi edukasi yang sudah dipublikasikan."""
+        queryset = self.filter_queryset(self.queryset.filter(status='published'))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
         
-        return Response({
-            'total_intervention': total_intervention,
-            'by_status': by_status,
-            'by_jenis': by_jenis,
-        })
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
@@ -0,0 +1,58 @@
+"""
+Data benchmark lab-service: satu hasil pemeriksaan lab per kunjungan.
+
+Kunjungan dan peserta mengikuti `SeedContext.visit()` (participant-service).
+"""
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.utils import timezone
+
+from .models import LabExamination
+
+
+MODELS = [LabExamination]
+
+# jenis: (bobot, rata-rata, simpangan baku, satuan)
+DISTRIBUSI = {
+    'gds': (30, 130, 40, 'mg/dL'),
+    'gdp': (10, 100, 25, 'mg/dL'),
+    'kol_total': (30, 200, 40, 'mg/dL'),
+    'hdl': (5, 50, 12, 'mg/dL'),
+    'ldl': (5, 120, 30, 'mg/dL'),
+    'trigliserida': (5, 150, 60, 'mg/dL'),
+    'asam_urat': (15, 5.5, 1.5, 'mg/dL'),
+}
+ALAT = ['Easy Touch GCU', 'Accu-Chek Instant', 'Nesco Multicheck']
+
+
+def _lab_rows(ctx):
+    rng = ctx.random('lab')
+    jenis_list = list(DISTRIBUSI)
+    bobot = [DISTRIBUSI[jenis][0] for jenis in jenis_list]
+    visit_count = ctx.count('visit')
+    for number in range(1, ctx.count('lab') + 1):
+        visit_id = (number - 1) % visit_count + 1
+        ref = ctx.visit(visit_id)
+        jenis = rng.choices(jenis_list, weights=bobot)[0]
+        _, rata_rata, simpangan, satuan = DISTRIBUSI[jenis]
+        nilai = max(rng.gauss(rata_rata, simpangan), rata_rata / 4)
+        waktu = datetime.combine(ref.pos_date, time(8)) + timedelta(minutes=rng.randint(0, 240))
+        yield LabExamination(
+            id=number,
+            visit_id=visit_id,
+            participant_id=ref.participant_id,
+            jenis_pemeriksaan=jenis,
+            nilai=Decimal(f'{nilai:.2f}'),
+            satuan=satuan,
+            alat=rng.choice(ALAT),
+            lot_strip=f'LOT-{ref.pos_date:%Y%m}-{rng.randint(1, 20):02d}',
+            exp_strip=ref.pos_date + timedelta(days=rng.randint(60, 540)),
+            waktu_ambil=timezone.make_aware(waktu),
+            status_puasa=jenis == 'gdp',
+            created_by=1,
+        )
+
+
+def seed(ctx):
+    ctx.bulk_insert(LabExamination, _lab_rows(ctx))
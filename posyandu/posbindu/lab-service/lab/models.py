@@ -3,6 +3,8 @@ Model untuk lab-service.
 Menangani pemeriksaan laboratorium sederhana POS BINDU PTM.
 """
 from django.db import models
+from common.stock import StockMovement, StockLedger, InsufficientStock
+from common.sync import Tombstone, track_deletions
 from decimal import Decimal
 
 
@@ -86,7 +88,7 @@ class LabExamination(models.Model):
             models.Index(fields=['visit_id']),
             models.Index(fields=['participant_id']),
             models.Index(fields=['jenis_pemeriksaan']),
-            models.Index(fields=['created_at']),
+            models.Index(fields=['created_at', 'id']),
         ]
     
     def __str__(self):
@@ -227,9 +229,10 @@ class StockStrip(models.Model):
     class Meta:
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['jenis_pemeriksaan']),
+            models.Index(fields=['jenis_pemeriksaan', 'exp_date']),
             models.Index(fields=['exp_date']),
             models.Index(fields=['created_at']),
+            models.Index(fields=['updated_at', 'id']),
         ]
     
     def __str__(self):
@@ -248,9 +251,37 @@ class StockStrip(models.Model):
         return self.exp_date <= date.today() + timedelta(days=30)
     
     def use_strip(self, jumlah=1):
-        """Mengurangi jumlah strip yang tersisa."""
-        if self.jumlah_tersisa >= jumlah:
-            self.jumlah_tersisa -= jumlah
-            self.save()
-            return True
-        return False
+        """Mengurangi stok strip secara atomik melalui ledger stok."""
+        try:
+            self.jumlah_tersisa = strip_ledger.decrement(self.pk, jumlah)
+        except InsufficientStock:
+            return False
+        return True
+
+
+class MutasiStrip(StockMovement):
+    """Model untuk mutasi stok strip."""
+    
+    stok = models.ForeignKey(StockStrip, on_delete=models.PROTECT, related_name='mutasi')
+    
+    class Meta(StockMovement.Meta):
+        indexes = [
+            models.Index(fields=['stok', 'created_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.get_jenis_mutasi_display()} {self.jumlah} - {self.stok}"
+
+
+strip_ledger = StockLedger(
+    MutasiStrip, quantity_field='jumlah_tersisa', status_field=None,
+    jenis_field='jenis_pemeriksaan', expiry_field='exp_date', lot_field='lot_number',
+    price_field='harga_per_strip'
+)
+
+
+class SyncTombstone(Tombstone):
+    """Penanda record yang dihapus untuk change feed `/api/sync/`."""
+
+
+track_deletions(SyncTombstone, StockStrip)
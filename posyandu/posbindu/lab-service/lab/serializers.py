@@ -2,35 +2,41 @@
 Serializers untuk lab-service.
 """
 from rest_framework import serializers
-from .models import LabResult, Stock
+from common.stock import StockLotSerializerMixin
+from .models import LabExamination, StockStrip, strip_ledger
 
 
-class LabResultSerializer(serializers.ModelSerializer):
-    """Serializer untuk model LabResult."""
+class LabExaminationSerializer(serializers.ModelSerializer):
+    """Serializer untuk model LabExamination."""
+    interpretasi = serializers.CharField(source='get_interpretation', read_only=True)
     
     class Meta:
-        model = LabResult
+        model = LabExamination
         fields = [
-            'id', 'visit', 'jenis_pemeriksaan', 'hasil', 'nilai_normal',
-            'status', 'catatan', 'tanggal_pemeriksaan', 'created_at', 'updated_at'
+            'id', 'visit_id', 'participant_id', 'jenis_pemeriksaan', 'nilai', 'satuan',
+            'alat', 'lot_strip', 'exp_strip', 'waktu_ambil', 'status_puasa', 'catatan',
+            'interpretasi', 'created_at', 'updated_at', 'created_by'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
 
 
-class StockSerializer(serializers.ModelSerializer):
-    """Serializer untuk model Stock."""
+class StockStripSerializer(StockLotSerializerMixin, serializers.ModelSerializer):
+    """Serializer untuk model StockStrip."""
+    stock_ledger = strip_ledger
+    locked_quantity_fields = ('jumlah_awal',)
     
     class Meta:
-        model = Stock
+        model = StockStrip
         fields = [
-            'id', 'nama_item', 'jenis_item', 'stok_awal', 'stok_tersisa',
-            'satuan', 'tanggal_kadaluarsa', 'supplier', 'created_at', 'updated_at'
+            'id', 'jenis_pemeriksaan', 'nama_strip', 'lot_number', 'exp_date',
+            'jumlah_awal', 'jumlah_tersisa', 'harga_per_strip', 'supplier',
+            'created_at', 'updated_at', 'created_by'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
 
 
-class LabResultSearchSerializer(serializers.Serializer):
-    """Serializer untuk pencarian lab result."""
+class LabExaminationSearchSerializer(serializers.Serializer):
+    """Serializer untuk pencarian pemeriksaan lab."""
     visit_id = serializers.IntegerField(required=False)
+    participant_id = serializers.IntegerField(required=False)
     jenis_pemeriksaan = serializers.CharField(required=False)
-    status = serializers.CharField(required=False)
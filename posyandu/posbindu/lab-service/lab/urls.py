@@ -3,11 +3,12 @@ URLs untuk lab-service.
 """
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import LabResultViewSet, StockViewSet
+from .views import LabExaminationViewSet, StockViewSet, SyncViewSet
 
 router = DefaultRouter()
-router.register(r'result', LabResultViewSet)
+router.register(r'result', LabExaminationViewSet)
 router.register(r'stock', StockViewSet)
+router.register(r'sync', SyncViewSet, basename='sync')
 
 urlpatterns = [
     path('', include(router.urls)),
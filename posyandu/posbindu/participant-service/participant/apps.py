@@ -1,6 +1,14 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class ParticipantConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'participant'
+
+    def ready(self):
+        from .models import Participant
+        from .search import connect_ngram_invalidation, ensure_search_indexes
+
+        post_migrate.connect(ensure_search_indexes, sender=self)
+        connect_ngram_invalidation(Participant)
@@ -0,0 +1,68 @@
+"""
+Data benchmark participant-service: desa, peserta POS BINDU, dan kunjungan.
+
+Peserta dan kunjungan mengikuti `SeedContext.participant()` dan
+`SeedContext.visit()` sehingga `visit_id`/`participant_id` di lab-service dan
+risk-assessment-service menunjuk data yang sama.
+"""
+from common.dedup import phonetic_key
+
+from .models import Location, Participant, Visit
+
+
+MODELS = [Visit, Participant, Location]
+PEKERJAAN = ['Petani', 'Pedagang', 'Buruh', 'Ibu Rumah Tangga', 'Guru', 'Wiraswasta', 'Pensiunan']
+PETUGAS = 50
+
+
+def _location_rows(ctx):
+    for number in range(1, ctx.count('desa') + 1):
+        yield Location(id=number, nama=ctx.desa_name(number), jenis='Desa')
+
+
+def _participant_rows(ctx):
+    rng = ctx.random('participant')
+    for number in range(1, ctx.count('participant') + 1):
+        ref = ctx.participant(number)
+        nama = ctx.person_name(rng, ref.jenis_kelamin)
+        yield Participant(
+            id=number,
+            nik=ctx.nik(2, number),
+            nama_lengkap=nama,
+            nama_fonetik=phonetic_key(nama),
+            tanggal_lahir=ref.tanggal_lahir,
+            jenis_kelamin=ref.jenis_kelamin,
+            alamat=f'Jl. Melati No. {rng.randint(1, 200)}',
+            rt=f'{rng.randint(1, 15):03d}',
+            rw=f'{rng.randint(1, 10):03d}',
+            desa_id=ref.desa_id,
+            no_hp=ctx.phone(rng),
+            bpjs=rng.random() < 0.7,
+            pekerjaan=rng.choice(PEKERJAAN),
+            status_merokok=rng.choices(['Tidak', 'Aktif', 'Eks'], weights=[65, 25, 10])[0],
+            riwayat_dm=rng.random() < 0.08,
+            riwayat_hipertensi=rng.random() < 0.2,
+            riwayat_jantung=rng.random() < 0.03,
+            riwayat_keluarga_ptm=rng.random() < 0.3,
+            created_by=1,
+        )
+
+
+def _visit_rows(ctx):
+    rng = ctx.random('visit')
+    for number in range(1, ctx.count('visit') + 1):
+        ref = ctx.visit(number)
+        yield Visit(
+            id=number,
+            participant_id=ref.participant_id,
+            pos_date=ref.pos_date,
+            lokasi_id=ctx.participant(ref.participant_id).desa_id,
+            petugas_id=rng.randint(1, PETUGAS),
+            status=rng.choices(['Completed', 'Verified', 'Draft'], weights=[80, 15, 5])[0],
+        )
+
+
+def seed(ctx):
+    ctx.bulk_insert(Location, _location_rows(ctx))
+    ctx.bulk_insert(Participant, _participant_rows(ctx))
+    ctx.bulk_insert(Visit, _visit_rows(ctx))
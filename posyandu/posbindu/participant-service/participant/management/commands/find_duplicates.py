@@ -0,0 +1,43 @@
+"""
+Command untuk mendeteksi data ganda peserta secara batch.
+
+Contoh::
+
+    python manage.py find_duplicates
+    python manage.py find_duplicates --model participant.participant --dry-run
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from common.dedup import find_duplicates, get_dedup_spec, registered_dedup_specs
+
+
+class Command(BaseCommand):
+    help = 'Mengisi kunci fonetik dan menyimpan kandidat data ganda (blocking fonetik + tanggal lahir + desa).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model', help='Label model, mis. participant.participant (default semua)')
+        parser.add_argument('--batch-size', type=int, default=2000, help='Jumlah baris per batch')
+        parser.add_argument('--dry-run', action='store_true', help='Hitung tanpa menyimpan kandidat')
+
+    def handle(self, *args, **options):
+        if options['model']:
+            spec = get_dedup_spec(options['model'])
+            if spec is None:
+                raise CommandError(f"Model tidak dikenal: {options['model']}")
+            specs = [spec]
+        else:
+            specs = registered_dedup_specs()
+
+        for spec in specs:
+            summary = find_duplicates(
+                spec, batch_size=options['batch_size'], dry_run=options['dry_run']
+            )
+            self.stdout.write(self.style.SUCCESS(
+                f"{summary['model']}: {summary['processed']} record, "
+                f"{summary['comparisons']} perbandingan, {summary['candidates']} kandidat "
+                f"dalam {summary['duration_ms']} ms"
+            ))
+            self.stdout.write(
+                f"  kunci fonetik diperbarui: {summary['keys_updated']}, "
+                f"blok: {summary['blocks']} ({summary['oversized_blocks']} blok besar)"
+            )
@@ -4,6 +4,8 @@ Menangani data peserta POS BINDU PTM.
 """
 from django.db import models
 from django.core.validators import RegexValidator
+from common.dedup import DuplicateCandidate, track_duplicates
+from common.sync import Tombstone, track_deletions
 
 
 class Location(models.Model):
@@ -36,6 +38,7 @@ class Participant(models.Model):
         )]
     )
     nama_lengkap = models.CharField(max_length=100)
+    nama_fonetik = models.CharField(max_length=100, blank=True, default='', editable=False)
     tanggal_lahir = models.DateField()
     jenis_kelamin = models.CharField(
         max_length=10,
@@ -102,8 +105,11 @@ class Participant(models.Model):
         indexes = [
             models.Index(fields=['nik']),
             models.Index(fields=['nama_lengkap']),
+            models.Index(fields=['nama_fonetik', 'tanggal_lahir']),
+            models.Index(fields=['tanggal_lahir']),
             models.Index(fields=['desa']),
             models.Index(fields=['created_at']),
+            models.Index(fields=['updated_at', 'id']),
         ]
     
     def __str__(self):
@@ -144,7 +150,24 @@ class Visit(models.Model):
             models.Index(fields=['participant', 'pos_date']),
             models.Index(fields=['pos_date']),
             models.Index(fields=['status']),
+            models.Index(fields=['updated_at', 'id']),
         ]
     
     def __str__(self):
         return f"Kunjungan {self.participant.nama_lengkap} - {self.pos_date}"
+
+
+class SyncTombstone(Tombstone):
+    """Penanda record yang dihapus untuk change feed `/api/sync/`."""
+
+
+track_deletions(SyncTombstone, Participant, Visit)
+
+
+class DedupCandidate(DuplicateCandidate):
+    """Kandidat data ganda peserta (ejaan nama berbeda, orang sama)."""
+
+
+track_duplicates(
+    DedupCandidate, Participant, name_field='nama_lengkap', area_field='desa_id'
+)
@@ -0,0 +1,178 @@
+"""
+Pencarian peserta untuk meja registrasi.
+
+- NIK dan nomor HP dicocokkan sebagai prefix (`LIKE 'q%'`) yang dilayani
+  index b-tree `varchar_pattern_ops`. Nomor HP dinormalisasi sehingga
+  `0812`, `62812`, dan `+62812` saling menemukan.
+- Nama dicari dengan pg_trgm (word similarity `%>` atau substring, keduanya
+  dilayani index GIN `gin_trgm_ops`) dan diurutkan berdasarkan kemiripan.
+- Selain PostgreSQL (mis. SQLite saat test), pencarian nama memakai index
+  n-gram di memori dengan cara hitung yang meniru pg_trgm.
+
+Index PostgreSQL dibuat oleh `ensure_search_indexes()` setelah `migrate`
+karena membutuhkan ekstensi dan operator class khusus PostgreSQL.
+"""
+import re
+import threading
+from collections import Counter
+
+from django.db import connections
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
+
+
+WORD_SIMILARITY_THRESHOLD = 0.6
+
+SEARCH_INDEXES_SQL = [
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    'CREATE INDEX IF NOT EXISTS participant_nama_trgm '
+    'ON {table} USING gin (nama_lengkap gin_trgm_ops)',
+    # `icontains` Django dikompilasi menjadi `UPPER(kolom) LIKE UPPER(...)`
+    'CREATE INDEX IF NOT EXISTS participant_nama_upper_trgm '
+    'ON {table} USING gin ((UPPER(nama_lengkap::text)) gin_trgm_ops)',
+    'CREATE INDEX IF NOT EXISTS participant_nik_prefix '
+    'ON {table} (nik varchar_pattern_ops)',
+    'CREATE INDEX IF NOT EXISTS participant_no_hp_prefix '
+    'ON {table} (no_hp varchar_pattern_ops)',
+]
+
+
+def ensure_search_indexes(using='default', **kwargs):
+    """Membuat ekstensi pg_trgm dan index pencarian (idempoten)."""
+    from .models import Participant
+
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return
+    table = connection.ops.quote_name(Participant._meta.db_table)
+    with connection.cursor() as cursor:
+        for statement in SEARCH_INDEXES_SQL:
+            cursor.execute(statement.format(table=table))
+
+
+def trigrams(text):
+    """Himpunan trigram seperti pg_trgm: per kata alfanumerik, huruf kecil."""
+    result = set()
+    for word in re.findall(r'[^\W_]+', text.lower()):
+        padded = f'  {word} '
+        result.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return result
+
+
+def phone_prefixes(no_hp):
+    """Variasi prefix nomor HP lokal (`08...`) dan internasional (`62...`)."""
+    digits = re.sub(r'\D', '', no_hp)
+    if not digits:
+        return []
+    if digits.startswith('62'):
+        local = digits[2:]
+    elif digits.startswith('0'):
+        local = digits[1:]
+    else:
+        # Tanpa awalan (mis. `812...`) bisa juga bagian awal nomor yang tersimpan apa adanya
+        return [digits, f'0{digits}', f'62{digits}', f'+62{digits}']
+    return [f'0{local}', f'62{local}', f'+62{local}']
+
+
+class NgramIndex:
+    """
+    Index n-gram nama peserta di memori untuk database tanpa pg_trgm.
+
+    Skor = porsi trigram query yang ada pada nama, pendekatan dari
+    `word_similarity()` pg_trgm.
+    """
+
+    def __init__(self, rows):
+        self.postings = {}
+        for pk, nama in rows:
+            for trigram in trigrams(nama or ''):
+                self.postings.setdefault(trigram, []).append(pk)
+
+    def search(self, query, threshold=WORD_SIMILARITY_THRESHOLD):
+        """Mengembalikan dict `pk -> skor` untuk nama yang cukup mirip."""
+        query_trigrams = trigrams(query)
+        if not query_trigrams:
+            return {}
+        hits = Counter()
+        for trigram in query_trigrams:
+            hits.update(self.postings.get(trigram, ()))
+        total = len(query_trigrams)
+        return {
+            pk: count / total
+            for pk, count in hits.items()
+            if count / total >= threshold
+        }
+
+
+_ngram_index = None
+_ngram_lock = threading.Lock()
+
+
+def get_ngram_index():
+    """Index n-gram proses ini; dibangun ulang setelah data peserta berubah."""
+    global _ngram_index
+    from .models import Participant
+
+    with _ngram_lock:
+        if _ngram_index is None:
+            _ngram_index = NgramIndex(Participant.objects.values_list('pk', 'nama_lengkap'))
+        return _ngram_index
+
+
+def _reset_ngram_index(**kwargs):
+    global _ngram_index
+    _ngram_index = None
+
+
+def connect_ngram_invalidation(model):
+    post_save.connect(_reset_ngram_index, sender=model, dispatch_uid='participant-ngram-index')
+    post_delete.connect(_reset_ngram_index, sender=model, dispatch_uid='participant-ngram-index')
+
+
+def search_participants(queryset, nik=None, nama=None, no_hp=None, desa_id=None, limit=50):
+    """
+    Mencari peserta dan mengembalikan list paling banyak `limit` baris.
+
+    Hasil pencarian nama diurutkan dari yang paling mirip; tanpa nama,
+    hasil diurutkan berdasarkan NIK.
+    """
+    if nik:
+        queryset = queryset.filter(nik__startswith=nik.strip())
+    if no_hp:
+        condition = Q()
+        for prefix in phone_prefixes(no_hp):
+            condition |= Q(no_hp__startswith=prefix)
+        if not condition:
+            return []
+        queryset = queryset.filter(condition)
+    if desa_id:
+        queryset = queryset.filter(desa_id=desa_id)
+
+    if not nama:
+        return list(queryset.order_by('nik')[:limit])
+
+    if connections[queryset.db].vendor == 'postgresql':
+        from django.contrib.postgres.search import TrigramWordSimilarity
+
+        return list(
+            queryset.annotate(similarity=TrigramWordSimilarity(nama, 'nama_lengkap'))
+            .filter(Q(nama_lengkap__trigram_word_similar=nama) | Q(nama_lengkap__icontains=nama))
+            .order_by('-similarity', 'nama_lengkap', 'pk')[:limit]
+        )
+
+    scores = get_ngram_index().search(nama)
+    # Substring yang tidak lolos ambang trigram tetap ditemukan, seperti ILIKE
+    for pk in queryset.filter(nama_lengkap__icontains=nama).values_list('pk', flat=True):
+        scores.setdefault(pk, WORD_SIMILARITY_THRESHOLD)
+    ranked = sorted(scores, key=lambda pk: -scores[pk])
+    results = []
+    # Kandidat diambil per potongan sesuai peringkat sampai `limit` terpenuhi
+    for start in range(0, len(ranked), 500):
+        chunk = queryset.in_bulk(ranked[start:start + 500])
+        results.extend(chunk.values())
+        if len(results) >= limit:
+            break
+    results.sort(key=lambda obj: (-scores[obj.pk], obj.nama_lengkap, obj.pk))
+    for obj in results:
+        obj.similarity = scores[obj.pk]
+    return results[:limit]
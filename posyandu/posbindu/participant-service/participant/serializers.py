@@ -2,7 +2,7 @@
 Serializers untuk participant-service.
 """
 from rest_framework import serializers
-from .models import Participant, Visit, Location
+from .models import Participant, Visit, Location, DedupCandidate
 
 
 class LocationSerializer(serializers.ModelSerializer):
@@ -74,3 +74,15 @@ class ParticipantSearchSerializer(serializers.Serializer):
     nama = serializers.CharField(required=False)
     no_hp = serializers.CharField(required=False)
     desa_id = serializers.IntegerField(required=False)
+
+
+class DedupCandidateSerializer(serializers.ModelSerializer):
+    """Serializer untuk kandidat data ganda peserta."""
+
+    class Meta:
+        model = DedupCandidate
+        fields = [
+            'id', 'model_label', 'left_id', 'right_id', 'score', 'matched_on',
+            'status', 'created_at', 'updated_at'
+        ]
+        read_only_fields = fields
@@ -7,12 +7,17 @@ from rest_framework_simplejwt.views import (
     TokenObtainPairView,
     TokenRefreshView,
 )
-from .views import ParticipantViewSet, VisitViewSet, LocationViewSet, UserInfoView
+from .views import (
+    ParticipantViewSet, VisitViewSet, LocationViewSet, UserInfoView, SyncViewSet,
+    DedupCandidateViewSet,
+)
 
 router = DefaultRouter()
 router.register(r'participants', ParticipantViewSet)
 router.register(r'visits', VisitViewSet)
 router.register(r'locations', LocationViewSet)
+router.register(r'sync', SyncViewSet, basename='sync')
+router.register(r'duplicates', DedupCandidateViewSet)
 
 urlpatterns = [
     path('', include(router.urls)),
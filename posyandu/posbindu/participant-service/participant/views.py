@@ -9,14 +9,21 @@ from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 from django.db.models import Q
-from .models import Participant, Visit, Location
+from common.batch import BatchLookupMixin
+from common.related import RelatedLoadsMixin
+from common.conditional import ConditionalGetMixin
+from common.dedup import DuplicateCandidateViewSet
+from common.statistics import StatisticsMixin, Total
+from common.sync import ChangeFeedViewSet, SyncSource
+from .models import Participant, Visit, Location, SyncTombstone, DedupCandidate
+from .search import search_participants
 from .serializers import (
     ParticipantSerializer, ParticipantListSerializer, VisitSerializer,
-    LocationSerializer, ParticipantSearchSerializer
+    LocationSerializer, ParticipantSearchSerializer, DedupCandidateSerializer
 )
 
 
-class LocationViewSet(viewsets.ModelViewSet):
+class LocationViewSet(BatchLookupMixin, RelatedLoadsMixin, viewsets.ModelViewSet):
     """ViewSet untuk model Location."""
     queryset = Location.objects.all()
     serializer_class = LocationSerializer
@@ -27,7 +34,7 @@ class LocationViewSet(viewsets.ModelViewSet):
     ordering = ['nama']
 
 
-class ParticipantViewSet(viewsets.ModelViewSet):
+class ParticipantViewSet(ConditionalGetMixin, StatisticsMixin, BatchLookupMixin, RelatedLoadsMixin, viewsets.ModelViewSet):
     """ViewSet untuk model Participant."""
     queryset = Participant.objects.all()
     serializer_class = ParticipantSerializer
@@ -36,6 +43,22 @@ class ParticipantViewSet(viewsets.ModelViewSet):
     search_fields = ['nik', 'nama_lengkap', 'no_hp']
     ordering_fields = ['nama_lengkap', 'created_at', 'tanggal_lahir']
     ordering = ['-created_at']
+    statistics_spec = {
+        'total_participants': Total(),
+        'by_gender': {
+            'laki_laki': Q(jenis_kelamin='Laki-laki'),
+            'perempuan': Q(jenis_kelamin='Perempuan'),
+        },
+        'by_smoking': {
+            'tidak': Q(status_merokok='Tidak'),
+            'aktif': Q(status_merokok='Aktif'),
+            'eks': Q(status_merokok='Eks'),
+        },
+        'by_bpjs': {
+            'with_bpjs': Q(bpjs=True),
+            'without_bpjs': Q(bpjs=False),
+        },
+    }
     
     def get_serializer_class(self):
         """Menggunakan serializer yang berbeda untuk list dan detail."""
@@ -49,23 +72,7 @@ class ParticipantViewSet(viewsets.ModelViewSet):
         serializer = ParticipantSearchSerializer(data=request.query_params)
         serializer.is_valid(raise_exception=True)
         
-        queryset = self.queryset
-        nik = serializer.validated_data.get('nik')
-        nama = serializer.validated_data.get('nama')
-        no_hp = serializer.validated_data.get('no_hp')
-        desa_id = serializer.validated_data.get('desa_id')
-        
-        if nik:
-            queryset = queryset.filter(nik__icontains=nik)
-        if nama:
-            queryset = queryset.filter(nama_lengkap__icontains=nama)
-        if no_hp:
-            queryset = queryset.filter(no_hp__icontains=no_hp)
-        if desa_id:
-            queryset = queryset.filter(desa_id=desa_id)
-        
-        # Limit hasil untuk performa
-        queryset = queryset[:50]
+        queryset = search_participants(self.queryset, limit=50, **serializer.validated_data)
         
         page = self.paginate_queryset(queryset)
         if page is not None:
@@ -93,34 +100,9 @@ class ParticipantViewSet(viewsets.ModelViewSet):
         
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
-    
-    @action(detail=False, methods=['get'])
-    def statistics(self, request):
-        """Statistik peserta."""
-        total_participants = self.queryset.count()
-        by_gender = {
-            'laki_laki': self.queryset.filter(jenis_kelamin='Laki-laki').count(),
-            'perempuan': self.queryset.filter(jenis_kelamin='Perempuan').count(),
-        }
-        by_smoking = {
-            'tidak': self.queryset.filter(status_merokok='Tidak').count(),
-            'aktif': self.queryset.filter(status_merokok='Aktif').count(),
-            'eks': self.queryset.filter(status_merokok='Eks').count(),
-        }
-        by_bpjs = {
-            'with_bpjs': self.queryset.filter(bpjs=True).count(),
-            'without_bpjs': self.queryset.filter(bpjs=False).count(),
-        }
-        
-        return Response({
-            'total_participants': total_participants,
-            'by_gender': by_gender,
-            'by_smoking': by_smoking,
-            'by_bpjs': by_bpjs,
-        })
 
 
-class VisitViewSet(viewsets.ModelViewSet):
+class VisitViewSet(ConditionalGetMixin, BatchLookupMixin, RelatedLoadsMixin, viewsets.ModelViewSet):
     """ViewSet untuk model Visit."""
     queryset = Visit.objects.all()
     serializer_class = VisitSerializer
@@ -188,3 +170,18 @@ class UserInfoView(APIView):
             'date_joined': user.date_joined,
             'last_login': user.last_login,
         })
+
+
+class SyncViewSet(ChangeFeedViewSet):
+    """Change feed untuk sinkronisasi perangkat offline."""
+    tombstone_model = SyncTombstone
+    sync_sources = {
+        'participants': SyncSource(Participant.objects.all(), ParticipantSerializer),
+        'visits': SyncSource(Visit.objects.all(), VisitSerializer),
+    }
+
+
+class DedupCandidateViewSet(DuplicateCandidateViewSet):
+    """Kandidat data ganda peserta untuk ditinjau petugas."""
+    queryset = DedupCandidate.objects.all()
+    serializer_class = DedupCandidateSerializer
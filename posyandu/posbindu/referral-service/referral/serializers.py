@@ -11,9 +11,12 @@ class ReferralSerializer(serializers.ModelSerializer):
     class Meta:
         model = Referral
         fields = [
-            'id', 'visit', 'fasilitas_tujuan', 'alasan_rujukan', 'prioritas',
-            'status', 'tanggal_rujukan', 'tanggal_tindak_lanjut', 'hasil_rujukan',
-            'catatan', 'created_at', 'updated_at'
+            'id', 'visit_id', 'participant_id', 'fasilitas_tujuan', 'no_rujukan',
+            'tanggal_rujukan', 'alasan_rujukan', 'indikasi_rujukan',
+            'ringkasan_temuan', 'instruksi_khusus', 'jadwal_kontrol_balik',
+            'status_rujukan', 'tanggal_diterima', 'tanggal_selesai',
+            'hasil_rujukan', 'rekomendasi', 'file_rujukan', 'created_at',
+            'updated_at', 'created_by'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
 
@@ -6,20 +6,29 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q, Count
+from django.db.models import Q
+from common.batch import BatchLookupMixin
+from common.related import RelatedLoadsMixin
+from common.conditional import ConditionalGetMixin
+from common.statistics import StatisticsMixin, Total, GroupBy, count_by
 from .models import Referral
 from .serializers import ReferralSerializer, ReferralSearchSerializer
 
 
-class ReferralViewSet(viewsets.ModelViewSet):
+class ReferralViewSet(ConditionalGetMixin, StatisticsMixin, BatchLookupMixin, RelatedLoadsMixin, viewsets.ModelViewSet):
     """ViewSet untuk model Referral."""
     queryset = Referral.objects.all()
     serializer_class = ReferralSerializer
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
-    filterset_fields = ['visit', 'fasilitas_tujuan', 'status', 'prioritas']
+    filterset_fields = ['visit_id', 'participant_id', 'fasilitas_tujuan', 'status_rujukan']
     search_fields = ['visit__participant__nama_lengkap', 'fasilitas_tujuan', 'alasan_rujukan']
     ordering_fields = ['tanggal_rujukan', 'created_at']
     ordering = ['-tanggal_rujukan']
+    statistics_spec = {
+        'total_referral': Total(),
+        'by_status': count_by('status_rujukan', ['dikirim', 'diterima', 'diproses', 'selesai', 'ditolak']),
+        'top_fasilitas': GroupBy('fasilitas_tujuan', top=10),
+    }
     
     @action(detail=False, methods=['get'])
     def by_visit(self, request):
@@ -120,30 +129,3 @@ class ReferralViewSet(viewsets.ModelViewSet):
         
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
-    
-    @action(detail=False, methods=['get'])
-    def statistics(self, request):
-        """Statistik rujukan."""
-        total_referral = self.queryset.count()
-        
-        # Statistik berdasarkan status
-        by_status = {}
-        for choice in Referral.STATUS_CHOICES:
-            by_status[choice[0]] = self.queryset.filter(status=choice[0]).count()
-        
-        # Statistik berdasarkan prioritas
-        by_prioritas = {}
-        for choice in Referral.PRIORITAS_CHOICES:
-            by_prioritas[choice[0]] = self.queryset.filter(prioritas=choice[0]).count()
-        
-        # Top fasilitas tujuan
-        top_fasilitas = self.queryset.values('fasilitas_tujuan').annotate(
-            count=Count('fasilitas_tujuan')
-        ).order_by('-count')[:10]
-        
-        return Response({
-            'total_referral': total_referral,
-            'by_status': by_status,
-            'by_prioritas': by_prioritas,
-            'top_fasilitas': list(top_fasilitas),
-        })
@@ -0,0 +1,159 @@
+"""
+Snapshot dashboard PTM reporting-service.
+
+`build_dashboard()` dijalankan berkala lewat command `build_dashboard`
+(mis. cron) dan menyimpan satu versi baru `DashboardData` berisi paket KPI:
+cakupan, distribusi kategori risiko CVD, rujukan yang belum selesai, dan
+peringatan stok strip lab. Datanya diambil paralel lewat `common.fanout` dari
+action `statistics`/`expiry_horizon` service sumber, masing-masing satu query
+agregat di database service tersebut.
+
+Snapshot hanya dibangun ulang setelah snapshot terakhir kedaluwarsa
+(`DASHBOARD_SNAPSHOT_TTL`). Bila satu service gagal, bagian dashboard dari
+service itu diambil dari snapshot sebelumnya dan statusnya dicatat di
+`sumber`. Action `latest` hanya membaca snapshot ini.
+"""
+from django.conf import settings
+from django.utils import timezone
+
+from common.fanout import ServiceCall, fan_out
+from common.snapshot import snapshot_expiry
+
+from .models import DashboardData
+
+
+# (nama sumber, setting URL service, path endpoint, parameter tambahan)
+DASHBOARD_SOURCES = [
+    ('peserta', 'PARTICIPANT_SERVICE_URL', '/api/participants/statistics/', {}),
+    ('risiko', 'RISK_ASSESSMENT_SERVICE_URL', '/api/assessment/statistics/', {}),
+    ('rujukan', 'REFERRAL_SERVICE_URL', '/api/referral/statistics/', {}),
+    ('stok', 'LAB_SERVICE_URL', '/api/stock/statistics/', {}),
+    ('stok_kedaluwarsa', 'LAB_SERVICE_URL', '/api/stock/expiry_horizon/', {}),
+]
+
+# Status rujukan yang belum selesai ditindaklanjuti
+RUJUKAN_PENDING = ['dikirim', 'diterima', 'diproses']
+# Status rujukan yang sudah ditindaklanjuti fasilitas tujuan
+RUJUKAN_DITINDAKLANJUTI = ['diterima', 'diproses', 'selesai']
+
+
+def _persen(bagian, total):
+    return round(bagian * 100 / total, 1) if total else None
+
+
+def _peserta(stats):
+    return {
+        'total': stats['total_participants'],
+        'laki_laki': stats['by_gender']['laki_laki'],
+        'perempuan': stats['by_gender']['perempuan'],
+        'merokok_aktif': stats['by_smoking']['aktif'],
+    }
+
+
+def _risiko(stats):
+    return {
+        'total_penilaian': stats['total_assessment'],
+        'by_kategori': stats['by_kategori'],
+        'perlu_rujukan': stats['by_rujukan']['perlu_rujukan'],
+        'rata_rata_skor': stats['rata_rata_skor'],
+    }
+
+
+def _rujukan(stats):
+    return {
+        'total': stats['total_referral'],
+        'pending': sum(stats['by_status'][status] for status in RUJUKAN_PENDING),
+        'selesai': stats['by_status']['selesai'],
+        'ditindaklanjuti': sum(stats['by_status'][status] for status in RUJUKAN_DITINDAKLANJUTI),
+        'by_status': stats['by_status'],
+    }
+
+
+def _peringatan_stok(stats, horizon):
+    result = {
+        'horizon_minggu': settings.DASHBOARD_STOK_WEEKS,
+        'stok_rendah': stats['low_stock_count'],
+        'lot_kedaluwarsa': 0,
+        'unit_kedaluwarsa': 0,
+        'lot_akan_kedaluwarsa': 0,
+        'unit_akan_kedaluwarsa': 0,
+    }
+    for bucket in horizon['buckets']:
+        kunci = 'kedaluwarsa' if bucket['minggu_ke'] == 0 else 'akan_kedaluwarsa'
+        result[f'lot_{kunci}'] += bucket['jumlah_lot']
+        result[f'unit_{kunci}'] += bucket['jumlah_unit']
+    return result
+
+
+# bagian dashboard -> (sumber yang dibutuhkan, fungsi pembentuk)
+SECTIONS = {
+    'peserta': (['peserta'], _peserta),
+    'distribusi_risiko': (['risiko'], _risiko),
+    'rujukan': (['rujukan'], _rujukan),
+    'peringatan_stok': (['stok', 'stok_kedaluwarsa'], _peringatan_stok),
+}
+
+
+def dashboard_calls():
+    """Daftar `ServiceCall` untuk satu build snapshot."""
+    calls = []
+    for name, setting, path, params in DASHBOARD_SOURCES:
+        if name == 'stok_kedaluwarsa':
+            params = {**params, 'weeks': settings.DASHBOARD_STOK_WEEKS}
+        url = getattr(settings, setting).rstrip('/') + path
+        calls.append(ServiceCall(name, url, params))
+    return calls
+
+
+def build_sections(results, previous=None):
+    """
+    Membentuk bagian dashboard dari hasil fan-out. Bagian yang sumbernya
+    gagal atau formatnya tidak dikenali diambil dari snapshot `previous`.
+    """
+    data = {}
+    for section, (sources, build) in SECTIONS.items():
+        if all(results[name].ok for name in sources):
+            try:
+                data[section] = build(*(results[name].data for name in sources))
+                continue
+            except (KeyError, TypeError):
+                pass
+        if previous is not None and section in previous.data_dashboard:
+            data[section] = previous.data_dashboard[section]
+
+    peserta = data.get('peserta', {})
+    risiko = data.get('distribusi_risiko', {})
+    rujukan = data.get('rujukan', {})
+    data['cakupan'] = {
+        'peserta_dinilai_risiko_persen': _persen(
+            risiko.get('total_penilaian', 0), peserta.get('total', 0)
+        ),
+        # Rujukan yang ditindaklanjuti dibanding penilaian berflag rujukan.
+        # Keduanya tidak dipasangkan per peserta (data ada di service
+        # berbeda), sehingga rasio dibatasi 100%.
+        'rujukan_ditindaklanjuti_persen': _persen(
+            min(rujukan.get('ditindaklanjuti', 0), risiko.get('perlu_rujukan', 0)),
+            risiko.get('perlu_rujukan', 0),
+        ),
+        'rujukan_selesai_persen': _persen(rujukan.get('selesai', 0), rujukan.get('total', 0)),
+    }
+    return data
+
+
+def build_dashboard(force=False):
+    """
+    Menyimpan snapshot baru bila snapshot terakhir sudah kedaluwarsa (atau
+    `force`). Mengembalikan snapshot baru, atau None bila tidak perlu.
+    """
+    now = timezone.now()
+    previous = DashboardData.objects.order_by('-created_at').first()
+    if not force and previous is not None and previous.kedaluwarsa_pada and previous.kedaluwarsa_pada > now:
+        return None
+
+    results = fan_out(dashboard_calls())
+    return DashboardData.objects.create(
+        data_dashboard=build_sections(results, previous),
+        versi=previous.versi + 1 if previous else 1,
+        sumber={name: result.summary() for name, result in results.items()},
+        kedaluwarsa_pada=snapshot_expiry(settings.DASHBOARD_SNAPSHOT_TTL, now),
+    )
@@ -0,0 +1,33 @@
+"""
+Command untuk membangun snapshot DashboardData dari service POS BINDU.
+
+Contoh::
+
+    python manage.py build_dashboard            # hanya bila snapshot terakhir kedaluwarsa
+    python manage.py build_dashboard --force
+"""
+from django.core.management.base import BaseCommand
+
+from reporting.dashboard import build_dashboard
+
+
+class Command(BaseCommand):
+    help = 'Bangun snapshot dashboard PTM dari participant, risk-assessment, referral, dan lab service.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Bangun snapshot baru walau snapshot terakhir belum kedaluwarsa'
+        )
+
+    def handle(self, *args, **options):
+        snapshot = build_dashboard(force=options['force'])
+        if snapshot is None:
+            self.stdout.write('Snapshot terakhir masih berlaku, tidak ada yang dibangun')
+            return
+        for sumber, summary in snapshot.sumber.items():
+            if summary['status'] != 'ok':
+                self.stderr.write(self.style.ERROR(
+                    f"{sumber}: {summary['status']} ({summary.get('error', '')})"
+                ))
+        self.stdout.write(self.style.SUCCESS(f'Snapshot dashboard versi {snapshot.versi} tersimpan'))
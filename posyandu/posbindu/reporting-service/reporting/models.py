@@ -134,7 +134,7 @@ class ActivityLog(models.Model):
             models.Index(fields=['user_id']),
             models.Index(fields=['modul']),
             models.Index(fields=['jenis_aktivitas']),
-            models.Index(fields=['created_at']),
+            models.Index(fields=['created_at', 'id']),
         ]
     
     def __str__(self):
@@ -142,13 +142,32 @@ class ActivityLog(models.Model):
 
 
 class DashboardData(models.Model):
-    """Model untuk data dashboard."""
+    """
+    Model untuk snapshot dashboard PTM (paket KPI). Diisi oleh command
+    `build_dashboard`; setiap build menyimpan versi baru.
+    """
     
     # Data dashboard
     data_dashboard = models.JSONField(
         help_text="Data dashboard dalam format JSON"
     )
     
+    # Versi snapshot
+    versi = models.PositiveIntegerField(
+        default=1,
+        help_text="Bertambah setiap kali snapshot dibangun ulang"
+    )
+    sumber = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Status pengambilan data per service sumber"
+    )
+    kedaluwarsa_pada = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Setelah waktu ini snapshot dibangun ulang"
+    )
+    
     # Metadata
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -160,4 +179,4 @@ class DashboardData(models.Model):
         ]
     
     def __str__(self):
-        return f"Dashboard Data - {self.created_at}"
+        return f"Dashboard Data v{self.versi} - {self.created_at}"
@@ -35,9 +35,10 @@ class DashboardDataSerializer(serializers.ModelSerializer):
     class Meta:
         model = DashboardData
         fields = [
-            'id', 'data_dashboard', 'created_at', 'updated_at'
+            'id', 'data_dashboard', 'versi', 'sumber', 'kedaluwarsa_pada',
+            'created_at', 'updated_at'
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'versi', 'sumber', 'kedaluwarsa_pada', 'created_at', 'updated_at']
 
 
 class ReportLogSearchSerializer(serializers.Serializer):
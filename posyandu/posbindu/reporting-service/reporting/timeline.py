@@ -0,0 +1,112 @@
+"""
+Timeline riwayat satu peserta dari seluruh service POS BINDU.
+
+Data kunjungan (participant-service) dan hasil pemeriksaan, lab, skrining,
+penilaian risiko, intervensi, serta rujukan diambil paralel lewat
+`common.fanout`, lalu digabung per `visit_id` dan diurutkan dari kunjungan
+terbaru. Service yang gagal atau lambat hanya membuat bagiannya kosong;
+statusnya dilaporkan di `sources` dan respons ditandai `partial`.
+"""
+import time
+
+from django.conf import settings
+
+from common.fanout import ServiceCall, fan_out
+
+
+# (nama bagian timeline, setting URL service, path endpoint, parameter tambahan)
+TIMELINE_SOURCES = [
+    ('vital_signs', 'EXAMINATION_SERVICE_URL', '/api/vital-signs/', {'pagination': 'cursor', 'page_size': 500}),
+    ('anthropometry', 'EXAMINATION_SERVICE_URL', '/api/anthropometry/', {}),
+    ('lab', 'LAB_SERVICE_URL', '/api/result/', {'pagination': 'cursor', 'page_size': 500}),
+    ('anamnesis', 'SCREENING_SERVICE_URL', '/api/anamnesis/', {}),
+    ('risk_assessment', 'RISK_ASSESSMENT_SERVICE_URL', '/api/assessment/', {}),
+    ('intervention', 'INTERVENTION_SERVICE_URL', '/api/intervention/', {}),
+    ('referral', 'REFERRAL_SERVICE_URL', '/api/referral/', {}),
+]
+SECTIONS = [name for name, *_ in TIMELINE_SOURCES]
+
+
+def _service_url(setting, path):
+    return getattr(settings, setting).rstrip('/') + path
+
+
+def timeline_calls(participant_id, timeout=None):
+    """Daftar `ServiceCall` untuk timeline satu peserta."""
+    calls = [
+        ServiceCall(
+            'participant',
+            _service_url('PARTICIPANT_SERVICE_URL', f'/api/participants/{participant_id}/'),
+            timeout=timeout,
+        ),
+        ServiceCall(
+            'visits',
+            _service_url('PARTICIPANT_SERVICE_URL', '/api/visits/'),
+            {'participant': participant_id},
+            timeout=timeout,
+        ),
+    ]
+    for name, setting, path, params in TIMELINE_SOURCES:
+        calls.append(ServiceCall(
+            name, _service_url(setting, path), {'participant_id': participant_id, **params}, timeout=timeout
+        ))
+    return calls
+
+
+def _new_entry(visit_id, tanggal=None, status=None):
+    entry = {'visit_id': visit_id, 'tanggal': tanggal, 'status': status}
+    entry.update({section: [] for section in SECTIONS})
+    return entry
+
+
+def merge_timeline(visits, sections):
+    """
+    Menggabungkan kunjungan dan data per bagian (`nama -> list baris`) per
+    `visit_id`. Baris tanpa kunjungan yang dikenal (mis. participant-service
+    tidak merespons) tetap dikelompokkan dengan tanggal dari `created_at`.
+    """
+    entries = {}
+    for visit in visits:
+        entries[visit['id']] = _new_entry(visit['id'], visit.get('pos_date'), visit.get('status'))
+
+    for section, rows in sections.items():
+        for row in rows:
+            visit_id = row.get('visit_id')
+            entry = entries.get(visit_id)
+            if entry is None:
+                entry = entries[visit_id] = _new_entry(visit_id)
+            entry[section].append(row)
+
+    for entry in entries.values():
+        if entry['tanggal'] is None:
+            created = [row['created_at'] for section in SECTIONS for row in entry[section] if row.get('created_at')]
+            entry['tanggal'] = min(created)[:10] if created else None
+
+    return sorted(
+        entries.values(),
+        key=lambda entry: (entry['tanggal'] or '', entry['visit_id'] or 0),
+        reverse=True,
+    )
+
+
+def build_timeline(participant_id, headers=None, timeout=None):
+    """
+    Mengembalikan `(status_code, data)` timeline peserta. 404 bila
+    participant-service menyatakan peserta tidak ada.
+    """
+    started = time.perf_counter()
+    results = fan_out(timeline_calls(participant_id, timeout), headers)
+
+    participant = results['participant']
+    if participant.status == 'not_found':
+        return 404, {'error': 'participant not found'}
+
+    visits = results['visits'].data if results['visits'].ok else []
+    sections = {name: results[name].data for name in SECTIONS if results[name].ok}
+    return 200, {
+        'participant': participant.data if participant.ok else None,
+        'timeline': merge_timeline(visits, sections),
+        'partial': not all(result.ok for result in results.values()),
+        'sources': {name: result.summary() for name, result in results.items()},
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 1),
+    }
@@ -3,12 +3,13 @@ URLs untuk reporting-service.
 """
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import ReportLogViewSet, ActivityLogViewSet, DashboardDataViewSet
+from .views import ReportLogViewSet, ActivityLogViewSet, DashboardDataViewSet, TimelineViewSet
 
 router = DefaultRouter()
 router.register(r'report-log', ReportLogViewSet)
 router.register(r'activity-log', ActivityLogViewSet)
 router.register(r'dashboard', DashboardDataViewSet)
+router.register(r'timeline', TimelineViewSet, basename='timeline')
 
 urlpatterns = [
     path('', include(router.urls)),
@@ -6,12 +6,25 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
+from django.conf import settings
 from django.db.models import Q, Count
+from common.batch import BatchLookupMixin
+from common.related import RelatedLoadsMixin
+from common.conditional import ConditionalGetMixin
+from common.fanout import forwarded_headers
+from common.pagination import KeysetPagination
+from common.snapshot import SnapshotCache
+from common.statistics import StatisticsMixin, Total, count_by
 from .models import ReportLog, ActivityLog, DashboardData
 from .serializers import ReportLogSerializer, ActivityLogSerializer, DashboardDataSerializer, ReportLogSearchSerializer
+from .timeline import build_timeline
 
 
-class ReportLogViewSet(viewsets.ModelViewSet):
+# Snapshot dashboard terbaru yang sudah dibaca, di memori proses
+_latest_cache = SnapshotCache(ttl=settings.DASHBOARD_CACHE_TTL)
+
+
+class ReportLogViewSet(ConditionalGetMixin, StatisticsMixin, BatchLookupMixin, RelatedLoadsMixin, viewsets.ModelViewSet):
     """ViewSet untuk model ReportLog."""
     queryset = ReportLog.objects.all()
     serializer_class = ReportLogSerializer
@@ -20,6 +33,11 @@ class ReportLogViewSet(viewsets.ModelViewSet):
     search_fields = ['nama_laporan']
     ordering_fields = ['tanggal_mulai', 'tanggal_akhir', 'created_at']
     ordering = ['-created_at']
+    statistics_spec = {
+        'total_laporan': Total(),
+        'by_jenis': count_by('jenis_laporan', ReportLog.JENIS_LAPORAN_CHOICES),
+        'by_status': count_by('status', ReportLog.STATUS_CHOICES),
+    }
     
     @action(detail=False, methods=['get'])
     def by_jenis(self, request):
@@ -58,30 +76,9 @@ class ReportLogViewSet(viewsets.ModelViewSet):
         
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
-    
-    @action(detail=False, methods=['get'])
-    def statistics(self, request):
-        """Statistik laporan."""
-        total_laporan = self.queryset.count()
-        
-        # Statistik berdasarkan jenis laporan
-        by_jenis = {}
-        for choice in ReportLog.JENIS_LAPORAN_CHOICES:
-            by_jenis[choice[0]] = self.queryset.filter(jenis_laporan=choice[0]).count()
-        
-        # Statistik berdasarkan status
-        by_status = {}
-        for choice in ReportLog.STATUS_CHOICES:
-            by_status[choice[0]] = self.queryset.filter(status=choice[0]).count()
-        
-        return Response({
-            'total_laporan': total_laporan,
-            'by_jenis': by_jenis,
-            'by_status': by_status,
-        })
 
 
-class ActivityLogViewSet(viewsets.ModelViewSet):
+class ActivityLogViewSet(StatisticsMixin, BatchLookupMixin, RelatedLoadsMixin, viewsets.ModelViewSet):
     """ViewSet untuk model ActivityLog."""
     queryset = ActivityLog.objects.all()
     serializer_class = ActivityLogSerializer
@@ -90,6 +87,13 @@ class ActivityLogViewSet(viewsets.ModelViewSet):
     search_fields = ['deskripsi']
     ordering_fields = ['created_at']
     ordering = ['-created_at']
+    pagination_class = KeysetPagination
+    cursor_ordering = ('-created_at', '-id')
+    statistics_spec = {
+        'total_activity': Total(),
+        'by_modul': count_by('modul', ActivityLog.MODUL_CHOICES),
+        'by_jenis': count_by('jenis_aktivitas', ActivityLog.JENIS_AKTIVITAS_CHOICES),
+    }
     
     @action(detail=False, methods=['get'])
     def by_user(self, request):
@@ -128,30 +132,9 @@ class ActivityLogViewSet(viewsets.ModelViewSet):
         
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
-    
-    @action(detail=False, methods=['get'])
-    def statistics(self, request):
-        """Statistik log aktivitas."""
-        total_activity = self.queryset.count()
-        
-        # Statistik berdasarkan modul
-        by_modul = {}
-        for choice in ActivityLog.MODUL_CHOICES:
-            by_modul[choice[0]] = self.queryset.filter(modul=choice[0]).count()
-        
-        # Statistik berdasarkan jenis aktivitas
-        by_jenis = {}
-        for choice in ActivityLog.JENIS_AKTIVITAS_CHOICES:
-            by_jenis[choice[0]] = self.queryset.filter(jenis_aktivitas=choice[0]).count()
-        
-        return Response({
-            'total_activity': total_activity,
-            'by_modul': by_modul,
-            'by_jenis': by_jenis,
-        })
 
 
-class DashboardDataViewSet(viewsets.ModelViewSet):
+class DashboardDataViewSet(ConditionalGetMixin, BatchLookupMixin, RelatedLoadsMixin, viewsets.ModelViewSet):
     """ViewSet untuk model DashboardData."""
     queryset = DashboardData.objects.all()
     serializer_class = DashboardDataSerializer
@@ -161,12 +144,28 @@ class DashboardDataViewSet(viewsets.ModelViewSet):
     
     @action(detail=False, methods=['get'])
     def latest(self, request):
-        """Mengambil data dashboard terbaru."""
-        queryset = self.queryset.order_by('-created_at')[:1]
-        page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-        
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        """
+        Snapshot dashboard terbaru dari `build_dashboard`, disimpan di cache
+        in-process selama `DASHBOARD_CACHE_TTL` detik.
+        """
+        def load():
+            queryset = self.queryset.order_by('-created_at')[:1]
+            return list(self.get_serializer(queryset, many=True).data)
+
+        return Response(_latest_cache.get_or_load('latest', load))
+
+
+class TimelineViewSet(viewsets.ViewSet):
+    """
+    Timeline riwayat peserta lintas service: `GET /api/timeline/<participant_id>/`.
+
+    Data diambil paralel dari participant, examination, lab, screening,
+    risk-assessment, intervention, dan referral service, lalu digabung per
+    kunjungan (`reporting/timeline.py`).
+    """
+    lookup_value_regex = r'[0-9]+'
+
+    def retrieve(self, request, pk=None):
+        """Timeline satu peserta, kunjungan terbaru lebih dulu."""
+        status_code, data = build_timeline(int(pk), headers=forwarded_headers(request))
+        return Response(data, status=status_code)
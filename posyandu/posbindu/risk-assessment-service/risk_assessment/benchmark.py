@@ -0,0 +1,48 @@
+"""
+Data benchmark risk-assessment-service: satu penilaian risiko per kunjungan.
+
+Kunjungan, umur, dan jenis kelamin mengikuti `SeedContext.visit()` dan
+`SeedContext.participant()`. Skor, kategori, rujukan, dan rekomendasi
+dihitung dengan `apply_scores()` per batch, sama seperti skoring biasa.
+"""
+from decimal import Decimal
+
+from .models import RiskAssessment
+from .scoring import apply_scores
+
+
+MODELS = [RiskAssessment]
+
+
+def _assessment_rows(ctx):
+    rng = ctx.random('risk')
+    visit_count = ctx.count('visit')
+    for number in range(1, ctx.count('risk') + 1):
+        visit_id = (number - 1) % visit_count + 1
+        visit = ctx.visit(visit_id)
+        participant = ctx.participant(visit.participant_id)
+        umur = (visit.pos_date - participant.tanggal_lahir).days // 365
+        sistol = int(rng.gauss(110 + umur * 0.5, 18))
+        yield RiskAssessment(
+            id=number,
+            visit_id=visit_id,
+            participant_id=visit.participant_id,
+            umur=umur,
+            jenis_kelamin=participant.jenis_kelamin,
+            td_sistol=sistol,
+            td_diastol=int(sistol * rng.uniform(0.55, 0.7)),
+            merokok=rng.random() < 0.3,
+            diabetes=rng.random() < 0.08,
+            kolesterol_total=Decimal(f'{max(rng.gauss(200, 40), 100):.2f}'),
+            hdl=Decimal(f'{max(rng.gauss(50, 12), 20):.2f}'),
+            imt=Decimal(f'{min(max(rng.gauss(24, 4), 15), 45):.1f}'),
+            lingkar_perut=Decimal(f'{max(rng.gauss(85, 12), 55):.1f}'),
+            # Diisi ulang oleh apply_scores()
+            skor_risiko_cvd=Decimal(0),
+            kategori_risiko='Rendah',
+            created_by=1,
+        )
+
+
+def seed(ctx):
+    ctx.bulk_insert(RiskAssessment, _assessment_rows(ctx), prepare=apply_scores)
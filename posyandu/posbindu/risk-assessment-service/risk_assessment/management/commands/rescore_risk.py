@@ -0,0 +1,41 @@
+"""
+Command untuk menghitung ulang skor risiko kardiovaskular secara batch.
+
+Contoh::
+
+    python manage.py rescore_risk
+    python manage.py rescore_risk --participant-id 12 --dry-run
+"""
+from django.core.management.base import BaseCommand
+
+from risk_assessment.models import RiskAssessment
+from risk_assessment.scoring import rescore_queryset
+
+
+class Command(BaseCommand):
+    help = 'Menghitung ulang skor, kategori, rujukan, dan rekomendasi RiskAssessment.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--participant-id', type=int, help='Batasi ke satu peserta')
+        parser.add_argument('--kategori', help='Batasi ke kategori risiko saat ini')
+        parser.add_argument('--batch-size', type=int, default=2000, help='Jumlah baris per batch')
+        parser.add_argument('--dry-run', action='store_true', help='Hitung tanpa menyimpan perubahan')
+
+    def handle(self, *args, **options):
+        queryset = RiskAssessment.objects.all()
+        if options['participant_id']:
+            queryset = queryset.filter(participant_id=options['participant_id'])
+        if options['kategori']:
+            queryset = queryset.filter(kategori_risiko=options['kategori'])
+
+        summary = rescore_queryset(
+            queryset, batch_size=options['batch_size'], dry_run=options['dry_run']
+        )
+
+        verb = 'akan diperbarui' if summary['dry_run'] else 'diperbarui'
+        self.stdout.write(self.style.SUCCESS(
+            f"{summary['processed']} penilaian diproses, {summary['updated']} {verb} "
+            f"dalam {summary['duration_ms']} ms"
+        ))
+        for kategori, jumlah in summary['by_kategori'].items():
+            self.stdout.write(f"  {kategori}: {jumlah}")
@@ -111,147 +111,17 @@ class RiskAssessment(models.Model):
     
     def calculate_cvd_risk(self):
         """Menghitung skor risiko kardiovaskular 10-tahun."""
-        # Implementasi sederhana berdasarkan faktor risiko
-        # Dalam implementasi nyata, gunakan chart WHO/CVD yang lebih akurat
-        
-        risk_score = 0
-        
-        # Faktor umur
-        if self.umur >= 60:
-            risk_score += 3
-        elif self.umur >= 50:
-            risk_score += 2
-        elif self.umur >= 40:
-            risk_score += 1
-        
-        # Faktor jenis kelamin
-        if self.jenis_kelamin == 'Laki-laki':
-            risk_score += 1
-        
-        # Faktor tekanan darah
-        if self.td_sistol >= 180 or self.td_diastol >= 110:
-            risk_score += 4
-        elif self.td_sistol >= 160 or self.td_diastol >= 100:
-            risk_score += 3
-        elif self.td_sistol >= 140 or self.td_diastol >= 90:
-            risk_score += 2
-        elif self.td_sistol >= 130 or self.td_diastol >= 80:
-            risk_score += 1
-        
-        # Faktor merokok
-        if self.merokok:
-            risk_score += 2
-        
-        # Faktor diabetes
-        if self.diabetes:
-            risk_score += 2
-        
-        # Faktor kolesterol
-        if self.kolesterol_total:
-            if self.kolesterol_total >= 240:
-                risk_score += 2
-            elif self.kolesterol_total >= 200:
-                risk_score += 1
-        
-        # Faktor HDL
-        if self.hdl:
-            if self.hdl < 40:
-                risk_score += 1
-        
-        # Faktor IMT
-        if self.imt:
-            if self.imt >= 30:
-                risk_score += 2
-            elif self.imt >= 25:
-                risk_score += 1
-        
-        # Faktor lingkar perut
-        if self.lingkar_perut:
-            if self.jenis_kelamin == 'Laki-laki' and self.lingkar_perut >= 90:
-                risk_score += 1
-            elif self.jenis_kelamin == 'Perempuan' and self.lingkar_perut >= 80:
-                risk_score += 1
-        
-        self.skor_risiko_cvd = risk_score
-        
-        # Kategorisasi risiko
-        if risk_score <= 2:
-            self.kategori_risiko = 'Rendah'
-        elif risk_score <= 4:
-            self.kategori_risiko = 'Sedang'
-        elif risk_score <= 6:
-            self.kategori_risiko = 'Tinggi'
-        else:
-            self.kategori_risiko = 'Sangat Tinggi'
-        
-        # Tentukan flag rujukan
-        self._determine_referral_flag()
+        # Aturan skor berada di scoring.py agar sama dengan skoring batch
+        from .scoring import apply_scores
         
+        apply_scores([self])
         self.save()
-        return risk_score
-    
-    def _determine_referral_flag(self):
-        """Menentukan apakah perlu rujukan."""
-        reasons = []
-        
-        # Kriteria rujukan berdasarkan tekanan darah
-        if self.td_sistol >= 180 or self.td_diastol >= 110:
-            reasons.append("Tekanan darah krisis")
-        
-        # Kriteria rujukan berdasarkan skor risiko
-        if self.skor_risiko_cvd >= 6:
-            reasons.append("Skor risiko tinggi")
-        
-        # Kriteria rujukan berdasarkan diabetes
-        if self.diabetes and self.td_sistol >= 140:
-            reasons.append("Diabetes dengan hipertensi")
-        
-        # Kriteria rujukan berdasarkan kolesterol
-        if self.kolesterol_total and self.kolesterol_total >= 240:
-            reasons.append("Kolesterol sangat tinggi")
-        
-        if reasons:
-            self.flag_rujukan = True
-            self.alasan_rujukan = "; ".join(reasons)
-        else:
-            self.flag_rujukan = False
-            self.alasan_rujukan = ""
+        return int(self.skor_risiko_cvd)
     
     def generate_recommendations(self):
         """Membuat rekomendasi berdasarkan penilaian risiko."""
-        recommendations = []
-        
-        # Rekomendasi berdasarkan tekanan darah
-        if self.td_sistol >= 140 or self.td_diastol >= 90:
-            recommendations.append("Kontrol tekanan darah dengan diet rendah garam dan olahraga teratur")
-        
-        # Rekomendasi berdasarkan merokok
-        if self.merokok:
-            recommendations.append("Berhenti merokok untuk mengurangi risiko kardiovaskular")
-        
-        # Rekomendasi berdasarkan diabetes
-        if self.diabetes:
-            recommendations.append("Kontrol gula darah dengan diet dan obat sesuai anjuran dokter")
-        
-        # Rekomendasi berdasarkan kolesterol
-        if self.kolesterol_total and self.kolesterol_total >= 200:
-            recommendations.append("Diet rendah lemak dan konsultasi untuk pengobatan kolesterol")
-        
-        # Rekomendasi berdasarkan IMT
-        if self.imt and self.imt >= 25:
-            recommendations.append("Turunkan berat badan dengan diet seimbang dan olahraga")
-        
-        # Rekomendasi berdasarkan lingkar perut
-        if self.lingkar_perut:
-            if self.jenis_kelamin == 'Laki-laki' and self.lingkar_perut >= 90:
-                recommendations.append("Kurangi lingkar perut dengan olahraga dan diet")
-            elif self.jenis_kelamin == 'Perempuan' and self.lingkar_perut >= 80:
-                recommendations.append("Kurangi lingkar perut dengan olahraga dan diet")
-        
-        # Rekomendasi umum
-        if self.kategori_risiko in ['Tinggi', 'Sangat Tinggi']:
-            recommendations.append("Konsultasi rutin dengan dokter untuk monitoring")
+        from .scoring import apply_scores
         
-        self.rekomendasi = "; ".join(recommendations)
+        apply_scores([self])
         self.save()
         return self.rekomendasi
@@ -3,6 +3,7 @@ Serializers untuk risk-assessment-service.
 """
 from rest_framework import serializers
 from .models import RiskAssessment
+from .scoring import apply_scores
 
 
 class RiskAssessmentSerializer(serializers.ModelSerializer):
@@ -11,14 +12,40 @@ class RiskAssessmentSerializer(serializers.ModelSerializer):
     class Meta:
         model = RiskAssessment
         fields = [
-            'id', 'visit', 'jenis_penilaian', 'skor_total', 'kategori_risiko',
-            'rekomendasi', 'tindak_lanjut', 'catatan', 'created_at', 'updated_at'
+            'id', 'visit_id', 'participant_id', 'umur', 'jenis_kelamin',
+            'td_sistol', 'td_diastol', 'merokok', 'diabetes', 'kolesterol_total',
+            'hdl', 'imt', 'lingkar_perut', 'skor_risiko_cvd', 'kategori_risiko',
+            'flag_rujukan', 'alasan_rujukan', 'rekomendasi',
+            'created_at', 'updated_at', 'created_by'
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        # Hasil penilaian selalu dihitung dari data klinis
+        read_only_fields = [
+            'id', 'skor_risiko_cvd', 'kategori_risiko', 'flag_rujukan',
+            'alasan_rujukan', 'rekomendasi', 'created_at', 'updated_at'
+        ]
+    
+    def create(self, validated_data):
+        instance = RiskAssessment(**validated_data)
+        apply_scores([instance])
+        instance.save()
+        return instance
+    
+    def update(self, instance, validated_data):
+        for field, value in validated_data.items():
+            setattr(instance, field, value)
+        apply_scores([instance])
+        instance.save()
+        return instance
 
 
 class RiskAssessmentSearchSerializer(serializers.Serializer):
     """Serializer untuk pencarian risk assessment."""
     visit_id = serializers.IntegerField(required=False)
-    jenis_penilaian = serializers.CharField(required=False)
+    participant_id = serializers.IntegerField(required=False)
     kategori_risiko = serializers.CharField(required=False)
+
+
+class RescoreSerializer(serializers.Serializer):
+    """Serializer untuk parameter skoring ulang."""
+    dry_run = serializers.BooleanField(required=False, default=False)
+    batch_size = serializers.IntegerField(required=False, default=2000, min_value=100, max_value=10000)
@@ -7,19 +7,33 @@ from rest_framework.response import Response
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
 from django.db.models import Q, Count, Avg
+from common.batch import BatchLookupMixin
+from common.related import RelatedLoadsMixin
+from common.conditional import ConditionalGetMixin
+from common.statistics import StatisticsMixin, Stat, Total, count_by
 from .models import RiskAssessment
-from .serializers import RiskAssessmentSerializer, RiskAssessmentSearchSerializer
+from .scoring import rescore_queryset
+from .serializers import RiskAssessmentSerializer, RiskAssessmentSearchSerializer, RescoreSerializer
 
 
-class RiskAssessmentViewSet(viewsets.ModelViewSet):
+class RiskAssessmentViewSet(ConditionalGetMixin, StatisticsMixin, BatchLookupMixin, RelatedLoadsMixin, viewsets.ModelViewSet):
     """ViewSet untuk model RiskAssessment."""
     queryset = RiskAssessment.objects.all()
     serializer_class = RiskAssessmentSerializer
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
-    filterset_fields = ['visit', 'jenis_penilaian', 'kategori_risiko']
-    search_fields = ['visit__participant__nama_lengkap', 'jenis_penilaian', 'rekomendasi']
-    ordering_fields = ['created_at', 'skor_total']
+    filterset_fields = ['visit_id', 'participant_id', 'kategori_risiko', 'flag_rujukan']
+    search_fields = ['alasan_rujukan', 'rekomendasi']
+    ordering_fields = ['created_at', 'skor_risiko_cvd']
     ordering = ['-created_at']
+    statistics_spec = {
+        'total_assessment': Total(),
+        'by_kategori': count_by('kategori_risiko', ['Rendah', 'Sedang', 'Tinggi', 'Sangat Tinggi']),
+        'by_rujukan': {
+            'perlu_rujukan': Q(flag_rujukan=True),
+            'tidak_perlu_rujukan': Q(flag_rujukan=False),
+        },
+        'rata_rata_skor': Stat(Avg('skor_risiko_cvd'), default=0, digits=2),
+    }
     
     @action(detail=False, methods=['get'])
     def by_visit(self, request):
@@ -41,16 +55,16 @@ class RiskAssessmentViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
     
     @action(detail=False, methods=['get'])
-    def by_jenis(self, request):
-        """Mengambil penilaian risiko berdasarkan jenis penilaian."""
-        jenis_penilaian = request.query_params.get('jenis_penilaian')
-        if not jenis_penilaian:
+    def by_participant(self, request):
+        """Mengambil penilaian risiko berdasarkan peserta."""
+        participant_id = request.query_params.get('participant_id')
+        if not participant_id:
             return Response(
-                {'error': 'jenis_penilaian parameter is required'}, 
+                {'error': 'participant_id parameter is required'}, 
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        queryset = self.queryset.filter(jenis_penilaian=jenis_penilaian)
+        queryset = self.queryset.filter(participant_id=participant_id)
         page = self.paginate_queryset(queryset)
         if page is not None:
             serializer = self.get_serializer(page, many=True)
@@ -90,27 +104,17 @@ class RiskAssessmentViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
     
-    @action(detail=False, methods=['get'])
-    def statistics(self, request):
-        """Statistik penilaian risiko."""
-        total_assessment = self.queryset.count()
-        
-        # Statistik berdasarkan kategori risiko
-        by_kategori = {}
-        for choice in RiskAssessment.KATEGORI_RISIKO_CHOICES:
-            by_kategori[choice[0]] = self.queryset.filter(kategori_risiko=choice[0]).count()
-        
-        # Statistik berdasarkan jenis penilaian
-        by_jenis = {}
-        for choice in RiskAssessment.JENIS_PENILAIAN_CHOICES:
-            by_jenis[choice[0]] = self.queryset.filter(jenis_penilaian=choice[0]).count()
+    @action(detail=False, methods=['post'])
+    def rescore(self, request):
+        """
+        Menghitung ulang skor, kategori, rujukan, dan rekomendasi secara batch.
         
-        # Rata-rata skor
-        avg_skor = self.queryset.aggregate(avg=Avg('skor_total'))['avg'] or 0
+        Filter list (mis. `?participant_id=`) ikut diterapkan; tanpa filter
+        seluruh data dihitung ulang.
+        """
+        serializer = RescoreSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
         
-        return Response({
-            'total_assessment': total_assessment,
-            'by_kategori': by_kategori,
-            'by_jenis': by_jenis,
-            'rata_rata_skor': round(avg_skor, 2),
-        })
+        queryset = self.filter_queryset(self.get_queryset())
+        summary = rescore_queryset(queryset, **serializer.validated_data)
+        return Response(summary)
@@ -7,19 +7,35 @@ from rest_framework.response import Response
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
 from django.db.models import Q
+from common.batch import BatchLookupMixin
+from common.related import RelatedLoadsMixin
+from common.conditional import ConditionalGetMixin
+from common.statistics import StatisticsMixin, Total, GroupBy
 from .models import Anamnesis
 from .serializers import AnamnesisSerializer, AnamnesisSearchSerializer
 
 
-class AnamnesisViewSet(viewsets.ModelViewSet):
+class AnamnesisViewSet(ConditionalGetMixin, StatisticsMixin, BatchLookupMixin, RelatedLoadsMixin, viewsets.ModelViewSet):
     """ViewSet untuk model Anamnesis."""
     queryset = Anamnesis.objects.all()
     serializer_class = AnamnesisSerializer
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
-    filterset_fields = ['visit', 'keluhan_utama']
+    filterset_fields = ['visit_id', 'participant_id']
     search_fields = ['visit__participant__nama_lengkap', 'keluhan_utama', 'keluhan_tambahan']
     ordering_fields = ['created_at']
     ordering = ['-created_at']
+    statistics_spec = {
+        'total_anamnesis': Total(),
+        'by_keluhan': {
+            'pusing': Q(keluhan_pusing=True),
+            'nyeri_dada': Q(keluhan_nyeri_dada=True),
+            'sesak': Q(keluhan_sesak=True),
+            'poliuria': Q(keluhan_poliuria=True),
+            'polidipsia': Q(keluhan_polidipsia=True),
+            'bengkak_kaki': Q(keluhan_bengkak_kaki=True),
+        },
+        'by_merokok': GroupBy('merokok_status'),
+    }
     
     @action(detail=False, methods=['get'])
     def by_participant(self, request):
@@ -61,19 +77,3 @@ class AnamnesisViewSet(viewsets.ModelViewSet):
         
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
-    
-    @action(detail=False, methods=['get'])
-    def statistics(self, request):
-        """Statistik anamnesis."""
-        total_anamnesis = self.queryset.count()
-        
-        # Top keluhan utama
-        from django.db.models import Count
-        top_keluhan = self.queryset.values('keluhan_utama').annotate(
-            count=Count('keluhan_utama')
-        ).order_by('-count')[:10]
-        
-        return Response({
-            'total_anamnesis': total_anamnesis,
-            'top_keluhan': list(top_keluhan),
-        })
@@ -0,0 +1,60 @@
+"""
+Data benchmark posyandu-service: posyandu dan balita binaannya.
+
+Dijalankan lewat `python manage.py seed_benchmark` (lihat `common.benchmark`).
+"""
+from common.dedup import phonetic_key
+
+from .models import Balita, Posyandu
+
+
+MODELS = [Balita, Posyandu]
+HARI = ['Senin', 'Selasa', 'Rabu', 'Kamis', 'Jumat', 'Sabtu']
+
+
+def _posyandu_rows(ctx):
+    rng = ctx.random('posyandu')
+    for number in range(1, ctx.count('posyandu') + 1):
+        yield Posyandu(
+            id=number,
+            nama=f'Posyandu Melati {number}',
+            alamat=f'Jl. Kenanga No. {rng.randint(1, 200)}',
+            rt=f'{rng.randint(1, 15):03d}',
+            rw=f'{rng.randint(1, 10):03d}',
+            desa=ctx.desa_name(number),
+            kecamatan=ctx.kecamatan_name(number),
+            kabupaten='Bogor',
+            nama_koordinator=ctx.person_name(rng, 'Perempuan'),
+            no_hp_koordinator=ctx.phone(rng),
+            jadwal_posyandu=f'Setiap hari {rng.choice(HARI)} minggu ke-{rng.randint(1, 4)}',
+        )
+
+
+def _balita_rows(ctx):
+    rng = ctx.random('balita')
+    for number in range(1, ctx.count('balita') + 1):
+        ref = ctx.balita(number)
+        nama = ctx.person_name(rng, ref.jenis_kelamin)
+        yield Balita(
+            id=number,
+            nik=ctx.nik(1, number),
+            nama=nama,
+            nama_fonetik=phonetic_key(nama),
+            tanggal_lahir=ref.tanggal_lahir,
+            jenis_kelamin=ref.jenis_kelamin,
+            nama_ayah=ctx.person_name(rng, 'Laki-laki'),
+            nama_ibu=ctx.person_name(rng, 'Perempuan'),
+            no_kk=ctx.nik(9, number),
+            no_hp_ortu=ctx.phone(rng),
+            alamat=f'Jl. Mawar No. {rng.randint(1, 200)}',
+            rt=f'{rng.randint(1, 15):03d}',
+            rw=f'{rng.randint(1, 10):03d}',
+            desa=ctx.desa_name(ref.posyandu_id),
+            posyandu_id=ref.posyandu_id,
+            status='aktif' if rng.random() < 0.95 else 'pindah',
+        )
+
+
+def seed(ctx):
+    ctx.bulk_insert(Posyandu, _posyandu_rows(ctx))
+    ctx.bulk_insert(Balita, _balita_rows(ctx))
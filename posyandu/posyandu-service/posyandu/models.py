@@ -4,6 +4,7 @@ Menangani data Posyandu fokus pada ibu & anak.
 """
 from django.db import models
 from decimal import Decimal
+from common.dedup import DuplicateCandidate, track_duplicates
 
 
 class Posyandu(models.Model):
@@ -56,6 +57,7 @@ class Balita(models.Model):
         help_text="NIK balita"
     )
     nama = models.CharField(max_length=100)
+    nama_fonetik = models.CharField(max_length=100, blank=True, default='', editable=False)
     tanggal_lahir = models.DateField()
     jenis_kelamin = models.CharField(
         max_length=10,
@@ -104,6 +106,7 @@ class Balita(models.Model):
             models.Index(fields=['nik']),
             models.Index(fields=['posyandu']),
             models.Index(fields=['tanggal_lahir']),
+            models.Index(fields=['nama_fonetik', 'tanggal_lahir']),
         ]
     
     def __str__(self):
@@ -127,6 +130,7 @@ class IbuHamil(models.Model):
         help_text="NIK ibu hamil"
     )
     nama = models.CharField(max_length=100)
+    nama_fonetik = models.CharField(max_length=100, blank=True, default='', editable=False)
     tanggal_lahir = models.DateField()
     nama_suami = models.CharField(max_length=100, blank=True, null=True)
     no_hp = models.CharField(max_length=15, blank=True, null=True)
@@ -191,6 +195,8 @@ class IbuHamil(models.Model):
             models.Index(fields=['nik']),
             models.Index(fields=['posyandu']),
             models.Index(fields=['hpht']),
+            models.Index(fields=['tanggal_lahir']),
+            models.Index(fields=['nama_fonetik', 'tanggal_lahir']),
         ]
     
     def __str__(self):
@@ -221,6 +227,7 @@ class WUS(models.Model):
         help_text="NIK WUS"
     )
     nama = models.CharField(max_length=100)
+    nama_fonetik = models.CharField(max_length=100, blank=True, default='', editable=False)
     tanggal_lahir = models.DateField()
     nama_suami = models.CharField(max_length=100, blank=True, null=True)
     no_hp = models.CharField(max_length=15, blank=True, null=True)
@@ -280,7 +287,18 @@ class WUS(models.Model):
             models.Index(fields=['nik']),
             models.Index(fields=['posyandu']),
             models.Index(fields=['status_kb']),
+            models.Index(fields=['tanggal_lahir']),
+            models.Index(fields=['nama_fonetik', 'tanggal_lahir']),
         ]
     
     def __str__(self):
         return f"{self.nama} - {self.get_status_kb_display()}"
+
+
+class DedupCandidate(DuplicateCandidate):
+    """Kandidat data ganda balita, ibu hamil, dan WUS."""
+
+
+track_duplicates(DedupCandidate, Balita)
+track_duplicates(DedupCandidate, IbuHamil)
+track_duplicates(DedupCandidate, WUS)
@@ -2,7 +2,7 @@
 Serializers untuk posyandu-service.
 """
 from rest_framework import serializers
-from .models import Posyandu
+from .models import Posyandu, DedupCandidate
 
 
 class PosyanduSerializer(serializers.ModelSerializer):
@@ -12,3 +12,15 @@ class PosyanduSerializer(serializers.ModelSerializer):
         model = Posyandu
         fields = ['id', 'nama', 'alamat']
         read_only_fields = ['id']
+
+
+class DedupCandidateSerializer(serializers.ModelSerializer):
+    """Serializer untuk kandidat data ganda balita, ibu hamil, dan WUS."""
+
+    class Meta:
+        model = DedupCandidate
+        fields = [
+            'id', 'model_label', 'left_id', 'right_id', 'score', 'matched_on',
+            'status', 'created_at', 'updated_at'
+        ]
+        read_only_fields = fields
@@ -3,10 +3,11 @@ URLs untuk posyandu-service.
 """
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import PosyanduViewSet
+from .views import PosyanduViewSet, DedupCandidateViewSet
 
 router = DefaultRouter()
 router.register(r'posyandu', PosyanduViewSet)
+router.register(r'duplicates', DedupCandidateViewSet)
 
 urlpatterns = [
     path('', include(router.urls)),
@@ -4,11 +4,15 @@ Views untuk posyandu-service.
 from rest_framework import viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from .models import Posyandu
-from .serializers import PosyanduSerializer
+from common.batch import BatchLookupMixin
+from common.related import RelatedLoadsMixin
+from common.conditional import ConditionalGetMixin
+from common.dedup import DuplicateCandidateViewSet
+from .models import Posyandu, DedupCandidate
+from .serializers import PosyanduSerializer, DedupCandidateSerializer
 
 
-class PosyanduViewSet(viewsets.ModelViewSet):
+class PosyanduViewSet(ConditionalGetMixin, BatchLookupMixin, RelatedLoadsMixin, viewsets.ModelViewSet):
     """ViewSet untuk model Posyandu."""
     queryset = Posyandu.objects.all()
     serializer_class = PosyanduSerializer
@@ -23,3 +27,9 @@ class PosyanduViewSet(viewsets.ModelViewSet):
             queryset = self.queryset
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
+
+
+class DedupCandidateViewSet(DuplicateCandidateViewSet):
+    """Kandidat data ganda balita, ibu hamil, dan WUS untuk ditinjau petugas."""
+    queryset = DedupCandidate.objects.all()
+    serializer_class = DedupCandidateSerializer
@@ -3,6 +3,7 @@ Model untuk rujukan-service.
 Menangani manajemen rujukan.
 """
 from django.db import models
+from common.statistics import VacatedDay, track_vacated_days
 from decimal import Decimal
 
 
@@ -352,3 +353,10 @@ class TemplateRujukan(models.Model):
     
     def __str__(self):
         return f"{self.nama_template} - {self.get_jenis_pasien_display()}"
+
+
+class FeedVacatedDay(VacatedDay):
+    """Hari yang ditinggalkan record feed harian, untuk rollup `daily_feed`."""
+
+
+track_vacated_days(FeedVacatedDay, Rujukan, 'tanggal_rujukan')
@@ -7,14 +7,19 @@ from rest_framework.response import Response
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
 from django.db.models import Q
-from .models import FasilitasKesehatan, Rujukan, FollowUpRujukan, TemplateRujukan
+from common.batch import BatchLookupMixin
+from common.related import RelatedLoadsMixin
+from common.conditional import ConditionalGetMixin
+from common.cache import CachedResponseMixin
+from common.statistics import StatisticsMixin, DailyFeedMixin, Total, count_by
+from .models import FasilitasKesehatan, Rujukan, FollowUpRujukan, TemplateRujukan, FeedVacatedDay
 from .serializers import (
     FasilitasKesehatanSerializer, RujukanSerializer, FollowUpRujukanSerializer,
     TemplateRujukanSerializer, RujukanSearchSerializer
 )
 
 
-class FasilitasKesehatanViewSet(viewsets.ModelViewSet):
+class FasilitasKesehatanViewSet(ConditionalGetMixin, CachedResponseMixin, StatisticsMixin, BatchLookupMixin, RelatedLoadsMixin, viewsets.ModelViewSet):
     """ViewSet untuk model FasilitasKesehatan."""
     queryset = FasilitasKesehatan.objects.all()
     serializer_class = FasilitasKesehatanSerializer
@@ -23,6 +28,23 @@ class FasilitasKesehatanViewSet(viewsets.ModelViewSet):
     search_fields = ['nama', 'alamat', 'desa', 'kecamatan', 'kabupaten']
     ordering_fields = ['nama', 'jenis_fasilitas', 'level_fasilitas']
     ordering = ['nama']
+    cache_alias = 'reference'
+    cache_actions = ('list', 'retrieve', 'aktif', 'by_pelayanan', 'statistics')
+    statistics_spec = {
+        'total_fasilitas': Total(),
+        'by_jenis': count_by('jenis_fasilitas', FasilitasKesehatan.JENIS_FASILITAS_CHOICES),
+        'by_level': count_by('level_fasilitas', FasilitasKesehatan.LEVEL_FASILITAS_CHOICES),
+        'by_pelayanan': {
+            'anak': Q(pelayanan_anak=True),
+            'ibu_hamil': Q(pelayanan_ibu_hamil=True),
+            'imunisasi': Q(pelayanan_imunisasi=True),
+            'kb': Q(pelayanan_kb=True),
+            'gizi': Q(pelayanan_gizi=True),
+            'lab': Q(pelayanan_lab=True),
+            'radiologi': Q(pelayanan_radiologi=True),
+            'ugd': Q(pelayanan_ugd=True),
+        },
+    }
     
     @action(detail=False, methods=['get'])
     def aktif(self, request):
@@ -46,6 +68,12 @@ class FasilitasKesehatanViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        if pelayanan not in self.statistics_spec['by_pelayanan']:
+            return Response(
+                {'error': f"pelayanan must be one of {', '.join(self.statistics_spec['by_pelayanan'])}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
         filter_kwargs = {f'pelayanan_{pelayanan}': True}
         queryset = self.queryset.filter(**filter_kwargs, aktif=True)
         page = self.paginate_queryset(queryset)
@@ -55,39 +83,9 @@ class FasilitasKesehatanViewSet(viewsets.ModelViewSet):
         
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
-    
-    @action(detail=False, methods=['get'])
-    def statistics(self, request):
-        """Statistik fasilitas kesehatan."""
-        total_fasilitas = self.queryset.count()
-        by_jenis = {}
-        for choice in FasilitasKesehatan.JENIS_FASILITAS_CHOICES:
-            by_jenis[choice[0]] = self.queryset.filter(jenis_fasilitas=choice[0]).count()
-        
-        by_level = {}
-        for choice in FasilitasKesehatan.LEVEL_FASILITAS_CHOICES:
-            by_level[choice[0]] = self.queryset.filter(level_fasilitas=choice[0]).count()
-        
-        by_pelayanan = {
-            'anak': self.queryset.filter(pelayanan_anak=True).count(),
-            'ibu_hamil': self.queryset.filter(pelayanan_ibu_hamil=True).count(),
-            'imunisasi': self.queryset.filter(pelayanan_imunisasi=True).count(),
-            'kb': self.queryset.filter(pelayanan_kb=True).count(),
-            'gizi': self.queryset.filter(pelayanan_gizi=True).count(),
-            'lab': self.queryset.filter(pelayanan_lab=True).count(),
-            'radiologi': self.queryset.filter(pelayanan_radiologi=True).count(),
-            'ugd': self.queryset.filter(pelayanan_ugd=True).count(),
-        }
-        
-        return Response({
-            'total_fasilitas': total_fasilitas,
-            'by_jenis': by_jenis,
-            'by_level': by_level,
-            'by_pelayanan': by_pelayanan,
-        })
 
 
-class RujukanViewSet(viewsets.ModelViewSet):
+class RujukanViewSet(ConditionalGetMixin, StatisticsMixin, DailyFeedMixin, BatchLookupMixin, RelatedLoadsMixin, viewsets.ModelViewSet):
     """ViewSet untuk model Rujukan."""
     queryset = Rujukan.objects.all()
     serializer_class = RujukanSerializer
@@ -96,6 +94,19 @@ class RujukanViewSet(viewsets.ModelViewSet):
     search_fields = ['pasien_id', 'posyandu_id', 'alasan_rujukan', 'petugas_rujukan']
     ordering_fields = ['tanggal_rujukan', 'created_at']
     ordering = ['-tanggal_rujukan']
+    statistics_spec = {
+        'total_rujukan': Total(),
+        'by_status': count_by('status', ['dikirim', 'diterima', 'dalam_proses', 'selesai', 'ditolak', 'batal']),
+        'by_prioritas': count_by('prioritas', ['rendah', 'sedang', 'tinggi', 'darurat']),
+        'by_jenis_pasien': count_by('jenis_pasien', ['balita', 'ibu_hamil', 'wus']),
+    }
+    daily_feed_date_field = 'tanggal_rujukan'
+    daily_feed_vacated_model = FeedVacatedDay
+    daily_feed_spec = {
+        'total_rujukan': Total(),
+        'rujukan_selesai': Q(status='selesai'),
+        'rujukan_pending': Q(status__in=['dikirim', 'diterima', 'dalam_proses']),
+    }
     
     @action(detail=False, methods=['get'])
     def by_pasien(self, request):
@@ -153,40 +164,9 @@ class RujukanViewSet(viewsets.ModelViewSet):
         
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
-    
-    @action(detail=False, methods=['get'])
-    def statistics(self, request):
-        """Statistik rujukan."""
-        total_rujukan = self.queryset.count()
-        by_status = {
-            'dikirim': self.queryset.filter(status='dikirim').count(),
-            'diterima': self.queryset.filter(status='diterima').count(),
-            'dalam_proses': self.queryset.filter(status='dalam_proses').count(),
-            'selesai': self.queryset.filter(status='selesai').count(),
-            'ditolak': self.queryset.filter(status='ditolak').count(),
-            'batal': self.queryset.filter(status='batal').count(),
-        }
-        by_prioritas = {
-            'rendah': self.queryset.filter(prioritas='rendah').count(),
-            'sedang': self.queryset.filter(prioritas='sedang').count(),
-            'tinggi': self.queryset.filter(prioritas='tinggi').count(),
-            'darurat': self.queryset.filter(prioritas='darurat').count(),
-        }
-        by_jenis_pasien = {
-            'balita': self.queryset.filter(jenis_pasien='balita').count(),
-            'ibu_hamil': self.queryset.filter(jenis_pasien='ibu_hamil').count(),
-            'wus': self.queryset.filter(jenis_pasien='wus').count(),
-        }
-        
-        return Response({
-            'total_rujukan': total_rujukan,
-            'by_status': by_status,
-            'by_prioritas': by_prioritas,
-            'by_jenis_pasien': by_jenis_pasien,
-        })
 
 
-class FollowUpRujukanViewSet(viewsets.ModelViewSet):
+class FollowUpRujukanViewSet(ConditionalGetMixin, StatisticsMixin, BatchLookupMixin, RelatedLoadsMixin, viewsets.ModelViewSet):
     """ViewSet untuk model FollowUpRujukan."""
     queryset = FollowUpRujukan.objects.all()
     serializer_class = FollowUpRujukanSerializer
@@ -195,6 +175,10 @@ class FollowUpRujukanViewSet(viewsets.ModelViewSet):
     search_fields = ['rujukan__pasien_id', 'petugas_follow_up']
     ordering_fields = ['tanggal_follow_up', 'created_at']
     ordering = ['-tanggal_follow_up']
+    statistics_spec = {
+        'total_follow_up': Total(),
+        'by_status': count_by('status', ['belum_datang', 'sudah_datang', 'tidak_datang', 'reschedule']),
+    }
     
     @action(detail=False, methods=['get'])
     def by_rujukan(self, request):
@@ -233,25 +217,9 @@ class FollowUpRujukanViewSet(viewsets.ModelViewSet):
         
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
-    
-    @action(detail=False, methods=['get'])
-    def statistics(self, request):
-        """Statistik follow-up rujukan."""
-        total_follow_up = self.queryset.count()
-        by_status = {
-            'belum_datang': self.queryset.filter(status='belum_datang').count(),
-            'sudah_datang': self.queryset.filter(status='sudah_datang').count(),
-            'tidak_datang': self.queryset.filter(status='tidak_datang').count(),
-            'reschedule': self.queryset.filter(status='reschedule').count(),
-        }
-        
-        return Response({
-            'total_follow_up': total_follow_up,
-            'by_status': by_status,
-        })
 
 
-class TemplateRujukanViewSet(viewsets.ModelViewSet):
+class TemplateRujukanViewSet(ConditionalGetMixin, StatisticsMixin, BatchLookupMixin, RelatedLoadsMixin, viewsets.ModelViewSet):
     """ViewSet untuk model TemplateRujukan."""
     queryset = TemplateRujukan.objects.all()
     serializer_class = TemplateRujukanSerializer
@@ -260,6 +228,14 @@ class TemplateRujukanViewSet(viewsets.ModelViewSet):
     search_fields = ['nama_template', 'indikasi_rujukan']
     ordering_fields = ['nama_template', 'jenis_pasien']
     ordering = ['nama_template']
+    statistics_spec = {
+        'total_template': Total(),
+        'by_jenis_pasien': count_by('jenis_pasien', ['balita', 'ibu_hamil', 'wus']),
+        'by_status': {
+            'aktif': Q(aktif=True),
+            'tidak_aktif': Q(aktif=False),
+        },
+    }
     
     @action(detail=False, methods=['get'])
     def aktif(self, request):
@@ -291,23 +267,3 @@ class TemplateRujukanViewSet(viewsets.ModelViewSet):
         
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
-    
-    @action(detail=False, methods=['get'])
-    def statistics(self, request):
-        """Statistik template rujukan."""
-        total_template = self.queryset.count()
-        by_jenis_pasien = {
-            'balita': self.queryset.filter(jenis_pasien='balita').count(),
-            'ibu_hamil': self.queryset.filter(jenis_pasien='ibu_hamil').count(),
-            'wus': self.queryset.filter(jenis_pasien='wus').count(),
-        }
-        by_status = {
-            'aktif': self.queryset.filter(aktif=True).count(),
-            'tidak_aktif': self.queryset.filter(aktif=False).count(),
-        }
-        
-        return Response({
-            'total_template': total_template,
-            'by_jenis_pasien': by_jenis_pasien,
-            'by_status': by_status,
-        })
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark throughput HTTP sederhana untuk membandingkan mode server.
+
+Mengirim request GET secara paralel ke satu URL selama durasi tertentu lalu
+mencetak request/detik dan latensi persentil. Hanya memakai pustaka standar.
+
+Contoh membandingkan runserver dan gunicorn pada balita-service::
+
+    SERVER_MODE=runserver docker compose up -d --build balita-service
+    python scripts/utils/benchmark_server.py http://localhost:8003/api/pemeriksaan/statistics/
+
+    SERVER_MODE=gunicorn docker compose up -d balita-service
+    python scripts/utils/benchmark_server.py http://localhost:8003/api/pemeriksaan/statistics/
+
+Gunakan `--json` untuk keluaran yang dapat dibandingkan antar run.
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_worker(url, deadline, timeout, latencies, errors, lock):
+    local_latencies = []
+    local_errors = 0
+    while time.monotonic() < deadline:
+        started = time.monotonic()
+        try:
+            with urllib.request.urlopen(url, timeout=timeout) as response:
+                response.read()
+                if response.status >= 400:
+                    local_errors += 1
+        except (urllib.error.URLError, OSError):
+            local_errors += 1
+            continue
+        local_latencies.append(time.monotonic() - started)
+    with lock:
+        latencies.extend(local_latencies)
+        errors.append(local_errors)
+
+
+def benchmark(url, concurrency, duration, timeout, warmup):
+    if warmup:
+        deadline = time.monotonic() + warmup
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for _ in range(concurrency):
+                executor.submit(run_worker, url, deadline, timeout, [], [], threading.Lock())
+
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    started = time.monotonic()
+    deadline = started + duration
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for _ in range(concurrency):
+            executor.submit(run_worker, url, deadline, timeout, latencies, errors, lock)
+    elapsed = time.monotonic() - started
+
+    latencies.sort()
+    return {
+        'url': url,
+        'concurrency': concurrency,
+        'duration_s': round(elapsed, 2),
+        'requests': len(latencies),
+        'errors': sum(errors),
+        'requests_per_second': round(len(latencies) / elapsed, 1),
+        'latency_ms': {
+            'p50': round(percentile(latencies, 0.50) * 1000, 1),
+            'p95': round(percentile(latencies, 0.95) * 1000, 1),
+            'p99': round(percentile(latencies, 0.99) * 1000, 1),
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('url')
+    parser.add_argument('-c', '--concurrency', type=int, default=32)
+    parser.add_argument('-d', '--duration', type=float, default=20, help='Detik pengukuran')
+    parser.add_argument('-w', '--warmup', type=float, default=3, help='Detik pemanasan')
+    parser.add_argument('-t', '--timeout', type=float, default=10)
+    parser.add_argument('--json', action='store_true', help='Cetak hasil sebagai JSON')
+    args = parser.parse_args()
+
+    result = benchmark(args.url, args.concurrency, args.duration, args.timeout, args.warmup)
+    if args.json:
+        json.dump(result, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    else:
+        print(f"URL          : {result['url']}")
+        print(f"Concurrency  : {result['concurrency']}")
+        print(f"Requests     : {result['requests']} ({result['errors']} error)")
+        print(f"Throughput   : {result['requests_per_second']} req/s")
+        latency = result['latency_ms']
+        print(f"Latency (ms) : p50 {latency['p50']}  p95 {latency['p95']}  p99 {latency['p99']}")
+    return 1 if result['errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Uji beban campuran kader + dashboard yang dapat diulang dan dibandingkan.
+
+Skenario JSON (mis. `scripts/utils/loadtest_scenarios/kader_dashboard.json`)
+berisi daftar request berbobot per service. Parameter seperti `{balita_id}`
+diisi secara acak dalam rentang data `seed_benchmark` (`common.benchmark`)
+pada `--scale` yang sama, dengan seed tetap sehingga urutan dan isi request
+identik di setiap run. Hanya memakai pustaka standar.
+
+Per endpoint dilaporkan p50/p95/p99, throughput, error, dan jumlah query
+per request (dibaca dari header `Server-Timing` service). Hasil JSON dari
+dua commit dibandingkan dengan subcommand `compare`::
+
+    python scripts/utils/loadtest.py run scripts/utils/loadtest_scenarios/kader_dashboard.json \\
+        --scale 0.1 --requests 5000 -c 16 -o sebelum.json
+    python scripts/utils/loadtest.py run ... -o sesudah.json
+    python scripts/utils/loadtest.py compare sebelum.json sesudah.json --max-regression 0.2
+"""
+import argparse
+import http.client
+import json
+import random
+import re
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from urllib.parse import quote, urlsplit
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from common.benchmark import DEFAULT_SEED, scaled  # noqa: E402
+
+
+PLACEHOLDER = re.compile(r'\{(\w+)\}')
+SERVER_TIMING_DB = re.compile(r'db;dur=([\d.]+);desc="(\d+) queries"')
+SERVER_TIMING_TOTAL = re.compile(r'total;dur=([\d.]+)')
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class Scenario:
+    """Skenario request berbobot dengan variabel acak yang dapat direproduksi."""
+
+    def __init__(self, data, scale, end_date, bases=None, services=None):
+        self.name = data['name']
+        self.scale = scale
+        self.end_date = end_date
+        self.bases = {**data['services'], **(bases or {})}
+        self.variables = data.get('variables', {})
+        self.requests = [
+            request for request in data['requests']
+            if not services or request['service'] in services
+        ]
+        if not self.requests:
+            raise SystemExit('Tidak ada request yang cocok dengan --services')
+        self.weights = [request['weight'] for request in self.requests]
+
+    def value(self, rng, name):
+        spec = self.variables[name]
+        if 'range' in spec:
+            return rng.randint(1, scaled(spec['range'], self.scale))
+        if 'choice' in spec:
+            return rng.choice(spec['choice'])
+        if 'days_ago' in spec:
+            return (self.end_date - timedelta(days=spec['days_ago'])).isoformat()
+        raise ValueError(f'Variabel {name} tidak dikenal: {spec}')
+
+    def fill(self, template, values):
+        if isinstance(template, dict):
+            return {key: self.fill(value, values) for key, value in template.items()}
+        if isinstance(template, list):
+            return [self.fill(value, values) for value in template]
+        if not isinstance(template, str):
+            return template
+        whole = PLACEHOLDER.fullmatch(template)
+        if whole:
+            # "{balita_id}" utuh tetap bertipe angka di body JSON
+            return values[whole.group(1)]
+        return PLACEHOLDER.sub(lambda match: str(values[match.group(1)]), template)
+
+    def fill_path(self, template, values):
+        return PLACEHOLDER.sub(lambda match: quote(str(values[match.group(1)])), template)
+
+    def plan(self, count, seed):
+        """Daftar `(nama, method, url, body)` sebanyak `count`, sama untuk seed yang sama."""
+        rng = random.Random(seed)
+        planned = []
+        for request in rng.choices(self.requests, weights=self.weights, k=count):
+            text = json.dumps([request['path'], request.get('body')])
+            values = {name: self.value(rng, name) for name in sorted(set(PLACEHOLDER.findall(text)))}
+            url = self.bases[request['service']].rstrip('/') + self.fill_path(request['path'], values)
+            body = self.fill(request.get('body'), values)
+            planned.append((request['name'], request.get('method', 'GET'), url, body))
+        return planned
+
+
+class Client:
+    """Koneksi keep-alive per host untuk satu thread."""
+
+    def __init__(self, timeout, headers):
+        self.timeout = timeout
+        self.headers = headers
+        self.connections = {}
+
+    def connection(self, parts):
+        key = (parts.scheme, parts.netloc)
+        if key not in self.connections:
+            factory = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+            self.connections[key] = factory(parts.netloc, timeout=self.timeout)
+        return key, self.connections[key]
+
+    def send(self, method, url, body):
+        parts = urlsplit(url)
+        path = parts.path + (f'?{parts.query}' if parts.query else '')
+        headers = dict(self.headers)
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode()
+            headers['Content-Type'] = 'application/json'
+        for attempt in range(2):
+            key, connection = self.connection(parts)
+            try:
+                connection.request(method, path, body=payload, headers=headers)
+                response = connection.getresponse()
+                response.read()
+                return response.status, response.getheader('Server-Timing', '')
+            except (http.client.HTTPException, OSError):
+                connection.close()
+                del self.connections[key]
+                if attempt:
+                    raise
+
+
+def run_worker(plan, cursor, lock, timeout, headers, samples):
+    client = Client(timeout, headers)
+    while True:
+        with lock:
+            index = cursor[0]
+            cursor[0] += 1
+        if index >= len(plan):
+            return
+        name, method, url, body = plan[index]
+        started = time.perf_counter()
+        try:
+            status, timing = client.send(method, url, body)
+        except (http.client.HTTPException, OSError):
+            status, timing = 0, ''
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        db = SERVER_TIMING_DB.search(timing)
+        total = SERVER_TIMING_TOTAL.search(timing)
+        samples.append((
+            name, status, elapsed_ms,
+            int(db.group(2)) if db else None,
+            float(db.group(1)) if db else None,
+            float(total.group(1)) if total else None,
+        ))
+
+
+def execute(plan, concurrency, timeout, headers):
+    samples = []
+    cursor = [0]
+    lock = threading.Lock()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for _ in range(concurrency):
+            executor.submit(run_worker, plan, cursor, lock, timeout, headers, samples)
+    return samples, time.perf_counter() - started
+
+
+def _mean(values):
+    return round(sum(values) / len(values), 2) if values else None
+
+
+def summarize(samples, elapsed):
+    latencies = sorted(sample[2] for sample in samples)
+    queries = [sample[3] for sample in samples if sample[3] is not None]
+    db_ms = [sample[4] for sample in samples if sample[4] is not None]
+    server_ms = [sample[5] for sample in samples if sample[5] is not None]
+    statuses = defaultdict(int)
+    for sample in samples:
+        statuses[str(sample[1])] += 1
+    return {
+        'requests': len(samples),
+        'errors': sum(1 for sample in samples if not 200 <= sample[1] < 400),
+        'throughput_rps': round(len(samples) / elapsed, 1) if elapsed else 0.0,
+        'p50_ms': round(percentile(latencies, 0.50), 1),
+        'p95_ms': round(percentile(latencies, 0.95), 1),
+        'p99_ms': round(percentile(latencies, 0.99), 1),
+        'mean_ms': _mean(latencies),
+        'max_ms': round(latencies[-1], 1) if latencies else 0.0,
+        'queries_per_request': _mean(queries),
+        'db_ms_mean': _mean(db_ms),
+        'server_ms_mean': _mean(server_ms),
+        'status': dict(sorted(statuses.items())),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args):
+    with open(args.scenario) as handle:
+        scenario = Scenario(
+            json.load(handle), args.scale, args.end_date,
+            bases=dict(item.split('=', 1) for item in args.base),
+            services=set(args.services.split(',')) if args.services else None,
+        )
+    headers = dict(item.split(':', 1) for item in args.header)
+    headers = {key.strip(): value.strip() for key, value in headers.items()}
+
+    if args.warmup:
+        execute(scenario.plan(args.warmup, args.seed + 1), args.concurrency, args.timeout, headers)
+    samples, elapsed = execute(scenario.plan(args.requests, args.seed), args.concurrency, args.timeout, headers)
+
+    by_endpoint = defaultdict(list)
+    for sample in samples:
+        by_endpoint[sample[0]].append(sample)
+    result = {
+        'meta': {
+            'scenario': scenario.name,
+            'commit': git_commit(),
+            'started_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'duration_s': round(elapsed, 2),
+            'requests': args.requests,
+            'concurrency': args.concurrency,
+            'seed': args.seed,
+            'scale': args.scale,
+            'end_date': args.end_date.isoformat(),
+            'services': scenario.bases,
+        },
+        'total': summarize(samples, elapsed),
+        'endpoints': {
+            name: summarize(by_endpoint[name], elapsed) for name in sorted(by_endpoint)
+        },
+    }
+    if args.output:
+        with open(args.output, 'w') as handle:
+            json.dump(result, handle, indent=2)
+            handle.write('\n')
+    if args.json:
+        json.dump(result, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    else:
+        print_report(result)
+    return 1 if result['total']['errors'] else 0
+
+
+def print_report(result):
+    meta = result['meta']
+    print(f"Skenario {meta['scenario']} @ {meta['commit']}: {meta['requests']} request, "
+          f"concurrency {meta['concurrency']}, skala {meta['scale']}, {meta['duration_s']} detik")
+    print(f"{'endpoint':38} {'req':>6} {'err':>5} {'rps':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'query':>6}")
+    rows = list(result['endpoints'].items()) + [('TOTAL', result['total'])]
+    for name, stats in rows:
+        queries = stats['queries_per_request']
+        print(f"{name:38} {stats['requests']:>6} {stats['errors']:>5} {stats['throughput_rps']:>7} "
+              f"{stats['p50_ms']:>8} {stats['p95_ms']:>8} {stats['p99_ms']:>8} "
+              f"{'-' if queries is None else queries:>6}")
+
+
+def compare(args):
+    with open(args.baseline) as handle:
+        baseline = json.load(handle)
+    with open(args.candidate) as handle:
+        candidate = json.load(handle)
+
+    for key in ('scenario', 'requests', 'concurrency', 'seed', 'scale', 'services'):
+        if baseline['meta'].get(key) != candidate['meta'].get(key):
+            print(f"Peringatan: {key} berbeda ({baseline['meta'].get(key)} vs {candidate['meta'].get(key)})")
+    print(f"{'endpoint':38} {'p95 lama':>9} {'p95 baru':>9} {'ubah':>7} {'query lama':>10} {'query baru':>10}")
+    regressions = []
+    rows = [
+        (name, baseline['endpoints'][name], candidate['endpoints'][name])
+        for name in sorted(baseline['endpoints']) if name in candidate['endpoints']
+    ] + [('TOTAL', baseline['total'], candidate['total'])]
+    for name, old, new in rows:
+        change = (new['p95_ms'] - old['p95_ms']) / old['p95_ms'] if old['p95_ms'] else 0.0
+        marks = []
+        if change > args.max_regression and new['p95_ms'] - old['p95_ms'] > args.min_ms:
+            marks.append('p95')
+        if (old['queries_per_request'] is not None and new['queries_per_request'] is not None
+                and new['queries_per_request'] > old['queries_per_request'] + 0.5):
+            marks.append('query')
+        if new['errors'] > old['errors']:
+            marks.append('error')
+        if marks:
+            regressions.append(name)
+        print(f"{name:38} {old['p95_ms']:>9} {new['p95_ms']:>9} {change:>+7.0%} "
+              f"{str(old['queries_per_request']):>10} {str(new['queries_per_request']):>10}"
+              f"{'  REGRESI ' + ','.join(marks) if marks else ''}")
+
+    if regressions:
+        print(f'{len(regressions)} endpoint regresi (ambang p95 +{args.max_regression:.0%})')
+        return 1
+    print('Tidak ada regresi')
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='Menjalankan skenario uji beban')
+    run_parser.add_argument('scenario', help='File skenario JSON')
+    run_parser.add_argument('-n', '--requests', type=int, default=2000, help='Jumlah request terukur')
+    run_parser.add_argument('-c', '--concurrency', type=int, default=16)
+    run_parser.add_argument('-w', '--warmup', type=int, default=200, help='Request pemanasan (tidak diukur)')
+    run_parser.add_argument('-t', '--timeout', type=float, default=30)
+    run_parser.add_argument('--scale', type=float, default=1.0, help='Skala data seed_benchmark')
+    run_parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help='Seed urutan dan parameter request')
+    run_parser.add_argument('--end-date', type=date.fromisoformat, default=date.today(),
+                            help='Tanggal akhir data seed_benchmark (default hari ini)')
+    run_parser.add_argument('--base', action='append', default=[], metavar='SERVICE=URL',
+                            help='Ganti base URL service, mis. balita=http://localhost:8003')
+    run_parser.add_argument('--services', help='Hanya service ini (dipisah koma)')
+    run_parser.add_argument('-H', '--header', action='append', default=[], metavar='NAMA: NILAI')
+    run_parser.add_argument('-o', '--output', help='Simpan hasil JSON ke file')
+    run_parser.add_argument('--json', action='store_true', help='Cetak hasil sebagai JSON')
+    run_parser.set_defaults(handler=run)
+
+    compare_parser = subparsers.add_parser('compare', help='Membandingkan dua hasil JSON')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('candidate')
+    compare_parser.add_argument('--max-regression', type=float, default=0.2,
+                                help='Kenaikan p95 relatif yang masih diterima (default 0.2)')
+    compare_parser.add_argument('--min-ms', type=float, default=2.0,
+                                help='Kenaikan p95 absolut minimum yang dianggap regresi')
+    compare_parser.set_defaults(handler=compare)
+
+    args = parser.parse_args()
+    return args.handler(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -46,6 +46,7 @@ show_help() {
     echo "  --status          Show service status overview"
     echo "  --monitor         Real-time monitoring"
     echo "  --endpoints       Health check endpoints"
+    echo "  --metrics         Request, error, and in-flight totals from /metrics"
     echo "  --resources       System resources usage"
     echo "  --logs            Show logs for all services"
     echo "  --help            Show this help message"
@@ -171,6 +172,42 @@ check_endpoints() {
     fi
 }
 
+# Function untuk ringkasan metrik Prometheus (/metrics) tiap service
+check_metrics() {
+    print_header "Service Metrics"
+
+    services=(
+        "auth-service:8001"
+        "posyandu-service:8002"
+        "balita-service:8003"
+        "ibu-hamil-service:8004"
+        "imunisasi-service:8005"
+        "kb-service:8006"
+        "vitamin-service:8007"
+        "rujukan-service:8008"
+        "laporan-service:8009"
+    )
+
+    printf "%-20s %10s %8s %9s %12s\n" "SERVICE" "REQUESTS" "5XX" "IN-FLIGHT" "DB QUERIES"
+    for service_port in "${services[@]}"; do
+        service=$(echo $service_port | cut -d: -f1)
+        port=$(echo $service_port | cut -d: -f2)
+
+        if ! metrics=$(curl -s -f "http://localhost:$port/metrics" 2>/dev/null); then
+            printf "%-20s %s\n" "$service" "unavailable"
+            continue
+        fi
+        echo "$metrics" | awk -v service="$service" '
+            /^http_request_duration_seconds_count/ { total += $NF; if ($0 ~ /status="5/) errors += $NF }
+            /^http_requests_in_progress/ { inflight += $NF }
+            /^db_queries_total/ { queries += $NF }
+            END { printf "%-20s %10d %8d %9d %12d\n", service, total, errors, inflight, queries }'
+    done
+
+    echo ""
+    print_status "Tren saturasi: docker compose --profile monitoring up -d, lalu buka Grafana http://localhost:3002"
+}
+
 # Function untuk system resources
 check_resources() {
     print_header "System Resources"
@@ -254,6 +291,10 @@ while [[ $# -gt 0 ]]; do
             MODE="resources"
             shift
             ;;
+        --metrics)
+            MODE="metrics"
+            shift
+            ;;
         --logs)
             MODE="logs"
             shift
@@ -299,6 +340,9 @@ case $MODE in
     "resources")
         check_resources
         ;;
+    "metrics")
+        check_metrics
+        ;;
     "logs")
         show_logs "$SERVICE_NAME"
         ;;
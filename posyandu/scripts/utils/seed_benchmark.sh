@@ -0,0 +1,84 @@
+#!/bin/bash
+
+# =============================================================================
+# Script: Seed Benchmark Data
+# Description: Mengisi data sintetis benchmark ke semua service Posyandu+ dan
+#              POS BINDU dengan skala dan seed yang sama (lihat common/benchmark.py)
+# Author: Posyandu+ Development Team
+# Version: 1.0
+# =============================================================================
+
+set -e
+
+# Colors untuk output
+RED='\033[0;31m'
+GREEN='\033[0;32m'
+BLUE='\033[0;34m'
+NC='\033[0m' # No Color
+
+print_status() {
+    echo -e "${BLUE}[INFO]${NC} $1"
+}
+
+print_success() {
+    echo -e "${GREEN}[SUCCESS]${NC} $1"
+}
+
+print_error() {
+    echo -e "${RED}[ERROR]${NC} $1"
+}
+
+show_help() {
+    echo "Usage: $0 [OPTIONS]"
+    echo ""
+    echo "Options:"
+    echo "  --scale N          Pengali volume acuan (default 1.0 = 100 ribu balita)"
+    echo "  --seed N           Seed generator acak (default 42)"
+    echo "  --end-date DATE    Tanggal data terakhir, YYYY-MM-DD (default hari ini)"
+    echo "  --flush            Kosongkan tabel benchmark sebelum mengisi"
+    echo "  --help             Show this help message"
+    echo ""
+    echo "Examples:"
+    echo "  $0 --scale 0.1                 # 10 ribu balita, 20 ribu peserta"
+    echo "  $0 --flush --end-date 2025-06-30"
+}
+
+# Tanggal akhir ditetapkan sekali agar semua service memakai tanggal yang sama
+ARGS=(--end-date "$(date +%Y-%m-%d)")
+while [ $# -gt 0 ]; do
+    case "$1" in
+        --scale|--seed|--end-date)
+            ARGS+=("$1" "$2")
+            shift 2
+            ;;
+        --flush)
+            ARGS+=("$1")
+            shift
+            ;;
+        --help)
+            show_help
+            exit 0
+            ;;
+        *)
+            print_error "Unknown option: $1"
+            show_help
+            exit 1
+            ;;
+    esac
+done
+
+cd "$(dirname "$0")/../.."
+
+seed_services() {
+    local compose_dir=$1
+    shift
+    for service in "$@"; do
+        print_status "Seeding $service..."
+        (cd "$compose_dir" && docker-compose exec -T "$service" python manage.py seed_benchmark "${ARGS[@]}")
+    done
+}
+
+seed_services . posyandu-service balita-service imunisasi-service
+seed_services posbindu participant-service lab-service risk-assessment-service
+
+print_success "Data benchmark terisi (${ARGS[*]})"
@@ -3,6 +3,9 @@ Model untuk vitamin-service.
 Menangani vitamin & PMT.
 """
 from django.db import models
+from common.statistics import VacatedDay, track_vacated_days
+from common.stock import StockMovement, StockLedger, InsufficientStock
+from common.sync import Tombstone, track_deletions
 from decimal import Decimal
 
 
@@ -375,10 +378,11 @@ class StokVitamin(models.Model):
     class Meta:
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['jenis_vitamin']),
+            models.Index(fields=['jenis_vitamin', 'status', 'tanggal_kedaluwarsa']),
             models.Index(fields=['batch_number']),
             models.Index(fields=['tanggal_kedaluwarsa']),
             models.Index(fields=['status']),
+            models.Index(fields=['updated_at', 'id']),
         ]
     
     def __str__(self):
@@ -397,14 +401,35 @@ class StokVitamin(models.Model):
         return self.tanggal_kedaluwarsa <= date.today() + timedelta(days=30)
     
     def use_vitamin(self, jumlah=1):
-        """Mengurangi jumlah stok vitamin."""
-        if self.jumlah_stok >= jumlah:
-            self.jumlah_stok -= jumlah
-            if self.jumlah_stok == 0:
-                self.status = 'habis'
-            self.save()
-            return True
-        return False
+        """Mengurangi stok vitamin secara atomik melalui ledger stok."""
+        try:
+            self.jumlah_stok = vitamin_ledger.decrement(self.pk, jumlah)
+        except InsufficientStock:
+            return False
+        if self.jumlah_stok == 0:
+            self.status = 'habis'
+        return True
+
+
+class MutasiStokVitamin(StockMovement):
+    """Model untuk mutasi stok vitamin."""
+    
+    stok = models.ForeignKey(StokVitamin, on_delete=models.PROTECT, related_name='mutasi')
+    
+    class Meta(StockMovement.Meta):
+        indexes = [
+            models.Index(fields=['stok', 'created_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.get_jenis_mutasi_display()} {self.jumlah} - {self.stok}"
+
+
+vitamin_ledger = StockLedger(
+    MutasiStokVitamin, quantity_field='jumlah_stok', status_field='status',
+    jenis_field='jenis_vitamin', expiry_field='tanggal_kedaluwarsa', lot_field='batch_number',
+    price_field='harga_per_unit'
+)
 
 
 class StokPMT(models.Model):
@@ -492,10 +517,11 @@ class StokPMT(models.Model):
     class Meta:
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['jenis_pmt']),
+            models.Index(fields=['jenis_pmt', 'status', 'tanggal_kedaluwarsa']),
             models.Index(fields=['batch_number']),
             models.Index(fields=['tanggal_kedaluwarsa']),
             models.Index(fields=['status']),
+            models.Index(fields=['updated_at', 'id']),
         ]
     
     def __str__(self):
@@ -514,11 +540,47 @@ class StokPMT(models.Model):
         return self.tanggal_kedaluwarsa <= date.today() + timedelta(days=30)
     
     def use_pmt(self, jumlah=1):
-        """Mengurangi jumlah stok PMT."""
-        if self.jumlah_stok >= jumlah:
-            self.jumlah_stok -= jumlah
-            if self.jumlah_stok == 0:
-                self.status = 'habis'
-            self.save()
-            return True
-        return False
+        """Mengurangi stok PMT secara atomik melalui ledger stok."""
+        try:
+            self.jumlah_stok = pmt_ledger.decrement(self.pk, jumlah)
+        except InsufficientStock:
+            return False
+        if self.jumlah_stok == 0:
+            self.status = 'habis'
+        return True
+
+
+class MutasiStokPMT(StockMovement):
+    """Model untuk mutasi stok PMT."""
+    
+    stok = models.ForeignKey(StokPMT, on_delete=models.PROTECT, related_name='mutasi')
+    
+    class Meta(StockMovement.Meta):
+        indexes = [
+            models.Index(fields=['stok', 'created_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.get_jenis_mutasi_display()} {self.jumlah} - {self.stok}"
+
+
+pmt_ledger = StockLedger(
+    MutasiStokPMT, quantity_field='jumlah_stok', status_field='status',
+    jenis_field='jenis_pmt', expiry_field='tanggal_kedaluwarsa', lot_field='batch_number',
+    price_field='harga_per_unit'
+)
+
+
+class SyncTombstone(Tombstone):
+    """Penanda record yang dihapus untuk change feed `/api/sync/`."""
+
+
+track_deletions(SyncTombstone, StokVitamin, StokPMT)
+
+
+class FeedVacatedDay(VacatedDay):
+    """Hari yang ditinggalkan record feed harian, untuk rollup `daily_feed`."""
+
+
+track_vacated_days(FeedVacatedDay, PemberianVitamin, 'tanggal_pemberian')
+track_vacated_days(FeedVacatedDay, PMT, 'tanggal_pemberian')
@@ -2,7 +2,8 @@
 Serializers untuk vitamin-service.
 """
 from rest_framework import serializers
-from .models import JenisVitamin, PemberianVitamin, PMT, StokVitamin, StokPMT
+from common.stock import StockLotSerializerMixin
+from .models import JenisVitamin, PemberianVitamin, PMT, StokVitamin, StokPMT, vitamin_ledger, pmt_ledger
 
 
 class JenisVitaminSerializer(serializers.ModelSerializer):
@@ -46,8 +47,9 @@ class PMTSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at']
 
 
-class StokVitaminSerializer(serializers.ModelSerializer):
+class StokVitaminSerializer(StockLotSerializerMixin, serializers.ModelSerializer):
     """Serializer untuk model StokVitamin."""
+    stock_ledger = vitamin_ledger
     
     class Meta:
         model = StokVitamin
@@ -59,8 +61,9 @@ class StokVitaminSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at']
 
 
-class StokPMTSerializer(serializers.ModelSerializer):
+class StokPMTSerializer(StockLotSerializerMixin, serializers.ModelSerializer):
     """Serializer untuk model StokPMT."""
+    stock_ledger = pmt_ledger
     
     class Meta:
         model = StokPMT
@@ -5,7 +5,7 @@ from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import (
     JenisVitaminViewSet, PemberianVitaminViewSet, PMTViewSet,
-    StokVitaminViewSet, StokPMTViewSet
+    StokVitaminViewSet, StokPMTViewSet, SyncViewSet
 )
 
 router = DefaultRouter()
@@ -14,6 +14,7 @@ router.register(r'pemberian', PemberianVitaminViewSet)
 router.register(r'pmt', PMTViewSet)
 router.register(r'stok-vitamin', StokVitaminViewSet)
 router.register(r'stok-pmt', StokPMTViewSet)
+router.register(r'sync', SyncViewSet, basename='sync')
 
 urlpatterns = [
     path('', include(router.urls)),
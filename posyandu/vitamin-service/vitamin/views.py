@@ -7,14 +7,24 @@ from rest_framework.response import Response
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
 from django.db.models import Q
-from .models import JenisVitamin, PemberianVitamin, PMT, StokVitamin, StokPMT
+from common.batch import BatchLookupMixin
+from common.related import RelatedLoadsMixin
+from common.conditional import ConditionalGetMixin
+from common.cache import CachedResponseMixin
+from common.statistics import StatisticsMixin, DailyFeedMixin, Total, count_by, count_by_choices
+from common.stock import StockLedgerMixin, StockExpiryMixin
+from common.sync import ChangeFeedViewSet, SyncSource
+from .models import (
+    JenisVitamin, PemberianVitamin, PMT, StokVitamin, StokPMT, vitamin_ledger, pmt_ledger,
+    SyncTombstone, FeedVacatedDay
+)
 from .serializers import (
     JenisVitaminSerializer, PemberianVitaminSerializer, PMTSerializer,
     StokVitaminSerializer, StokPMTSerializer, VitaminSearchSerializer
 )
 
 
-class JenisVitaminViewSet(viewsets.ModelViewSet):
+class JenisVitaminViewSet(ConditionalGetMixin, CachedResponseMixin, BatchLookupMixin, RelatedLoadsMixin, viewsets.ModelViewSet):
     """ViewSet untuk model JenisVitamin."""
     queryset = JenisVitamin.objects.all()
     serializer_class = JenisVitaminSerializer
@@ -23,6 +33,8 @@ class JenisVitaminViewSet(viewsets.ModelViewSet):
     search_fields = ['jenis_vitamin', 'deskripsi']
     ordering_fields = ['jenis_vitamin']
     ordering = ['jenis_vitamin']
+    cache_alias = 'reference'
+    cache_actions = ('list', 'retrieve', 'aktif')
     
     @action(detail=False, methods=['get'])
     def aktif(self, request):
@@ -37,7 +49,7 @@ class JenisVitaminViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class PemberianVitaminViewSet(viewsets.ModelViewSet):
+class PemberianVitaminViewSet(ConditionalGetMixin, StatisticsMixin, DailyFeedMixin, BatchLookupMixin, RelatedLoadsMixin, viewsets.ModelViewSet):
     """ViewSet untuk model PemberianVitamin."""
     queryset = PemberianVitamin.objects.all()
     serializer_class = PemberianVitaminSerializer
@@ -46,6 +58,16 @@ class PemberianVitaminViewSet(viewsets.ModelViewSet):
     search_fields = ['penerima_id', 'posyandu_id', 'petugas_pemberian']
     ordering_fields = ['tanggal_pemberian', 'created_at']
     ordering = ['-tanggal_pemberian']
+    statistics_spec = {
+        'total_pemberian': Total(),
+        'by_status': count_by('status', ['diberikan', 'tidak_diberikan', 'menolak']),
+        'by_jenis': count_by('jenis_vitamin', JenisVitamin.JENIS_VITAMIN_CHOICES),
+    }
+    daily_feed_date_field = 'tanggal_pemberian'
+    daily_feed_vacated_model = FeedVacatedDay
+    daily_feed_spec = {
+        'total_vitamin': Q(status='diberikan'),
+    }
     
     @action(detail=False, methods=['get'])
     def by_penerima(self, request):
@@ -84,28 +106,9 @@ class PemberianVitaminViewSet(viewsets.ModelViewSet):
         
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
-    
-    @action(detail=False, methods=['get'])
-    def statistics(self, request):
-        """Statistik pemberian vitamin."""
-        total_pemberian = self.queryset.count()
-        by_status = {
-            'diberikan': self.queryset.filter(status='diberikan').count(),
-            'tidak_diberikan': self.queryset.filter(status='tidak_diberikan').count(),
-            'menolak': self.queryset.filter(status='menolak').count(),
-        }
-        by_jenis = {}
-        for choice in PemberianVitamin.JENIS_VITAMIN_CHOICES:
-            by_jenis[choice[0]] = self.queryset.filter(jenis_vitamin=choice[0]).count()
-        
-        return Response({
-            'total_pemberian': total_pemberian,
-            'by_status': by_status,
-            'by_jenis': by_jenis,
-        })
 
 
-class PMTViewSet(viewsets.ModelViewSet):
+class PMTViewSet(ConditionalGetMixin, StatisticsMixin, DailyFeedMixin, BatchLookupMixin, RelatedLoadsMixin, viewsets.ModelViewSet):
     """ViewSet untuk model PMT."""
     queryset = PMT.objects.all()
     serializer_class = PMTSerializer
@@ -114,6 +117,16 @@ class PMTViewSet(viewsets.ModelViewSet):
     search_fields = ['penerima_id', 'posyandu_id', 'petugas_pemberian']
     ordering_fields = ['tanggal_pemberian', 'created_at']
     ordering = ['-tanggal_pemberian']
+    statistics_spec = {
+        'total_pmt': Total(),
+        'by_status': count_by('status', ['diberikan', 'tidak_diberikan', 'menolak']),
+        'by_jenis': count_by_choices(PMT, 'jenis_pmt'),
+    }
+    daily_feed_date_field = 'tanggal_pemberian'
+    daily_feed_vacated_model = FeedVacatedDay
+    daily_feed_spec = {
+        'total_pmt': Q(status='diberikan'),
+    }
     
     @action(detail=False, methods=['get'])
     def by_penerima(self, request):
@@ -152,36 +165,23 @@ class PMTViewSet(viewsets.ModelViewSet):
         
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
-    
-    @action(detail=False, methods=['get'])
-    def statistics(self, request):
-        """Statistik PMT."""
-        total_pmt = self.queryset.count()
-        by_status = {
-            'diberikan': self.queryset.filter(status='diberikan').count(),
-            'tidak_diberikan': self.queryset.filter(status='tidak_diberikan').count(),
-            'menolak': self.queryset.filter(status='menolak').count(),
-        }
-        by_jenis = {}
-        for choice in PMT.JENIS_PMT_CHOICES:
-            by_jenis[choice[0]] = self.queryset.filter(jenis_pmt=choice[0]).count()
-        
-        return Response({
-            'total_pmt': total_pmt,
-            'by_status': by_status,
-            'by_jenis': by_jenis,
-        })
 
 
-class StokVitaminViewSet(viewsets.ModelViewSet):
+class StokVitaminViewSet(ConditionalGetMixin, StatisticsMixin, StockLedgerMixin, StockExpiryMixin, BatchLookupMixin, RelatedLoadsMixin, viewsets.ModelViewSet):
     """ViewSet untuk model StokVitamin."""
     queryset = StokVitamin.objects.all()
     serializer_class = StokVitaminSerializer
+    stock_ledger = vitamin_ledger
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['jenis_vitamin', 'status', 'supplier']
     search_fields = ['jenis_vitamin', 'nama_produk', 'batch_number', 'supplier']
     ordering_fields = ['jenis_vitamin', 'tanggal_kedaluwarsa', 'created_at']
     ordering = ['jenis_vitamin', 'tanggal_kedaluwarsa']
+    statistics_spec = {
+        'total_stok': Total(),
+        'by_status': count_by('status', ['tersedia', 'habis', 'kedaluwarsa']),
+        'by_jenis': count_by('jenis_vitamin', JenisVitamin.JENIS_VITAMIN_CHOICES),
+    }
     
     @action(detail=False, methods=['get'])
     def by_jenis(self, request):
@@ -201,53 +201,23 @@ class StokVitaminViewSet(viewsets.ModelViewSet):
         
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
-    
-    @action(detail=False, methods=['get'])
-    def expiring_soon(self, request):
-        """Mengambil stok yang akan kedaluwarsa dalam 30 hari."""
-        queryset = self.queryset.filter(status='tersedia')
-        expiring_items = []
-        for item in queryset:
-            if item.is_expiring_soon:
-                expiring_items.append(item)
-        
-        page = self.paginate_queryset(expiring_items)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-        
-        serializer = self.get_serializer(expiring_items, many=True)
-        return Response(serializer.data)
-    
-    @action(detail=False, methods=['get'])
-    def statistics(self, request):
-        """Statistik stok vitamin."""
-        total_stok = self.queryset.count()
-        by_status = {
-            'tersedia': self.queryset.filter(status='tersedia').count(),
-            'habis': self.queryset.filter(status='habis').count(),
-            'kedaluwarsa': self.queryset.filter(status='kedaluwarsa').count(),
-        }
-        by_jenis = {}
-        for choice in StokVitamin.JENIS_VITAMIN_CHOICES:
-            by_jenis[choice[0]] = self.queryset.filter(jenis_vitamin=choice[0]).count()
-        
-        return Response({
-            'total_stok': total_stok,
-            'by_status': by_status,
-            'by_jenis': by_jenis,
-        })
 
 
-class StokPMTViewSet(viewsets.ModelViewSet):
+class StokPMTViewSet(ConditionalGetMixin, StatisticsMixin, StockLedgerMixin, StockExpiryMixin, BatchLookupMixin, RelatedLoadsMixin, viewsets.ModelViewSet):
     """ViewSet untuk model StokPMT."""
     queryset = StokPMT.objects.all()
     serializer_class = StokPMTSerializer
+    stock_ledger = pmt_ledger
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['jenis_pmt', 'status', 'supplier']
     search_fields = ['jenis_pmt', 'nama_produk', 'batch_number', 'supplier']
     ordering_fields = ['jenis_pmt', 'tanggal_kedaluwarsa', 'created_at']
     ordering = ['jenis_pmt', 'tanggal_kedaluwarsa']
+    statistics_spec = {
+        'total_stok': Total(),
+        'by_status': count_by('status', ['tersedia', 'habis', 'kedaluwarsa']),
+        'by_jenis': count_by_choices(StokPMT, 'jenis_pmt'),
+    }
     
     @action(detail=False, methods=['get'])
     def by_jenis(self, request):
@@ -267,39 +237,12 @@ class StokPMTViewSet(viewsets.ModelViewSet):
         
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
-    
-    @action(detail=False, methods=['get'])
-    def expiring_soon(self, request):
-        """Mengambil stok yang akan kedaluwarsa dalam 30 hari."""
-        queryset = self.queryset.filter(status='tersedia')
-        expiring_items = []
-        for item in queryset:
-            if item.is_expiring_soon:
-                expiring_items.append(item)
-        
-        page = self.paginate_queryset(expiring_items)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-        
-        serializer = self.get_serializer(expiring_items, many=True)
-        return Response(serializer.data)
-    
-    @action(detail=False, methods=['get'])
-    def statistics(self, request):
-        """Statistik stok PMT."""
-        total_stok = self.queryset.count()
-        by_status = {
-            'tersedia': self.queryset.filter(status='tersedia').count(),
-            'habis': self.queryset.filter(status='habis').count(),
-            'kedaluwarsa': self.queryset.filter(status='kedaluwarsa').count(),
-        }
-        by_jenis = {}
-        for choice in StokPMT.JENIS_PMT_CHOICES:
-            by_jenis[choice[0]] = self.queryset.filter(jenis_pmt=choice[0]).count()
-        
-        return Response({
-            'total_stok': total_stok,
-            'by_status': by_status,
-            'by_jenis': by_jenis,
-        })
+
+
+class SyncViewSet(ChangeFeedViewSet):
+    """Change feed untuk sinkronisasi perangkat offline."""
+    tombstone_model = SyncTombstone
+    sync_sources = {
+        'stok-vitamin': SyncSource(StokVitamin.objects.all(), StokVitaminSerializer),
+        'stok-pmt': SyncSource(StokPMT.objects.all(), StokPMTSerializer),
+    }